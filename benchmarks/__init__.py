@@ -0,0 +1,4 @@
+"""End-to-end performance benchmarks for the three LangGraph flows.
+
+Run with ``python -m benchmarks.run_flows`` — see :mod:`benchmarks.run_flows`.
+"""
@@ -0,0 +1,163 @@
+"""Benchmark ``/api/bets`` payload encoding: encode time and bytes on the wire.
+
+Builds a synthetic result of ``--rows`` bet rows (the query's 2000-row cap
+by default) and times three ways of turning it into a response body:
+
+* ``stdlib``  — per-row dicts, ``jsonable_encoder`` and ``json.dumps``
+  (FastAPI's default path before ``webapp.serialize``);
+* ``records`` — :func:`~soccersmartbet.webapp.serialize.shape_bets` +
+  orjson, the default ``/api/bets`` format;
+* ``columns`` — the opt-in ``?format=columns`` layout + orjson.
+
+For each it reports the best-of-``--repeat`` encode time and the body size
+raw, gzip-compressed and brotli-compressed, at the levels
+:mod:`soccersmartbet.webapp.compression` uses.
+
+Usage::
+
+    python -m benchmarks.api_payloads [--rows 2000] [--repeat 20]
+
+No database or network access is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import date, time as dtime, timedelta
+from decimal import Decimal
+from typing import Any, Callable
+
+import brotli
+from fastapi.encoders import jsonable_encoder
+
+from soccersmartbet.webapp.compression import BROTLI_QUALITY, GZIP_LEVEL
+from soccersmartbet.webapp.query.models import BetRow
+from soccersmartbet.webapp.serialize import dumps, shape_bets
+
+_TEAMS = (
+    "Arsenal", "Chelsea", "Liverpool", "Manchester City", "Real Madrid",
+    "Barcelona", "Atletico Madrid", "Bayern Munich", "Borussia Dortmund",
+    "Inter", "Juventus", "AC Milan", "Paris Saint-Germain", "Napoli",
+)
+_LEAGUES = ("Premier League", "La Liga", "Bundesliga", "Serie A", "Ligue 1")
+
+
+def _synthetic_rows(n: int, seed: int = 7) -> list[BetRow]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        home, away = rng.sample(_TEAMS, 2)
+        prediction = rng.choice(("1", "x", "2"))
+        outcome = rng.choice(("1", "x", "2", None))
+        stake = Decimal(rng.choice((50, 100, 150, 200)))
+        odds = Decimal(str(round(rng.uniform(1.3, 6.0), 2)))
+        pnl = None if outcome is None else (
+            stake * (odds - 1) if outcome == prediction else -stake
+        )
+        rows.append(BetRow(
+            bet_id=i + 1,
+            bettor="user" if i % 2 else "ai",
+            prediction=prediction,
+            stake=stake,
+            odds=odds,
+            result=None if outcome is None else ("win" if pnl > 0 else "loss"),
+            pnl=pnl,
+            game_id=i // 2 + 1,
+            home_team=home,
+            away_team=away,
+            match_date=date(2026, 1, 1) + timedelta(days=i // 6),
+            kickoff_time=dtime(rng.choice((16, 18, 21)), rng.choice((0, 30))),
+            league=rng.choice(_LEAGUES),
+            outcome=outcome,
+            home_score=None if outcome is None else rng.randint(0, 4),
+            away_score=None if outcome is None else rng.randint(0, 4),
+        ))
+    return rows
+
+
+def _stdlib(rows: list[BetRow]) -> bytes:
+    payload = {"rows": [
+        {
+            "bet_id": b.bet_id,
+            "bettor": b.bettor,
+            "prediction": b.prediction,
+            "stake": float(b.stake),
+            "odds": float(b.odds),
+            "result": b.result,
+            "pnl": float(b.pnl) if b.pnl is not None else None,
+            "game_id": b.game_id,
+            "home_team": b.home_team,
+            "away_team": b.away_team,
+            "match_date": b.match_date.isoformat(),
+            "kickoff_time": b.kickoff_time.strftime("%H:%M"),
+            "league": b.league,
+            "outcome": b.outcome,
+            "home_score": b.home_score,
+            "away_score": b.away_score,
+        }
+        for b in rows
+    ]}
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _best_of(fn: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, body
+
+
+def run(rows: int, repeat: int) -> list[dict[str, Any]]:
+    """Return one result dict per encoding strategy."""
+    data = _synthetic_rows(rows)
+    strategies: dict[str, Callable[[], bytes]] = {
+        "stdlib": lambda: _stdlib(data),
+        "records": lambda: dumps(shape_bets(data, "records")),
+        "columns": lambda: dumps(shape_bets(data, "columns")),
+    }
+    results = []
+    for name, fn in strategies.items():
+        seconds, body = _best_of(fn, repeat)
+        results.append({
+            "format": name,
+            "encode_ms": round(seconds * 1000, 2),
+            "raw_bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=GZIP_LEVEL)),
+            "br_bytes": len(brotli.compress(body, quality=BROTLI_QUALITY)),
+        })
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"/api/bets payload, {args.rows} rows (best of {args.repeat})")
+    print(f"{'format':<10}{'encode ms':>11}{'raw B':>10}{'gzip B':>10}{'br B':>10}")
+    for r in results:
+        print(
+            f"{r['format']:<10}{r['encode_ms']:>11.2f}{r['raw_bytes']:>10}"
+            f"{r['gzip_bytes']:>10}{r['br_bytes']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
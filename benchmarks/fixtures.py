@@ -0,0 +1,353 @@
+"""Synthetic matchday and stubbed network / LLM / Telegram boundary.
+
+Everything the flows would normally fetch from the outside world is served
+from :class:`SyntheticMatchday`.  Each stub sleeps for the latency configured
+in the active :class:`LatencyProfile` so wall times and fan-out concurrency
+look like a real run, while staying deterministic and offline.
+
+Any HTTP call that is *not* stubbed here hits the cassette layer in replay
+mode against an empty directory and fails fast with ``CassetteMiss`` — the
+benchmark never touches the network.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Sequence
+from unittest.mock import patch
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Per-call latency (seconds) injected by the stubs."""
+
+    http: float
+    llm: float
+    telegram: float
+
+
+PROFILES: dict[str, LatencyProfile] = {
+    # No injected latency: measures pure Python + DB overhead.
+    "zero": LatencyProfile(http=0.0, llm=0.0, telegram=0.0),
+    # Default: small but non-zero so fan-out overlap is observable.
+    "ci": LatencyProfile(http=0.02, llm=0.15, telegram=0.01),
+    # Roughly what a production morning run sees.
+    "realistic": LatencyProfile(http=0.25, llm=4.0, telegram=0.3),
+}
+
+
+# (home, away, competition, kickoff hour UTC, home fotmob id, away fotmob id)
+_GAMES: tuple[tuple[str, str, str, int, int, int], ...] = (
+    ("Bench Arsenal", "Bench Chelsea", "Premier League", 12, 90001, 90002),
+    ("Bench Liverpool", "Bench Everton", "Premier League", 14, 90003, 90004),
+    ("Bench Barcelona", "Bench Sevilla", "La Liga", 16, 90005, 90006),
+    ("Bench Real Madrid", "Bench Valencia", "La Liga", 19, 90007, 90008),
+    ("Bench Bayern", "Bench Dortmund", "Bundesliga", 17, 90009, 90010),
+    ("Bench Inter", "Bench Juventus", "Serie A", 18, 90011, 90012),
+)
+
+
+@dataclass
+class SyntheticMatchday:
+    """A deterministic matchday of ``n_games`` fixtures on ``match_date``."""
+
+    match_date: date
+    n_games: int = len(_GAMES)
+    profile: LatencyProfile = field(default_factory=lambda: PROFILES["ci"])
+
+    def __post_init__(self) -> None:
+        self.games = [_GAMES[i % len(_GAMES)] for i in range(self.n_games)]
+
+    # -- seeding ----------------------------------------------------------
+
+    def team_rows(self) -> list[dict[str, Any]]:
+        rows: dict[str, dict[str, Any]] = {}
+        for home, away, league, _h, home_id, away_id in self.games:
+            rows[home] = {"canonical_name": home, "fotmob_id": home_id, "league": league}
+            rows[away] = {"canonical_name": away, "fotmob_id": away_id, "league": league}
+        return list(rows.values())
+
+    # -- football-data.org / winner.co.il ----------------------------------
+
+    def _kickoff_utc(self, hour: int) -> datetime:
+        return datetime(
+            self.match_date.year, self.match_date.month, self.match_date.day,
+            hour, 0, tzinfo=timezone.utc,
+        )
+
+    def fetch_daily_fixtures(self, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        time.sleep(self.profile.http)
+        fixtures = [
+            {
+                "match_id": 500_000 + i,
+                "home_team": home,
+                "away_team": away,
+                "competition": league,
+                "kickoff_time": self._kickoff_utc(hour).isoformat().replace("+00:00", "Z"),
+            }
+            for i, (home, away, league, hour, _hid, _aid) in enumerate(self.games)
+        ]
+        return {"fixtures": fixtures, "error": None}
+
+    def fetch_all_winner_odds(self, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        time.sleep(self.profile.http)
+        events = [
+            {
+                "home_team": home,
+                "away_team": away,
+                "league": league,
+                "commence_time": self._kickoff_utc(hour).isoformat(),
+                "odds_home": 1.8 + 0.1 * i,
+                "odds_draw": 3.4,
+                "odds_away": 4.2 - 0.1 * i,
+            }
+            for i, (home, away, league, hour, _hid, _aid) in enumerate(self.games)
+        ]
+        return {"events": events, "error": None}
+
+    # -- FotMob --------------------------------------------------------------
+
+    def fotmob_client(self) -> "_FakeFotMobClient":
+        return _FakeFotMobClient(self)
+
+    # -- per-game tools (analyze_game fan-out) -----------------------------
+
+    def _tool(self, payload: dict[str, Any]) -> dict[str, Any]:
+        time.sleep(self.profile.http)
+        return {"error": None, **payload}
+
+    def fetch_h2h(self, home: str, away: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        meetings = [
+            {
+                "date": f"202{i}-03-01",
+                "home_team": home if i % 2 else away,
+                "away_team": away if i % 2 else home,
+                "score_home": i % 3,
+                "score_away": (i + 1) % 2,
+                "winner": (home, away, "DRAW")[i % 3],
+            }
+            for i in range(5)
+        ]
+        return self._tool({"home_team": home, "away_team": away, "h2h_matches": meetings,
+                           "total_h2h": len(meetings)})
+
+    def fetch_venue(self, home: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"venue_name": f"{home} Stadium", "venue_city": "Bench City",
+                           "venue_capacity": 50_000, "venue_surface": "grass"})
+
+    def fetch_weather(self, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"venue_city": "Bench City", "temperature_celsius": 14.0,
+                           "precipitation_mm": 0.0, "precipitation_probability": 10,
+                           "wind_speed_kmh": 12.0, "conditions": "Clear"})
+
+    def fetch_form(self, team: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        matches = [
+            {"result": "WDL"[i % 3], "goals_for": i % 3, "goals_against": 1,
+             "opponent": f"Opponent {i}", "home_away": "home" if i % 2 else "away",
+             "date": (self.match_date - timedelta(days=7 * (i + 1))).isoformat()}
+            for i in range(5)
+        ]
+        return self._tool({"team_name": team, "matches": matches,
+                           "record": {"wins": 2, "draws": 2, "losses": 1}})
+
+    def fetch_injuries(self, team: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"team_name": team, "injuries": [], "total_injuries": 0})
+
+    def fetch_league_position(self, team: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"team_name": team, "league_name": "Bench League",
+                           "position": 4, "points": 40, "played": 20})
+
+    def calculate_recovery_time(self, team: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"team_name": team, "recovery_days": 4})
+
+    def fetch_team_news(self, team: str, *_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return self._tool({"team_name": team, "articles": []})
+
+    # -- LLM -----------------------------------------------------------------
+
+    def invoke_structured(
+        self,
+        _model: str,
+        _temperature: float,
+        schema: type[BaseModel],
+        messages: Sequence[BaseMessage],
+    ) -> BaseModel:
+        time.sleep(self.profile.llm)
+        user_text = str(messages[-1].content)
+        builder = _LLM_BUILDERS.get(schema.__name__)
+        if builder is None:
+            raise AssertionError(f"benchmark has no synthetic LLM output for {schema.__name__}")
+        return schema.model_validate(builder(user_text))
+
+    # -- Telegram ------------------------------------------------------------
+
+    async def send_async(self, *_args: Any, **_kwargs: Any) -> None:
+        time.sleep(self.profile.telegram)
+
+    # -- wiring --------------------------------------------------------------
+
+    def patch_boundary(self, stack: ExitStack) -> None:
+        """Install every stub on *stack* (undone when the stack closes)."""
+        picker = "soccersmartbet.pre_gambling_flow.nodes.smart_game_picker"
+        game_agent = "soccersmartbet.pre_gambling_flow.agents.game_intelligence"
+        team_agent = "soccersmartbet.pre_gambling_flow.agents.team_intelligence"
+        notify = "soccersmartbet.pre_gambling_flow.nodes.notify_telegram"
+        prefetch = "soccersmartbet.pre_gambling_flow.nodes.prefetch_game_data"
+
+        targets: dict[str, Any] = {
+            f"{picker}.fetch_daily_fixtures": self.fetch_daily_fixtures,
+            f"{picker}.fetch_all_winner_odds": self.fetch_all_winner_odds,
+            f"{picker}.get_fotmob_client": self.fotmob_client,
+            f"{picker}.invoke_structured": self.invoke_structured,
+            "soccersmartbet.pre_gambling_flow.nodes.persist_games._enrich_with_fotmob":
+                lambda _ids: time.sleep(self.profile.http),
+            f"{prefetch}.get_fotmob_client": self.fotmob_client,
+            f"{prefetch}.prefetch_competition": lambda _league: time.sleep(self.profile.http),
+            f"{prefetch}.get_venue": lambda *_args: None,
+            f"{prefetch}.prefetch_weather": lambda _games: time.sleep(self.profile.http),
+            f"{game_agent}.fetch_h2h": self.fetch_h2h,
+            f"{game_agent}.fetch_venue": self.fetch_venue,
+            f"{game_agent}.fetch_weather": self.fetch_weather,
+            f"{game_agent}.invoke_structured": self.invoke_structured,
+            f"{team_agent}.fetch_form": self.fetch_form,
+            f"{team_agent}.fetch_injuries": self.fetch_injuries,
+            f"{team_agent}.fetch_league_position": self.fetch_league_position,
+            f"{team_agent}.calculate_recovery_time": self.calculate_recovery_time,
+            f"{team_agent}.fetch_team_news": self.fetch_team_news,
+            f"{team_agent}.invoke_structured": self.invoke_structured,
+            "soccersmartbet.pre_gambling_flow.agents.expert_report.invoke_structured":
+                self.invoke_structured,
+            f"{notify}.send_gambling_time": self.send_async,
+            f"{notify}.send_html_report": self.send_async,
+            f"{notify}.send_want_to_bet": self.send_async,
+            f"{notify}.Bot": _FakeBot,
+            "soccersmartbet.gambling_flow.ai_betting_agent.invoke_structured":
+                self.invoke_structured,
+            "soccersmartbet.gambling_flow.notify_result.send_message": self.send_async,
+            "soccersmartbet.post_games_flow.fetch_results.get_fotmob_client": self.fotmob_client,
+            "soccersmartbet.post_games_flow.notify_summary.send_message": self.send_async,
+        }
+        for target, replacement in targets.items():
+            stack.enter_context(patch(target, replacement))
+
+
+class _FakeBot:
+    def __init__(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
+    async def __aenter__(self) -> "_FakeBot":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        return None
+
+
+class _FakeFotMobClient:
+    """Subset of ``FotMobClient`` used by the picker, prefetch and fetch_results."""
+
+    def __init__(self, day: SyntheticMatchday) -> None:
+        self._day = day
+        self._by_id = {}
+        self._by_name = {}
+        for home, away, _league, hour, home_id, away_id in day.games:
+            self._by_name[home] = {"id": home_id, "name": home}
+            self._by_name[away] = {"id": away_id, "name": away}
+            self._by_id[home_id] = (away, hour)
+
+    def get_league_table(self, _league_id: int) -> list[dict[str, Any]]:
+        time.sleep(self._day.profile.http)
+        return []
+
+    def get_league_standings(self, league_id: int) -> list[dict[str, Any]]:
+        return self.get_league_table(league_id)
+
+    def find_team(self, name: str) -> dict[str, Any] | None:
+        return self._by_name.get(name)
+
+    def get_team_news(self, _team_id: int) -> dict[str, Any] | None:
+        time.sleep(self._day.profile.http)
+        return {"data": [], "totalItems": 0}
+
+    def get_team_data(self, team_id: int) -> dict[str, Any] | None:
+        time.sleep(self._day.profile.http)
+        fixture = self._by_id.get(team_id)
+        if fixture is None:
+            return None
+        opponent, hour = fixture
+        utc = self._day._kickoff_utc(hour).isoformat().replace("+00:00", "Z")
+        return {
+            "overview": {
+                "overviewFixtures": [
+                    {
+                        "opponent": {"name": opponent},
+                        "status": {"utcTime": utc, "finished": True},
+                        "home": {"score": 2},
+                        "away": {"score": 1},
+                    }
+                ]
+            }
+        }
+
+
+# ---------------------------------------------------------------------------
+# Synthetic structured LLM outputs
+# ---------------------------------------------------------------------------
+
+_ELIGIBLE_LINE_RE = re.compile(
+    r"^- (?P<home>.+?) vs (?P<away>.+?) \| (?P<league>.+?) \| "
+    r"(?P<date>\S+) (?P<time>\S+) ISR \|",
+    re.MULTILINE,
+)
+_GAME_ID_RE = re.compile(r"--- Game ID: (\d+) ---")
+
+
+def _selected_games(user_text: str) -> dict[str, Any]:
+    games = [
+        {
+            "home_team": m["home"],
+            "away_team": m["away"],
+            "match_date": m["date"],
+            "kickoff_time": m["time"],
+            "league": m["league"],
+            "venue": None,
+            "justification": "benchmark pick",
+        }
+        for m in _ELIGIBLE_LINE_RE.finditer(user_text)
+    ]
+    return {"games": games, "selection_reasoning": "benchmark: every eligible game"}
+
+
+def _ai_bets(user_text: str) -> dict[str, Any]:
+    return {
+        "bets": [
+            {"game_id": int(gid), "prediction": "1", "stake": 100, "justification": "benchmark"}
+            for gid in _GAME_ID_RE.findall(user_text)
+        ]
+    }
+
+
+_BULLETS = ["synthetic bullet one", "synthetic bullet two"]
+
+_LLM_BUILDERS = {
+    "SelectedGames": _selected_games,
+    "GameReportBullets": lambda _t: {
+        "h2h_bullets": _BULLETS,
+        "weather_bullets": _BULLETS,
+        "weather_cancellation_risk": "low",
+    },
+    "TeamReportBullets": lambda _t: {
+        "form_bullets": _BULLETS,
+        "league_bullets": _BULLETS,
+        "injury_bullets": _BULLETS,
+        "news_bullets": _BULLETS,
+    },
+    "ExpertGameReport": lambda _t: {"expert_analysis": _BULLETS},
+    "AIBetsOutput": _ai_bets,
+}
@@ -0,0 +1,203 @@
+"""Instrumentation for the flow benchmarks.
+
+Collects, per flow run:
+
+* per-node wall time — every node function (including the three nodes inside
+  the ``analyze_game`` subgraph) is wrapped before the graph is built;
+* fan-out concurrency — the maximum number of games and of intelligence
+  nodes in flight at the same time inside ``analyze_game``;
+* DB round-trips — every ``psycopg`` ``Cursor.execute``/``executemany``;
+* peak Python memory — ``tracemalloc`` peak over the run.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+
+import psycopg
+
+# Node functions looked up by name at graph-build time, per flow.
+_PRE_GAMBLING_NODES = {
+    "soccersmartbet.pre_gambling_flow.graph_manager": (
+        "smart_game_picker",
+        "persist_games",
+        "prefetch_game_data",
+        "combine_reports",
+        "generate_expert_reports",
+        "persist_reports",
+        "notify_telegram",
+    ),
+}
+_ANALYZE_GAME_NODES = {
+    "_game_intelligence_node": "analyze_game.game_intelligence",
+    "_team_intelligence_home_node": "analyze_game.team_intel_home",
+    "_team_intelligence_away_node": "analyze_game.team_intel_away",
+}
+_GAMBLING_NODES = {
+    "soccersmartbet.gambling_flow.graph_manager": (
+        "ai_betting_agent",
+        "verify_and_persist_bets",
+        "notify_gambling_result",
+    ),
+}
+_POST_GAMES_NODES = {
+    "soccersmartbet.post_games_flow.graph_manager": (
+        "fetch_results",
+        "calculate_pnl",
+        "notify_daily_summary",
+    ),
+}
+
+FLOW_NODES: dict[str, dict[str, tuple[str, ...]]] = {
+    "pre_gambling": _PRE_GAMBLING_NODES,
+    "gambling": _GAMBLING_NODES,
+    "post_games": _POST_GAMES_NODES,
+}
+
+
+@dataclass
+class FlowMetrics:
+    """Everything measured for one flow run."""
+
+    wall_s: float = 0.0
+    nodes: dict[str, float] = field(default_factory=dict)
+    db_round_trips: int = 0
+    peak_mem_kib: int = 0
+    max_games_in_flight: int = 0
+    max_nodes_in_flight: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "wall_s": round(self.wall_s, 4),
+            "nodes": {k: round(v, 4) for k, v in sorted(self.nodes.items())},
+            "db_round_trips": self.db_round_trips,
+            "peak_mem_kib": self.peak_mem_kib,
+        }
+        if self.max_nodes_in_flight:
+            out["max_games_in_flight"] = self.max_games_in_flight
+            out["max_nodes_in_flight"] = self.max_nodes_in_flight
+        return out
+
+
+class _Recorder:
+    """Thread-safe accumulator shared by the node and cursor wrappers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.metrics = FlowMetrics()
+        self._games: dict[int, int] = {}
+        self._nodes_in_flight = 0
+
+    def add_node_time(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            self.metrics.nodes[name] = self.metrics.nodes.get(name, 0.0) + elapsed
+
+    def count_db(self) -> None:
+        with self._lock:
+            self.metrics.db_round_trips += 1
+
+    def enter_game_node(self, game_id: int) -> None:
+        with self._lock:
+            self._games[game_id] = self._games.get(game_id, 0) + 1
+            self._nodes_in_flight += 1
+            self.metrics.max_nodes_in_flight = max(
+                self.metrics.max_nodes_in_flight, self._nodes_in_flight
+            )
+            self.metrics.max_games_in_flight = max(
+                self.metrics.max_games_in_flight, len(self._games)
+            )
+
+    def exit_game_node(self, game_id: int) -> None:
+        with self._lock:
+            self._nodes_in_flight -= 1
+            self._games[game_id] -= 1
+            if not self._games[game_id]:
+                del self._games[game_id]
+
+
+def _timed(rec: _Recorder, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(state, *args, **kwargs)
+        finally:
+            rec.add_node_time(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _fanout_timed(rec: _Recorder, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+        game_id = state["game_id"]
+        rec.enter_game_node(game_id)
+        start = time.perf_counter()
+        try:
+            return fn(state, *args, **kwargs)
+        finally:
+            rec.add_node_time(name, time.perf_counter() - start)
+            rec.exit_game_node(game_id)
+
+    return wrapper
+
+
+def _counting(rec: _Recorder, method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        rec.count_db()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def measure(flow: str) -> Iterator[FlowMetrics]:
+    """Instrument *flow*'s nodes, the DB driver and memory for one run.
+
+    The graph must be built *inside* this context so the wrapped node
+    functions are the ones registered with LangGraph.
+    """
+    import importlib
+
+    rec = _Recorder()
+    with ExitStack() as stack:
+        for module_name, names in FLOW_NODES[flow].items():
+            module = importlib.import_module(module_name)
+            for name in names:
+                stack.enter_context(
+                    patch.object(module, name, _timed(rec, name, getattr(module, name)))
+                )
+        if flow == "pre_gambling":
+            from soccersmartbet.pre_gambling_flow.nodes import analyze_game
+
+            for attr, label in _ANALYZE_GAME_NODES.items():
+                stack.enter_context(
+                    patch.object(
+                        analyze_game, attr, _fanout_timed(rec, label, getattr(analyze_game, attr))
+                    )
+                )
+
+        stack.enter_context(
+            patch.object(psycopg.Cursor, "execute", _counting(rec, psycopg.Cursor.execute))
+        )
+        stack.enter_context(
+            patch.object(psycopg.Cursor, "executemany", _counting(rec, psycopg.Cursor.executemany))
+        )
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield rec.metrics
+        finally:
+            rec.metrics.wall_s = time.perf_counter() - start
+            rec.metrics.peak_mem_kib = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
@@ -0,0 +1,229 @@
+"""Benchmark the pre-gambling, gambling and post-games flows end-to-end.
+
+Drives the real graphs (``run_pre_gambling_flow`` → ``run_gambling_flow`` →
+``run_post_games_flow``) against a local Postgres seeded with a synthetic
+matchday.  Network, LLM and Telegram are stubbed with fixed latency profiles
+(see :mod:`benchmarks.fixtures`), so results are reproducible offline.
+
+Usage::
+
+    BENCH_DATABASE_URL=postgresql://postgres:pw@localhost:5433/ssb_bench \\
+        python -m benchmarks.run_flows [--games 6] [--profile ci]
+    python -m benchmarks.run_flows --update-baseline   # after an intended change
+
+The database is TRUNCATED before every run, so ``BENCH_DATABASE_URL`` must
+name a scratch database whose name contains ``bench``.  The schema from
+``deployment/db/init/001_create_schema.sql`` is applied if missing.
+
+Exit status is 1 when any metric regresses past ``--tolerance`` relative to
+``benchmarks/baseline.json`` (timings also get a fixed absolute slack so
+millisecond-scale nodes don't flap).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_SCHEMA_SQL = _REPO_ROOT / "deployment" / "db" / "init" / "001_create_schema.sql"
+_DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+_TIME_SLACK_S = 0.05
+
+_DATA_TABLES = (
+    "bet_edits", "run_events", "daily_runs", "bets", "expert_game_reports",
+    "team_reports", "game_reports", "odds_snapshots", "games", "teams", "stats_rollups",
+)
+
+
+def _configure_env(database_url: str) -> None:
+    """Point the app at the bench DB and make un-stubbed network calls fail fast.
+
+    Must run before any ``soccersmartbet`` import: ``db.DATABASE_URL`` is read
+    at import time.
+    """
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["CASSETTE_MODE"] = "replay"
+    os.environ["CASSETTE_DIR"] = tempfile.mkdtemp(prefix="ssb-bench-cassettes-")
+    os.environ["LOGO_CACHE_DIR"] = tempfile.mkdtemp(prefix="ssb-bench-logos-")
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "bench")
+    os.environ.setdefault("TELEGRAM_CHAT_ID", "0")
+
+
+def _prepare_db(database_url: str, team_rows: list[dict[str, Any]]) -> None:
+    import psycopg
+
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        exists = conn.execute("SELECT to_regclass('public.games')").fetchone()[0]
+        if exists is None:
+            conn.execute(_SCHEMA_SQL.read_text(encoding="utf-8"))
+        conn.execute(f"TRUNCATE {', '.join(_DATA_TABLES)} RESTART IDENTITY CASCADE")
+        conn.execute(
+            "UPDATE bankroll SET total_bankroll = 10000.00, games_played = 0, "
+            "games_won = 0, games_lost = 0"
+        )
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO teams (canonical_name, fotmob_id, league) "
+                "VALUES (%(canonical_name)s, %(fotmob_id)s, %(league)s)",
+                team_rows,
+            )
+
+
+def run_benchmark(n_games: int, profile_name: str) -> dict[str, Any]:
+    """Run all three flows once and return their metrics keyed by flow name."""
+    from benchmarks.fixtures import PROFILES, SyntheticMatchday
+    from benchmarks.harness import measure
+    from soccersmartbet.db import close_pool
+    from soccersmartbet.gambling_flow.graph_manager import run_gambling_flow
+    from soccersmartbet.post_games_flow.graph_manager import run_post_games_flow
+    from soccersmartbet.pre_gambling_flow.graph_manager import run_pre_gambling_flow
+    from soccersmartbet.utils.timezone import today_isr
+
+    day = SyntheticMatchday(today_isr(), n_games=n_games, profile=PROFILES[profile_name])
+    _prepare_db(os.environ["DATABASE_URL"], day.team_rows())
+
+    results: dict[str, Any] = {}
+    try:
+        with ExitStack() as stack:
+            day.patch_boundary(stack)
+
+            with measure("pre_gambling") as metrics:
+                pre_state = run_pre_gambling_flow()
+            game_ids: list[int] = pre_state["games_to_analyze"]
+            if len(game_ids) != n_games:
+                raise RuntimeError(
+                    f"pre-gambling selected {len(game_ids)} game(s), expected {n_games}"
+                )
+            results["pre_gambling"] = metrics.as_dict()
+
+            user_bets = [
+                {"game_id": gid, "prediction": "1", "odds": 2.0, "stake": 100.0}
+                for gid in game_ids
+            ]
+            with measure("gambling") as metrics:
+                gambling_state = run_gambling_flow(game_ids, user_bets)
+            if gambling_state.get("verification_result") != "accepted":
+                raise RuntimeError(f"gambling flow rejected bets: {gambling_state}")
+            results["gambling"] = metrics.as_dict()
+
+            with measure("post_games") as metrics:
+                run_post_games_flow(game_ids)
+            results["post_games"] = metrics.as_dict()
+    finally:
+        close_pool()
+
+    return {"games": n_games, "profile": profile_name, "flows": results}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    """Return human-readable regressions of *current* against *baseline*."""
+    failures: list[str] = []
+    if (baseline.get("games"), baseline.get("profile")) != (current["games"], current["profile"]):
+        return [
+            f"baseline was recorded with games={baseline.get('games')} "
+            f"profile={baseline.get('profile')}; rerun with the same settings "
+            f"or --update-baseline"
+        ]
+
+    def _slower(label: str, base: float, cur: float) -> None:
+        if cur > base * (1 + tolerance) + _TIME_SLACK_S:
+            failures.append(f"{label}: {cur:.3f}s vs baseline {base:.3f}s")
+
+    for flow, base in baseline["flows"].items():
+        cur = current["flows"].get(flow)
+        if cur is None:
+            failures.append(f"{flow}: missing from current run")
+            continue
+        _slower(f"{flow}.wall_s", base["wall_s"], cur["wall_s"])
+        for node, base_s in base["nodes"].items():
+            if node in cur["nodes"]:
+                _slower(f"{flow}.{node}", base_s, cur["nodes"][node])
+        if cur["db_round_trips"] > base["db_round_trips"] * (1 + tolerance):
+            failures.append(
+                f"{flow}.db_round_trips: {cur['db_round_trips']} "
+                f"vs baseline {base['db_round_trips']}"
+            )
+        if cur["peak_mem_kib"] > base["peak_mem_kib"] * (1 + tolerance):
+            failures.append(
+                f"{flow}.peak_mem_kib: {cur['peak_mem_kib']} vs baseline {base['peak_mem_kib']}"
+            )
+        if cur.get("max_games_in_flight", 0) < base.get("max_games_in_flight", 0):
+            failures.append(
+                f"{flow}.max_games_in_flight: {cur.get('max_games_in_flight', 0)} "
+                f"vs baseline {base['max_games_in_flight']}"
+            )
+    return failures
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"games={report['games']} profile={report['profile']}")
+    for flow, m in report["flows"].items():
+        print(f"\n[{flow}] wall={m['wall_s']:.3f}s db_round_trips={m['db_round_trips']} "
+              f"peak_mem={m['peak_mem_kib']} KiB")
+        if "max_games_in_flight" in m:
+            print(f"  fan-out: max games in flight={m['max_games_in_flight']} "
+                  f"max nodes in flight={m['max_nodes_in_flight']}")
+        for node, secs in sorted(m["nodes"].items(), key=lambda kv: -kv[1]):
+            print(f"  {node:<40} {secs:8.3f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=6)
+    parser.add_argument("--profile", default="ci", choices=("zero", "ci", "realistic"))
+    parser.add_argument("--baseline", type=Path, default=_DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args(argv)
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    if not database_url:
+        print("BENCH_DATABASE_URL is not set", file=sys.stderr)
+        return 2
+    db_name = urlsplit(database_url).path.lstrip("/")
+    if "bench" not in db_name:
+        print(f"refusing to TRUNCATE database {db_name!r}: name must contain 'bench'",
+              file=sys.stderr)
+        return 2
+
+    logging.basicConfig(level=logging.WARNING)
+    _configure_env(database_url)
+    report = run_benchmark(args.games, args.profile)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+        return 0
+
+    failures = compare(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.tolerance)
+    if failures:
+        print("\nREGRESSIONS:", file=sys.stderr)
+        for line in failures:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print("\nno regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Benchmark parsing the winner.co.il ``GetCMobileLine`` payload.
+
+Times three ways of turning the raw body into the 1X2 soccer events
+:func:`~soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds._parse_soccer_markets`
+returns:
+
+* ``json``   — ``json.loads`` on the whole document, then filter (the old
+  ``response.json()`` path);
+* ``orjson`` — the same with orjson, for reference;
+* ``stream`` — :func:`~soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds.iter_markets`,
+  which decodes one market at a time and keeps only what the filter wants.
+
+For each it reports the best-of-``--repeat`` parse time and the
+``tracemalloc`` peak above the raw body, and checks that all three produce
+the same events.
+
+Usage::
+
+    python -m benchmarks.winner_line [--payload PATH] [--markets 20000] [--repeat 5]
+
+``--payload`` takes a recorded body: either the raw JSON or an ``http``
+cassette (``CASSETTE_MODE=record``, ``.json.gz``).  Without it a synthetic
+line of ``--markets`` markets is generated — every sport and market type,
+with roughly one in twenty a soccer 1X2 full-time market, like the real one.
+No database or network access is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import importlib
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+
+# The package re-exports the fetch_winner_odds function under the module's name.
+_winner = importlib.import_module(
+    "soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds"
+)
+
+_TEAMS_HE = (
+    "ברצלונה", "ריאל מדריד", "אתלטיקו מדריד", "ארסנל", "צ'לסי", "ליברפול",
+    "באיירן מינכן", "יובנטוס", "אינטר", "מכבי תל אביב", "הפועל באר שבע", "מכבי חיפה",
+)
+_LEAGUES_HE = (
+    "ספרדית ראשונה", "אנגלית ראשונה", "איטלקית ראשונה", "גרמנית ראשונה",
+    "ליגת האלופות", "ליגת Winner", "NBA", "יורוליג", "ATP טניס",
+)
+_MARKET_TYPES = (
+    "1X2 תוצאת סיום", "1X2 מחצית ראשונה", "מעל/מתחת 2.5 שערים", "הימור יתרון",
+    "שתי הקבוצות יבקיעו", "תוצאה מדויקת", "מנצח המשחק", "סה\"כ נקודות",
+)
+
+
+def synthetic_line(markets: int, seed: int = 11) -> bytes:
+    """Return a GetCMobileLine-shaped body with *markets* mixed markets."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(markets):
+        home, away = rng.sample(_TEAMS_HE, 2)
+        soccer_1x2 = i % 20 == 0
+        market_type = _MARKET_TYPES[0] if soccer_1x2 else rng.choice(_MARKET_TYPES[1:])
+        names = [home, "‏X‏", away] if soccer_1x2 else [
+            f"{market_type} {n}" for n in range(rng.choice((2, 3, 6, 12)))
+        ]
+        rows.append({
+            "mId": 900000 + i,
+            "eId": 500000 + i // 6,
+            "sId": 240 if soccer_1x2 else rng.choice((240, 227, 1100, 1200)),
+            "league": rng.choice(_LEAGUES_HE[:6] if soccer_1x2 else _LEAGUES_HE),
+            "desc": f"{home} - {away}",
+            "mp": f"{market_type} | {i}",
+            "e_date": 260501 + i % 7,
+            "m_hour": rng.choice(("1600", "1930", "2145")),
+            "isLive": False,
+            "outcomes": [
+                {"oId": i * 20 + n, "desc": name, "price": round(rng.uniform(1.05, 12.0), 2)}
+                for n, name in enumerate(names)
+            ],
+        })
+    line = {
+        "lineChecksum": "%032x" % rng.getrandbits(128),
+        "sports": [{"sId": s, "name": f"sport {s}"} for s in (240, 227, 1100, 1200)],
+        "markets": rows,
+        "serverTime": "2026-05-01T09:00:00Z",
+    }
+    return json.dumps(line, ensure_ascii=False).encode("utf-8")
+
+
+def load_payload(path: Path) -> bytes:
+    """Return the raw body from a JSON file or a recorded ``http`` cassette."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            record = json.load(fh)
+        return base64.b64decode(record["response"]["body_b64"])
+    return path.read_bytes()
+
+
+def _json(body: bytes) -> list[dict[str, Any]]:
+    return _winner._parse_soccer_markets(json.loads(body).get("markets") or [])
+
+
+def _orjson(body: bytes) -> list[dict[str, Any]]:
+    return _winner._parse_soccer_markets(orjson.loads(body).get("markets") or [])
+
+
+def _stream(body: bytes) -> list[dict[str, Any]]:
+    return _winner._parse_soccer_markets(_winner.iter_markets(body))
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(body: bytes, repeat: int) -> list[dict[str, Any]]:
+    """Return one result dict per parse strategy."""
+    strategies: dict[str, Callable[[bytes], list[dict[str, Any]]]] = {
+        "json": _json,
+        "orjson": _orjson,
+        "stream": _stream,
+    }
+    expected = _json(body)
+    results = []
+    for name, fn in strategies.items():
+        if fn(body) != expected:
+            raise AssertionError(f"{name} parse differs from json.loads")
+        results.append({
+            "strategy": name,
+            "parse_ms": round(_best_of(lambda: fn(body), repeat) * 1000, 2),
+            "peak_kib": _peak_bytes(lambda: fn(body)) // 1024,
+            "events": len(expected),
+        })
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload", type=Path, help="recorded body (.json) or cassette (.json.gz)")
+    parser.add_argument("--markets", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args(argv)
+
+    body = load_payload(args.payload) if args.payload else synthetic_line(args.markets)
+    results = run(body, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    source = args.payload or f"synthetic, {args.markets} markets"
+    print(f"GetCMobileLine parse, {len(body) // 1024} KiB body ({source}; best of {args.repeat})")
+    print(f"{'strategy':<10}{'parse ms':>10}{'peak KiB':>10}{'events':>8}")
+    for r in results:
+        print(f"{r['strategy']:<10}{r['parse_ms']:>10.2f}{r['peak_kib']:>10}{r['events']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
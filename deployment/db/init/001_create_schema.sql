@@ -354,3 +354,151 @@ CREATE TRIGGER trg_bet_edit_window
 BEFORE INSERT ON bet_edits
 FOR EACH ROW
 EXECUTE FUNCTION check_bet_edit_window();
+
+-- ============================================================================
+-- TABLE: llm_cache (migration 005)
+-- Purpose: Persistent LLM structured-output cache — reruns reuse earlier answers
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key    CHAR(64) PRIMARY KEY,
+    model        VARCHAR(60) NOT NULL,
+    schema_name  VARCHAR(80) NOT NULL,
+    response     JSONB NOT NULL,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at   TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+
+COMMENT ON TABLE llm_cache IS 'LLM structured-output cache keyed by sha256(model, temperature, messages, schema hash). Rows past expires_at are ignored and purged on write.';
+
+-- ============================================================================
+-- TABLE: stats_rollups (migration 008)
+-- Purpose: Precomputed team / league stats, refreshed by calculate_pnl
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS stats_rollups (
+    scope        VARCHAR(10) NOT NULL CHECK (scope IN ('team', 'league')),
+    scope_key    VARCHAR(255) NOT NULL,
+    bettor       VARCHAR(10) NOT NULL CHECK (bettor IN ('user', 'ai')),
+    total_bets   INTEGER NOT NULL DEFAULT 0,
+    wins         INTEGER NOT NULL DEFAULT 0,
+    total_stake  NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_pnl    NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    notable      JSONB NOT NULL DEFAULT '[]'::JSONB,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, scope_key, bettor)
+);
+
+COMMENT ON TABLE stats_rollups IS 'Settled-bet rollups per team (normalized stored name) and league. Derived data: safe to TRUNCATE and rebuild with python -m soccersmartbet.stats_rollups --rebuild.';
+
+-- The stats routes add still-pending bets on top of the rollups.
+CREATE INDEX IF NOT EXISTS idx_bets_pending ON bets(game_id) WHERE pnl IS NULL;
+
+-- ============================================================================
+-- TABLE: odds_snapshots (migration 009)
+-- Purpose: Line movement between pick and kickoff, written by the odds sampler
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS odds_snapshots (
+    game_id   INTEGER NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
+    ts        TIMESTAMPTZ NOT NULL,
+    home_odd  INTEGER NOT NULL CHECK (home_odd > 100),
+    draw_odd  INTEGER NOT NULL CHECK (draw_odd > 100),
+    away_odd  INTEGER NOT NULL CHECK (away_odd > 100),
+    PRIMARY KEY (game_id, ts)
+);
+
+COMMENT ON TABLE odds_snapshots IS 'Winner.co.il line movement per game: odds x 100, one row per change. The latest row before kickoff is the closing line.';
+
+-- ============================================================================
+-- TABLES: h2h_pairs, h2h_meetings (migration 010)
+-- Purpose: Persistent football-data.org head-to-head history for fetch_h2h
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS h2h_pairs (
+    team_a          VARCHAR(255) NOT NULL,
+    team_b          VARCHAR(255) NOT NULL,
+    synced_through  DATE NOT NULL,
+    depth           INTEGER NOT NULL,
+    PRIMARY KEY (team_a, team_b),
+    CHECK (team_a < team_b)
+);
+
+CREATE TABLE IF NOT EXISTS h2h_meetings (
+    team_a      VARCHAR(255) NOT NULL,
+    team_b      VARCHAR(255) NOT NULL,
+    match_id    INTEGER NOT NULL,
+    match_date  DATE NOT NULL,
+    home_team   VARCHAR(255) NOT NULL,
+    away_team   VARCHAR(255) NOT NULL,
+    score_home  SMALLINT NOT NULL,
+    score_away  SMALLINT NOT NULL,
+    PRIMARY KEY (team_a, team_b, match_id),
+    FOREIGN KEY (team_a, team_b) REFERENCES h2h_pairs(team_a, team_b) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_h2h_meetings_pair_date ON h2h_meetings(team_a, team_b, match_date DESC);
+
+COMMENT ON TABLE h2h_pairs IS 'football-data.org H2H sync state per unordered canonical team pair: meetings are complete through synced_through, at least depth deep. Safe to TRUNCATE (CASCADE) to force a full refetch.';
+COMMENT ON TABLE h2h_meetings IS 'Finished football-data.org head-to-head meetings per unordered canonical team pair (home/away as named by the API).';
+
+-- ============================================================================
+-- TABLE: venues (migration 011)
+-- Purpose: Home stadium and coordinates per FotMob team, for venue / weather tools
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS venues (
+    fotmob_team_id  INTEGER PRIMARY KEY,
+    name            VARCHAR(255),
+    city            VARCHAR(255),
+    latitude        DOUBLE PRECISION,
+    longitude       DOUBLE PRECISION,
+    capacity        INTEGER,
+    surface         VARCHAR(50),
+    fetched_at      TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE venues IS 'FotMob home stadium per team id (NULL name/city: FotMob lists none). Re-fetched after soccersmartbet.venues.VENUE_TTL; safe to TRUNCATE.';
+
+-- ============================================================================
+-- Change notifications (migrations 006, 007)
+-- Purpose: pg_notify('ssb_changes', {table, op, run_date}) so the scheduler
+-- wakes on daily_runs changes and the dashboard SSE stream pushes updates
+-- ============================================================================
+CREATE OR REPLACE FUNCTION notify_ssb_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row JSONB := to_jsonb(COALESCE(NEW, OLD));
+BEGIN
+    PERFORM pg_notify(
+        'ssb_changes',
+        json_build_object(
+            'table',    TG_TABLE_NAME,
+            'op',       TG_OP,
+            'run_date', COALESCE(v_row ->> 'run_date', v_row ->> 'match_date')
+        )::TEXT
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_daily_runs_notify ON daily_runs;
+CREATE TRIGGER trg_daily_runs_notify
+AFTER INSERT OR UPDATE OR DELETE ON daily_runs
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
+
+DROP TRIGGER IF EXISTS trg_run_events_notify ON run_events;
+CREATE TRIGGER trg_run_events_notify
+AFTER INSERT ON run_events
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
+
+DROP TRIGGER IF EXISTS trg_bets_notify ON bets;
+CREATE TRIGGER trg_bets_notify
+AFTER INSERT OR UPDATE OR DELETE ON bets
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
+
+DROP TRIGGER IF EXISTS trg_games_notify ON games;
+CREATE TRIGGER trg_games_notify
+AFTER INSERT OR UPDATE OR DELETE ON games
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
@@ -0,0 +1,15 @@
+-- Migration 005: Add llm_cache table
+-- Persistent structured-output cache for the intelligence, expert, picker and
+-- AI-betting LLM calls (see soccersmartbet.utils.llm). Safe to TRUNCATE at any time.
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key    CHAR(64) PRIMARY KEY,
+    model        VARCHAR(60) NOT NULL,
+    schema_name  VARCHAR(80) NOT NULL,
+    response     JSONB NOT NULL,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at   TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+
+COMMENT ON TABLE llm_cache IS 'LLM structured-output cache keyed by sha256(model, temperature, messages, schema hash). Rows past expires_at are ignored and purged on write.';
@@ -0,0 +1,28 @@
+-- Migration 006: NOTIFY on daily_runs changes
+-- The scheduler sleeps until its next deadline and LISTENs on ssb_changes to
+-- wake early when daily_runs changes (see soccersmartbet.db_listener).
+
+CREATE OR REPLACE FUNCTION notify_ssb_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row JSONB := to_jsonb(COALESCE(NEW, OLD));
+BEGIN
+    PERFORM pg_notify(
+        'ssb_changes',
+        json_build_object(
+            'table',    TG_TABLE_NAME,
+            'op',       TG_OP,
+            'run_date', v_row ->> 'run_date'
+        )::TEXT
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_daily_runs_notify ON daily_runs;
+CREATE TRIGGER trg_daily_runs_notify
+AFTER INSERT OR UPDATE OR DELETE ON daily_runs
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
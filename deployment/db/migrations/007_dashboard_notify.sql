@@ -0,0 +1,40 @@
+-- Migration 007: NOTIFY on run_events, bets and games changes
+-- Feeds the dashboard's Server-Sent Events stream (GET /api/status/stream).
+-- notify_ssb_change() now also reports games.match_date as run_date.
+
+CREATE OR REPLACE FUNCTION notify_ssb_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row JSONB := to_jsonb(COALESCE(NEW, OLD));
+BEGIN
+    PERFORM pg_notify(
+        'ssb_changes',
+        json_build_object(
+            'table',    TG_TABLE_NAME,
+            'op',       TG_OP,
+            'run_date', COALESCE(v_row ->> 'run_date', v_row ->> 'match_date')
+        )::TEXT
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_run_events_notify ON run_events;
+CREATE TRIGGER trg_run_events_notify
+AFTER INSERT ON run_events
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
+
+DROP TRIGGER IF EXISTS trg_bets_notify ON bets;
+CREATE TRIGGER trg_bets_notify
+AFTER INSERT OR UPDATE OR DELETE ON bets
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
+
+DROP TRIGGER IF EXISTS trg_games_notify ON games;
+CREATE TRIGGER trg_games_notify
+AFTER INSERT OR UPDATE OR DELETE ON games
+FOR EACH ROW
+EXECUTE FUNCTION notify_ssb_change();
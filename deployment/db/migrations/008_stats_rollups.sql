@@ -0,0 +1,25 @@
+-- Migration 008: Add stats_rollups table
+-- Precomputed per-team / per-league settled-bet totals and top-N notable bets,
+-- maintained incrementally by the post-games calculate_pnl node and read by
+-- the Team / League stats routes (see soccersmartbet.stats_rollups).
+--
+-- After applying, backfill existing history once with:
+--   python -m soccersmartbet.stats_rollups --rebuild
+
+CREATE TABLE IF NOT EXISTS stats_rollups (
+    scope        VARCHAR(10) NOT NULL CHECK (scope IN ('team', 'league')),
+    scope_key    VARCHAR(255) NOT NULL,
+    bettor       VARCHAR(10) NOT NULL CHECK (bettor IN ('user', 'ai')),
+    total_bets   INTEGER NOT NULL DEFAULT 0,
+    wins         INTEGER NOT NULL DEFAULT 0,
+    total_stake  NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_pnl    NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    notable      JSONB NOT NULL DEFAULT '[]'::JSONB,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, scope_key, bettor)
+);
+
+COMMENT ON TABLE stats_rollups IS 'Settled-bet rollups per team (normalized stored name) and league. Derived data: safe to TRUNCATE and rebuild with python -m soccersmartbet.stats_rollups --rebuild.';
+
+-- The stats routes add still-pending bets on top of the rollups.
+CREATE INDEX IF NOT EXISTS idx_bets_pending ON bets(game_id) WHERE pnl IS NULL;
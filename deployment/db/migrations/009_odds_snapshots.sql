@@ -0,0 +1,17 @@
+-- Migration 009: Add odds_snapshots table
+-- Winner.co.il 1/X/2 line movement between the morning pick and kickoff,
+-- written by the dashboard's background odds sampler and read by the AI
+-- betting agent and /api/games/{game_id}/odds (see soccersmartbet.odds_history).
+-- Odds are fixed-point integers (decimal odds x 100); a row is only written
+-- when the line moved since the game's previous sample.
+
+CREATE TABLE IF NOT EXISTS odds_snapshots (
+    game_id   INTEGER NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
+    ts        TIMESTAMPTZ NOT NULL,
+    home_odd  INTEGER NOT NULL CHECK (home_odd > 100),
+    draw_odd  INTEGER NOT NULL CHECK (draw_odd > 100),
+    away_odd  INTEGER NOT NULL CHECK (away_odd > 100),
+    PRIMARY KEY (game_id, ts)
+);
+
+COMMENT ON TABLE odds_snapshots IS 'Winner.co.il line movement per game: odds x 100, one row per change. The latest row before kickoff is the closing line.';
@@ -0,0 +1,31 @@
+-- Migration 010: Add h2h_meetings / h2h_pairs tables
+-- Persistent head-to-head history for tools.game.fetch_h2h. Past meetings never
+-- change, so each finished meeting is stored once per unordered team pair and
+-- only meetings played since h2h_pairs.synced_through are requested again.
+-- Team keys are normalized canonical names (team_registry), team_a < team_b.
+
+CREATE TABLE IF NOT EXISTS h2h_pairs (
+    team_a          VARCHAR(255) NOT NULL,
+    team_b          VARCHAR(255) NOT NULL,
+    synced_through  DATE NOT NULL,
+    depth           INTEGER NOT NULL,
+    PRIMARY KEY (team_a, team_b),
+    CHECK (team_a < team_b)
+);
+
+CREATE TABLE IF NOT EXISTS h2h_meetings (
+    team_a      VARCHAR(255) NOT NULL,
+    team_b      VARCHAR(255) NOT NULL,
+    match_id    INTEGER NOT NULL,
+    match_date  DATE NOT NULL,
+    home_team   VARCHAR(255) NOT NULL,
+    away_team   VARCHAR(255) NOT NULL,
+    score_home  SMALLINT NOT NULL,
+    score_away  SMALLINT NOT NULL,
+    PRIMARY KEY (team_a, team_b, match_id),
+    FOREIGN KEY (team_a, team_b) REFERENCES h2h_pairs(team_a, team_b) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_h2h_meetings_pair_date ON h2h_meetings(team_a, team_b, match_date DESC);
+
+COMMENT ON TABLE h2h_pairs IS 'football-data.org H2H sync state per unordered canonical team pair: meetings are complete through synced_through, at least depth deep. Safe to TRUNCATE (CASCADE) to force a full refetch.';
+COMMENT ON TABLE h2h_meetings IS 'Finished football-data.org head-to-head meetings per unordered canonical team pair (home/away as named by the API).';
@@ -0,0 +1,18 @@
+-- Migration 011: Add venues table
+-- Home stadium per FotMob team id, read by the fetch_venue and fetch_weather
+-- tools before falling back to FotMob's /api/data/teams payload (see
+-- soccersmartbet.venues). Filled lazily; bulk-seed after applying with:
+--   python -m soccersmartbet.venues --seed
+
+CREATE TABLE IF NOT EXISTS venues (
+    fotmob_team_id  INTEGER PRIMARY KEY,
+    name            VARCHAR(255),
+    city            VARCHAR(255),
+    latitude        DOUBLE PRECISION,
+    longitude       DOUBLE PRECISION,
+    capacity        INTEGER,
+    surface         VARCHAR(50),
+    fetched_at      TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE venues IS 'FotMob home stadium per team id (NULL name/city: FotMob lists none). Re-fetched after soccersmartbet.venues.VENUE_TTL; safe to TRUNCATE.';
@@ -0,0 +1,124 @@
+"""Postgres-backed LangGraph checkpoints for resumable flow runs.
+
+Every flow run is bound to a checkpoint thread keyed by flow type and
+run_date (``pre_gambling:2026-05-01``).  Gambling and post-games threads add
+a short fingerprint of their inputs so a retry with different bets or games
+never resumes someone else's half-finished run.
+
+:func:`run_checkpointed` decides how to invoke a compiled graph:
+
+* the thread has pending nodes (a previous attempt failed or the process
+  died mid-run) — resume from the last completed super-step; nodes and
+  ``Send`` branches that already succeeded are not re-run;
+* the thread finished earlier (or never ran) — start over on a clean thread.
+
+Checkpoints live in the ``checkpoint*`` tables created by
+``PostgresSaver.setup()`` on first use.  ``FLOW_CHECKPOINTS=0`` disables
+them (graphs then compile and run exactly as before).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import date
+from typing import Any
+
+from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from soccersmartbet.db import get_checkpoint_pool
+
+logger = logging.getLogger(__name__)
+
+# Non-builtin types stored in flow state; msgpack only revives allow-listed ones.
+_STATE_TYPES = [("soccersmartbet.pre_gambling_flow.state", "Phase")]
+
+_saver: PostgresSaver | None = None
+_saver_lock = threading.Lock()
+
+
+def checkpoints_enabled() -> bool:
+    """Return False when ``FLOW_CHECKPOINTS`` turns checkpointing off."""
+    return os.getenv("FLOW_CHECKPOINTS", "1").strip().lower() not in ("0", "false", "no")
+
+
+def get_checkpointer() -> PostgresSaver | None:
+    """Return the process-wide PostgresSaver (``None`` when disabled).
+
+    Tables are created on first use.  The saver is rebuilt if ``close_pool``
+    replaced the underlying connection pool.
+    """
+    global _saver
+    if not checkpoints_enabled():
+        return None
+    pool = get_checkpoint_pool()
+    with _saver_lock:
+        if _saver is None or _saver.conn is not pool:
+            saver = PostgresSaver(
+                pool, serde=JsonPlusSerializer(allowed_msgpack_modules=_STATE_TYPES)
+            )
+            saver.setup()
+            _saver = saver
+    return _saver
+
+
+def thread_id(flow_type: str, run_date: date, inputs: Any = None) -> str:
+    """Return the checkpoint thread id for one flow run.
+
+    Args:
+        flow_type: ``pre_gambling``, ``gambling`` or ``post_games``.
+        run_date: The ISR date the run belongs to.
+        inputs: Optional JSON-serialisable run inputs; fingerprinted into the id.
+    """
+    tid = f"{flow_type}:{run_date.isoformat()}"
+    if inputs is not None:
+        blob = json.dumps(inputs, sort_keys=True, default=str)
+        tid += ":" + hashlib.sha256(blob.encode("utf-8")).hexdigest()[:12]
+    return tid
+
+
+def clear_checkpoint(flow_type: str, run_date: date, inputs: Any = None) -> None:
+    """Drop the checkpoint thread so the next run starts from scratch."""
+    saver = get_checkpointer()
+    if saver is not None:
+        saver.delete_thread(thread_id(flow_type, run_date, inputs))
+
+
+def run_checkpointed(
+    graph: Any,
+    initial_state: dict,
+    flow_type: str,
+    run_date: date,
+    inputs: Any = None,
+) -> dict:
+    """Invoke *graph*, resuming an unfinished checkpoint thread when one exists.
+
+    Args:
+        graph: Compiled graph.  Without a checkpointer it is simply invoked.
+        initial_state: State for a fresh run (ignored when resuming).
+        flow_type: Flow name used in the thread id.
+        run_date: ISR run date used in the thread id.
+        inputs: Optional run inputs fingerprinted into the thread id.
+
+    Returns:
+        The final graph state.
+    """
+    if graph.checkpointer is None:
+        return graph.invoke(initial_state)
+
+    tid = thread_id(flow_type, run_date, inputs)
+    config = {"configurable": {"thread_id": tid}}
+    snapshot = graph.get_state(config)
+
+    if snapshot.next:
+        logger.info("checkpoint %s: resuming at %s", tid, list(snapshot.next))
+        return graph.invoke(None, config)
+
+    if snapshot.values:
+        # Finished earlier today — a new run must not inherit reducer state.
+        logger.info("checkpoint %s: previous run completed — starting fresh", tid)
+        graph.checkpointer.delete_thread(tid)
+    return graph.invoke(initial_state, config)
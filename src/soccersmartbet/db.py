@@ -3,6 +3,10 @@
 Module-level psycopg_pool.ConnectionPool (min=1, max=75 — 75% of Postgres
 default max_connections=100). All modules must import get_conn() /
 get_cursor() from here instead of calling psycopg.connect() directly.
+
+A second, small autocommit pool backs the LangGraph checkpointer (see
+soccersmartbet.checkpointing) — PostgresSaver requires autocommit
+connections and must not share transactions with application code.
 """
 from __future__ import annotations
 
@@ -16,6 +20,7 @@ from psycopg_pool import ConnectionPool
 DATABASE_URL: str | None = os.getenv("DATABASE_URL")
 
 _pool: ConnectionPool | None = None
+_checkpoint_pool: ConnectionPool | None = None
 
 
 def _get_pool() -> ConnectionPool:
@@ -32,14 +37,31 @@ def _get_pool() -> ConnectionPool:
     return _pool
 
 
+def get_checkpoint_pool() -> ConnectionPool:
+    """Return the autocommit pool used by the LangGraph checkpointer."""
+    global _checkpoint_pool
+    if _checkpoint_pool is None:
+        _checkpoint_pool = ConnectionPool(
+            conninfo=DATABASE_URL,
+            min_size=1,
+            max_size=int(os.getenv("CHECKPOINT_POOL_MAX", "4")),
+            kwargs={"autocommit": True, "prepare_threshold": 0},
+            open=True,
+        )
+    return _checkpoint_pool
+
+
 def close_pool() -> None:
-    """Close the module-level pool. Call from start_scheduler shutdown so
+    """Close the module-level pools. Call from start_scheduler shutdown so
     psycopg3's pool worker threads stop and the process can exit cleanly.
     """
-    global _pool
+    global _pool, _checkpoint_pool
     if _pool is not None:
         _pool.close()
         _pool = None
+    if _checkpoint_pool is not None:
+        _checkpoint_pool.close()
+        _checkpoint_pool = None
 
 
 @contextmanager
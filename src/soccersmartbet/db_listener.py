@@ -0,0 +1,156 @@
+"""Postgres LISTEN/NOTIFY fan-out for in-process subscribers.
+
+Row-level triggers (see ``deployment/db/migrations/006_change_notify.sql``
+and ``007_dashboard_notify.sql``)
+``NOTIFY ssb_changes`` with a small JSON payload whenever a watched table
+changes::
+
+    {"table": "daily_runs", "op": "UPDATE", "run_date": "2026-05-01"}
+
+One :class:`ChangeListener` per process holds a single dedicated autocommit
+connection, LISTENs on that channel and copies every payload into the
+``asyncio.Queue`` of each subscriber.  The scheduler subscribes to wake up
+early when ``daily_runs`` changes; the dashboard's SSE stream subscribes to
+push status and row changes to open browsers; the live ingester and the
+odds sampler sleep with :func:`wait_for_change` to wake on ``games`` changes.
+
+The listener reconnects with exponential backoff.  After every (re)connect
+it publishes a synthetic ``{"table": "*", "op": "RECONNECT"}`` payload,
+because notifications sent while it was disconnected are lost and
+subscribers must re-read their state.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Iterable
+
+import psycopg
+
+from soccersmartbet import db
+from soccersmartbet.utils.timezone import now_isr
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = "ssb_changes"
+
+_BACKOFF_START_S = 1.0
+_BACKOFF_MAX_S = 60.0
+_QUEUE_SIZE = 100
+
+RECONNECT_EVENT: dict[str, Any] = {"table": "*", "op": "RECONNECT"}
+
+
+class ChangeListener:
+    """Single LISTEN connection fanned out to any number of asyncio queues."""
+
+    def __init__(self, channel: str = CHANGE_CHANNEL) -> None:
+        self.channel = channel
+        self.connected = False
+        self._subscribers: set[asyncio.Queue[dict[str, Any]]] = set()
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self) -> asyncio.Queue[dict[str, Any]]:
+        """Return a new queue that receives every change payload."""
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        """Deliver *payload* to every subscriber, dropping the oldest item if full."""
+        for queue in list(self._subscribers):
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(payload)
+
+    def ensure_running(self) -> asyncio.Task:
+        """Start the listen loop on the running event loop if it is not running yet."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name=f"pg-listen-{self.channel}")
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the listen loop and wait for its connection to close."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self) -> None:
+        """LISTEN forever, reconnecting with exponential backoff on errors."""
+        backoff = _BACKOFF_START_S
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    db.DATABASE_URL, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    self.connected = True
+                    backoff = _BACKOFF_START_S
+                    logger.info("db_listener: listening on %s", self.channel)
+                    self.publish(RECONNECT_EVENT)
+                    async for notify in conn.notifies():
+                        self.publish(_parse_payload(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "db_listener: %s connection lost (%s) — retrying in %.0fs",
+                    self.channel,
+                    exc,
+                    backoff,
+                )
+            finally:
+                self.connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _BACKOFF_MAX_S)
+
+
+async def wait_for_change(
+    deadline: datetime,
+    wake: asyncio.Queue[dict[str, Any]],
+    tables: Iterable[str],
+) -> None:
+    """Sleep until *deadline* (ISR), returning early when one of *tables* changes.
+
+    *wake* is a :meth:`ChangeListener.subscribe` queue; a reconnect (``"*"``)
+    also wakes the caller, since notifications may have been missed.
+    """
+    watched = {*tables, "*"}
+    while True:
+        remaining = (deadline - now_isr()).total_seconds()
+        if remaining <= 0:
+            return
+        try:
+            change = await asyncio.wait_for(wake.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            return
+        if change.get("table") in watched:
+            return
+
+
+def _parse_payload(raw: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return {"table": raw}
+    return payload if isinstance(payload, dict) else {"table": str(payload)}
+
+
+_listener: ChangeListener | None = None
+
+
+def get_listener() -> ChangeListener:
+    """Return the process-wide :class:`ChangeListener`."""
+    global _listener
+    if _listener is None:
+        _listener = ChangeListener()
+    return _listener
@@ -12,11 +12,13 @@ import os
 from typing import Any
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from soccersmartbet.db import get_conn
+from soccersmartbet.odds_history import read_movement
 from soccersmartbet.gambling_flow.state import GamblingState
+from soccersmartbet.utils.llm import invoke_structured
+from soccersmartbet.utils.timezone import utc_to_isr
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +136,23 @@ def _h2h_line(
     return "H2H: No data available."
 
 
+def _movement_line(g: dict[str, Any]) -> str | None:
+    """Describe how the line moved since pick time, or None when it has not."""
+    series = g.get("odds_movement") or []
+    if not series:
+        return None
+    latest = series[-1]
+    opening = (float(g["home_win_odd"]), float(g["draw_odd"]), float(g["away_win_odd"]))
+    current = (latest["home"], latest["draw"], latest["away"])
+    if opening == current:
+        return None
+    moves = " / ".join(
+        f"{label}={old:.2f}\u2192{new:.2f}"
+        for label, old, new in zip(("1", "X", "2"), opening, current)
+    )
+    return f"Line movement since pick: {moves} (as of {utc_to_isr(latest['ts']).strftime('%H:%M')} ISR)"
+
+
 def _build_games_prompt(games_data: list[dict[str, Any]], ai_bankroll: float) -> str:
     lines: list[str] = [
         f"Your current bankroll: {ai_bankroll:.2f} NIS",
@@ -148,6 +167,9 @@ def _build_games_prompt(games_data: list[dict[str, Any]], ai_bankroll: float) ->
         lines.append(f"--- Game ID: {g['game_id']} ---")
         lines.append(f"{g['home_team']} vs {g['away_team']} ({league})")
         lines.append(f"Odds: 1={g['home_win_odd']} / X={g['draw_odd']} / 2={g['away_win_odd']}")
+        movement = _movement_line(g)
+        if movement:
+            lines.append(movement)
         lines.append("")
 
         h2h_text = _h2h_line(
@@ -313,6 +335,11 @@ def ai_betting_agent(state: GamblingState) -> dict:
                     game_data["expert_analysis"] = bullets
 
                 games_data.append(game_data)
+
+            # Sampled line movement for every game in one query (odds_history).
+            movement = read_movement(cur, [g["game_id"] for g in games_data])
+            for game_data in games_data:
+                game_data["odds_movement"] = movement.get(game_data["game_id"], [])
         # read-only: no commit needed
 
     if not games_data:
@@ -321,13 +348,15 @@ def ai_betting_agent(state: GamblingState) -> dict:
 
     prompt_text = _build_games_prompt(games_data, ai_bankroll)
 
-    model = ChatOpenAI(model=AI_BETTING_MODEL, temperature=0.3)
-    structured_model = model.with_structured_output(AIBetsOutput)
-
-    result: AIBetsOutput = structured_model.invoke([
-        SystemMessage(content=_SYSTEM_PROMPT),
-        HumanMessage(content=prompt_text),
-    ])
+    result: AIBetsOutput = invoke_structured(
+        AI_BETTING_MODEL,
+        0.3,
+        AIBetsOutput,
+        [
+            SystemMessage(content=_SYSTEM_PROMPT),
+            HumanMessage(content=prompt_text),
+        ],
+    )
     logger.info("ai_betting_agent: LLM returned %d bet(s)", len(result.bets))
 
     odds_map: dict[int, dict[str, float]] = {}
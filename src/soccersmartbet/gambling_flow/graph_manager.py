@@ -15,47 +15,63 @@ from __future__ import annotations
 
 import logging
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, START, END
 
+from soccersmartbet.checkpointing import get_checkpointer, run_checkpointed
 from soccersmartbet.gambling_flow.state import GamblingState
 from soccersmartbet.gambling_flow.ai_betting_agent import ai_betting_agent
 from soccersmartbet.gambling_flow.bet_verifier import verify_and_persist_bets
 from soccersmartbet.gambling_flow.notify_result import notify_gambling_result
+from soccersmartbet.utils.timezone import today_isr
+from soccersmartbet.utils.tracing import trace_flow, traced_node
 
 logger = logging.getLogger(__name__)
 
 
-def build_gambling_graph() -> StateGraph:
+def build_gambling_graph(checkpointer: BaseCheckpointSaver | None = None) -> StateGraph:
     """Build and return the compiled Gambling Flow graph.
 
     Graph structure:
         START -> ai_betting_agent -> verify_and_persist_bets
               -> notify_gambling_result -> END
 
+    Args:
+        checkpointer: Optional saver; when given, runs are resumable per
+            checkpoint thread (see soccersmartbet.checkpointing).
+
     Returns:
         Compiled LangGraph Runnable ready to invoke.
     """
     graph = StateGraph(GamblingState)
 
-    graph.add_node("ai_betting_agent", ai_betting_agent)
-    graph.add_node("verify_and_persist_bets", verify_and_persist_bets)
-    graph.add_node("notify_gambling_result", notify_gambling_result)
+    graph.add_node("ai_betting_agent", traced_node("ai_betting_agent", ai_betting_agent))
+    graph.add_node("verify_and_persist_bets", traced_node("verify_and_persist_bets", verify_and_persist_bets))
+    graph.add_node("notify_gambling_result", traced_node("notify_gambling_result", notify_gambling_result))
 
     graph.add_edge(START, "ai_betting_agent")
     graph.add_edge("ai_betting_agent", "verify_and_persist_bets")
     graph.add_edge("verify_and_persist_bets", "notify_gambling_result")
     graph.add_edge("notify_gambling_result", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
 
 
-def run_gambling_flow(game_ids: list[int], user_bets: list[dict]) -> dict:
+def run_gambling_flow(
+    game_ids: list[int],
+    user_bets: list[dict],
+    triggered_by: str = "manual",
+) -> dict:
     """Entry point invoked by Telegram handlers after user clicks SEND BET.
 
+    A retry with the same games and bets resumes today's failed attempt from
+    its last checkpoint (the AI bets are not regenerated).
+
     Args:
         game_ids: List of game IDs the user is betting on.
         user_bets: List of BetSelection dicts from the Telegram UI, each with
             game_id, prediction, odds, and stake.
+        triggered_by: Recorded on the run's ``flow_trace`` event.
 
     Returns:
         Final GamblingState after the flow completes.
@@ -66,7 +82,7 @@ def run_gambling_flow(game_ids: list[int], user_bets: list[dict]) -> dict:
         len(user_bets),
     )
 
-    graph = build_gambling_graph()
+    graph = build_gambling_graph(checkpointer=get_checkpointer())
 
     initial_state: GamblingState = {
         "game_ids": game_ids,
@@ -76,7 +92,14 @@ def run_gambling_flow(game_ids: list[int], user_bets: list[dict]) -> dict:
         "rejection_reason": "",
     }
 
-    result = graph.invoke(initial_state)
+    with trace_flow("gambling", triggered_by=triggered_by):
+        result = run_checkpointed(
+            graph,
+            initial_state,
+            "gambling",
+            today_isr(),
+            inputs={"game_ids": game_ids, "user_bets": user_bets},
+        )
 
     logger.info(
         "run_gambling_flow: completed — verification=%s",
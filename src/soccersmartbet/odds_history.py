@@ -0,0 +1,164 @@
+"""Odds-movement history (the ``odds_snapshots`` table).
+
+``games.home_win_odd / draw_odd / away_win_odd`` are the line at pick time.
+Between the morning pick and kickoff a background sampler (see
+:mod:`soccersmartbet.webapp.odds_sampler`) reads the shared winner.co.il
+line snapshot and records each game's 1/X/2 price here, so the betting agent
+and the dashboard get line movement and the closing line without scraping
+per request.
+
+Rows are compact: ``(game_id, ts, home_odd, draw_odd, away_odd)`` with the
+odds stored as fixed-point integers (decimal odds × 100).  A sample is only
+written when it differs from the game's latest stored row, so a quiet line
+costs nothing and the series is the list of change points.  Each sampling
+round is one ``INSERT … SELECT FROM unnest(…)`` round-trip for all games.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable
+
+from psycopg import Cursor
+
+logger = logging.getLogger(__name__)
+
+_SCALE = 100
+
+OddsRow = tuple[int, int, int, int]  # (game_id, home, draw, away) fixed-point
+
+# ---------------------------------------------------------------------------
+# Fixed-point helpers
+# ---------------------------------------------------------------------------
+
+
+def to_fixed(odd: float | Decimal) -> int:
+    """Return decimal odds as a fixed-point integer (2.15 → 215)."""
+    return int((Decimal(str(odd)) * _SCALE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_fixed(value: int) -> float:
+    """Return a fixed-point integer as decimal odds (215 → 2.15)."""
+    return value / _SCALE
+
+
+# ---------------------------------------------------------------------------
+# Sampling (pure, no DB I/O)
+# ---------------------------------------------------------------------------
+
+
+def pending_games(
+    now: datetime, games: Iterable[tuple[int, str, str, date, time]]
+) -> list[tuple[int, str, str]]:
+    """Return ``(game_id, home_team, away_team)`` for games not yet kicked off.
+
+    Args:
+        now: Current ISR time.
+        games: ``(game_id, home_team, away_team, match_date, kickoff_time)`` rows.
+    """
+    naive_now = now.replace(tzinfo=None)
+    return [
+        (game_id, home, away)
+        for game_id, home, away, match_date, kickoff in games
+        if datetime.combine(match_date, kickoff) > naive_now
+    ]
+
+
+def match_line(line: Any, games: Iterable[tuple[int, str, str]]) -> list[OddsRow]:
+    """Look each game up in a :class:`WinnerLine` and return its fixed-point odds.
+
+    Games the line no longer lists (pulled markets) are skipped.
+    """
+    rows: list[OddsRow] = []
+    for game_id, home, away in games:
+        event = line.find(home, away)
+        if event is None:
+            continue
+        odds = [to_fixed(event[k]) for k in ("odds_home", "odds_draw", "odds_away")]
+        if min(odds) <= _SCALE:
+            continue  # not a real price (suspended market); the table requires > 1.00
+        rows.append((game_id, *odds))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# DB I/O
+# ---------------------------------------------------------------------------
+
+# Bulk insert, skipping rows equal to the game's latest stored sample.
+_INSERT_SQL = """
+INSERT INTO odds_snapshots (game_id, ts, home_odd, draw_odd, away_odd)
+SELECT s.game_id, %(ts)s, s.home_odd, s.draw_odd, s.away_odd
+FROM unnest(%(game_ids)s::int[], %(home)s::int[], %(draw)s::int[], %(away)s::int[])
+     AS s(game_id, home_odd, draw_odd, away_odd)
+LEFT JOIN LATERAL (
+    SELECT o.home_odd, o.draw_odd, o.away_odd
+    FROM odds_snapshots o
+    WHERE o.game_id = s.game_id
+    ORDER BY o.ts DESC
+    LIMIT 1
+) last ON TRUE
+WHERE last.home_odd IS NULL
+   OR (last.home_odd, last.draw_odd, last.away_odd)
+      IS DISTINCT FROM (s.home_odd, s.draw_odd, s.away_odd)
+ON CONFLICT (game_id, ts) DO NOTHING
+"""
+
+_PENDING_SQL = """
+SELECT game_id, home_team, away_team, match_date, kickoff_time
+FROM games
+WHERE match_date = %(today)s
+  AND status NOT IN ('completed', 'cancelled')
+ORDER BY game_id
+"""
+
+_SERIES_SQL = """
+SELECT game_id, ts, home_odd, draw_odd, away_odd
+FROM odds_snapshots
+WHERE game_id = ANY(%(game_ids)s)
+ORDER BY game_id, ts
+"""
+
+
+def record_snapshots(cur: Cursor, ts: datetime, rows: list[OddsRow]) -> int:
+    """Store one sampling round at *ts*; returns the number of rows written."""
+    if not rows:
+        return 0
+    game_ids, home, draw, away = (list(col) for col in zip(*rows))
+    cur.execute(
+        _INSERT_SQL,
+        {"ts": ts, "game_ids": game_ids, "home": home, "draw": draw, "away": away},
+    )
+    return cur.rowcount
+
+
+def read_movement(cur: Cursor, game_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    """Return ``{game_id: [{"ts", "home", "draw", "away"}, ...]}`` oldest first.
+
+    Games without samples are absent.  The last point of a series sampled up
+    to kickoff is the closing line.
+    """
+    if not game_ids:
+        return {}
+    cur.execute(_SERIES_SQL, {"game_ids": list(game_ids)})
+    series: dict[int, list[dict[str, Any]]] = {}
+    for game_id, ts, home, draw, away in cur.fetchall():
+        series.setdefault(game_id, []).append({
+            "ts": ts,
+            "home": from_fixed(home),
+            "draw": from_fixed(draw),
+            "away": from_fixed(away),
+        })
+    return series
+
+
+def fetch_pending_games(cur: Cursor, now: datetime) -> list[tuple[int, str, str]]:
+    """Return ``(game_id, home_team, away_team)`` for *now*'s games not yet kicked off."""
+    cur.execute(_PENDING_SQL, {"today": now.date()})
+    return pending_games(now, cur.fetchall())
+
+
+def sample(cur: Cursor, now: datetime, line: Any) -> int:
+    """Record the current *line* for every game of *now*'s date not yet kicked off."""
+    return record_snapshots(cur, now, match_line(line, fetch_pending_games(cur, now)))
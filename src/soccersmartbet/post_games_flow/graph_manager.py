@@ -13,47 +13,57 @@ from __future__ import annotations
 
 import logging
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
+from soccersmartbet.checkpointing import get_checkpointer, run_checkpointed
 from soccersmartbet.post_games_flow.fetch_results import fetch_results
 from soccersmartbet.post_games_flow.pnl_calculator import calculate_pnl
 from soccersmartbet.post_games_flow.notify_summary import notify_daily_summary
 from soccersmartbet.post_games_flow.state import PostGamesState
+from soccersmartbet.utils.timezone import today_isr
+from soccersmartbet.utils.tracing import trace_flow, traced_node
 
 logger = logging.getLogger(__name__)
 
 
-def build_post_games_graph() -> StateGraph:
+def build_post_games_graph(checkpointer: BaseCheckpointSaver | None = None) -> StateGraph:
     """Build and return the compiled Post-Games Flow graph.
 
     Graph structure:
         START -> fetch_results -> calculate_pnl -> notify_daily_summary -> END
 
+    Args:
+        checkpointer: Optional saver; when given, runs are resumable per
+            checkpoint thread (see soccersmartbet.checkpointing).
+
     Returns:
         Compiled LangGraph Runnable ready to invoke.
     """
     graph = StateGraph(PostGamesState)
 
-    graph.add_node("fetch_results", fetch_results)
-    graph.add_node("calculate_pnl", calculate_pnl)
-    graph.add_node("notify_daily_summary", notify_daily_summary)
+    graph.add_node("fetch_results", traced_node("fetch_results", fetch_results))
+    graph.add_node("calculate_pnl", traced_node("calculate_pnl", calculate_pnl))
+    graph.add_node("notify_daily_summary", traced_node("notify_daily_summary", notify_daily_summary))
 
     graph.add_edge(START, "fetch_results")
     graph.add_edge("fetch_results", "calculate_pnl")
     graph.add_edge("calculate_pnl", "notify_daily_summary")
     graph.add_edge("notify_daily_summary", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
 
 
-def run_post_games_flow(game_ids: list[int]) -> dict:
+def run_post_games_flow(game_ids: list[int], triggered_by: str = "manual") -> dict:
     """Entry point: run post-games flow for the given game IDs.
 
     Fetches final scores from football-data.org, calculates P&L for all bets,
-    updates the DB, and sends a Telegram summary.
+    updates the DB, and sends a Telegram summary.  A retry for the same
+    game IDs resumes today's failed attempt from its last checkpoint.
 
     Args:
         game_ids: List of DB game IDs for games that have finished.
+        triggered_by: Recorded on the run's ``flow_trace`` event.
 
     Returns:
         Final PostGamesState after the flow completes.
@@ -63,7 +73,7 @@ def run_post_games_flow(game_ids: list[int]) -> dict:
     reload_registry()
     logger.info("run_post_games_flow: starting for %d game(s)", len(game_ids))
 
-    graph = build_post_games_graph()
+    graph = build_post_games_graph(checkpointer=get_checkpointer())
 
     initial_state: PostGamesState = {
         "game_ids": game_ids,
@@ -72,7 +82,10 @@ def run_post_games_flow(game_ids: list[int]) -> dict:
         "skipped_games": [],
     }
 
-    result = graph.invoke(initial_state)
+    with trace_flow("post_games", triggered_by=triggered_by):
+        result = run_checkpointed(
+            graph, initial_state, "post_games", today_isr(), inputs=sorted(game_ids)
+        )
 
     logger.info(
         "run_post_games_flow: completed — processed %d result(s)",
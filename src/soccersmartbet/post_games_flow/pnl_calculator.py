@@ -12,6 +12,7 @@ from collections import defaultdict
 
 from soccersmartbet.db import get_conn
 from soccersmartbet.post_games_flow.state import PostGamesState
+from soccersmartbet.stats_rollups import fold_settled_bets
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,7 @@ def compute_bet_pnl_estimate(
     return stake * (odds - 1.0) if won else -stake
 
 _FETCH_BETS_SQL = """
-SELECT bet_id, game_id, bettor, prediction, odds, stake
+SELECT bet_id, game_id, bettor, prediction, odds, stake, pnl
 FROM bets
 WHERE game_id = ANY(%(game_ids)s)
 """
@@ -101,8 +102,13 @@ def calculate_pnl(state: PostGamesState) -> dict:
       2. Compare each bet.prediction to the game outcome.
       3. UPDATE bets.result and bets.pnl for each bet.
       4. Aggregate and UPDATE bankroll per bettor.
+      5. Fold the settled bets into the team / league stats rollups
+         (see :mod:`soccersmartbet.stats_rollups`).
 
-    All writes run inside a single DB transaction for atomicity.
+    All writes run inside a single DB transaction for atomicity.  A rollup
+    failure is rolled back to a savepoint and logged — it never blocks
+    settlement; ``python -m soccersmartbet.stats_rollups --rebuild`` repairs
+    the rollups afterwards.
 
     Args:
         state: Current PostGamesState with game_ids and results populated.
@@ -130,8 +136,11 @@ def calculate_pnl(state: PostGamesState) -> dict:
             # Per-game P&L keyed by (game_id, bettor)
             game_bettor_pnl: dict[tuple, float] = {}
 
+            # bet_id -> pnl before this run (None unless re-settling)
+            previous_pnl: dict[int, float | None] = {}
+
             for row in bets:
-                bet_id, game_id, bettor, prediction, odds, stake = row
+                bet_id, game_id, bettor, prediction, odds, stake, prev_pnl = row
 
                 game_result = results.get(game_id)
                 if game_result is None:
@@ -161,6 +170,7 @@ def calculate_pnl(state: PostGamesState) -> dict:
                     bettor_lost[bettor] += 1
 
                 game_bettor_pnl[(game_id, bettor)] = pnl
+                previous_pnl[bet_id] = float(prev_pnl) if prev_pnl is not None else None
                 logger.info(
                     "calculate_pnl: bet_id=%d game_id=%d bettor=%s prediction=%s "
                     "outcome=%s pnl=%.2f",
@@ -187,6 +197,15 @@ def calculate_pnl(state: PostGamesState) -> dict:
                     bettor_won[bettor],
                     bettor_lost[bettor],
                 )
+
+            # 5. Refresh stats rollups (savepoint: a failure here must not
+            #    undo the settlement above)
+            try:
+                with conn.transaction():
+                    folded = fold_settled_bets(cur, previous_pnl)
+                logger.info("calculate_pnl: %d stats rollup(s) refreshed", folded)
+            except Exception as exc:
+                logger.warning("calculate_pnl: stats rollup refresh failed: %s", exc)
         conn.commit()  # MANDATORY: bets result/pnl + bankroll totals in one atomic commit
 
     # Build pnl_summary keyed by game_id
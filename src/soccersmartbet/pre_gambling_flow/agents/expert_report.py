@@ -17,11 +17,11 @@ import os
 logger = logging.getLogger(__name__)
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from soccersmartbet.pre_gambling_flow.agents.db_utils import insert_expert_report
 from soccersmartbet.pre_gambling_flow.prompts import EXPERT_REPORT_PROMPT
 from soccersmartbet.pre_gambling_flow.structured_outputs import ExpertGameReport
+from soccersmartbet.utils.llm import invoke_structured
 
 EXPERT_MODEL = os.getenv("EXPERT_MODEL", "gpt-5.4")
 
@@ -44,13 +44,12 @@ def run_expert_report(game_id: int, combined_report_text: str) -> ExpertGameRepo
     """
     logger.info("run_expert_report: starting for game_id=%d", game_id)
 
-    model = ChatOpenAI(model=EXPERT_MODEL, temperature=0.3)
-    structured_model = model.with_structured_output(ExpertGameReport)
-
     system_msg = SystemMessage(content=EXPERT_REPORT_PROMPT)
     human_msg = HumanMessage(content=combined_report_text)
 
-    result: ExpertGameReport = structured_model.invoke([system_msg, human_msg])
+    result: ExpertGameReport = invoke_structured(
+        EXPERT_MODEL, 0.3, ExpertGameReport, [system_msg, human_msg]
+    )
     logger.info("run_expert_report: LLM call done for game_id=%d", game_id)
 
     insert_expert_report(game_id, result)
@@ -22,7 +22,6 @@ import os
 from typing import Any, Dict
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from soccersmartbet.pre_gambling_flow.agents.db_utils import insert_game_report
 from soccersmartbet.pre_gambling_flow.prompts import GAME_INTELLIGENCE_AGENT_PROMPT
@@ -33,7 +32,11 @@ from soccersmartbet.pre_gambling_flow.structured_outputs import (
 )
 from soccersmartbet.pre_gambling_flow.tools.game.fetch_h2h import fetch_h2h
 from soccersmartbet.pre_gambling_flow.tools.game.fetch_venue import fetch_venue
-from soccersmartbet.pre_gambling_flow.tools.game.fetch_weather import fetch_weather
+from soccersmartbet.pre_gambling_flow.tools.game.fetch_weather import (
+    fetch_weather,
+    prefetched_weather,
+)
+from soccersmartbet.utils.llm import invoke_structured
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +67,7 @@ def _build_h2h_aggregate(
         return None
 
     # ``winner`` is populated by fetch_h2h using the user-supplied team names
-    # (see fetch_h2h.py lines ~205-222). So we count against ``home_team`` /
+    # (see ``fetch_h2h._winner``). So we count against ``home_team`` /
     # ``away_team`` as passed into this function.
     home_wins = sum(1 for m in matches if m.get("winner") == home_team)
     away_wins = sum(1 for m in matches if m.get("winner") == away_team)
@@ -226,7 +229,10 @@ def run_game_intelligence(
     logger.info("run_game_intelligence: fetch_venue done, error=%s", venue_data.get("error"))
 
     match_datetime = f"{match_date}T{kickoff_time}:00"
-    weather_data = fetch_weather(home_team, away_team, match_datetime)
+    # Forecasts are batched for the whole slate when prefetched; else one request.
+    weather_data = prefetched_weather(home_team, away_team, match_datetime) or fetch_weather(
+        home_team, away_team, match_datetime
+    )
     logger.info("run_game_intelligence: fetch_weather done, error=%s", weather_data.get("error"))
 
     # Step 2: Build the structured portion of the report in Python.
@@ -246,13 +252,12 @@ def run_game_intelligence(
     )
 
     # Step 4: Single LLM call — bullets + cancellation-risk classification only.
-    model = ChatOpenAI(model=INTELLIGENCE_MODEL, temperature=0.2)
-    structured_model = model.with_structured_output(GameReportBullets)
-
     system_msg = SystemMessage(content=GAME_INTELLIGENCE_AGENT_PROMPT)
     human_msg = HumanMessage(content=user_content)
 
-    llm_out: GameReportBullets = structured_model.invoke([system_msg, human_msg])
+    llm_out: GameReportBullets = invoke_structured(
+        INTELLIGENCE_MODEL, 0.2, GameReportBullets, [system_msg, human_msg]
+    )
     logger.info("run_game_intelligence: LLM call done")
 
     # Step 5: Merge Python-built structured fields with LLM bullets.
@@ -22,7 +22,6 @@ from typing import Any, Dict, List
 logger = logging.getLogger(__name__)
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from soccersmartbet.pre_gambling_flow.agents.db_utils import insert_team_report
 from soccersmartbet.pre_gambling_flow.prompts import TEAM_INTELLIGENCE_AGENT_PROMPT
@@ -40,6 +39,7 @@ from soccersmartbet.pre_gambling_flow.tools.team.fetch_league_position import (
     fetch_league_position,
 )
 from soccersmartbet.pre_gambling_flow.tools.team.fetch_team_news import fetch_team_news
+from soccersmartbet.utils.llm import invoke_structured
 
 INTELLIGENCE_MODEL = os.getenv("INTELLIGENCE_MODEL", "gpt-5.4")
 
@@ -358,13 +358,12 @@ def run_team_intelligence(game_id: int, team_name: str, match_date: str) -> Team
     )
 
     # Step 4: Single LLM call — bullet lists only.
-    model = ChatOpenAI(model=INTELLIGENCE_MODEL, temperature=0.2)
-    structured_model = model.with_structured_output(TeamReportBullets)
-
     system_msg = SystemMessage(content=TEAM_INTELLIGENCE_AGENT_PROMPT)
     human_msg = HumanMessage(content=user_content)
 
-    llm_out: TeamReportBullets = structured_model.invoke([system_msg, human_msg])
+    llm_out: TeamReportBullets = invoke_structured(
+        INTELLIGENCE_MODEL, 0.2, TeamReportBullets, [system_msg, human_msg]
+    )
     logger.info("run_team_intelligence: LLM call done for %s", team_name)
 
     # Step 5: Merge Python-built structured fields with LLM bullets.
@@ -7,33 +7,52 @@ Send() for parallel game analysis via the analyze_game subgraph.
 Flow phases: SELECTING -> FILTERING -> ANALYZING -> COMPLETE
 
 Graph structure:
-    START -> smart_game_picker -> persist_games -> [fan_out_to_analysis]
+    START -> smart_game_picker -> persist_games -> prefetch_game_data
+          -> [fan_out_to_analysis]
           -> analyze_game subgraph (N parallel via Send()) -> combine_reports
           -> generate_expert_reports -> persist_reports -> notify_telegram -> END
 
+prefetch_game_data fetches each distinct remote resource behind the selected
+games once (team payloads, news, league tables, competition scans, venues,
+forecasts), so the parallel branches read shared data instead of each
+requesting it.
+
 The ``analyze_game`` node is a compiled subgraph with its own internal
 parallel topology (game_intelligence, team_intel_home, team_intel_away).
 Each Send() dispatches one subgraph invocation per game.  LangGraph
 handles both the outer fan-out (per-game) and the inner parallelism
 (per-intelligence-call within each game).
 
+The fan-out is bounded by :mod:`soccersmartbet.utils.concurrency`: games,
+live LLM calls and live HTTP requests per host each have an in-flight limit,
+and games are sent — and queue for every limit — earliest kickoff first.
+
 When no games need analysis, the fan-out sends directly to combine_reports
 to gracefully skip the analysis phase.
 """
 
 from __future__ import annotations
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Send
 
+from soccersmartbet.checkpointing import get_checkpointer, run_checkpointed
 from soccersmartbet.pre_gambling_flow.state import PreGamblingState, Phase
+from soccersmartbet.pre_gambling_flow.tools import run_store
 from soccersmartbet.pre_gambling_flow.nodes.smart_game_picker import smart_game_picker
 from soccersmartbet.pre_gambling_flow.nodes.persist_games import persist_games
-from soccersmartbet.pre_gambling_flow.nodes.analyze_game import build_analyze_game_subgraph
+from soccersmartbet.pre_gambling_flow.nodes.prefetch_game_data import prefetch_game_data
+from soccersmartbet.pre_gambling_flow.nodes.analyze_game import (
+    build_analyze_game_subgraph,
+    governed_analyze_game,
+)
 from soccersmartbet.pre_gambling_flow.nodes.combine_reports import combine_reports
 from soccersmartbet.pre_gambling_flow.nodes.generate_expert_reports import generate_expert_reports
 from soccersmartbet.pre_gambling_flow.nodes.persist_reports import persist_reports
 from soccersmartbet.pre_gambling_flow.nodes.notify_telegram import notify_telegram
+from soccersmartbet.utils.timezone import today_isr
+from soccersmartbet.utils.tracing import trace_flow, traced_node
 
 
 def fan_out_to_analysis(state: PreGamblingState) -> list[Send]:
@@ -45,7 +64,9 @@ def fan_out_to_analysis(state: PreGamblingState) -> list[Send]:
     kickoff_time).  The payload matches the ``AnalyzeGameState`` schema
     so LangGraph can initialize the subgraph's state correctly.
 
-    LangGraph runs all dispatched subgraph invocations in parallel.
+    Sends are ordered earliest kickoff first.  LangGraph starts all
+    dispatched subgraph invocations in parallel, but each waits for a game
+    slot (``MAX_GAMES_IN_FLIGHT``), which goes to the earliest kickoff.
     Within each subgraph, the three intelligence nodes also run in
     parallel.  Results are merged into the parent ``PreGamblingState``
     via the ``analyzed_game_ids`` ``add`` reducer before proceeding to
@@ -56,7 +77,7 @@ def fan_out_to_analysis(state: PreGamblingState) -> list[Send]:
     gracefully.
 
     Args:
-        state: Current Pre-Gambling Flow state after persist_games.
+        state: Current Pre-Gambling Flow state after prefetch_game_data.
 
     Returns:
         List of Send() objects -- one per game for analyze_game, or a
@@ -68,9 +89,13 @@ def fan_out_to_analysis(state: PreGamblingState) -> list[Send]:
     if not game_ids:
         return [Send("combine_reports", state)]
 
+    # all_games[i] is the game persisted as game_ids[i].
+    by_kickoff = sorted(
+        zip(game_ids, all_games),
+        key=lambda pair: (pair[1]["match_date"], pair[1]["kickoff_time"]),
+    )
     sends: list[Send] = []
-    for i, game_id in enumerate(game_ids):
-        game = all_games[i]
+    for game_id, game in by_kickoff:
         sends.append(
             Send(
                 "analyze_game",
@@ -89,19 +114,24 @@ def fan_out_to_analysis(state: PreGamblingState) -> list[Send]:
     return sends
 
 
-def build_pre_gambling_graph() -> StateGraph:
+def build_pre_gambling_graph(checkpointer: BaseCheckpointSaver | None = None) -> StateGraph:
     """Build and return the compiled Pre-Gambling Flow graph.
 
     Graph structure:
-        START -> smart_game_picker -> persist_games -> [fan_out_to_analysis]
+        START -> smart_game_picker -> persist_games -> prefetch_game_data
+              -> [fan_out_to_analysis]
               -> analyze_game subgraph (N parallel) -> combine_reports
               -> generate_expert_reports -> persist_reports -> notify_telegram -> END
 
     The analyze_game node is a compiled subgraph (not a plain function).
     Internally it runs game_intelligence, team_intel_home, and
-    team_intel_away in parallel.  The fan-out at persist_games uses
+    team_intel_away in parallel.  The fan-out after prefetch_game_data uses
     LangGraph's Send() API to dispatch one subgraph invocation per game.
 
+    Args:
+        checkpointer: Optional saver; when given, runs are resumable per
+            checkpoint thread (see soccersmartbet.checkpointing).
+
     Returns:
         Compiled LangGraph Runnable ready to invoke.
     """
@@ -109,19 +139,22 @@ def build_pre_gambling_graph() -> StateGraph:
 
     analyze_game_subgraph = build_analyze_game_subgraph()
 
-    graph.add_node("smart_game_picker", smart_game_picker)
-    graph.add_node("persist_games", persist_games)
-    graph.add_node("analyze_game", analyze_game_subgraph)
-    graph.add_node("combine_reports", combine_reports)
-    graph.add_node("generate_expert_reports", generate_expert_reports)
-    graph.add_node("persist_reports", persist_reports)
-    graph.add_node("notify_telegram", notify_telegram)
+    graph.add_node("smart_game_picker", traced_node("smart_game_picker", smart_game_picker))
+    graph.add_node("persist_games", traced_node("persist_games", persist_games))
+    graph.add_node("prefetch_game_data", traced_node("prefetch_game_data", prefetch_game_data))
+    graph.add_node("analyze_game", governed_analyze_game(analyze_game_subgraph))
+    graph.add_node("combine_reports", traced_node("combine_reports", combine_reports))
+    graph.add_node("generate_expert_reports", traced_node("generate_expert_reports", generate_expert_reports))
+    graph.add_node("persist_reports", traced_node("persist_reports", persist_reports))
+    graph.add_node("notify_telegram", traced_node("notify_telegram", notify_telegram))
 
     graph.add_edge(START, "smart_game_picker")
     graph.add_edge("smart_game_picker", "persist_games")
 
+    graph.add_edge("persist_games", "prefetch_game_data")
+
     graph.add_conditional_edges(
-        "persist_games",
+        "prefetch_game_data",
         fan_out_to_analysis,
         ["analyze_game", "combine_reports"],
     )
@@ -133,14 +166,20 @@ def build_pre_gambling_graph() -> StateGraph:
     graph.add_edge("persist_reports", "notify_telegram")
     graph.add_edge("notify_telegram", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
 
 
-def run_pre_gambling_flow():
+def run_pre_gambling_flow(triggered_by: str = "manual"):
     """Run the complete Pre-Gambling Flow with default initial state.
 
     Builds the graph and invokes it starting from Phase.SELECTING with
-    empty message history and no games loaded yet.
+    empty message history and no games loaded yet.  If today's previous
+    attempt failed part-way, the run resumes from its last checkpoint
+    instead — analysis that already succeeded is not repeated.
+
+    Args:
+        triggered_by: Recorded on the run's ``flow_trace`` event
+            ('scheduler', 'manual' or 'recovery').
 
     Returns:
         Final PreGamblingState after the full flow completes.
@@ -148,7 +187,7 @@ def run_pre_gambling_flow():
     from soccersmartbet.team_registry import reload_registry  # noqa: PLC0415
 
     reload_registry()
-    graph = build_pre_gambling_graph()
+    graph = build_pre_gambling_graph(checkpointer=get_checkpointer())
     initial_state = {
         "messages": [],
         "all_games": [],
@@ -156,4 +195,8 @@ def run_pre_gambling_flow():
         "analyzed_game_ids": [],
         "phase": Phase.SELECTING,
     }
-    return graph.invoke(initial_state)
+    try:
+        with trace_flow("pre_gambling", triggered_by=triggered_by):
+            return run_checkpointed(graph, initial_state, "pre_gambling", today_isr())
+    finally:
+        run_store.end_run()
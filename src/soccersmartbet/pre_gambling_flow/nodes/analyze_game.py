@@ -16,18 +16,27 @@ The game_intelligence node also produces the ``analyzed_game_ids``
 output so the parent graph's ``add`` reducer can track fan-in progress.
 The team intelligence nodes return empty dicts since their only side
 effect is the DB write.
+
+:func:`governed_analyze_game` wraps the compiled subgraph so each game runs
+in a game slot of :mod:`soccersmartbet.utils.concurrency`, at its kickoff
+priority: at most ``MAX_GAMES_IN_FLIGHT`` games run at once, earliest
+kickoff first, and their LLM/HTTP calls queue at the same priority.
 """
 
 from __future__ import annotations
 
 import logging
+from typing import Any, Callable
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 
 from soccersmartbet.pre_gambling_flow.state import AnalyzeGameState
 from soccersmartbet.pre_gambling_flow.agents.db_utils import update_game_status
 from soccersmartbet.pre_gambling_flow.agents.game_intelligence import run_game_intelligence
 from soccersmartbet.pre_gambling_flow.agents.team_intelligence import run_team_intelligence
+from soccersmartbet.utils.concurrency import game_slot, kickoff_priority
+from soccersmartbet.utils.tracing import traced_node
 
 logger = logging.getLogger(__name__)
 
@@ -141,9 +150,9 @@ def build_analyze_game_subgraph():
     """
     graph = StateGraph(AnalyzeGameState)
 
-    graph.add_node("game_intelligence", _game_intelligence_node)
-    graph.add_node("team_intel_home", _team_intelligence_home_node)
-    graph.add_node("team_intel_away", _team_intelligence_away_node)
+    graph.add_node("game_intelligence", traced_node("game_intelligence", _game_intelligence_node))
+    graph.add_node("team_intel_home", traced_node("team_intel_home", _team_intelligence_home_node))
+    graph.add_node("team_intel_away", traced_node("team_intel_away", _team_intelligence_away_node))
 
     graph.add_edge(START, "game_intelligence")
     graph.add_edge(START, "team_intel_home")
@@ -154,3 +163,23 @@ def build_analyze_game_subgraph():
     graph.add_edge("team_intel_away", END)
 
     return graph.compile()
+
+
+def governed_analyze_game(subgraph: Any) -> Callable[[AnalyzeGameState, RunnableConfig], dict]:
+    """Wrap the compiled analyze_game subgraph in a kickoff-prioritised game slot.
+
+    Args:
+        subgraph: Compiled graph from :func:`build_analyze_game_subgraph`.
+
+    Returns:
+        Node function to register as ``analyze_game`` in the parent graph.
+        It returns only ``analyzed_game_ids``, the subgraph's fan-in output.
+    """
+
+    def analyze_game(state: AnalyzeGameState, config: RunnableConfig) -> dict:
+        priority = kickoff_priority(state["match_date"], state["kickoff_time"])
+        with game_slot(priority):
+            result = subgraph.invoke(state, config)
+        return {"analyzed_game_ids": result["analyzed_game_ids"]}
+
+    return analyze_game
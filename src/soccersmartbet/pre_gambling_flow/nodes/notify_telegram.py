@@ -7,7 +7,7 @@ from telegram import Bot
 
 from soccersmartbet.gambling_flow.handlers import send_want_to_bet
 from soccersmartbet.pre_gambling_flow.state import PreGamblingState
-from soccersmartbet.reports.html_report import generate_game_report_html
+from soccersmartbet.reports.html_report import generate_reports_html
 from soccersmartbet.reports.telegram_message import get_games_info
 from soccersmartbet.telegram.bot import (
     TELEGRAM_BOT_TOKEN,
@@ -31,7 +31,11 @@ def notify_telegram(state: PreGamblingState) -> dict:
         return {}
 
     async def _send_all() -> None:
+        # Build every report (one DB query + concurrent logo downloads) while
+        # the gambling-time message is being sent.
+        reports_task = asyncio.create_task(asyncio.to_thread(generate_reports_html, game_ids))
         await send_gambling_time(game_ids)
+        reports = await reports_task
 
         games_info = get_games_info(game_ids)
         info_by_id = {g["game_id"]: g for g in games_info}
@@ -43,8 +47,7 @@ def notify_telegram(state: PreGamblingState) -> dict:
             home = info["home_team"].replace(" ", "_")
             away = info["away_team"].replace(" ", "_")
             filename = f"{home}_vs_{away}.html"
-            html = generate_game_report_html(game_id)
-            await send_html_report(game_id, html, filename)
+            await send_html_report(game_id, reports[game_id], filename)
 
         # Send interactive "want to bet?" prompt after all HTML reports
         bot = Bot(token=TELEGRAM_BOT_TOKEN)
@@ -0,0 +1,125 @@
+"""Prefetch Game Data node for the Pre-Gambling Flow.
+
+Runs between persist_games and the analyze_game fan-out.  Each analyze_game
+branch fetches its own data, so without this node the same league tables,
+team payloads and competition scans are requested by several branches at
+once.  This node computes the distinct remote resources behind every selected
+game and fetches each one once, concurrently:
+
+    1. FotMob league tables (team-name resolution for every tool)
+    2. FotMob team payloads and team news, per distinct team
+    3. football-data.org competition scans, per distinct league (fetch_h2h)
+    4. Home venues (``venues`` table), then every forecast in one Open-Meteo
+       request (fetch_weather)
+
+Team payloads and news land in the run-scoped store
+(:mod:`soccersmartbet.pre_gambling_flow.tools.run_store`); the other
+resources already have their own caches, which this node just warms.  The
+agents read through those caches unchanged, so API calls scale with distinct
+resources rather than games × tools.  Prefetching is best-effort: a failed
+resource is logged and left for the tool that needs it to fetch on its own.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Iterable
+
+from soccersmartbet.pre_gambling_flow.state import GameContext, PreGamblingState
+from soccersmartbet.pre_gambling_flow.tools import run_store
+from soccersmartbet.pre_gambling_flow.tools.fotmob_client import FOTMOB_LEAGUES, get_fotmob_client
+from soccersmartbet.pre_gambling_flow.tools.game.fetch_h2h import prefetch_competition
+from soccersmartbet.pre_gambling_flow.tools.game.fetch_weather import prefetch_weather
+from soccersmartbet.venues import get_venue
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = max(1, int(os.getenv("PREFETCH_WORKERS", "8")))
+
+
+def _selected_games(state: PreGamblingState) -> list[GameContext]:
+    # fan_out_to_analysis pairs games_to_analyze[i] with all_games[i].
+    return state["all_games"][: len(state["games_to_analyze"])]
+
+
+def _run_all(pool: ThreadPoolExecutor, jobs: Iterable[partial[Any]]) -> None:
+    """Run every job on *pool* and wait for all of them; failures are only logged."""
+
+    def safe(job: partial[Any]) -> None:
+        try:
+            job()
+        except Exception as exc:
+            logger.warning("prefetch_game_data: %s%r failed: %s", job.func.__name__, job.args, exc)
+
+    # Each job runs in a copy of this context so its spans reach the run's trace.
+    futures = [pool.submit(contextvars.copy_context().run, safe, job) for job in jobs]
+    for future in futures:
+        future.result()
+
+
+def _prefetch(games: list[GameContext]) -> None:
+    client = get_fotmob_client()
+    team_names = list(dict.fromkeys(n for g in games for n in (g["home_team"], g["away_team"])))
+    leagues = list(dict.fromkeys(g["league"] for g in games if g.get("league")))
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch") as pool:
+        # find_team walks the league tables, so load them all at once first.
+        _run_all(pool, (partial(client.get_league_standings, i) for i in FOTMOB_LEAGUES.values()))
+        team_ids = {name: (client.find_team(name) or {}).get("id") for name in team_names}
+        ids = list(dict.fromkeys(i for i in team_ids.values() if i is not None))
+
+        _run_all(pool, [
+            *(partial(client.get_team_data, i) for i in ids),
+            *(partial(client.get_team_news, i) for i in ids),
+            *(partial(prefetch_competition, lg) for lg in leagues),
+        ])
+
+        # Venues come out of the stored team payloads, so this costs no request.
+        home_ids = {team_ids[g["home_team"]] for g in games} - {None}
+        _run_all(pool, (partial(get_venue, i, client) for i in home_ids))
+
+    prefetch_weather(
+        (g["home_team"], g["away_team"], f"{g['match_date']}T{g['kickoff_time']}:00")
+        for g in games
+    )
+    logger.info(
+        "prefetch_game_data: %d game(s) -> %d team(s), %d league(s)",
+        len(games),
+        len(ids),
+        len(leagues),
+    )
+
+
+def prefetch_game_data(state: PreGamblingState) -> dict[str, Any]:
+    """LangGraph node: fetch every selected game's remote data once, up front.
+
+    Opens a fresh run-scoped store (closed by ``run_pre_gambling_flow``) and
+    fills it and the tools' caches.  Never raises: anything not prefetched
+    is fetched by the tool that needs it.
+
+    Args:
+        state: Current Pre-Gambling Flow state after persist_games.
+
+    Returns:
+        Empty dict -- the prefetched data lives in the caches, not in state.
+    """
+    store = run_store.start_run()
+    games = _selected_games(state)
+    if not games:
+        return {}
+
+    try:
+        _prefetch(games)
+    except Exception as exc:
+        logger.warning("prefetch_game_data: prefetch skipped due to error: %s", exc)
+
+    logger.info(
+        "prefetch_game_data: %d payload(s) stored in %d request(s)",
+        len(store.values),
+        store.fetches,
+    )
+    return {}
@@ -14,7 +14,6 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from soccersmartbet.pre_gambling_flow.prompts import SMART_GAME_PICKER_PROMPT
 from soccersmartbet.utils.timezone import utc_to_isr
@@ -28,6 +27,7 @@ from soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds import (
     fetch_all_winner_odds,
 )
 from soccersmartbet.team_registry import normalize_team_name, resolve_team
+from soccersmartbet.utils.llm import invoke_structured
 
 PICKER_MODEL = os.getenv("SMART_PICKER_MODEL", "gpt-5.4-mini")
 
@@ -216,7 +216,7 @@ def smart_game_picker(state: PreGamblingState) -> dict:  # noqa: ARG001
     if fixtures_error:
         # A fetch failure is NOT a genuine no-games day.  Raise so the flow
         # fails loudly and daily_runs is left with pre_gambling_started_at set
-        # but no completed_at — the wall-clock poller will log this as a crash
+        # but no completed_at — the scheduler will not re-fire; this is a crash
         # requiring manual intervention (avoids silent data loss).
         raise RuntimeError(f"smart_game_picker: fixtures fetch failed — {fixtures_error}")
     fixtures: list[dict[str, Any]] = fixtures_result.get("fixtures") or []
@@ -318,10 +318,9 @@ Select the most interesting games for today's betting analysis."""
     system_msg = SystemMessage(content=SMART_GAME_PICKER_PROMPT)
     human_msg = HumanMessage(content=user_message_text)
 
-    model = ChatOpenAI(model=PICKER_MODEL, temperature=0.3)
-    structured_model = model.with_structured_output(SelectedGames)
-
-    selected: SelectedGames = structured_model.invoke([system_msg, human_msg])
+    selected: SelectedGames = invoke_structured(
+        PICKER_MODEL, 0.3, SelectedGames, [system_msg, human_msg]
+    )
     logger.info("smart_game_picker: LLM selected %d games", len(selected.games))
 
     # Build a map from (normalised_home, normalised_away) → eligible entry
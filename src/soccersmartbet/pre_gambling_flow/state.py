@@ -185,16 +185,20 @@ class PreGamblingState(TypedDict):
        - Inserts games to DB, gets real PKs
        - Sets state.games_to_analyze with DB PKs
 
-    3. persist_games -> [fan_out_to_analysis via Send()]
+    3. persist_games -> prefetch_game_data
+       - Fetches each distinct team/league/competition/venue/forecast once
+       - No state changes; the data lives in the tools' caches
+
+    4. prefetch_game_data -> [fan_out_to_analysis via Send()]
        - For each game_id: Send("analyze_game", {game payload})
        - LangGraph dispatches N parallel analyze_game invocations
 
-    4. analyze_game (N parallel invocations)
+    5. analyze_game (N parallel invocations)
        - Runs game intelligence + 2x team intelligence per game
        - Writes reports to DB
        - Returns {analyzed_game_ids: [game_id]} for fan-in
 
-    5. analyze_game -> combine_reports -> persist_reports -> END
+    6. analyze_game -> combine_reports -> persist_reports -> END
 
     References:
     -----------
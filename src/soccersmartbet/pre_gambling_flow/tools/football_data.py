@@ -0,0 +1,209 @@
+"""Process-wide request scheduler for football-data.org.
+
+The free tier allows ``FDORG_REQUESTS_PER_MINUTE`` (default 10) requests per
+minute per API key.  Every football-data.org call (``fetch_daily_fixtures``,
+``fetch_h2h``) goes through :func:`get`, which takes a token from one shared
+:class:`TokenBucket` before the request is sent, so parallel ``analyze_game``
+branches queue up and are served first-come first-served at the quota
+ceiling instead of all hitting a 429 and then sleeping independently.
+
+The bucket follows the server's own counters: ``X-Requests-Available-Minute``
+caps the local token count and, at zero (or on a 429), the bucket is closed
+until ``X-RequestCounter-Reset`` seconds have passed.  Replay runs
+(``CASSETTE_MODE=replay``) make no real requests and are not throttled.
+
+:func:`metrics` reports the queue (current and peak depth, waits, 429s);
+each token wait is also recorded as a ``ratelimit`` span in the flow trace.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Mapping, Optional
+
+import requests
+
+from soccersmartbet.utils.cassette import MODE_REPLAY, cassette_mode, http_get
+from soccersmartbet.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_MINUTE = int(os.getenv("FDORG_REQUESTS_PER_MINUTE", "10"))
+
+# Requests retried after a 429 (each retry waits for the shared reset).
+_MAX_ATTEMPTS = 6
+# Wait assumed when a 429 / exhausted counter comes without a reset header.
+_DEFAULT_RESET_S = 60.0
+
+
+@dataclass
+class SchedulerMetrics:
+    """Counters for the shared bucket since process start."""
+
+    requests: int = 0
+    waited: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    throttled: int = 0
+    queue_depth: int = 0
+    queue_depth_max: int = 0
+
+
+class TokenBucket:
+    """Thread-safe FIFO token bucket refilled at *per_minute* tokens a minute.
+
+    Args:
+        per_minute: Sustained request rate.
+        burst: Bucket capacity (default *per_minute*: a fresh minute's quota).
+        clock: Monotonic seconds clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate_per_s = per_minute / 60.0
+        self.burst = burst if burst is not None else max(int(per_minute), 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._queue: deque[object] = deque()
+        self._cond = threading.Condition()
+        self.metrics = SchedulerMetrics()
+
+    def _wait_needed(self, now: float) -> float:
+        """Refill for the time elapsed and return seconds until a token is free."""
+        if self._blocked_until:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            # The server's minute counter has reset.
+            self._blocked_until = 0.0
+            self._tokens = float(self.burst)
+        else:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_s
+
+    def acquire(self) -> float:
+        """Block until this caller's turn and a token are both available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waiter = object()
+        with self._cond:
+            start = self._clock()
+            self._queue.append(waiter)
+            self.metrics.queue_depth = len(self._queue)
+            self.metrics.queue_depth_max = max(self.metrics.queue_depth_max, len(self._queue))
+            blocked = False
+            try:
+                while True:
+                    if self._queue[0] is waiter:
+                        wait = self._wait_needed(self._clock())
+                        if wait <= 0:
+                            self._tokens -= 1
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                    blocked = True
+            finally:
+                self._queue.remove(waiter)
+                self.metrics.queue_depth = len(self._queue)
+                self._cond.notify_all()
+            self.metrics.requests += 1
+            if not blocked:
+                return 0.0
+            waited = self._clock() - start
+            self.metrics.waited += 1
+            self.metrics.wait_ms_total += waited * 1000
+            self.metrics.wait_ms_max = max(self.metrics.wait_ms_max, waited * 1000)
+            return waited
+
+    def observe(
+        self, available: Optional[int], reset_s: Optional[float], throttled: bool = False
+    ) -> None:
+        """Align the bucket with the server's quota headers after a response."""
+        with self._cond:
+            now = self._clock()
+            self._wait_needed(now)
+            if throttled:
+                self.metrics.throttled += 1
+                available = 0
+            if available is None:
+                return
+            self._tokens = min(self._tokens, float(available))
+            if available <= 0:
+                reset = reset_s if reset_s is not None else _DEFAULT_RESET_S
+                self._blocked_until = max(self._blocked_until, now + reset)
+            self._cond.notify_all()
+
+
+def _header_number(resp: requests.Response, name: str) -> Optional[float]:
+    try:
+        return float(resp.headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_bucket = TokenBucket(REQUESTS_PER_MINUTE)
+
+
+def get(
+    url: str,
+    headers: Mapping[str, str],
+    params: Optional[Mapping[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> requests.Response | None:
+    """Send a football-data.org GET through the shared bucket.
+
+    A 429 closes the bucket for every caller until the server's reset and the
+    request is queued again, up to ``_MAX_ATTEMPTS`` times.
+
+    Returns:
+        The response (any status other than 429), or None once every attempt
+        was throttled.
+    """
+    live = cassette_mode() != MODE_REPLAY
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        if live:
+            with span("ratelimit", "football-data.org"):
+                waited = _bucket.acquire()
+            if waited >= 1:
+                logger.info("football_data: waited %.1fs for a request slot (%s)", waited, url)
+        resp = http_get(url, headers=headers, params=params, timeout=timeout)
+        throttled = resp.status_code == 429
+        if live:
+            available = _header_number(resp, "X-Requests-Available-Minute")
+            _bucket.observe(
+                int(available) if available is not None else None,
+                _header_number(resp, "X-RequestCounter-Reset"),
+                throttled=throttled,
+            )
+        if not throttled:
+            return resp
+        logger.warning(
+            "football_data: 429 on %s (attempt %d/%d)", url, attempt, _MAX_ATTEMPTS
+        )
+    logger.warning("football_data: exhausted retries on %s", url)
+    return None
+
+
+def metrics() -> dict[str, Any]:
+    """Return the shared bucket's :class:`SchedulerMetrics` as a dict."""
+    with _bucket._cond:
+        out = asdict(_bucket.metrics)
+    out["wait_ms_total"] = round(out["wait_ms_total"], 1)
+    out["wait_ms_max"] = round(out["wait_ms_max"], 1)
+    return out
@@ -8,10 +8,12 @@ import urllib.parse
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import requests
-
 from soccersmartbet.team_registry import normalize_team_name
+from soccersmartbet.utils.cassette import http_get
 from soccersmartbet.utils.timezone import isr_datetime, now_isr
+from soccersmartbet.utils.tracing import mark_cache_hit
+
+from . import run_store
 
 FOTMOB_LEAGUES = {
     "Premier League": 47, "La Liga": 87, "Serie A": 55, "Bundesliga": 54,
@@ -57,7 +59,7 @@ class FotMobClient:
             "x-mas": _generate_xmas_header(url),
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         if response.status_code in (401, 403):
             raise PermissionError(
                 f"FotMob auth failed ({response.status_code}) — x-mas key may be rotated"
@@ -73,7 +75,13 @@ class FotMobClient:
             return None
 
     def get_team_data(self, team_id: int) -> Optional[Dict[str, Any]]:
-        """Fetch team data including venue, form, and match info."""
+        """Fetch team data including venue, form, and match info.
+
+        Shared through the flow run's store (see :mod:`.run_store`).
+        """
+        return run_store.cached(("fotmob.team", team_id), lambda: self._fetch_team_data(team_id))
+
+    def _fetch_team_data(self, team_id: int) -> Optional[Dict[str, Any]]:
         try:
             return self._request("/api/data/teams", params={"id": team_id})
         except Exception:
@@ -87,7 +95,10 @@ class FotMobClient:
             return None
 
     def get_team_news(self, team_id: int) -> Optional[Dict[str, Any]]:
-        """Fetch latest news articles for a team."""
+        """Fetch latest news articles for a team (shared through the run's store)."""
+        return run_store.cached(("fotmob.news", team_id), lambda: self._fetch_team_news(team_id))
+
+    def _fetch_team_news(self, team_id: int) -> Optional[Dict[str, Any]]:
         try:
             return self._request(
                 "/api/data/tlnews",
@@ -99,6 +110,7 @@ class FotMobClient:
     def _load_league(self, league_id: int) -> Dict[str, Any]:
         now = now_isr()
         if league_id in _league_cache and now - _cache_time.get(league_id, _CACHE_EPOCH) < CACHE_TTL:
+            mark_cache_hit("fotmob.league_table")
             return _league_cache[league_id]
         try:
             data = self.get_league_table(league_id)
@@ -22,14 +22,13 @@ import logging
 from datetime import date
 from typing import Optional
 
-import requests
-
 from soccersmartbet.db import get_conn
 from soccersmartbet.pre_gambling_flow.tools.fotmob_client import (
     FOTMOB_LEAGUES,
     _generate_xmas_header,
 )
 from soccersmartbet.team_registry import normalize_team_name
+from soccersmartbet.utils.cassette import http_get
 from soccersmartbet.utils.timezone import utc_to_isr
 
 logger = logging.getLogger(__name__)
@@ -50,7 +49,7 @@ def _fotmob_get(url: str) -> Optional[dict]:
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             ),
         }
-        resp = requests.get(url, headers=headers, timeout=_TIMEOUT)
+        resp = http_get(url, headers=headers, timeout=_TIMEOUT)
         resp.raise_for_status()
         return resp.json()
     except Exception as exc:
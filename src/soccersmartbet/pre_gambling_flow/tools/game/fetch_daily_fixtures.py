@@ -12,7 +12,9 @@ from typing import Any, Dict, List, Optional
 import requests
 from dotenv import load_dotenv
 
+from soccersmartbet.pre_gambling_flow.tools import football_data
 from soccersmartbet.utils.timezone import today_isr
+from soccersmartbet.utils.tracing import traced_tool
 
 load_dotenv()
 
@@ -24,6 +26,7 @@ BASE_URL = "https://api.football-data.org/v4"
 TIMEOUT = 30
 
 
+@traced_tool
 def fetch_daily_fixtures(date: Optional[str] = None) -> Dict[str, Any]:
     """Fetch all fixtures for a given date.
 
@@ -73,9 +76,10 @@ def fetch_daily_fixtures(date: Optional[str] = None) -> Dict[str, Any]:
     headers = {"X-Auth-Token": FOOTBALL_DATA_API_KEY}
 
     try:
-        response = requests.get(
+        # Shared football-data.org quota: queues behind any H2H lookups in flight.
+        response = football_data.get(
             f"{BASE_URL}/matches",
-            headers=headers,
+            headers,
             params={
                 "dateFrom": resolved_date,
                 "dateTo": str(date_type.fromisoformat(resolved_date) + timedelta(days=1)),
@@ -83,6 +87,9 @@ def fetch_daily_fixtures(date: Optional[str] = None) -> Dict[str, Any]:
             timeout=TIMEOUT,
         )
 
+        if response is None:
+            return {**error_base, "error": "API error: 429 - rate limit retries exhausted"}
+
         if response.status_code != 200:
             return {
                 **error_base,
@@ -1,12 +1,33 @@
+"""
+Head-to-head history between two teams from football-data.org.
+
+The head2head endpoint needs the upcoming match's id, found by scanning
+``/competitions/{code}/matches``.  Each competition's scan is fetched once per
+``SCAN_TTL`` and indexed by the unordered pair of canonical team names, so
+every later game of the run in that competition is an in-memory lookup.
+
+Past meetings never change, so they are persisted in ``h2h_meetings`` keyed
+by the unordered canonical pair, with ``h2h_pairs`` recording the date the
+pair is synced through.  A pair synced today costs no head2head request; an
+older one only asks for the meetings played since.  The store is best-effort:
+when the DB is unavailable the tool falls back to a full fetch.
+"""
+
 import logging
 import os
-import time
-from typing import Any
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable
 
 import requests
 from dotenv import load_dotenv
 
+from soccersmartbet.db import get_cursor
+from soccersmartbet.pre_gambling_flow.tools import football_data
 from soccersmartbet.team_registry import normalize_team_name, resolve_team
+from soccersmartbet.utils.timezone import now_isr, today_isr
+from soccersmartbet.utils.tracing import mark_cache_hit, traced_tool
 
 load_dotenv()
 
@@ -16,7 +37,12 @@ FOOTBALL_DATA_API_KEY = os.getenv("FOOTBALL_DATA_API_KEY")
 BASE_URL = "https://api.football-data.org/v4"
 TIMEOUT = int(os.getenv("FDORG_H2H_TIMEOUT_S", "30"))
 
-_BACKOFF_SEQUENCE = [5, 10, 20, 40, 80]
+# Scheduled matches change rarely; one scan per competition serves a whole run.
+SCAN_TTL = timedelta(minutes=30)
+# Meetings requested on a pair's first sync, enough for every caller's limit.
+_HISTORY_DEPTH = 10
+_FINAL_STATUSES = ("FINISHED", "AWARDED")
+_API_ISSUES = "couldn't retrieve h2h due to API issues"
 
 LEAGUE_CODE_MAP: dict[str, str] = {
     "premier league": "PL",
@@ -41,41 +67,265 @@ LEAGUE_CODE_MAP: dict[str, str] = {
     "serie a brasileirao": "BSA",
 }
 
+PairKey = tuple[str, str]
 
-def _graceful(home: str, away: str) -> dict[str, Any]:
+
+def _empty(
+    home: str,
+    away: str,
+    error: str,
+    match_id: int | None = None,
+    match_date: str | None = None,
+) -> dict[str, Any]:
     return {
         "home_team": home,
         "away_team": away,
-        "upcoming_match_id": None,
-        "upcoming_match_date": None,
+        "upcoming_match_id": match_id,
+        "upcoming_match_date": match_date,
         "h2h_matches": [],
         "total_h2h": 0,
-        "error": "couldn't retrieve h2h due to API issues",
+        "error": error,
     }
 
 
-def _get_with_backoff(
-    url: str,
-    headers: dict[str, str],
-    params: dict[str, Any],
-) -> requests.Response | None:
-    for attempt, sleep_s in enumerate([0] + _BACKOFF_SEQUENCE):
-        if sleep_s:
-            logger.warning(
-                "fetch_h2h: 429 on %s, sleeping %ds (attempt %d/%d)",
-                url,
-                sleep_s,
-                attempt,
-                len(_BACKOFF_SEQUENCE) + 1,
-            )
-            time.sleep(sleep_s)
-        resp = requests.get(url, headers=headers, params=params, timeout=TIMEOUT)
-        if resp.status_code != 429:
-            return resp
-    logger.warning("fetch_h2h: exhausted retries on %s", url)
-    return None
+def _graceful(home: str, away: str) -> dict[str, Any]:
+    return _empty(home, away, _API_ISSUES)
+
+
+def _canonical_norm(name: str) -> str:
+    return normalize_team_name(resolve_team(name) or name)
+
+
+def pair_key(team_a_norm: str, team_b_norm: str) -> PairKey:
+    """Return the unordered pair key (alphabetical) for two normalized names."""
+    if team_a_norm <= team_b_norm:
+        return team_a_norm, team_b_norm
+    return team_b_norm, team_a_norm
+
+
+# ---------------------------------------------------------------------------
+# Competition scans (in-process, SCAN_TTL)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CompetitionScan:
+    """One competition's scheduled matches, indexed by unordered canonical pair.
 
+    Every team name is resolved once, when the scan is built.
+    """
 
+    fetched_at: datetime
+    by_pair: dict[PairKey, dict[str, Any]]
+    entries: list[tuple[str, str, dict[str, Any]]]
+
+    @classmethod
+    def build(cls, matches: Iterable[dict[str, Any]], fetched_at: datetime) -> "CompetitionScan":
+        entries: list[tuple[str, str, dict[str, Any]]] = []
+        for match in sorted(matches, key=lambda m: m.get("utcDate") or ""):
+            home_name = (match.get("homeTeam") or {}).get("name")
+            away_name = (match.get("awayTeam") or {}).get("name")
+            if not home_name or not away_name:
+                continue
+            entries.append((_canonical_norm(home_name), _canonical_norm(away_name), match))
+        by_pair: dict[PairKey, dict[str, Any]] = {}
+        for home_norm, away_norm, match in entries:
+            by_pair.setdefault(pair_key(home_norm, away_norm), match)  # earliest kickoff
+        return cls(fetched_at, by_pair, entries)
+
+    def find(self, home_norm: str, away_norm: str) -> dict[str, Any] | None:
+        """Return the earliest match between the two teams, either way round.
+
+        Exact pair first, then the substring match API names sometimes need.
+        """
+        match = self.by_pair.get(pair_key(home_norm, away_norm))
+        if match is not None:
+            return match
+        for scan_home, scan_away, match in self.entries:
+            home_matches_home = home_norm in scan_home or scan_home in home_norm
+            away_matches_away = away_norm in scan_away or scan_away in away_norm
+            home_matches_away = home_norm in scan_away or scan_away in home_norm
+            away_matches_home = away_norm in scan_home or scan_home in away_norm
+            if (home_matches_home and away_matches_away) or (home_matches_away and away_matches_home):
+                return match
+        return None
+
+
+_scans: dict[str, CompetitionScan] = {}
+_scan_locks: dict[str, threading.Lock] = {}
+_scan_locks_guard = threading.Lock()
+
+
+def get_competition_scan(
+    competition_code: str, headers: dict[str, str]
+) -> tuple[CompetitionScan | None, str | None]:
+    """Return ``(scan, None)`` for *competition_code*, or ``(None, error)``.
+
+    Concurrent callers for the same competition wait for a single request.
+    Failed scans are not cached.
+    """
+    with _scan_locks_guard:
+        lock = _scan_locks.setdefault(competition_code, threading.Lock())
+    with lock:
+        now = now_isr()
+        scan = _scans.get(competition_code)
+        if scan is not None and now - scan.fetched_at < SCAN_TTL:
+            mark_cache_hit("football_data.scan")
+            return scan, None
+        resp = football_data.get(
+            f"{BASE_URL}/competitions/{competition_code}/matches",
+            headers,
+            {"status": "TIMED,SCHEDULED"},
+            timeout=TIMEOUT,
+        )
+        if resp is None:
+            return None, _API_ISSUES
+        if resp.status_code != 200:
+            return None, f"H2H API error: {resp.status_code}"
+        scan = CompetitionScan.build(resp.json().get("matches", []), now)
+        _scans[competition_code] = scan
+        return scan, None
+
+
+def prefetch_competition(league: str) -> str | None:
+    """Warm the competition scan :func:`fetch_h2h` will use for *league*.
+
+    Returns:
+        None once the scan is cached (or the league has no H2H source),
+        otherwise the error that prevented fetching it.
+    """
+    competition_code = LEAGUE_CODE_MAP.get(league.lower())
+    if not FOOTBALL_DATA_API_KEY or competition_code is None:
+        return None
+    _scan, error = get_competition_scan(competition_code, {"X-Auth-Token": FOOTBALL_DATA_API_KEY})
+    return error
+
+
+# ---------------------------------------------------------------------------
+# Meeting history (h2h_pairs / h2h_meetings tables)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _History:
+    synced_through: date
+    depth: int
+    meetings: list[dict[str, Any]]
+
+
+_PAIR_SQL = "SELECT synced_through, depth FROM h2h_pairs WHERE team_a = %s AND team_b = %s"
+
+_MEETINGS_SQL = """
+SELECT match_id, match_date, home_team, away_team, score_home, score_away
+FROM h2h_meetings
+WHERE team_a = %s AND team_b = %s
+ORDER BY match_date DESC, match_id DESC
+LIMIT %s
+"""
+
+_UPSERT_PAIR_SQL = """
+INSERT INTO h2h_pairs (team_a, team_b, synced_through, depth)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (team_a, team_b) DO UPDATE
+    SET synced_through = GREATEST(h2h_pairs.synced_through, EXCLUDED.synced_through),
+        depth = GREATEST(h2h_pairs.depth, EXCLUDED.depth)
+"""
+
+_INSERT_MEETING_SQL = """
+INSERT INTO h2h_meetings
+    (team_a, team_b, match_id, match_date, home_team, away_team, score_home, score_away)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (team_a, team_b, match_id) DO NOTHING
+"""
+
+
+def _meeting(match: dict[str, Any]) -> dict[str, Any] | None:
+    """Return a stored-meeting dict for a finished API match, else None."""
+    score = (match.get("score") or {}).get("fullTime") or {}
+    utc_date = match.get("utcDate") or ""
+    if (
+        match.get("id") is None
+        or len(utc_date) < 10
+        or score.get("home") is None
+        or score.get("away") is None
+        or match.get("status", "FINISHED") not in _FINAL_STATUSES
+    ):
+        return None
+    return {
+        "match_id": match["id"],
+        "date": date.fromisoformat(utc_date[:10]),
+        "home_team": (match.get("homeTeam") or {}).get("name", "Unknown"),
+        "away_team": (match.get("awayTeam") or {}).get("name", "Unknown"),
+        "score_home": score["home"],
+        "score_away": score["away"],
+    }
+
+
+def _load_history(key: PairKey, limit: int) -> _History | None:
+    """Return the stored history for *key*, or None (never synced / DB error)."""
+    try:
+        with get_cursor(commit=False) as cur:
+            cur.execute(_PAIR_SQL, key)
+            row = cur.fetchone()
+            if row is None:
+                return None
+            cur.execute(_MEETINGS_SQL, (*key, limit))
+            meetings = [
+                {
+                    "match_id": match_id,
+                    "date": match_date,
+                    "home_team": home,
+                    "away_team": away,
+                    "score_home": score_home,
+                    "score_away": score_away,
+                }
+                for match_id, match_date, home, away, score_home, score_away in cur.fetchall()
+            ]
+    except Exception as exc:  # the store must never fail the tool
+        logger.warning("fetch_h2h: history read failed for %s: %s", key, exc)
+        return None
+    return _History(row[0], row[1], meetings)
+
+
+def _save_history(
+    key: PairKey, meetings: list[dict[str, Any]], synced_through: date, depth: int
+) -> None:
+    try:
+        with get_cursor() as cur:
+            cur.execute(_UPSERT_PAIR_SQL, (*key, synced_through, depth))
+            if meetings:
+                cur.executemany(
+                    _INSERT_MEETING_SQL,
+                    [
+                        (*key, m["match_id"], m["date"], m["home_team"], m["away_team"],
+                         m["score_home"], m["score_away"])
+                        for m in meetings
+                    ],
+                )
+    except Exception as exc:
+        logger.warning("fetch_h2h: history write failed for %s: %s", key, exc)
+
+
+def _merge(stored: list[dict[str, Any]], fetched: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return the union of two meeting lists, most recent first."""
+    merged = {m["match_id"]: m for m in stored}
+    merged.update((m["match_id"], m) for m in fetched)
+    return sorted(merged.values(), key=lambda m: (m["date"], m["match_id"]), reverse=True)
+
+
+def _winner(meeting: dict[str, Any], home_team_name: str, away_team_name: str,
+            home_input_norm: str) -> str:
+    """Name the meeting's winner using the caller's team names, or ``"DRAW"``."""
+    if meeting["score_home"] > meeting["score_away"]:
+        side = meeting["home_team"]
+    elif meeting["score_away"] > meeting["score_home"]:
+        side = meeting["away_team"]
+    else:
+        return "DRAW"
+    return home_team_name if _canonical_norm(side) == home_input_norm else away_team_name
+
+
+@traced_tool
 def fetch_h2h(
     home_team_name: str,
     away_team_name: str,
@@ -83,15 +333,9 @@ def fetch_h2h(
     league: str | None = None,
 ) -> dict[str, Any]:
     if not FOOTBALL_DATA_API_KEY:
-        return {
-            "home_team": home_team_name,
-            "away_team": away_team_name,
-            "upcoming_match_id": None,
-            "upcoming_match_date": None,
-            "h2h_matches": [],
-            "total_h2h": 0,
-            "error": "FOOTBALL_DATA_API_KEY not found in environment",
-        }
+        return _empty(
+            home_team_name, away_team_name, "FOOTBALL_DATA_API_KEY not found in environment"
+        )
 
     if league is None:
         return _graceful(home_team_name, away_team_name)
@@ -103,126 +347,75 @@ def fetch_h2h(
     headers = {"X-Auth-Token": FOOTBALL_DATA_API_KEY}
 
     try:
-        home_canonical = resolve_team(home_team_name) or home_team_name
-        away_canonical = resolve_team(away_team_name) or away_team_name
-        home_input_norm = normalize_team_name(home_canonical)
-        away_input_norm = normalize_team_name(away_canonical)
-
-        scan_url = f"{BASE_URL}/competitions/{competition_code}/matches"
-        scan_resp = _get_with_backoff(
-            scan_url, headers, {"status": "TIMED,SCHEDULED"}
-        )
-
-        if scan_resp is None:
-            return _graceful(home_team_name, away_team_name)
-
-        if scan_resp.status_code != 200:
-            return {
-                "home_team": home_team_name,
-                "away_team": away_team_name,
-                "upcoming_match_id": None,
-                "upcoming_match_date": None,
-                "h2h_matches": [],
-                "total_h2h": 0,
-                "error": f"H2H API error: {scan_resp.status_code}",
-            }
-
-        upcoming_match = None
-        candidates = []
-        for match in scan_resp.json().get("matches", []):
-            home_name = (match.get("homeTeam") or {}).get("name")
-            away_name = (match.get("awayTeam") or {}).get("name")
-            if not home_name or not away_name:
-                continue
-
-            home_resolved = resolve_team(home_name) or home_name
-            away_resolved = resolve_team(away_name) or away_name
-            home_norm = normalize_team_name(home_resolved)
-            away_norm = normalize_team_name(away_resolved)
-
-            home_matches_home = home_input_norm in home_norm or home_norm in home_input_norm
-            away_matches_away = away_input_norm in away_norm or away_norm in away_input_norm
-            home_matches_away = home_input_norm in away_norm or away_norm in home_input_norm
-            away_matches_home = away_input_norm in home_norm or home_norm in away_input_norm
-
-            if (home_matches_home and away_matches_away) or (home_matches_away and away_matches_home):
-                candidates.append(match)
+        home_input_norm = _canonical_norm(home_team_name)
+        away_input_norm = _canonical_norm(away_team_name)
 
-        if candidates:
-            candidates.sort(key=lambda m: m.get("utcDate") or "")
-            upcoming_match = candidates[0]
+        scan, scan_error = get_competition_scan(competition_code, headers)
+        if scan is None:
+            return _empty(home_team_name, away_team_name, scan_error)
 
+        upcoming_match = scan.find(home_input_norm, away_input_norm)
         if not upcoming_match:
-            return {
-                "home_team": home_team_name,
-                "away_team": away_team_name,
-                "upcoming_match_id": None,
-                "upcoming_match_date": None,
-                "h2h_matches": [],
-                "total_h2h": 0,
-                "error": f"No upcoming match found between {home_team_name} and {away_team_name}",
-            }
+            return _empty(
+                home_team_name,
+                away_team_name,
+                f"No upcoming match found between {home_team_name} and {away_team_name}",
+            )
 
         match_id = upcoming_match["id"]
         match_date = upcoming_match.get("utcDate", "")[:10]
 
-        h2h_resp = _get_with_backoff(
-            f"{BASE_URL}/matches/{match_id}/head2head",
-            headers,
-            {"limit": limit},
-        )
-
-        if h2h_resp is None:
-            return _graceful(home_team_name, away_team_name)
-
-        if h2h_resp.status_code != 200:
-            return {
-                "home_team": home_team_name,
-                "away_team": away_team_name,
-                "upcoming_match_id": match_id,
-                "upcoming_match_date": match_date,
-                "h2h_matches": [],
-                "total_h2h": 0,
-                "error": f"H2H API error: {h2h_resp.status_code}",
+        key = pair_key(home_input_norm, away_input_norm)
+        today = today_isr()
+        history = _load_history(key, limit)
+        usable = history if history is not None and history.depth >= limit else None
+        if usable is not None and usable.synced_through >= today:
+            mark_cache_hit("football_data.h2h")
+            meetings = usable.meetings
+        else:
+            if usable is not None:
+                # Only meetings played since the last sync can be missing.
+                depth = usable.depth
+                params: dict[str, Any] = {
+                    "dateFrom": usable.synced_through.isoformat(),
+                    "dateTo": today.isoformat(),
+                }
+            else:
+                depth = max(limit, _HISTORY_DEPTH)
+                params = {"limit": depth}
+            h2h_resp = football_data.get(
+                f"{BASE_URL}/matches/{match_id}/head2head", headers, params, timeout=TIMEOUT
+            )
+            if h2h_resp is not None and h2h_resp.status_code == 200:
+                fetched = [m for m in map(_meeting, h2h_resp.json().get("matches", [])) if m]
+                _save_history(key, fetched, today, depth)
+                meetings = _merge(history.meetings if history else [], fetched)
+            elif usable is not None:
+                # Stored meetings are still right; only newer ones are missing.
+                logger.warning("fetch_h2h: refresh failed for %s, serving stored history", key)
+                meetings = usable.meetings
+            elif h2h_resp is None:
+                return _graceful(home_team_name, away_team_name)
+            else:
+                return _empty(
+                    home_team_name,
+                    away_team_name,
+                    f"H2H API error: {h2h_resp.status_code}",
+                    match_id,
+                    match_date,
+                )
+
+        h2h_matches = [
+            {
+                "date": m["date"].isoformat(),
+                "home_team": m["home_team"],
+                "away_team": m["away_team"],
+                "score_home": m["score_home"],
+                "score_away": m["score_away"],
+                "winner": _winner(m, home_team_name, away_team_name, home_input_norm),
             }
-
-        h2h_matches = []
-        for match in h2h_resp.json().get("matches", []):
-            utc_date = match.get("utcDate", "")
-            match_date_str = utc_date[:10] if utc_date else "Unknown"
-
-            home = match.get("homeTeam", {}).get("name", "Unknown")
-            away = match.get("awayTeam", {}).get("name", "Unknown")
-
-            score = match.get("score", {}).get("fullTime", {})
-            score_home = score.get("home")
-            score_away = score.get("away")
-
-            winner = "DRAW"
-            if score_home is not None and score_away is not None:
-                if score_home > score_away:
-                    home_match_canonical = resolve_team(home) or home
-                    input_home_canonical = resolve_team(home_team_name) or home_team_name
-                    if normalize_team_name(home_match_canonical) == normalize_team_name(input_home_canonical):
-                        winner = home_team_name
-                    else:
-                        winner = away_team_name
-                elif score_away > score_home:
-                    away_match_canonical = resolve_team(away) or away
-                    input_home_canonical = resolve_team(home_team_name) or home_team_name
-                    if normalize_team_name(away_match_canonical) == normalize_team_name(input_home_canonical):
-                        winner = home_team_name
-                    else:
-                        winner = away_team_name
-
-            h2h_matches.append({
-                "date": match_date_str,
-                "home_team": home,
-                "away_team": away,
-                "score_home": score_home,
-                "score_away": score_away,
-                "winner": winner,
-            })
+            for m in meetings[:limit]
+        ]
 
         return {
             "home_team": home_team_name,
@@ -235,22 +428,6 @@ def fetch_h2h(
         }
 
     except requests.Timeout:
-        return {
-            "home_team": home_team_name,
-            "away_team": away_team_name,
-            "upcoming_match_id": None,
-            "upcoming_match_date": None,
-            "h2h_matches": [],
-            "total_h2h": 0,
-            "error": f"Request timeout after {TIMEOUT}s",
-        }
+        return _empty(home_team_name, away_team_name, f"Request timeout after {TIMEOUT}s")
     except Exception as e:
-        return {
-            "home_team": home_team_name,
-            "away_team": away_team_name,
-            "upcoming_match_id": None,
-            "upcoming_match_date": None,
-            "h2h_matches": [],
-            "total_h2h": 0,
-            "error": f"Unexpected error: {e}",
-        }
+        return _empty(home_team_name, away_team_name, f"Unexpected error: {e}")
@@ -2,14 +2,25 @@
 Fetch betting odds for a match between two teams.
 
 Clean interface: Accepts team names, returns 1/X/2 odds in decimal format.
+
+All ``SOCCER_LEAGUES`` are fetched concurrently on the first lookup and kept
+as per-sport snapshots for ``SNAPSHOT_TTL``, together with an index from
+normalized ``(home, away)`` pairs to events — every later game in the run is
+an in-memory lookup and costs no API credits.
 """
 
 import os
+import threading
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 import requests
 from dotenv import load_dotenv
 from soccersmartbet.team_registry import normalize_team_name, resolve_team
+from soccersmartbet.utils.cassette import http_get
+from soccersmartbet.utils.timezone import now_isr
+from soccersmartbet.utils.tracing import mark_cache_hit, traced_tool
 
 load_dotenv()
 
@@ -31,7 +42,96 @@ SOCCER_LEAGUES = [
     "soccer_fifa_world_cup",         # World Cup
 ]
 
+# Per-sport odds snapshots: sport_key -> (fetched_at, events).  Odds move, so
+# a snapshot only lives long enough to serve one flow run's games.
+SNAPSHOT_TTL = timedelta(minutes=10)
+_snapshots: Dict[str, Tuple[datetime, List[Dict[str, Any]]]] = {}
+# (normalized home, normalized away) -> event, rebuilt after every sweep;
+# SOCCER_LEAGUES order wins when a fixture is listed under two sports.
+_event_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_sweep_lock = threading.Lock()
+
+
+def _fetch_sport(sport_key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the events listed for *sport_key*, or None when the fetch failed.
+
+    Any other non-200 answer (e.g. an out-of-season sport) is an empty list,
+    so it is cached like a real snapshot and not re-requested per game.
+    """
+    def _get() -> requests.Response:
+        return http_get(
+            f"{BASE_URL}/sports/{sport_key}/odds/",
+            params={
+                "apiKey": ODDS_API_KEY,
+                "regions": "eu",
+                "markets": "h2h",
+                "oddsFormat": "decimal"
+            },
+            timeout=TIMEOUT
+        )
+
+    try:
+        response = _get()
+        # Retry once on 429 (rate limit) — blocks only this sport's worker
+        if response.status_code == 429:
+            time.sleep(2)
+            response = _get()
+        if response.status_code == 429 or response.status_code >= 500:
+            return None
+        if response.status_code != 200:
+            return []
+        return response.json()
+    except Exception:
+        return None
+
+
+def _refresh_snapshots() -> None:
+    """Fetch every stale sport concurrently and rebuild the pair index."""
+    now = now_isr()
+    stale = [
+        key for key in SOCCER_LEAGUES
+        if key not in _snapshots or now - _snapshots[key][0] >= SNAPSHOT_TTL
+    ]
+    if not stale:
+        mark_cache_hit("odds_api.snapshot")
+        return
+    with ThreadPoolExecutor(max_workers=len(stale), thread_name_prefix="odds") as pool:
+        for sport_key, events in zip(stale, pool.map(_fetch_sport, stale)):
+            if events is None:
+                _snapshots.pop(sport_key, None)  # retried on the next lookup
+            else:
+                _snapshots[sport_key] = (now, events)
 
+    index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for sport_key in SOCCER_LEAGUES:
+        for event in _snapshots.get(sport_key, (now, []))[1]:
+            pair = (
+                normalize_team_name(event.get("home_team") or ""),
+                normalize_team_name(event.get("away_team") or ""),
+            )
+            if all(pair):
+                index.setdefault(pair, event)
+    _event_index.clear()
+    _event_index.update(index)
+
+
+def _find_event(home_norms: set, away_norms: set) -> Optional[Dict[str, Any]]:
+    """Look a fixture up in the index: exact pair first, then substring match."""
+    for home in home_norms:
+        for away in away_norms:
+            event = _event_index.get((home, away))
+            if event is not None:
+                return event
+    # Fuzzy fallback (accent-folded substring either way), as API names vary
+    for (home_api, away_api), event in _event_index.items():
+        home_matches = any(h in home_api or home_api in h for h in home_norms)
+        away_matches = any(a in away_api or away_api in a for a in away_norms)
+        if home_matches and away_matches:
+            return event
+    return None
+
+
+@traced_tool
 def fetch_odds(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
     """
     Fetch betting odds for a match between two teams.
@@ -95,56 +195,14 @@ def fetch_odds(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
         if away_canonical:
             away_norms.add(normalize_team_name(away_canonical))
 
-        for sport_key in SOCCER_LEAGUES:
-            try:
-                response = requests.get(
-                    f"{BASE_URL}/sports/{sport_key}/odds/",
-                    params={
-                        "apiKey": ODDS_API_KEY,
-                        "regions": "eu",
-                        "markets": "h2h",
-                        "oddsFormat": "decimal"
-                    },
-                    timeout=TIMEOUT
-                )
-
-                # Retry once on 429 (rate limit) before moving on
-                if response.status_code == 429:
-                    time.sleep(2)
-                    response = requests.get(
-                        f"{BASE_URL}/sports/{sport_key}/odds/",
-                        params={
-                            "apiKey": ODDS_API_KEY,
-                            "regions": "eu",
-                            "markets": "h2h",
-                            "oddsFormat": "decimal"
-                        },
-                        timeout=TIMEOUT
-                    )
+        # One concurrent sweep per SNAPSHOT_TTL; concurrent callers wait for
+        # it and then read the same snapshot.
+        with _sweep_lock:
+            _refresh_snapshots()
+            match = _find_event(home_norms, away_norms)
+        if match is not None:
+            return _extract_odds_from_match(match, home_team_name, away_team_name)
 
-                if response.status_code != 200:
-                    continue  # Try next league
-
-                matches = response.json()
-
-                # Find match between these two teams (fuzzy matching with accent folding)
-                for match in matches:
-                    home_api = normalize_team_name(match.get("home_team") or "")
-                    away_api = normalize_team_name(match.get("away_team") or "")
-
-                    # Check if any of our normalized names match the API name
-                    home_matches = any(h in home_api or home_api in h for h in home_norms)
-                    away_matches = any(a in away_api or away_api in a for a in away_norms)
-
-                    if home_matches and away_matches:
-                        # Found the match! Extract odds
-                        return _extract_odds_from_match(match, home_team_name, away_team_name)
-                
-            except requests.Timeout:
-                continue  # Try next league
-            except Exception:
-                continue  # Try next league
-        
         # No match found in any league
         return {
             "home_team": home_team_name,
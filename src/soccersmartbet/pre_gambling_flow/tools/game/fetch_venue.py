@@ -2,14 +2,19 @@
 Fetch venue information for a match between two teams using FotMob API.
 
 Clean interface: Accepts both team names, returns home team's venue.
-NO API KEY REQUIRED - uses unofficial FotMob API.
+NO API KEY REQUIRED - uses unofficial FotMob API, read through the ``venues``
+table (:mod:`soccersmartbet.venues`).
 """
 
 from typing import Dict, Any
 
+from soccersmartbet.utils.tracing import traced_tool
+from soccersmartbet.venues import get_venue
+
 from ..fotmob_client import get_fotmob_client
 
 
+@traced_tool
 def fetch_venue(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
     """
     Fetch venue information for match between two teams.
@@ -26,7 +31,7 @@ def fetch_venue(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
             "away_team": "Tottenham",
             "venue_name": "Etihad Stadium",
             "venue_city": "Manchester",
-            "venue_capacity": "55097",
+            "venue_capacity": 55097,
             "venue_address": None,
             "venue_surface": "Grass",
             "error": None
@@ -50,10 +55,10 @@ def fetch_venue(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
                 "error": f"Team '{home_team_name}' not found in any major league",
             }
 
-        # Get team details with venue
-        team_data = client.get_team_data(team_info["id"])
+        # Stored stadium first; FotMob team payload only on a miss
+        venue = get_venue(team_info["id"], client)
 
-        if not team_data:
+        if venue is None:
             return {
                 "home_team": home_team_name,
                 "away_team": away_team_name,
@@ -65,10 +70,7 @@ def fetch_venue(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
                 "error": f"Could not fetch team data for '{home_team_name}'",
             }
 
-        overview = team_data.get("overview", {})
-        venue = overview.get("venue", {})
-
-        if not venue:
+        if not (venue.name or venue.city):
             return {
                 "home_team": team_info.get("name", home_team_name),
                 "away_team": away_team_name,
@@ -80,22 +82,14 @@ def fetch_venue(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
                 "error": "Venue data not available",
             }
 
-        # FotMob venue data structure
-        widget = venue.get("widget", {})
-
-        # Capacity and surface are in statPairs, not widget
-        stat_pairs = venue.get("statPairs", [])
-        capacity = next((v for k, v in stat_pairs if k == "Capacity"), None)
-        surface = next((v for k, v in stat_pairs if k == "Surface"), None)
-
         return {
             "home_team": team_info.get("name", home_team_name),
             "away_team": away_team_name,
-            "venue_name": widget.get("name"),
-            "venue_city": widget.get("city"),
-            "venue_capacity": capacity,
+            "venue_name": venue.name,
+            "venue_city": venue.city,
+            "venue_capacity": venue.capacity,
             "venue_address": None,  # FotMob doesn't provide address
-            "venue_surface": surface,
+            "venue_surface": venue.surface,
             "error": None,
         }
 
@@ -1,26 +1,193 @@
 """
 Fetch weather forecast for match between two teams.
 
-Uses FotMob for venue city lookup, then Open-Meteo for weather data.
+Uses the stored FotMob venue (city and coordinates, :mod:`soccersmartbet.venues`),
+then Open-Meteo for weather data.
 Clean interface: Accepts both team names, finds venue city, gets weather.
 NO API KEY REQUIRED.
+
+:func:`fetch_forecasts` takes any number of ``(lat, lon, match_datetime)``
+points and fetches them in one Open-Meteo request (comma-separated
+coordinates).  :func:`prefetch_weather` uses it for a whole day's games up
+front; ``run_game_intelligence`` then reads each game's result with
+:func:`prefetched_weather` instead of making its own request.
 """
 
-from datetime import datetime
-from typing import Dict, Any
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Sequence
 
 import requests
 
+from soccersmartbet.utils.cassette import http_get
+from soccersmartbet.utils.timezone import now_isr
+from soccersmartbet.utils.tracing import mark_cache_hit, traced_tool
+from soccersmartbet.venues import get_venue
+
 from ..fotmob_client import get_fotmob_client
 
 TIMEOUT = 10
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+_HOURLY_FIELDS = "temperature_2m,precipitation,precipitation_probability,windspeed_10m"
+
+# Prefetched results live for one flow run; forecasts move after that.
+PREFETCH_TTL = timedelta(minutes=30)
+
+WeatherPoint = tuple[float, float, str]  # (latitude, longitude, match_datetime)
+GameKey = tuple[str, str, str]  # (home_team, away_team, match_datetime)
+
+_prefetched: Dict[GameKey, tuple[datetime, Dict[str, Any]]] = {}
+_prefetched_lock = threading.Lock()
+
+
+def _conditions(temperature: float, precipitation: float) -> str:
+    # Check snow first - before rain checks
+    if temperature < 0 and precipitation > 0:
+        return "Snow"
+    if precipitation >= 5.0:
+        return "Heavy Rain"
+    if precipitation >= 0.5:
+        return "Rain"
+    return "Clear"
+
+
+def _forecast_error(error: str) -> Dict[str, Any]:
+    return {
+        "temperature_celsius": None,
+        "precipitation_mm": None,
+        "precipitation_probability": None,
+        "wind_speed_kmh": None,
+        "conditions": None,
+        "error": error,
+    }
+
+
+def _hour_values(hourly: Dict[str, Any], start: datetime, match_hour: datetime) -> Dict[str, Any]:
+    """Pick the kickoff hour out of one location's hourly series.
+
+    The series is hourly from ``start`` 00:00, so the kickoff's index is
+    computed directly; the times list is only scanned if it disagrees.
+    """
+    times = hourly.get("time", [])
+    wanted = match_hour.strftime("%Y-%m-%dT%H:00")
+    hour_index = int((match_hour - start) // timedelta(hours=1))
+    if not (0 <= hour_index < len(times) and times[hour_index] == wanted):
+        try:
+            hour_index = times.index(wanted)
+        except ValueError:
+            return _forecast_error(f"Match time {wanted} not in forecast")
+
+    temperature = hourly.get("temperature_2m", [])[hour_index]
+    precipitation = hourly.get("precipitation", [])[hour_index]
+    precipitation_probs = hourly.get("precipitation_probability", [])
+    return {
+        "temperature_celsius": temperature,
+        "precipitation_mm": precipitation,
+        "precipitation_probability": (
+            precipitation_probs[hour_index] if hour_index < len(precipitation_probs) else 0
+        ),
+        "wind_speed_kmh": hourly.get("windspeed_10m", [])[hour_index],
+        "conditions": _conditions(temperature, precipitation),
+        "error": None,
+    }
+
+
+def fetch_forecasts(points: Sequence[WeatherPoint]) -> list[Dict[str, Any]]:
+    """Fetch the kickoff-hour forecast for every point in one Open-Meteo request.
+
+    Args:
+        points: ``(latitude, longitude, match_datetime)`` tuples; the datetime
+            is ISO format (e.g. ``"2025-12-15T15:00:00"``).
+
+    Returns:
+        One dict per point, in order, with ``temperature_celsius``,
+        ``precipitation_mm``, ``precipitation_probability``,
+        ``wind_speed_kmh``, ``conditions`` and ``error``.
+    """
+    results: list[Dict[str, Any] | None] = [None] * len(points)
+    hours: Dict[int, datetime] = {}
+    for i, (_lat, _lon, match_datetime) in enumerate(points):
+        try:
+            match_dt = datetime.fromisoformat(match_datetime.replace("Z", "+00:00"))
+        except ValueError:
+            results[i] = _forecast_error("Invalid datetime format")
+            continue
+        hours[i] = match_dt.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+    if not hours:
+        return results  # type: ignore[return-value]
+
+    # One location per distinct stadium; the date range covers every kickoff.
+    coords = list(dict.fromkeys((points[i][0], points[i][1]) for i in hours))
+    start = min(hours.values()).replace(hour=0)
+    end = max(hours.values())
+    params = {
+        "latitude": ",".join(str(lat) for lat, _lon in coords),
+        "longitude": ",".join(str(lon) for _lat, lon in coords),
+        "hourly": _HOURLY_FIELDS,
+        "start_date": start.strftime("%Y-%m-%d"),
+        "end_date": end.strftime("%Y-%m-%d"),
+    }
+    error: str | None = None
+    try:
+        response = http_get(OPEN_METEO_URL, params=params, timeout=TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        # A single location comes back as an object, several as a list.
+        locations = data if isinstance(data, list) else [data]
+        if len(locations) != len(coords):
+            raise ValueError(f"expected {len(coords)} locations, got {len(locations)}")
+    except requests.Timeout:
+        locations, error = None, "Weather API timeout"
+    except Exception as e:
+        locations, error = None, f"Weather API error: {str(e)}"
+
+    location_of = {coord: n for n, coord in enumerate(coords)}
+    for i, match_hour in hours.items():
+        if locations is None:
+            results[i] = _forecast_error(error)
+            continue
+        location = locations[location_of[(points[i][0], points[i][1])]]
+        try:
+            results[i] = _hour_values(location.get("hourly", {}), start, match_hour)
+        except (IndexError, TypeError) as e:
+            results[i] = _forecast_error(f"Weather API error: {str(e)}")
+    return results  # type: ignore[return-value]
 
 
+def _locate(home_team_name: str) -> tuple[str | None, tuple[float, float] | None, str | None]:
+    """Return ``(venue_city, (lat, lon), error)`` for the home team's stadium."""
+    try:
+        client = get_fotmob_client()
+
+        team_info = client.find_team(home_team_name)
+
+        if not team_info:
+            return None, None, f"Team '{home_team_name}' not found in any major league"
+
+        venue = get_venue(team_info["id"], client)
+
+        if venue is None:
+            return None, None, f"Could not fetch team data for '{home_team_name}'"
+
+        if not venue.city:
+            return None, None, f"Venue city not found for team '{home_team_name}'"
+
+        # Stadium lat/lon (from the venue widget's location field)
+        if venue.coordinates is None:
+            return venue.city, None, f"Venue coordinates not available for '{home_team_name}'"
+
+        return venue.city, venue.coordinates, None
+
+    except Exception as e:
+        return None, None, f"Error fetching venue: {str(e)}"
+
+
+@traced_tool
 def fetch_weather(home_team_name: str, away_team_name: str, match_datetime: str) -> Dict[str, Any]:
     """
     Fetch weather forecast for match between two teams.
 
-    Automatically looks up home team's venue city via FotMob and gets weather from Open-Meteo.
+    Looks up the home team's stored venue (fetched from FotMob once) and gets weather from Open-Meteo.
 
     Args:
         home_team_name: Home team name (e.g., "Manchester City")
@@ -41,181 +208,83 @@ def fetch_weather(home_team_name: str, away_team_name: str, match_datetime: str)
             "error": None
         }
     """
-    # Step 1: Get venue city from FotMob
-    try:
-        client = get_fotmob_client()
+    venue_city, coordinates, error = _locate(home_team_name)
+    if coordinates is None:
+        return _error_response(home_team_name, away_team_name, venue_city, match_datetime, error)
 
-        team_info = client.find_team(home_team_name)
+    forecast = fetch_forecasts([(coordinates[0], coordinates[1], match_datetime)])[0]
+    return _response(home_team_name, away_team_name, venue_city, match_datetime, forecast)
 
-        if not team_info:
-            return _error_response(
-                home_team_name,
-                away_team_name,
-                None,
-                match_datetime,
-                f"Team '{home_team_name}' not found in any major league",
-            )
-
-        team_data = client.get_team_data(team_info["id"])
-
-        if not team_data:
-            return _error_response(
-                home_team_name,
-                away_team_name,
-                None,
-                match_datetime,
-                f"Could not fetch team data for '{home_team_name}'",
-            )
-
-        overview = team_data.get("overview", {})
-        venue = overview.get("venue", {})
-        widget = venue.get("widget", {})
-        venue_city = widget.get("city")
-
-        if not venue_city:
-            return _error_response(
-                home_team_name,
-                away_team_name,
-                None,
-                match_datetime,
-                f"Venue city not found for team '{home_team_name}'",
-            )
-
-        # Step 2: Extract lat/lon directly from venue widget location field
-        location = widget.get("location", [])
-        if len(location) >= 2:
-            latitude = float(location[0])
-            longitude = float(location[1])
-        else:
-            return _error_response(
-                home_team_name,
-                away_team_name,
-                venue_city,
-                match_datetime,
-                f"Venue coordinates not available for '{home_team_name}'",
-            )
 
-    except Exception as e:
-        return _error_response(
-            home_team_name,
-            away_team_name,
-            None,
-            match_datetime,
-            f"Error fetching venue: {str(e)}",
-        )
-
-    # Step 3: Parse match datetime
-    try:
-        match_dt = datetime.fromisoformat(match_datetime.replace("Z", "+00:00"))
-    except ValueError:
-        return _error_response(
-            home_team_name,
-            away_team_name,
-            venue_city,
-            match_datetime,
-            "Invalid datetime format",
-        )
-
-    match_date = match_dt.strftime("%Y-%m-%d")
-    match_hour = match_dt.strftime("%Y-%m-%dT%H:00")
-
-    # Step 4: Get weather from Open-Meteo
-    try:
-        weather_url = "https://api.open-meteo.com/v1/forecast"
-        weather_params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "hourly": "temperature_2m,precipitation,precipitation_probability,windspeed_10m",
-            "start_date": match_date,
-            "end_date": match_date,
-        }
+def prefetch_weather(games: Iterable[GameKey]) -> Dict[GameKey, Dict[str, Any]]:
+    """Fetch every game's forecast with a single Open-Meteo request.
 
-        weather_response = requests.get(weather_url, params=weather_params, timeout=TIMEOUT)
-        weather_response.raise_for_status()
+    Successful results are kept for ``PREFETCH_TTL`` and served by
+    :func:`prefetched_weather`; a game that failed here is left for its own
+    :func:`fetch_weather` call.
 
-        data = weather_response.json()
-        hourly = data.get("hourly", {})
-        times = hourly.get("time", [])
-        temperatures = hourly.get("temperature_2m", [])
-        precipitation_values = hourly.get("precipitation", [])
-        precipitation_probs = hourly.get("precipitation_probability", [])
-        wind_speeds = hourly.get("windspeed_10m", [])
+    Args:
+        games: ``(home_team, away_team, match_datetime)`` tuples.
 
-        # Find index for match hour
-        try:
-            hour_index = times.index(match_hour)
-        except ValueError:
-            return _error_response(
-                home_team_name,
-                away_team_name,
-                venue_city,
-                match_datetime,
-                f"Match time {match_hour} not in forecast",
-            )
-
-        temperature = temperatures[hour_index]
-        precipitation = precipitation_values[hour_index]
-        precip_prob = precipitation_probs[hour_index] if hour_index < len(precipitation_probs) else 0
-        wind_speed = wind_speeds[hour_index]
-
-        # Determine conditions (check snow first - before rain checks)
-        if temperature < 0 and precipitation > 0:
-            conditions = "Snow"
-        elif precipitation >= 5.0:
-            conditions = "Heavy Rain"
-        elif precipitation >= 0.5:
-            conditions = "Rain"
+    Returns:
+        ``{game: fetch_weather-shaped result}`` for every game.
+    """
+    games = list(dict.fromkeys(games))
+    results: Dict[GameKey, Dict[str, Any]] = {}
+    located: list[tuple[GameKey, str, tuple[float, float]]] = []
+    for game in games:
+        home, away, match_datetime = game
+        venue_city, coordinates, error = _locate(home)
+        if coordinates is None:
+            results[game] = _error_response(home, away, venue_city, match_datetime, error)
         else:
-            conditions = "Clear"
-
-        return {
-            "home_team": home_team_name,
-            "away_team": away_team_name,
-            "venue_city": venue_city,
-            "match_datetime": match_datetime,
-            "temperature_celsius": temperature,
-            "precipitation_mm": precipitation,
-            "precipitation_probability": precip_prob,
-            "wind_speed_kmh": wind_speed,
-            "conditions": conditions,
-            "error": None,
-        }
+            located.append((game, venue_city, coordinates))
 
-    except requests.Timeout:
-        return _error_response(
-            home_team_name,
-            away_team_name,
-            venue_city,
-            match_datetime,
-            "Weather API timeout",
-        )
-    except Exception as e:
-        return _error_response(
-            home_team_name,
-            away_team_name,
-            venue_city,
-            match_datetime,
-            f"Weather API error: {str(e)}",
-        )
+    forecasts = fetch_forecasts([(lat, lon, game[2]) for game, _city, (lat, lon) in located])
+    now = now_isr()
+    with _prefetched_lock:
+        for (game, venue_city, _coords), forecast in zip(located, forecasts):
+            result = _response(*game[:2], venue_city, game[2], forecast)
+            results[game] = result
+            if result["error"] is None:
+                _prefetched[game] = (now, result)
+    return results
 
 
-def _error_response(
+def prefetched_weather(
+    home_team_name: str, away_team_name: str, match_datetime: str
+) -> Dict[str, Any] | None:
+    """Return the result :func:`prefetch_weather` stored for this game, if still fresh."""
+    with _prefetched_lock:
+        entry = _prefetched.get((home_team_name, away_team_name, match_datetime))
+    if entry is None or now_isr() - entry[0] >= PREFETCH_TTL:
+        return None
+    mark_cache_hit("open_meteo.prefetched")
+    return entry[1]
+
+
+def _response(
     home_team: str,
     away_team: str,
     venue_city: str | None,
     match_datetime: str,
-    error: str,
+    forecast: Dict[str, Any],
 ) -> Dict[str, Any]:
-    """Return error response with all fields."""
     return {
         "home_team": home_team,
         "away_team": away_team,
         "venue_city": venue_city,
         "match_datetime": match_datetime,
-        "temperature_celsius": None,
-        "precipitation_mm": None,
-        "precipitation_probability": None,
-        "wind_speed_kmh": None,
-        "conditions": None,
-        "error": error,
+        **forecast,
     }
+
+
+def _error_response(
+    home_team: str,
+    away_team: str,
+    venue_city: str | None,
+    match_datetime: str,
+    error: str,
+) -> Dict[str, Any]:
+    """Return error response with all fields."""
+    return _response(home_team, away_team, venue_city, match_datetime, _forecast_error(error))
@@ -4,22 +4,36 @@ Fetch betting odds from winner.co.il Israeli Toto mobile API.
 Uses a GET request to /api/v2/publicapi/GetCMobileLine which returns a flat
 list of all available markets. Requires session cookies obtained by visiting
 the main site first.
+
+The line is downloaded and parsed once per ``SNAPSHOT_TTL`` into a
+:class:`WinnerLine`, indexed by canonical team pair, Hebrew team pair and
+league.  The game picker, the tool tester and any per-game refresh share
+that snapshot, so repeated odds lookups are dict hits with no extra calls.
 """
 
 import json
+import re
+import threading
 import uuid
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 import requests
 
 from soccersmartbet.team_registry import resolve_team, get_source_name_he
-from soccersmartbet.utils.timezone import isr_datetime
+from soccersmartbet.utils.cassette import http_get
+from soccersmartbet.utils.timezone import isr_datetime, now_isr
+from soccersmartbet.utils.tracing import mark_cache_hit, traced_tool
 
 # API Configuration
 _BASE_URL = "https://www.winner.co.il"
 _API_URL = f"{_BASE_URL}/api/v2/publicapi/GetCMobileLine"
 TIMEOUT = 30
 
+# How long a downloaded line is reused — long enough to cover one flow run.
+SNAPSHOT_TTL = timedelta(minutes=10)
+
 # Stable device ID for the session lifetime
 _DEVICE_ID = str(uuid.uuid4())
 
@@ -72,10 +86,11 @@ def _get_session() -> requests.Session:
         _session = requests.Session()
         # Visit the main page to acquire any required session cookies
         try:
-            _session.get(
+            http_get(
                 _BASE_URL,
                 headers={"User-Agent": _REQUEST_HEADERS["User-Agent"]},
                 timeout=TIMEOUT,
+                session=_session,
             )
         except Exception:
             pass  # Proceed even if the homepage request fails
@@ -179,9 +194,65 @@ def _extract_1x2_odds(
     return {"home": odds_home, "draw": odds_draw, "away": odds_away}
 
 
-def _parse_soccer_markets(data: Dict[str, Any]) -> list[Dict[str, Any]]:
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def iter_markets(body: bytes | str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries of the top-level ``markets`` array one at a time.
+
+    The line covers every sport and market type, so instead of ``json.loads``
+    building the whole document this walks the top-level object by hand and
+    decodes one market per step (``raw_decode``, the C scanner); the caller
+    keeps what it needs and the rest is freed immediately.  Other top-level
+    values are decoded and dropped.
+
+    Raises:
+        ValueError: If *body* is not a JSON object (``json.JSONDecodeError``).
     """
-    Parse the flat ``markets`` list from the GetCMobileLine response.
+    text = body.decode("utf-8-sig") if isinstance(body, bytes) else body
+
+    def _skip(pos: int) -> int:
+        return _WHITESPACE.match(text, pos).end()
+
+    def _expect(pos: int, chars: str) -> int:
+        pos = _skip(pos)
+        if pos >= len(text) or text[pos] not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", text, pos)
+        return pos
+
+    pos = _expect(0, "{") + 1
+    if text.startswith("}", _skip(pos)):
+        return
+    while True:
+        key, pos = _DECODER.raw_decode(text, _expect(pos, '"'))
+        pos = _expect(pos, ":") + 1
+        pos = _skip(pos)
+        if key == "markets" and text.startswith("[", pos):
+            pos = _skip(pos + 1)
+            if text.startswith("]", pos):
+                pos += 1
+            else:
+                while True:
+                    market, pos = _DECODER.raw_decode(text, pos)
+                    if isinstance(market, dict):
+                        yield market
+                    pos = _expect(pos, ",]")
+                    pos += 1
+                    if text[pos - 1] == "]":
+                        break
+                    pos = _skip(pos)
+        else:
+            _, pos = _DECODER.raw_decode(text, pos)
+        pos = _expect(pos, ",}") + 1
+        if text[pos - 1] == "}":
+            return
+
+
+def _parse_soccer_markets(markets: Iterable[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    """
+    Parse markets from the GetCMobileLine response (see :func:`iter_markets`).
 
     Filters to 1X2 full-time result markets ("1X2" and "תוצאת סיום" both
     present in the ``mp`` field) and returns a list of enriched event dicts.
@@ -191,7 +262,6 @@ def _parse_soccer_markets(data: Dict[str, Any]) -> list[Dict[str, Any]]:
         odds_home, odds_draw, odds_away, commence_time
     """
     events: list[Dict[str, Any]] = []
-    markets: list[Dict[str, Any]] = data.get("markets") or []
 
     for market in markets:
         mp: str = market.get("mp") or ""
@@ -246,42 +316,6 @@ def _he_name_for_english(english_name: str) -> Optional[str]:
     return None
 
 
-def _events_match(
-    event: Dict[str, Any],
-    home_team_name: str,
-    away_team_name: str,
-) -> bool:
-    """
-    Return True if an event matches the requested home/away team names.
-
-    Matching strategy (in priority order):
-    1. Direct Hebrew lookup via team_registry
-    2. Canonical name resolution on both sides via resolve_team
-    """
-    home_he = event["home_name_he"]
-    away_he = event["away_name_he"]
-
-    expected_home_he = _he_name_for_english(home_team_name)
-    expected_away_he = _he_name_for_english(away_team_name)
-
-    if expected_home_he and expected_away_he:
-        if home_he == expected_home_he and away_he == expected_away_he:
-            return True
-        # Hebrew spelling may differ between registry and source; fall through
-        # to canonical comparison before giving up.
-
-    # Fallback: resolve both sides to canonical and compare
-    home_canonical = resolve_team(home_he)
-    away_canonical = resolve_team(away_he)
-    req_home_canonical = resolve_team(home_team_name)
-    req_away_canonical = resolve_team(away_team_name)
-
-    if home_canonical and away_canonical and req_home_canonical and req_away_canonical:
-        return home_canonical == req_home_canonical and away_canonical == req_away_canonical
-
-    return False
-
-
 def _error_dict(
     home_team_name: str,
     away_team_name: str,
@@ -322,10 +356,11 @@ def _fetch_all_soccer_events() -> tuple[list[Dict[str, Any]], Optional[str]]:
     """
     session = _get_session()
     try:
-        response = session.get(
+        response = http_get(
             _API_URL,
             headers=_build_headers(),
             timeout=TIMEOUT,
+            session=session,
         )
     except requests.RequestException as exc:
         return [], f"Network error reaching winner.co.il: {exc}"
@@ -336,30 +371,157 @@ def _fetch_all_soccer_events() -> tuple[list[Dict[str, Any]], Optional[str]]:
             f"from GetCMobileLine"
         )
 
+    # Stream the markets out of the raw body rather than response.json(): the
+    # full line is mostly other sports and market types we drop anyway.
     try:
-        data = response.json()
+        events = _parse_soccer_markets(iter_markets(response.content))
     except ValueError as exc:
         return [], f"Invalid JSON from winner.co.il: {exc}"
-
-    try:
-        events = _parse_soccer_markets(data)
     except Exception as exc:
         return [], f"Error parsing winner.co.il response: {exc}"
 
     return events, None
 
 
+# ---------------------------------------------------------------------------
+# Line snapshot
+# ---------------------------------------------------------------------------
+
+TeamPair = tuple[str, str]
+
+
+@dataclass
+class WinnerLine:
+    """One parsed GetCMobileLine download with hash indexes over its events.
+
+    Each event is the :func:`_parse_soccer_markets` dict plus ``home_team`` /
+    ``away_team`` — the registry canonical name, or the Hebrew name when the
+    registry does not know the team.  ``resolve_team`` runs once per distinct
+    Hebrew name per snapshot, not once per lookup.
+    """
+
+    fetched_at: datetime
+    events: list[Dict[str, Any]]
+    by_pair: Dict[TeamPair, Dict[str, Any]] = field(default_factory=dict)
+    by_he_pair: Dict[TeamPair, Dict[str, Any]] = field(default_factory=dict)
+    by_league: Dict[str, list[Dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, events: list[Dict[str, Any]], fetched_at: datetime) -> "WinnerLine":
+        """Resolve team names and index *events* (first listing wins on duplicates)."""
+        canonical: Dict[str, Optional[str]] = {}
+
+        def _resolve(name_he: str) -> Optional[str]:
+            if name_he not in canonical:
+                canonical[name_he] = resolve_team(name_he)
+            return canonical[name_he]
+
+        line = cls(fetched_at=fetched_at, events=[])
+        for event in events:
+            home = _resolve(event["home_name_he"])
+            away = _resolve(event["away_name_he"])
+            event = {
+                **event,
+                "home_team": home or event["home_name_he"],
+                "away_team": away or event["away_name_he"],
+            }
+            line.events.append(event)
+            if home and away:
+                line.by_pair.setdefault((home, away), event)
+            line.by_he_pair.setdefault((event["home_name_he"], event["away_name_he"]), event)
+            line.by_league.setdefault(event["league_en"], []).append(event)
+        return line
+
+    def find(self, home_team_name: str, away_team_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the event for an English home/away pair, or None.
+
+        Matching strategy (in priority order):
+        1. Direct Hebrew lookup via team_registry
+        2. Canonical name resolution on both sides via resolve_team
+        """
+        expected_home_he = _he_name_for_english(home_team_name)
+        expected_away_he = _he_name_for_english(away_team_name)
+        if expected_home_he and expected_away_he:
+            event = self.by_he_pair.get((expected_home_he, expected_away_he))
+            if event is not None:
+                return event
+            # Hebrew spelling may differ between registry and source; fall
+            # through to canonical comparison before giving up.
+
+        req_home_canonical = resolve_team(home_team_name)
+        req_away_canonical = resolve_team(away_team_name)
+        if req_home_canonical and req_away_canonical:
+            return self.by_pair.get((req_home_canonical, req_away_canonical))
+        return None
+
+    def league_events(self, league: Optional[str] = None) -> list[Dict[str, Any]]:
+        """Return events whose English league contains *league* (case-insensitive), in line order."""
+        if not league:
+            return list(self.events)
+        league_filter = league.lower()
+        matching = [k for k in self.by_league if league_filter in k.lower()]
+        if len(matching) == 1:
+            return list(self.by_league[matching[0]])
+        return [e for e in self.events if e["league_en"] in matching]
+
+
+_line: Optional[WinnerLine] = None
+_line_lock = threading.Lock()
+
+
+def get_winner_line(max_age: timedelta = SNAPSHOT_TTL) -> tuple[Optional[WinnerLine], Optional[str]]:
+    """
+    Return the shared line snapshot, downloading it when older than *max_age*.
+
+    Concurrent callers wait for a single download.  Failed downloads are not
+    cached — the next call tries again.
+
+    Returns:
+        (line, error) — line is None exactly when error is set.
+    """
+    global _line
+    with _line_lock:
+        now = now_isr()
+        if _line is not None and now - _line.fetched_at < max_age:
+            mark_cache_hit("winner.line")
+            return _line, None
+        events, error = _fetch_all_soccer_events()
+        if error:
+            return None, error
+        _line = WinnerLine.build(events, now)
+        return _line, None
+
+
+def _odds_dict(event: Dict[str, Any], home_team: str, away_team: str) -> Dict[str, Any]:
+    return {
+        "home_team": home_team,
+        "away_team": away_team,
+        "match_id": None,
+        "commence_time": event["commence_time"],
+        "odds_home": event["odds_home"],
+        "odds_draw": event["odds_draw"],
+        "odds_away": event["odds_away"],
+        "bookmaker": "winner.co.il",
+        "league": event["league_en"],
+        "home_name_he": event["home_name_he"],
+        "away_name_he": event["away_name_he"],
+        "error": None,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
+@traced_tool
 def fetch_winner_odds(home_team_name: str, away_team_name: str) -> Dict[str, Any]:
     """
     Fetch 1X2 odds for a specific match from winner.co.il.
 
-    Calls GetCMobileLine, parses all 1X2 soccer markets, and returns odds for
-    the requested fixture.
+    Looks the fixture up in the shared line snapshot (see
+    :func:`get_winner_line`), downloading GetCMobileLine only when stale.
 
     Args:
         home_team_name: Home team name in English (e.g., "Barcelona").
@@ -377,26 +539,13 @@ def fetch_winner_odds(home_team_name: str, away_team_name: str) -> Dict[str, Any
             home_name_he (str | None), away_name_he (str | None),
             error (str | None)
     """
-    events, error = _fetch_all_soccer_events()
-    if error:
+    line, error = get_winner_line()
+    if line is None:
         return _error_dict(home_team_name, away_team_name, error)
 
-    for event in events:
-        if _events_match(event, home_team_name, away_team_name):
-            return {
-                "home_team": home_team_name,
-                "away_team": away_team_name,
-                "match_id": None,
-                "commence_time": event["commence_time"],
-                "odds_home": event["odds_home"],
-                "odds_draw": event["odds_draw"],
-                "odds_away": event["odds_away"],
-                "bookmaker": "winner.co.il",
-                "league": event["league_en"],
-                "home_name_he": event["home_name_he"],
-                "away_name_he": event["away_name_he"],
-                "error": None,
-            }
+    event = line.find(home_team_name, away_team_name)
+    if event is not None:
+        return _odds_dict(event, home_team_name, away_team_name)
 
     return _error_dict(
         home_team_name,
@@ -405,6 +554,7 @@ def fetch_winner_odds(home_team_name: str, away_team_name: str) -> Dict[str, Any
     )
 
 
+@traced_tool
 def fetch_all_winner_odds(league: Optional[str] = None) -> Dict[str, Any]:
     """
     Fetch all available 1X2 odds from winner.co.il, optionally filtered by league.
@@ -419,35 +569,12 @@ def fetch_all_winner_odds(league: Optional[str] = None) -> Dict[str, Any]:
             error: str | None — set on API failure so callers can distinguish
                    empty results from fetch errors
     """
-    events, error = _fetch_all_soccer_events()
-    if error:
+    line, error = get_winner_line()
+    if line is None:
         return {"events": [], "error": error}
 
-    results: list[Dict[str, Any]] = []
-    league_filter = league.lower() if league else None
-
-    for event in events:
-        if league_filter and league_filter not in event["league_en"].lower():
-            continue
-
-        home_en = resolve_team(event["home_name_he"]) or event["home_name_he"]
-        away_en = resolve_team(event["away_name_he"]) or event["away_name_he"]
-
-        results.append(
-            {
-                "home_team": home_en,
-                "away_team": away_en,
-                "match_id": None,
-                "commence_time": event["commence_time"],
-                "odds_home": event["odds_home"],
-                "odds_draw": event["odds_draw"],
-                "odds_away": event["odds_away"],
-                "bookmaker": "winner.co.il",
-                "league": event["league_en"],
-                "home_name_he": event["home_name_he"],
-                "away_name_he": event["away_name_he"],
-                "error": None,
-            }
-        )
-
+    results = [
+        _odds_dict(event, event["home_team"], event["away_team"])
+        for event in line.league_events(league)
+    ]
     return {"events": results, "error": None}
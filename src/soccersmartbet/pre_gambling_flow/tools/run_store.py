@@ -0,0 +1,79 @@
+"""Run-scoped store for remote payloads shared by the analysis fan-out.
+
+Every ``analyze_game`` branch runs its tools independently, so without a
+shared store the same FotMob team payload is downloaded by fetch_form,
+fetch_injuries, fetch_league_position and calculate_recovery_time — for each
+game the team plays in — and team news once per branch.  While a run is
+active (:func:`start_run` … :func:`end_run`), :func:`cached` keeps one copy
+of each payload for the rest of the run, and concurrent callers for the same
+key wait for a single download.  The ``prefetch_game_data`` node fills the
+store up front; anything it missed is fetched on first use.
+
+Outside a run (the web app, scripts, tests) :func:`cached` just calls the
+fetcher.  Failed fetches (``None``) are not stored, so a later caller retries.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+from soccersmartbet.utils.tracing import mark_cache_hit
+
+
+@dataclass
+class RunStore:
+    """Payloads fetched during one flow run, keyed by ``(kind, id)``."""
+
+    values: dict[Hashable, Any] = field(default_factory=dict)
+    fetches: int = 0
+    hits: int = 0
+    _locks: dict[Hashable, threading.Lock] = field(default_factory=dict, repr=False)
+    _guard: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self, key: tuple[str, Hashable], fetch: Callable[[], Any]) -> Any:
+        """Return the stored value for *key*, fetching it on first use."""
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key in self.values:
+                with self._guard:
+                    self.hits += 1
+                mark_cache_hit(f"run_store.{key[0]}")
+                return self.values[key]
+            value = fetch()
+            with self._guard:
+                self.fetches += 1
+                if value is not None:
+                    self.values[key] = value
+            return value
+
+
+_active: Optional[RunStore] = None
+
+
+def start_run() -> RunStore:
+    """Open a fresh store for the current run (replacing any previous one)."""
+    global _active
+    _active = RunStore()
+    return _active
+
+
+def end_run() -> None:
+    """Drop the current run's store."""
+    global _active
+    _active = None
+
+
+def active() -> Optional[RunStore]:
+    """Return the current run's store, or None outside a run."""
+    return _active
+
+
+def cached(key: tuple[str, Hashable], fetch: Callable[[], Any]) -> Any:
+    """Return ``fetch()`` through the active run's store, if there is one."""
+    store = _active
+    if store is None:
+        return fetch()
+    return store.get(key, fetch)
@@ -8,9 +8,12 @@ NO API KEY REQUIRED - uses unofficial FotMob API.
 from datetime import datetime
 from typing import Dict, Any
 
+from soccersmartbet.utils.tracing import traced_tool
+
 from ..fotmob_client import get_fotmob_client
 
 
+@traced_tool
 def calculate_recovery_time(team_name: str, upcoming_match_date: str) -> Dict[str, Any]:
     """
     Calculate days between team's last match and upcoming match.
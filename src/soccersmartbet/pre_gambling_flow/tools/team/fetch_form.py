@@ -2,9 +2,13 @@
 
 from typing import Dict, Any
 from datetime import datetime
+
+from soccersmartbet.utils.tracing import traced_tool
+
 from ..fotmob_client import get_fotmob_client
 
 
+@traced_tool
 def fetch_form(team_name: str, limit: int = 5) -> Dict[str, Any]:
     """Fetch team's recent match results with scores."""
     try:
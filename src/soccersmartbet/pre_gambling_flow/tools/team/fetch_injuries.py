@@ -2,6 +2,8 @@
 
 from typing import Any, Dict, List
 
+from soccersmartbet.utils.tracing import traced_tool
+
 from ..fotmob_client import get_fotmob_client
 
 # Mapping from FotMob injury id to human-readable type.
@@ -20,6 +22,7 @@ _INJURY_TYPE_MAP: Dict[str, str] = {
 _PLAYER_GROUPS = {"keepers", "defenders", "midfielders", "attackers"}
 
 
+@traced_tool
 def fetch_injuries(team_name: str) -> Dict[str, Any]:
     """Fetch team's current injury list from squad data.
 
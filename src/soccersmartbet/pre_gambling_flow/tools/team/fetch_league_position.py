@@ -8,9 +8,12 @@ Returns ALL teams in standings (not just top 5 like TheSportsDB free tier).
 
 from typing import Dict, Any
 
+from soccersmartbet.utils.tracing import traced_tool
+
 from ..fotmob_client import get_fotmob_client
 
 
+@traced_tool
 def fetch_league_position(team_name: str) -> Dict[str, Any]:
     """
     Fetch team's current league position.
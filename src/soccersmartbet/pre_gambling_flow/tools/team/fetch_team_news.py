@@ -2,9 +2,12 @@
 
 from typing import Any, Dict, List
 
+from soccersmartbet.utils.tracing import traced_tool
+
 from ..fotmob_client import get_fotmob_client
 
 
+@traced_tool
 def fetch_team_news(team_name: str, limit: int = 10) -> Dict[str, Any]:
     """Fetch latest news articles for a team.
 
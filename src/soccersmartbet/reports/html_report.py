@@ -1,96 +1,62 @@
 from __future__ import annotations
 
-import base64
 import logging
 from pathlib import Path
 from typing import Any
 
-import requests
+from soccersmartbet.db import get_conn
+from soccersmartbet.reports.logo_store import FOTMOB_LEAGUE_ID, LogoKey, get_logo_store
 
 logger = logging.getLogger(__name__)
 
-# Logos are embedded as base64 data URIs so they render from file:// pages
-# (downloaded HTML attachments in Telegram's in-app browser block external
-# https:// image requests from file:// origin). Cache is process-lifetime;
-# entries are either a data URI string or None on failed fetch.
-_LOGO_CACHE: dict[str, str | None] = {}
-_LOGO_FETCH_TIMEOUT_S = 5
-
-
-def _fetch_logo_data_uri(url: str) -> str | None:
-    if url in _LOGO_CACHE:
-        return _LOGO_CACHE[url]
-    try:
-        resp = requests.get(url, timeout=_LOGO_FETCH_TIMEOUT_S)
-        if resp.status_code != 200:
-            logger.info("logo fetch failed: %s -> %d", url, resp.status_code)
-            _LOGO_CACHE[url] = None
-            return None
-        content_type = resp.headers.get("content-type", "image/png").split(";")[0].strip()
-        encoded = base64.b64encode(resp.content).decode("ascii")
-        data_uri = f"data:{content_type};base64,{encoded}"
-        _LOGO_CACHE[url] = data_uri
-        return data_uri
-    except requests.RequestException as e:
-        logger.info("logo fetch error for %s: %s", url, e)
-        _LOGO_CACHE[url] = None
-        return None
-
-from soccersmartbet.db import get_conn
-
 _EL_LEAGUES = {"Europa League", "UEFA Europa League", "UEFA Europa Conference League", "Conference League"}
 
-# FotMob league IDs — verified 200 via curl before embedding
-# Verified: 47 (PL), 87 (La Liga), 55 (Serie A), 54 (Bundesliga), 53 (Ligue 1), 42 (UCL), 73 (EL), 264 (Israeli)
-FOTMOB_LEAGUE_ID: dict[str, int] = {
-    "Premier League": 47,
-    "La Liga": 87,
-    "Serie A": 55,
-    "Bundesliga": 54,
-    "Ligue 1": 53,
-    "Champions League": 42,
-    "UEFA Champions League": 42,
-    "Europa League": 73,
-    "UEFA Europa League": 73,
-    "Conference League": 10216,
-    "UEFA Conference League": 10216,
-    "UEFA Europa Conference League": 10216,
-    "Israeli Premier League": 264,
-    "\u05dc\u05d9\u05d2\u05ea Winner": 264,
-}
-
-_FETCH_GAME_SQL = """
+# One round-trip for any number of games: the game row plus its game report,
+# team reports and expert report, each folded into a JSONB column.
+_FETCH_REPORTS_SQL = """
 SELECT g.game_id, g.match_date, g.kickoff_time, g.home_team, g.away_team, g.league, g.venue,
        g.home_win_odd, g.away_win_odd, g.draw_odd,
        th.fotmob_id AS home_fotmob_id,
-       ta.fotmob_id AS away_fotmob_id
+       ta.fotmob_id AS away_fotmob_id,
+       gr.report    AS game_report,
+       tr.reports   AS team_reports,
+       er.expert_analysis
 FROM games g
-LEFT JOIN teams th ON th.canonical_name = g.home_team
-                   OR th.aliases @> to_jsonb(g.home_team)
-LEFT JOIN teams ta ON ta.canonical_name = g.away_team
-                   OR ta.aliases @> to_jsonb(g.away_team)
-WHERE g.game_id = %(game_id)s
-"""
-
-_FETCH_GAME_REPORT_SQL = """
-SELECT h2h_home_team, h2h_away_team, h2h_home_team_wins, h2h_away_team_wins,
-       h2h_draws, h2h_total_meetings, h2h_bullets,
-       weather_bullets, weather_cancellation_risk, venue
-FROM game_reports WHERE game_id = %(game_id)s
-LIMIT 1
-"""
-
-_FETCH_TEAM_REPORTS_SQL = """
-SELECT team_name, recovery_days, form_streak, last_5_games, form_bullets,
-       league_rank, league_points, league_matches_played, league_bullets,
-       injury_bullets, news_bullets
-FROM team_reports WHERE game_id = %(game_id)s ORDER BY team_name
-"""
-
-_FETCH_EXPERT_SQL = """
-SELECT expert_analysis
-FROM expert_game_reports WHERE game_id = %(game_id)s
-LIMIT 1
+LEFT JOIN LATERAL (
+    SELECT fotmob_id FROM teams
+    WHERE canonical_name = g.home_team OR aliases @> to_jsonb(g.home_team)
+    LIMIT 1
+) th ON TRUE
+LEFT JOIN LATERAL (
+    SELECT fotmob_id FROM teams
+    WHERE canonical_name = g.away_team OR aliases @> to_jsonb(g.away_team)
+    LIMIT 1
+) ta ON TRUE
+LEFT JOIN LATERAL (
+    SELECT to_jsonb(r) AS report
+    FROM (
+        SELECT h2h_home_team, h2h_away_team, h2h_home_team_wins, h2h_away_team_wins,
+               h2h_draws, h2h_total_meetings, h2h_bullets,
+               weather_bullets, weather_cancellation_risk, venue
+        FROM game_reports WHERE game_id = g.game_id
+        LIMIT 1
+    ) r
+) gr ON TRUE
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(to_jsonb(t) ORDER BY t.team_name) AS reports
+    FROM (
+        SELECT team_name, recovery_days, form_streak, last_5_games, form_bullets,
+               league_rank, league_points, league_matches_played, league_bullets,
+               injury_bullets, news_bullets
+        FROM team_reports WHERE game_id = g.game_id
+    ) t
+) tr ON TRUE
+LEFT JOIN LATERAL (
+    SELECT expert_analysis
+    FROM expert_game_reports WHERE game_id = g.game_id
+    LIMIT 1
+) er ON TRUE
+WHERE g.game_id = ANY(%(game_ids)s)
 """
 
 # ---------------------------------------------------------------------------
@@ -641,68 +607,95 @@ def _cmp_header_row(home_team: str, away_team: str) -> str:
     )
 
 
-def generate_game_report_html(game_id: int) -> str:
-    """Query DB and return a complete self-contained HTML string for one game."""
+def _team_report(raw: dict[str, Any]) -> dict[str, Any]:
+    report = dict(raw)
+    for key in ("last_5_games", "form_bullets", "league_bullets", "injury_bullets", "news_bullets"):
+        report[key] = report.get(key) or []
+    return report
+
+
+def _fetch_report_rows(game_ids: list[int]) -> dict[int, dict[str, Any]]:
+    """Load everything the reports need for *game_ids* in one query."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute(_FETCH_GAME_SQL, {"game_id": game_id})
-            game_row = cur.fetchone()
-            if game_row is None:
-                return f"<html><body><p>Game {game_id} not found.</p></body></html>"
-
-            (
-                _gid, match_date, kickoff_time, home_team, away_team, league,
-                venue_from_games, home_win_odd, away_win_odd, draw_odd,
-                home_fotmob_id, away_fotmob_id,
-            ) = game_row
-
-            h2h_home = h2h_away = None
-            h2h_hw = h2h_aw = h2h_d = h2h_total = None
-            h2h_bullets: list[str] = []
-            weather_bullets: list[str] = []
-            cancel_risk: str | None = None
-            venue_from_report: str | None = None
-
-            cur.execute(_FETCH_GAME_REPORT_SQL, {"game_id": game_id})
-            report_row = cur.fetchone()
-            if report_row is not None:
-                (
-                    h2h_home, h2h_away, h2h_hw, h2h_aw, h2h_d, h2h_total,
-                    h2h_bullets_raw, weather_bullets_raw, cancel_risk, venue_from_report,
-                ) = report_row
-                h2h_bullets = h2h_bullets_raw or []
-                weather_bullets = weather_bullets_raw or []
-
-            venue_display = venue_from_report or venue_from_games
-
-            cur.execute(_FETCH_TEAM_REPORTS_SQL, {"game_id": game_id})
-            team_rows = cur.fetchall()
-            team_map: dict[str, dict[str, Any]] = {}
-            for row in team_rows:
-                (
-                    t_name, recovery_days, form_streak, last5_raw, form_bullets_raw,
-                    league_rank, league_points, league_mp, league_bullets_raw,
-                    injury_bullets_raw, news_bullets_raw,
-                ) = row
-                team_map[t_name] = {
-                    "recovery_days": recovery_days,
-                    "form_streak": form_streak,
-                    "last_5_games": last5_raw or [],
-                    "form_bullets": form_bullets_raw or [],
-                    "league_rank": league_rank,
-                    "league_points": league_points,
-                    "league_matches_played": league_mp,
-                    "league_bullets": league_bullets_raw or [],
-                    "injury_bullets": injury_bullets_raw or [],
-                    "news_bullets": news_bullets_raw or [],
-                }
-
-            cur.execute(_FETCH_EXPERT_SQL, {"game_id": game_id})
-            expert_row = cur.fetchone()
-            expert_bullets: list[str] = expert_row[0] if expert_row else []
-            if not isinstance(expert_bullets, list):
-                expert_bullets = [str(expert_bullets)] if expert_bullets else []
+            cur.execute(_FETCH_REPORTS_SQL, {"game_ids": list(game_ids)})
+            columns = [d.name for d in cur.description]
+            rows = cur.fetchall()
         # read-only: no commit needed
+    return {row[0]: dict(zip(columns, row)) for row in rows}
+
+
+def _logo_keys(row: dict[str, Any]) -> dict[str, LogoKey | None]:
+    """Return the logo store key (or None) for the home team, away team and league."""
+    keys: dict[str, LogoKey | None] = {"home": None, "away": None, "league": None}
+    for side in ("home", "away"):
+        fotmob_id = row[f"{side}_fotmob_id"]
+        if fotmob_id is not None:
+            keys[side] = ("team", fotmob_id)
+    league_id = FOTMOB_LEAGUE_ID.get(row["league"]) if row["league"] else None
+    if league_id is not None:
+        keys["league"] = ("league", league_id)
+    return keys
+
+
+def _not_found_html(game_id: int) -> str:
+    return f"<html><body><p>Game {game_id} not found.</p></body></html>"
+
+
+def generate_reports_html(game_ids: list[int]) -> dict[int, str]:
+    """Return ``{game_id: html}`` for *game_ids*, batching all I/O.
+
+    One DB query loads every game and its reports, then all distinct logos
+    are resolved from the on-disk logo store — only logos it does not know
+    yet are downloaded, concurrently — before the pages are rendered.
+    """
+    rows = _fetch_report_rows(game_ids)
+    keys = {gid: _logo_keys(row) for gid, row in rows.items()}
+    logos = get_logo_store().prefetch(
+        k for per_game in keys.values() for k in per_game.values() if k
+    )
+
+    reports: dict[int, str] = {}
+    for gid in game_ids:
+        if gid not in rows:
+            reports[gid] = _not_found_html(gid)
+            continue
+        game_logos = {side: logos[k] if k else None for side, k in keys[gid].items()}
+        reports[gid] = _render_game_report(rows[gid], game_logos)
+    return reports
+
+
+def generate_game_report_html(game_id: int) -> str:
+    """Query DB and return a complete self-contained HTML string for one game."""
+    return generate_reports_html([game_id])[game_id]
+
+
+def _render_game_report(row: dict[str, Any], logos: dict[str, str | None]) -> str:
+    """Render one report from a ``_FETCH_REPORTS_SQL`` row and its logo data URIs."""
+    match_date = row["match_date"]
+    kickoff_time = row["kickoff_time"]
+    home_team = row["home_team"]
+    away_team = row["away_team"]
+    league = row["league"]
+
+    report = row["game_report"] or {}
+    h2h_home = report.get("h2h_home_team")
+    h2h_away = report.get("h2h_away_team")
+    h2h_hw = report.get("h2h_home_team_wins")
+    h2h_aw = report.get("h2h_away_team_wins")
+    h2h_d = report.get("h2h_draws")
+    h2h_total = report.get("h2h_total_meetings")
+    h2h_bullets: list[str] = report.get("h2h_bullets") or []
+    weather_bullets: list[str] = report.get("weather_bullets") or []
+    cancel_risk: str | None = report.get("weather_cancellation_risk")
+
+    venue_display = report.get("venue") or row["venue"]
+
+    team_map = {t["team_name"]: _team_report(t) for t in row["team_reports"] or []}
+
+    expert_bullets = row["expert_analysis"] or []
+    if not isinstance(expert_bullets, list):
+        expert_bullets = [str(expert_bullets)]
 
     home_report = team_map.get(home_team)
     away_report = team_map.get(away_team)
@@ -710,38 +703,19 @@ def generate_game_report_html(game_id: int) -> str:
     date_str = str(match_date) if match_date else "\u2014"
     time_str = kickoff_time.strftime("%H:%M") if kickoff_time else "\u2014"
 
+    home_win_odd, draw_odd, away_win_odd = row["home_win_odd"], row["draw_odd"], row["away_win_odd"]
     h_odd_disp = f"{float(home_win_odd):.2f}" if home_win_odd is not None else "\u2014"
     d_odd_disp = f"{float(draw_odd):.2f}" if draw_odd is not None else "\u2014"
     a_odd_disp = f"{float(away_win_odd):.2f}" if away_win_odd is not None else "\u2014"
 
-    # --- logo HTML helpers ---
-    _fotmob_team_base = "https://images.fotmob.com/image_resources/logo/teamlogo"
-    _fotmob_league_base = "https://images.fotmob.com/image_resources/logo/leaguelogo"
-
-    def _team_logo_img(fotmob_id: int | None) -> str:
-        if fotmob_id is None:
-            return ""
-        url = f"{_fotmob_team_base}/{fotmob_id}.png"
-        data_uri = _fetch_logo_data_uri(url)
-        if data_uri is None:
-            return ""
-        return f'<img class="team-logo" src="{data_uri}" alt="">'
-
-    def _league_logo_img(league_name: str | None) -> str:
-        if not league_name:
-            return ""
-        lid = FOTMOB_LEAGUE_ID.get(league_name)
-        if lid is None:
-            return ""
-        url = f"{_fotmob_league_base}/{lid}.png"
-        data_uri = _fetch_logo_data_uri(url)
+    def _logo_img(css_class: str, data_uri: str | None) -> str:
         if data_uri is None:
             return ""
-        return f'<img class="league-logo" src="{data_uri}" alt="">'
+        return f'<img class="{css_class}" src="{data_uri}" alt="">'
 
-    home_logo_html = _team_logo_img(home_fotmob_id)
-    away_logo_html = _team_logo_img(away_fotmob_id)
-    league_logo_html = _league_logo_img(league)
+    home_logo_html = _logo_img("team-logo", logos.get("home"))
+    away_logo_html = _logo_img("team-logo", logos.get("away"))
+    league_logo_html = _logo_img("league-logo", logos.get("league"))
 
     cmp_header = _cmp_header_row(home_team, away_team)
     cmp_rows = "".join([
@@ -847,8 +821,7 @@ def generate_all_reports(game_ids: list[int], output_dir: str) -> dict[int, str]
     out_path.mkdir(parents=True, exist_ok=True)
 
     result: dict[int, str] = {}
-    for game_id in game_ids:
-        html = generate_game_report_html(game_id)
+    for game_id, html in generate_reports_html(game_ids).items():
         file_path = out_path / f"{game_id}.html"
         file_path.write_text(html, encoding="utf-8")
         result[game_id] = str(file_path)
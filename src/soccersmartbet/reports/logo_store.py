@@ -0,0 +1,339 @@
+"""Disk-backed FotMob logo store for the HTML reports.
+
+Reports embed team and league logos as base64 data URIs so they render from
+``file://`` pages (downloaded HTML attachments in Telegram's in-app browser
+block external ``https://`` image requests from a ``file://`` origin).
+Logos are keyed by ``(kind, fotmob_id)`` and kept under ``LOGO_CACHE_DIR``
+(default ``./logo_cache``)::
+
+    logo_cache/team/8456.png     raw bytes as served by images.fotmob.com
+    logo_cache/team/8456.json    {"content_type", "data_uri", "fetched_at", ...}
+
+The JSON sidecar carries the pre-encoded data URI, so a restart serves every
+known logo from disk without re-downloading or re-encoding it.  A failed
+fetch is recorded as ``{"failed_at", "attempts", "retry_after"}`` and is
+retried once ``retry_after`` has passed — transient errors back off
+exponentially, a 404 waits the maximum — instead of being cached forever.
+
+An in-memory layer sits in front of the disk.  Pre-seed the store for every
+team with a ``fotmob_id`` (plus every league in :data:`FOTMOB_LEAGUE_ID`)::
+
+    python -m soccersmartbet.reports.logo_store --seed [--refresh]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+import mimetypes
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Literal
+
+import requests
+
+from soccersmartbet.utils.cassette import CassetteMiss, http_get
+
+logger = logging.getLogger(__name__)
+
+LogoKind = Literal["team", "league"]
+LogoKey = tuple[LogoKind, int]
+
+_DEFAULT_DIR = "logo_cache"
+_FETCH_TIMEOUT_S = 5
+_FETCH_WORKERS = 8
+_RETRY_BASE_S = 15 * 60  # first retry after a transient failure
+_RETRY_MAX_S = 24 * 3600  # backoff cap; also the wait after a 404
+
+_LOGO_URLS: dict[str, str] = {
+    "team": "https://images.fotmob.com/image_resources/logo/teamlogo/{}.png",
+    "league": "https://images.fotmob.com/image_resources/logo/leaguelogo/{}.png",
+}
+
+# FotMob league IDs — verified 200 via curl before embedding
+# Verified: 47 (PL), 87 (La Liga), 55 (Serie A), 54 (Bundesliga), 53 (Ligue 1), 42 (UCL), 73 (EL), 264 (Israeli)
+FOTMOB_LEAGUE_ID: dict[str, int] = {
+    "Premier League": 47,
+    "La Liga": 87,
+    "Serie A": 55,
+    "Bundesliga": 54,
+    "Ligue 1": 53,
+    "Champions League": 42,
+    "UEFA Champions League": 42,
+    "Europa League": 73,
+    "UEFA Europa League": 73,
+    "Conference League": 10216,
+    "UEFA Conference League": 10216,
+    "UEFA Europa Conference League": 10216,
+    "Israeli Premier League": 264,
+    "\u05dc\u05d9\u05d2\u05ea Winner": 264,
+}
+
+
+def logo_cache_dir() -> Path:
+    """Return the root directory logos are stored under."""
+    return Path(os.getenv("LOGO_CACHE_DIR", _DEFAULT_DIR))
+
+
+def logo_url(key: LogoKey) -> str:
+    """Return the FotMob image URL for a ``(kind, fotmob_id)`` key."""
+    kind, fotmob_id = key
+    return _LOGO_URLS[kind].format(fotmob_id)
+
+
+@dataclass(frozen=True)
+class Logo:
+    """A fetched logo: its content type and pre-encoded data URI."""
+
+    content_type: str
+    data_uri: str
+
+
+@dataclass(frozen=True)
+class _Failure:
+    attempts: int
+    retry_after: float
+
+
+def retry_delay(attempts: int, status_code: int | None = None) -> float:
+    """Seconds to wait before retrying a logo that has failed *attempts* times.
+
+    A 404 means FotMob has no logo for the id, so it waits the maximum;
+    anything else doubles from ``_RETRY_BASE_S`` up to ``_RETRY_MAX_S``.
+    """
+    if status_code == 404:
+        return _RETRY_MAX_S
+    return min(_RETRY_BASE_S * 2 ** max(attempts - 1, 0), _RETRY_MAX_S)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Atomic replace: concurrent renders may store the same logo.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class LogoStore:
+    """Memory + disk cache of FotMob logos, filled from the network on a miss.
+
+    Args:
+        root: Directory to store logos under (default :func:`logo_cache_dir`).
+        clock: Epoch-seconds clock, injectable for tests.
+    """
+
+    def __init__(self, root: Path | None = None, clock: Callable[[], float] = time.time) -> None:
+        self.root = Path(root) if root is not None else logo_cache_dir()
+        self._clock = clock
+        self._memory: dict[LogoKey, Logo | _Failure] = {}
+
+    def _meta_path(self, key: LogoKey) -> Path:
+        kind, fotmob_id = key
+        return self.root / kind / f"{fotmob_id}.json"
+
+    # -- disk ---------------------------------------------------------------
+
+    def _load(self, key: LogoKey) -> Logo | _Failure | None:
+        path = self._meta_path(key)
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("logo_store: unreadable %s: %s", path, e)
+            return None
+        if "data_uri" in meta:
+            return Logo(meta["content_type"], meta["data_uri"])
+        return _Failure(int(meta.get("attempts", 1)), float(meta.get("retry_after", 0)))
+
+    def _save_logo(self, key: LogoKey, content_type: str, content: bytes) -> Logo:
+        encoded = base64.b64encode(content).decode("ascii")
+        logo = Logo(content_type, f"data:{content_type};base64,{encoded}")
+        self._memory[key] = logo
+        meta_path = self._meta_path(key)
+        image_path = meta_path.with_suffix(mimetypes.guess_extension(content_type) or ".bin")
+        meta = {
+            "url": logo_url(key),
+            "content_type": content_type,
+            "file": image_path.name,
+            "size": len(content),
+            "fetched_at": self._clock(),
+            "data_uri": logo.data_uri,
+        }
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(image_path, content)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.warning("logo_store: could not persist %s: %s", meta_path, e)
+        return logo
+
+    def _save_failure(self, key: LogoKey, status_code: int | None) -> None:
+        previous = self._cached(key)
+        if isinstance(previous, Logo):
+            return  # a failed refresh keeps the logo already stored
+        attempts = previous.attempts + 1 if isinstance(previous, _Failure) else 1
+        now = self._clock()
+        failure = _Failure(attempts, now + retry_delay(attempts, status_code))
+        self._memory[key] = failure
+        meta = {
+            "url": logo_url(key),
+            "status_code": status_code,
+            "failed_at": now,
+            "attempts": attempts,
+            "retry_after": failure.retry_after,
+        }
+        meta_path = self._meta_path(key)
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.warning("logo_store: could not persist %s: %s", meta_path, e)
+
+    # -- lookup -------------------------------------------------------------
+
+    def _cached(self, key: LogoKey) -> Logo | _Failure | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._memory[key] = entry
+        return entry
+
+    def _fetch(self, key: LogoKey) -> str | None:
+        url = logo_url(key)
+        try:
+            resp = http_get(url, timeout=_FETCH_TIMEOUT_S)
+        except CassetteMiss:
+            return None  # replay run without this logo recorded — not a real failure
+        except requests.RequestException as e:
+            logger.info("logo fetch error for %s: %s", url, e)
+            self._save_failure(key, None)
+            return None
+        if resp.status_code != 200:
+            logger.info("logo fetch failed: %s -> %d", url, resp.status_code)
+            self._save_failure(key, resp.status_code)
+            return None
+        content_type = resp.headers.get("content-type", "image/png").split(";")[0].strip()
+        return self._save_logo(key, content_type, resp.content).data_uri
+
+    def _needs_fetch(self, key: LogoKey, refresh: bool) -> bool:
+        if refresh:
+            return True
+        entry = self._cached(key)
+        if isinstance(entry, _Failure):
+            return self._clock() >= entry.retry_after
+        return entry is None
+
+    def get(self, key: LogoKey) -> str | None:
+        """Return the data URI for *key*, fetching it only when not known."""
+        return self.prefetch([key])[key]
+
+    def prefetch(self, keys: Iterable[LogoKey], refresh: bool = False) -> dict[LogoKey, str | None]:
+        """Resolve every distinct key, downloading the unknown ones concurrently.
+
+        Keys stored on disk are served without network access; failures still
+        inside their retry window resolve to None.  ``refresh`` re-downloads
+        every key regardless.
+
+        Returns:
+            ``{key: data_uri_or_None}`` for all *keys*.
+        """
+        wanted = list(dict.fromkeys(keys))
+        missing = [k for k in wanted if self._needs_fetch(k, refresh)]
+        if missing:
+            workers = min(_FETCH_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="logo") as pool:
+                list(pool.map(self._fetch, missing))
+        logos: dict[LogoKey, str | None] = {}
+        for key in wanted:
+            entry = self._memory.get(key)
+            logos[key] = entry.data_uri if isinstance(entry, Logo) else None
+        return logos
+
+    def stats(self) -> dict[str, int]:
+        """Count stored logos and recorded failures on disk."""
+        counts = {"logos": 0, "failures": 0}
+        for path in self.root.glob("*/*.json"):
+            try:
+                meta: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            counts["logos" if "data_uri" in meta else "failures"] += 1
+        return counts
+
+
+_STORE: LogoStore | None = None
+
+
+def get_logo_store() -> LogoStore:
+    """Return the process-wide store rooted at :func:`logo_cache_dir`."""
+    global _STORE
+    if _STORE is None or _STORE.root != logo_cache_dir():
+        _STORE = LogoStore()
+    return _STORE
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+
+def seed_keys(cur: Any) -> list[LogoKey]:
+    """Return a key for every team with a ``fotmob_id`` and every known league."""
+    cur.execute("SELECT DISTINCT fotmob_id FROM teams WHERE fotmob_id IS NOT NULL ORDER BY 1")
+    keys: list[LogoKey] = [("team", int(row[0])) for row in cur.fetchall()]
+    keys.extend(("league", league_id) for league_id in sorted(set(FOTMOB_LEAGUE_ID.values())))
+    return keys
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from soccersmartbet.db import close_pool, get_cursor
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="FotMob logo store")
+    parser.add_argument(
+        "--seed", action="store_true", help="download every team / league logo not yet stored"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="with --seed, re-download logos already stored"
+    )
+    args = parser.parse_args(argv)
+
+    store = get_logo_store()
+    if args.seed:
+        try:
+            with get_cursor(commit=False) as cur:
+                keys = seed_keys(cur)
+        finally:
+            close_pool()
+        logos = store.prefetch(keys, refresh=args.refresh)
+        fetched = sum(1 for uri in logos.values() if uri)
+        logger.info("logo_store: %d/%d logo(s) available", fetched, len(keys))
+    counts = store.stats()
+    logger.info(
+        "logo_store: %s — %d logo(s), %d failure(s) on disk",
+        store.root, counts["logos"], counts["failures"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,437 @@
+"""Precomputed team and league stats (the ``stats_rollups`` table).
+
+One row per ``(scope, scope_key, bettor)`` holds the settled-bet totals and
+the top-``NOTABLE_N`` bets by ``|pnl|`` for a team or a league:
+
+* ``team`` rows are keyed by ``normalize_team_name(stored name)`` — a bet
+  counts for both its home and away team.  The Team route sums the rows whose
+  key is one of the team's normalized variants, so accent / prefix
+  divergence in stored names ("Club Atlético de Madrid") still resolves.
+* ``league`` rows are keyed by ``games.league`` exactly; the League route
+  sums every key matching its prefix.
+
+Rollups are maintained incrementally: ``calculate_pnl`` calls
+:func:`fold_settled_bets` inside its settlement transaction.  Re-settling an
+already settled bet applies the P&L delta instead of counting it twice; if
+that demotes one of the notable bets, the rollup's top-N is recomputed from
+its settled bets, since the heap alone cannot know which bet it pushed out
+earlier.
+:func:`rebuild` recomputes everything from ``bets`` — run it once after
+migration 008 and after any manual backfill::
+
+    python -m soccersmartbet.stats_rollups --rebuild
+
+Rollups hold settled bets only: a bet enters them when the post-games flow
+settles it.  The read helpers add the few still-pending bets on top, so
+``total_bets`` / ``total_stake`` cover every bet while ``settled_bets``,
+``total_pnl`` and ``win_rate`` cover the settled ones.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from psycopg import Cursor
+from psycopg.types.json import Jsonb
+
+from soccersmartbet.team_registry import normalize_team_name
+
+logger = logging.getLogger(__name__)
+
+NOTABLE_N = 5
+
+RollupKey = tuple[str, str, str]  # (scope, scope_key, bettor)
+_HeapItem = tuple[float, int, dict[str, Any]]  # (|pnl|, bet_id, bet)
+
+# ---------------------------------------------------------------------------
+# Rollup arithmetic (pure, no DB I/O)
+# ---------------------------------------------------------------------------
+
+
+def _rank(item: _HeapItem) -> tuple[float, int]:
+    return item[0], item[1]
+
+
+@dataclass
+class Rollup:
+    """Settled-bet totals plus a bounded min-heap of the largest ``|pnl|`` bets.
+
+    ``pending_bets`` / ``pending_stake`` count unsettled bets at read time;
+    they are never stored.  ``notable_stale`` is set when a re-settlement
+    drops a notable bet below the heap minimum: a bet pushed out earlier may
+    now belong in the top-N, so :meth:`reset_notable` must be given every
+    settled bet of the rollup.
+    """
+
+    total_bets: int = 0
+    wins: int = 0
+    total_stake: float = 0.0
+    total_pnl: float = 0.0
+    pending_bets: int = 0
+    pending_stake: float = 0.0
+    notable_stale: bool = field(default=False, repr=False)
+    _heap: list[_HeapItem] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def from_notable(cls, notable: Iterable[dict[str, Any]], **totals: Any) -> Rollup:
+        rollup = cls(**totals)
+        rollup._heap = [(abs(b["pnl"]), b["bet_id"], b) for b in notable]
+        heapq.heapify(rollup._heap)
+        return rollup
+
+    @property
+    def notable(self) -> list[dict[str, Any]]:
+        """Top bets, largest ``|pnl|`` first."""
+        return [entry for *_, entry in sorted(self._heap, key=_rank, reverse=True)]
+
+    @property
+    def win_rate(self) -> float | None:
+        return self.wins / self.total_bets if self.total_bets else None
+
+    def add(self, bet: dict[str, Any], previous_pnl: float | None = None) -> None:
+        """Fold in a settled *bet*; *previous_pnl* marks a re-settlement."""
+        pnl = bet["pnl"]
+        item = (abs(pnl), bet["bet_id"], bet)
+        if previous_pnl is None:
+            self.total_bets += 1
+            self.total_stake += bet["stake"]
+        else:
+            self.total_pnl -= previous_pnl
+            self.wins -= previous_pnl > 0
+            kept = [h for h in self._heap if h[1] != bet["bet_id"]]
+            if (
+                len(kept) < len(self._heap)
+                and self.total_bets > len(self._heap)
+                and _rank(item) < _rank(self._heap[0])
+            ):
+                # Bets outside the heap rank below its old minimum, not below
+                # this bet's new |pnl|.
+                self.notable_stale = True
+            self._heap = kept
+            heapq.heapify(self._heap)
+        self.total_pnl += pnl
+        self.wins += pnl > 0
+
+        if len(self._heap) < NOTABLE_N:
+            heapq.heappush(self._heap, item)
+        elif _rank(item) > _rank(self._heap[0]):
+            heapq.heapreplace(self._heap, item)
+
+    def reset_notable(self, bets: Iterable[dict[str, Any]]) -> None:
+        """Recompute the top-N from every settled bet of this rollup."""
+        items = ((abs(b["pnl"]), b["bet_id"], b) for b in bets)
+        top = heapq.nlargest(NOTABLE_N, items, key=_rank)
+        self._heap = top[::-1]  # ascending order is a valid min-heap
+        self.notable_stale = False
+
+    def merge(self, other: Rollup) -> Rollup:
+        """Return the combined rollup of *self* and *other*."""
+        merged = Rollup(
+            total_bets=self.total_bets + other.total_bets,
+            wins=self.wins + other.wins,
+            total_stake=self.total_stake + other.total_stake,
+            total_pnl=self.total_pnl + other.total_pnl,
+            pending_bets=self.pending_bets + other.pending_bets,
+            pending_stake=self.pending_stake + other.pending_stake,
+        )
+        unique = {h[1]: h for h in self._heap + other._heap}
+        top = heapq.nlargest(NOTABLE_N, unique.values(), key=_rank)
+        merged._heap = top[::-1]  # ascending order is a valid min-heap
+        return merged
+
+    def totals(self) -> dict[str, Any]:
+        return {
+            "total_bets": self.total_bets + self.pending_bets,
+            "settled_bets": self.total_bets,
+            "total_stake": round(self.total_stake + self.pending_stake, 2),
+            "total_pnl": round(self.total_pnl, 2),
+            "win_rate": self.win_rate,
+        }
+
+
+def bet_entry(row: tuple) -> dict[str, Any]:  # type: ignore[type-arg]
+    """Shape a ``_SETTLED_BETS_SQL`` row as the JSON bet dict the routes return."""
+    return {
+        "bet_id": row[0],
+        "bettor": row[1],
+        "prediction": row[2],
+        "stake": float(row[3]),
+        "odds": float(row[4]),
+        "result": row[5],
+        "pnl": float(row[6]),
+        "game_id": row[7],
+        "home_team": row[8],
+        "away_team": row[9],
+        "match_date": row[10].isoformat(),
+        "kickoff_time": row[11].strftime("%H:%M"),
+        "league": row[12],
+        "outcome": row[13],
+        "home_score": row[14],
+        "away_score": row[15],
+    }
+
+
+def rollup_keys(bet: dict[str, Any]) -> set[RollupKey]:
+    """Return every rollup a settled *bet* belongs to."""
+    bettor = bet["bettor"]
+    keys = {("league", bet["league"], bettor)}
+    for team in (bet["home_team"], bet["away_team"]):
+        keys.add(("team", normalize_team_name(team), bettor))
+    return keys
+
+
+def build_rollups(bets: Iterable[dict[str, Any]]) -> dict[RollupKey, Rollup]:
+    """Compute rollups from scratch for *bets* (all settled)."""
+    rollups: dict[RollupKey, Rollup] = defaultdict(Rollup)
+    for bet in bets:
+        for key in rollup_keys(bet):
+            rollups[key].add(bet)
+    return dict(rollups)
+
+
+def stats_payload(rollups: Iterable[tuple[str, Rollup]]) -> dict[str, Any]:
+    """Combine ``(bettor, rollup)`` pairs into the Team / League stats response body.
+
+    Returns:
+        ``{total_bets, settled_bets, total_stake, total_pnl, win_rate,
+        notable_games, by_bettor}`` — zeroed when *rollups* is empty.
+    """
+    by_bettor: dict[str, Rollup] = {}
+    for bettor, rollup in rollups:
+        by_bettor[bettor] = by_bettor[bettor].merge(rollup) if bettor in by_bettor else rollup
+    combined = Rollup()
+    for rollup in by_bettor.values():
+        combined = combined.merge(rollup)
+    return {
+        **combined.totals(),
+        "notable_games": combined.notable,
+        "by_bettor": {b: r.totals() for b, r in sorted(by_bettor.items())},
+    }
+
+
+# ---------------------------------------------------------------------------
+# DB I/O
+# ---------------------------------------------------------------------------
+
+_SETTLED_BETS_SQL = """
+    SELECT
+        b.bet_id, b.bettor, b.prediction, b.stake, b.odds, b.result, b.pnl,
+        g.game_id, g.home_team, g.away_team, g.match_date, g.kickoff_time,
+        g.league, g.outcome, g.home_score, g.away_score
+    FROM bets b
+    JOIN games g ON g.game_id = b.game_id
+    WHERE b.pnl IS NOT NULL
+"""
+
+# Pending bets are few (today's picks), so the partial index keeps this cheap.
+_PENDING_BETS_SQL = """
+    SELECT b.bettor, b.stake, g.home_team, g.away_team
+    FROM bets b
+    JOIN games g ON g.game_id = b.game_id
+    WHERE b.pnl IS NULL
+"""
+
+_LOCK_ROLLUPS_SQL = """
+    SELECT r.scope, r.scope_key, r.bettor, r.total_bets, r.wins,
+           r.total_stake, r.total_pnl, r.notable
+    FROM stats_rollups r
+    JOIN unnest(%(scopes)s::text[], %(keys)s::text[], %(bettors)s::text[])
+         AS k(scope, scope_key, bettor)
+      ON (r.scope, r.scope_key, r.bettor) = (k.scope, k.scope_key, k.bettor)
+    FOR UPDATE OF r
+"""
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO stats_rollups
+        (scope, scope_key, bettor, total_bets, wins, total_stake, total_pnl, notable)
+    VALUES (%(scope)s, %(scope_key)s, %(bettor)s, %(total_bets)s, %(wins)s,
+            %(total_stake)s, %(total_pnl)s, %(notable)s)
+    ON CONFLICT (scope, scope_key, bettor) DO UPDATE
+        SET total_bets  = EXCLUDED.total_bets,
+            wins        = EXCLUDED.wins,
+            total_stake = EXCLUDED.total_stake,
+            total_pnl   = EXCLUDED.total_pnl,
+            notable     = EXCLUDED.notable,
+            updated_at  = CURRENT_TIMESTAMP
+"""
+
+_READ_COLUMNS = "bettor, total_bets, wins, total_stake, total_pnl, notable"
+
+
+def _rollup_from_row(row: tuple) -> Rollup:  # type: ignore[type-arg]
+    total_bets, wins, total_stake, total_pnl, notable = row
+    return Rollup.from_notable(
+        notable,
+        total_bets=total_bets,
+        wins=wins,
+        total_stake=float(total_stake),
+        total_pnl=float(total_pnl),
+    )
+
+
+def _upsert_params(key: RollupKey, rollup: Rollup) -> dict[str, Any]:
+    scope, scope_key, bettor = key
+    return {
+        "scope": scope,
+        "scope_key": scope_key,
+        "bettor": bettor,
+        "total_bets": rollup.total_bets,
+        "wins": rollup.wins,
+        "total_stake": round(rollup.total_stake, 2),
+        "total_pnl": round(rollup.total_pnl, 2),
+        "notable": Jsonb(rollup.notable),
+    }
+
+
+def _reset_stale_notable(cur: Cursor, stale: dict[RollupKey, Rollup]) -> None:
+    """Recompute the top-N of *stale* rollups from their settled bets.
+
+    Team keys are normalized names SQL cannot match, so this reads the settled
+    bets of the rollups' bettors and keeps the matching ones in Python.  It
+    only runs when a re-settlement demotes a notable bet.
+    """
+    cur.execute(
+        _SETTLED_BETS_SQL + " AND b.bettor = ANY(%(bettors)s)",
+        {"bettors": sorted({key[2] for key in stale})},
+    )
+    bets: dict[RollupKey, list[dict[str, Any]]] = defaultdict(list)
+    for bet in map(bet_entry, cur.fetchall()):
+        for key in rollup_keys(bet) & stale.keys():
+            bets[key].append(bet)
+    for key, rollup in stale.items():
+        rollup.reset_notable(bets[key])
+
+
+def fold_settled_bets(cur: Cursor, previous_pnl: dict[int, float | None]) -> int:
+    """Fold just-settled bets into their rollups, in the caller's transaction.
+
+    Args:
+        cur: Cursor on the settlement transaction (the bets must already carry
+            their new ``pnl``).
+        previous_pnl: ``bet_id`` → the bet's ``pnl`` before this settlement
+            (None for a first settlement).
+
+    Returns:
+        Number of rollup rows written.
+    """
+    if not previous_pnl:
+        return 0
+    cur.execute(_SETTLED_BETS_SQL + " AND b.bet_id = ANY(%(ids)s)", {"ids": list(previous_pnl)})
+    bets = [bet_entry(row) for row in cur.fetchall()]
+    wanted = sorted({key for bet in bets for key in rollup_keys(bet)})
+    if not wanted:
+        return 0
+
+    scopes, keys, bettors = (list(col) for col in zip(*wanted))
+    cur.execute(_LOCK_ROLLUPS_SQL, {"scopes": scopes, "keys": keys, "bettors": bettors})
+    rollups: dict[RollupKey, Rollup] = {
+        (row[0], row[1], row[2]): _rollup_from_row(row[3:]) for row in cur.fetchall()
+    }
+    existing = set(rollups)
+    for bet in bets:
+        for key in rollup_keys(bet):
+            # A bet settled before its rollup existed (no rebuild yet) counts as new.
+            previous = previous_pnl.get(bet["bet_id"]) if key in existing else None
+            rollups.setdefault(key, Rollup()).add(bet, previous)
+
+    stale = {key: rollups[key] for key in wanted if rollups[key].notable_stale}
+    if stale:
+        _reset_stale_notable(cur, stale)
+    cur.executemany(_UPSERT_ROLLUP_SQL, [_upsert_params(k, rollups[k]) for k in wanted])
+    return len(wanted)
+
+
+def rebuild(cur: Cursor) -> int:
+    """Recompute every rollup from ``bets`` and replace the table's contents.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    cur.execute(_SETTLED_BETS_SQL)
+    rollups = build_rollups(bet_entry(row) for row in cur.fetchall())
+    cur.execute("DELETE FROM stats_rollups")
+    cur.executemany(_UPSERT_ROLLUP_SQL, [_upsert_params(k, r) for k, r in sorted(rollups.items())])
+    return len(rollups)
+
+
+def _pending_rollup(row: tuple) -> tuple[str, Rollup]:  # type: ignore[type-arg]
+    return row[0], Rollup(pending_bets=1, pending_stake=float(row[1]))
+
+
+def read_team_stats(cur: Cursor, variants: Iterable[str]) -> dict[str, Any]:
+    """Return the stats payload for a team's normalized name *variants*."""
+    keys = set(variants)
+    cur.execute(
+        f"SELECT {_READ_COLUMNS} FROM stats_rollups"
+        " WHERE scope = 'team' AND scope_key = ANY(%(keys)s)",
+        {"keys": sorted(keys)},
+    )
+    rollups = [(row[0], _rollup_from_row(row[1:])) for row in cur.fetchall()]
+    cur.execute(_PENDING_BETS_SQL)
+    rollups += [
+        _pending_rollup(row)
+        for row in cur.fetchall()
+        if normalize_team_name(row[2]) in keys or normalize_team_name(row[3]) in keys
+    ]
+    return stats_payload(rollups)
+
+
+def read_league_stats(cur: Cursor, pattern: str) -> dict[str, Any] | None:
+    """Return the stats payload for leagues matching the ILIKE *pattern*.
+
+    Returns:
+        The payload, or None when no bet at all (settled or pending) is in a
+        matching league.
+    """
+    league_filter = " ILIKE %(pattern)s ESCAPE '\\'"
+    cur.execute(
+        f"SELECT {_READ_COLUMNS} FROM stats_rollups"
+        " WHERE scope = 'league' AND scope_key" + league_filter,
+        {"pattern": pattern},
+    )
+    rollups = [(row[0], _rollup_from_row(row[1:])) for row in cur.fetchall()]
+    cur.execute(_PENDING_BETS_SQL + " AND g.league" + league_filter, {"pattern": pattern})
+    rollups += [_pending_rollup(row) for row in cur.fetchall()]
+    return stats_payload(rollups) if rollups else None
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from soccersmartbet.db import close_pool, get_cursor
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Team / league stats rollups")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute every rollup from the bets table"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        with get_cursor(commit=args.rebuild) as cur:
+            if args.rebuild:
+                logger.info("stats_rollups: rebuilt %d rollup row(s)", rebuild(cur))
+            cur.execute(
+                "SELECT scope, COUNT(*), MAX(updated_at) FROM stats_rollups GROUP BY scope"
+            )
+            for scope, count, updated_at in cur.fetchall():
+                logger.info(
+                    "stats_rollups: %s — %d row(s), last updated %s", scope, count, updated_at
+                )
+    finally:
+        close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import signal
-from datetime import date
+from datetime import date, datetime, timedelta
 from typing import Coroutine, Any
 
 import uvicorn
@@ -18,6 +18,7 @@ from telegram.ext import (
 )
 
 from soccersmartbet.daily_runs import get_daily_run, get_pending_post_games, upsert_daily_run
+from soccersmartbet.db_listener import ChangeListener, get_listener
 from soccersmartbet.gambling_flow.handlers import handle_gamble_callback
 from soccersmartbet.telegram.bot import (
     TELEGRAM_BOT_TOKEN,
@@ -101,7 +102,7 @@ async def trigger_pre_gambling_and_notify() -> None:
 
     started = now_isr()
     try:
-        result = await asyncio.to_thread(run_pre_gambling_flow)
+        result = await asyncio.to_thread(run_pre_gambling_flow, triggered_by="scheduler")
     except Exception as exc:
         mark_failed(today, exc)
         write_run_event(
@@ -123,7 +124,7 @@ async def trigger_pre_gambling_and_notify() -> None:
             "Re-trigger manually when ready."
         )
         await _send_operator_alert(alert_text)
-        # Re-raised for future Wave 11 HTTP-route exception handling; poller's bare except logs it.
+        # Re-raised for future Wave 11 HTTP-route exception handling; scheduler task logs it.
         raise
 
     game_ids: list[int] = result.get("games_to_analyze", [])
@@ -196,86 +197,185 @@ async def trigger_pre_gambling_and_notify() -> None:
 
 
 # ---------------------------------------------------------------------------
-# Wall-clock poller
+# Deadline scheduler
 # ---------------------------------------------------------------------------
 
+# Upper bound on one sleep slice.  asyncio sleeps on the monotonic clock, which
+# stops while the host (macOS) sleeps, so the loop wakes at least this often
+# to compare wall-clock time against the deadline — no DB access per slice.
+_MAX_SLICE_S = 30.0
+# A wall-clock jump larger than this across one slice means the host slept.
+_DRIFT_TOLERANCE_S = 5.0
+# Re-check cadence while a due flow is still unstarted or pending (running, or
+# failed and awaiting retry) and while the LISTEN connection is down.
+_FALLBACK_RECHECK_S = 60.0
+
+
+def _plan_triggers(
+    now: datetime,
+    daily: dict | None,
+    pending: dict | None,
+) -> tuple[list[str], datetime]:
+    """Decide which flows are due at *now* and when to evaluate again.
+
+    Pure function — all DB reads happen in the caller.
+
+    Args:
+        now: Current ISR wall-clock time.
+        daily: Today's daily_runs row (``get_daily_run``), or None.
+        pending: The pending post-games row (``get_pending_post_games``), or None.
+
+    Returns:
+        ``(due, next_check)`` where *due* lists ``"pre_gambling"`` and/or
+        ``"post_games"`` and *next_check* is the next instant anything can
+        become due (a NOTIFY on daily_runs may wake the scheduler earlier).
+    """
+    due: list[str] = []
 
-async def _wall_clock_poller(application: Application) -> None:
-    """Background asyncio task that replaces APScheduler's run_daily().
-
-    Loops every 60 seconds and checks wall-clock time.  After a macOS
-    sleep/resume the first iteration sees the real wall time and fires
-    immediately if a trigger was missed.
-
-    Pre-gambling fires at _PRE_GAMBLING_HOUR:_PRE_GAMBLING_MINUTE ISR if
-    today's daily_runs has no pre_gambling_started_at.
+    pre_at = now.replace(
+        hour=_PRE_GAMBLING_HOUR, minute=_PRE_GAMBLING_MINUTE, second=0, microsecond=0
+    )
+    if now >= pre_at:
+        if daily is None or daily["pre_gambling_started_at"] is None:
+            due.append("pre_gambling")
+        elif daily.get("status") in (
+            "pre_gambling_running",
+            "gambling_running",
+            "post_games_running",
+        ):
+            # Flow started but mutex still held — do NOT re-fire.
+            logger.debug("Scheduler: flow in progress (status=%s)", daily["status"])
+        next_check = pre_at + timedelta(days=1)
+        if "pre_gambling" in due:
+            # A fire that fails before writing pre_gambling_started_at sends no
+            # NOTIFY, so re-check soon instead of tomorrow.
+            next_check = min(next_check, now + timedelta(seconds=_FALLBACK_RECHECK_S))
+    else:
+        next_check = pre_at
+
+    # ANY pending post-games row, not just today's — late games cross midnight
+    # (e.g. trigger at 01:00 Apr 13 is stored on the Apr 12 row).
+    if pending is not None:
+        trigger_at = pending["post_games_trigger_at"]
+        if now >= trigger_at:
+            due.append("post_games")
+            next_check = min(next_check, now + timedelta(seconds=_FALLBACK_RECHECK_S))
+        else:
+            next_check = min(next_check, trigger_at)
+
+    return due, next_check
+
+
+def _evaluate_triggers(now: datetime) -> datetime:
+    """Read daily_runs, spawn every due flow, and return the next check instant."""
+    today = now.date()
+    pending = get_pending_post_games()
+    due, next_check = _plan_triggers(now, get_daily_run(today), pending)
+
+    if "pre_gambling" in due:
+        logger.info("Scheduler: firing pre-gambling (now=%s)", now.strftime("%H:%M"))
+        _spawn_flow(trigger_pre_gambling_and_notify())
+    if "post_games" in due and pending is not None:
+        logger.info(
+            "Scheduler: firing post-games (now=%s, trigger_at=%s, run_date=%s)",
+            now.strftime("%H:%M"),
+            pending["post_games_trigger_at"].strftime("%H:%M"),
+            pending["run_date"],
+        )
+        _spawn_flow(_fire_post_games(pending["game_ids"], pending["run_date"]))
+    return next_check
 
-    Post-games fires when:
-        - post_games_trigger_at is set (calculated once when gambling completes)
-        - post_games_completed_at is not set
-        - now >= post_games_trigger_at
 
-    Updates _LAST_POLLER_TICK[0] every iteration for /api/health.
+async def _sleep_until(
+    deadline: datetime,
+    wake: asyncio.Queue,
+    listener: ChangeListener,
+) -> str:
+    """Sleep until *deadline* (ISR wall clock) or an early wake-up.
 
-    Flow triggers are spawned as background tasks so the poller's 60s heartbeat
-    stays fresh while a multi-minute flow runs. Concurrent fires are deduped by
-    the daily_runs.status mutex.
+    Returns the reason: ``"deadline"``, ``"notify"`` (a daily_runs change or
+    listener reconnect arrived) or ``"drift"`` (wall clock jumped — the host
+    slept and resumed).
     """
-    logger.info("Wall-clock poller started")
+    if not listener.connected:
+        # No push channel: fall back to a periodic DB re-check.
+        deadline = min(deadline, now_isr() + timedelta(seconds=_FALLBACK_RECHECK_S))
 
+    loop = asyncio.get_running_loop()
     while True:
+        now = now_isr()
+        LAST_POLLER_TICK[0] = now.isoformat()
+        remaining = (deadline - now).total_seconds()
+        if remaining <= 0:
+            return "deadline"
+
+        mono_start = loop.time()
         try:
-            now = now_isr()
-            today = now.date()
+            event = await asyncio.wait_for(wake.get(), timeout=min(remaining, _MAX_SLICE_S))
+        except asyncio.TimeoutError:
+            event = None
+
+        if event is not None:
+            # Drain the burst a single flow transition produces.
+            relevant = event.get("table") in ("daily_runs", "*")
+            while not wake.empty():
+                relevant |= wake.get_nowait().get("table") in ("daily_runs", "*")
+            if relevant:
+                return "notify"
+            continue
+
+        mono_elapsed = loop.time() - mono_start
+        wall_elapsed = (now_isr() - now).total_seconds()
+        if wall_elapsed - mono_elapsed > _DRIFT_TOLERANCE_S:
+            logger.warning(
+                "Scheduler: wall clock advanced %.0fs during a %.0fs sleep (host sleep/resume?)",
+                wall_elapsed,
+                mono_elapsed,
+            )
+            return "drift"
 
-            # Update health tick — poller is alive
-            LAST_POLLER_TICK[0] = now.isoformat()
 
-            daily = get_daily_run(today)
+async def _deadline_scheduler(application: Application) -> None:
+    """Background asyncio task that fires the daily flows exactly when due.
 
-            # ---- pre-gambling check ----------------------------------------
-            pre_gambling_due = now.hour > _PRE_GAMBLING_HOUR or (
-                now.hour == _PRE_GAMBLING_HOUR and now.minute >= _PRE_GAMBLING_MINUTE
-            )
+    Replaces the 60-second wall-clock poller.  Each iteration reads
+    daily_runs once, fires whatever is due, computes the next due instant
+    (pre-gambling at _PRE_GAMBLING_HOUR:_PRE_GAMBLING_MINUTE ISR,
+    post_games_trigger_at) and sleeps until then.  A ``NOTIFY ssb_changes``
+    for daily_runs (e.g. gambling completed and set post_games_trigger_at)
+    wakes it early, so trigger latency is sub-second and an idle day costs a
+    handful of queries instead of 2880.
+
+    Sleep/resume resistance is kept: sleeps are sliced to _MAX_SLICE_S and
+    compared against wall-clock time, so after a macOS sleep a missed
+    trigger fires on the first slice after resume.  If the LISTEN connection
+    is down the scheduler re-checks every _FALLBACK_RECHECK_S.
+
+    Updates LAST_POLLER_TICK[0] every slice for /api/health.
+
+    Flow triggers are spawned as background tasks; concurrent fires are
+    deduped by the daily_runs.status mutex.
+    """
+    listener = get_listener()
+    listener.ensure_running()
+    wake = listener.subscribe()
+    logger.info("Deadline scheduler started")
 
-            if pre_gambling_due:
-                if daily is None or daily["pre_gambling_started_at"] is None:
-                    logger.info(
-                        "Wall-clock poller: firing pre-gambling (now=%s, row=%s)",
-                        now.strftime("%H:%M"),
-                        "none" if daily is None else "no started_at",
-                    )
-                    _spawn_flow(trigger_pre_gambling_and_notify())
-
-                elif daily.get("status") in (
-                    "pre_gambling_running",
-                    "gambling_running",
-                    "post_games_running",
-                ):
-                    # Flow started but mutex still held — do NOT re-fire.
-                    logger.warning(
-                        "Wall-clock poller: flow in progress (status=%s) — skipping re-fire.",
-                        daily["status"],
-                    )
-
-            # ---- post-games check ------------------------------------------
-            # Query for ANY pending post-games trigger (not just today's row),
-            # because late games cross midnight (e.g. trigger at 01:00 Apr 13
-            # is stored on the Apr 12 row).
-            pending = get_pending_post_games()
-            if pending is not None and now >= pending["post_games_trigger_at"]:
-                logger.info(
-                    "Wall-clock poller: firing post-games (now=%s, trigger_at=%s, run_date=%s)",
-                    now.strftime("%H:%M"),
-                    pending["post_games_trigger_at"].strftime("%H:%M"),
-                    pending["run_date"],
-                )
-                _spawn_flow(_fire_post_games(pending["game_ids"], pending["run_date"]))
-
-        except Exception:
-            logger.exception("Wall-clock poller: unhandled error in polling loop")
-
-        await asyncio.sleep(60)
+    try:
+        while True:
+            now = now_isr()
+            LAST_POLLER_TICK[0] = now.isoformat()
+            try:
+                next_check = _evaluate_triggers(now)
+            except Exception:
+                logger.exception("Scheduler: unhandled error evaluating triggers")
+                next_check = now + timedelta(seconds=_FALLBACK_RECHECK_S)
+
+            logger.debug("Scheduler: sleeping until %s", next_check.isoformat())
+            reason = await _sleep_until(next_check, wake, listener)
+            logger.debug("Scheduler: woke (%s)", reason)
+    finally:
+        listener.unsubscribe(wake)
 
 
 async def _fire_post_games(game_ids: list[int], today: date) -> None:
@@ -304,7 +404,7 @@ async def _fire_post_games(game_ids: list[int], today: date) -> None:
 
     started = now_isr()
     try:
-        await asyncio.to_thread(run_post_games_flow, game_ids)
+        await asyncio.to_thread(run_post_games_flow, game_ids, triggered_by="scheduler")
     except Exception as exc:
         mark_failed(today, exc)
         write_run_event(
@@ -323,10 +423,10 @@ async def _fire_post_games(game_ids: list[int], today: date) -> None:
             f"<b>Message:</b> {exc}\n\n"
             f"<b>Time:</b> {now_isr().strftime('%Y-%m-%d %H:%M ISR')}\n\n"
             "The <code>daily_runs</code> row has been marked <code>failed</code>.\n\n"
-            "To re-run manually: use the dashboard or wait for the next poller tick."
+            "To re-run manually: use the dashboard or wait for the scheduler's next re-check."
         )
         await _send_operator_alert(alert_text)
-        # Re-raised for future Wave 11 HTTP-route exception handling; poller's bare except logs it.
+        # Re-raised for future Wave 11 HTTP-route exception handling; scheduler task logs it.
         raise
 
     try:
@@ -413,22 +513,23 @@ async def _handle_unknown(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 # ---------------------------------------------------------------------------
-# Scheduler entry point — async, co-hosts FastAPI + Telegram + poller
+# Scheduler entry point — async, co-hosts FastAPI + Telegram + scheduler
 # ---------------------------------------------------------------------------
 
 
 async def start_scheduler() -> None:
-    """Start the bot with wall-clock polling scheduler and FastAPI dashboard.
+    """Start the bot with the deadline scheduler and FastAPI dashboard.
 
     Runs as a single asyncio event loop:
       - uvicorn.Server serves FastAPI on 127.0.0.1:8083
-      - wall-clock poller fires at _PRE_GAMBLING_HOUR:_PRE_GAMBLING_MINUTE ISR
+      - deadline scheduler fires at _PRE_GAMBLING_HOUR:_PRE_GAMBLING_MINUTE ISR
+        and at post_games_trigger_at, woken early by NOTIFY ssb_changes
       - Telegram updater receives updates via long-polling
 
     Graceful shutdown on SIGTERM / SIGINT:
       1. Signal uvicorn to stop
       2. Stop/shutdown Telegram application
-      3. Cancel poller task
+      3. Cancel scheduler task and stop the LISTEN connection
     """
     if not TELEGRAM_BOT_TOKEN:
         raise RuntimeError("TELEGRAM_BOT_TOKEN must be set to start the scheduler.")
@@ -446,7 +547,7 @@ async def start_scheduler() -> None:
     application.add_handler(MessageHandler(filters.ALL, _handle_unknown))
 
     logger.info(
-        "SoccerSmartBet bot starting — wall-clock poller will fire at %02d:%02d ISR",
+        "SoccerSmartBet bot starting — scheduler will fire pre-gambling at %02d:%02d ISR",
         _PRE_GAMBLING_HOUR,
         _PRE_GAMBLING_MINUTE,
     )
@@ -475,7 +576,7 @@ async def start_scheduler() -> None:
         loop.add_signal_handler(sig, shutdown_event.set)
 
     # Start background tasks
-    poller_task = asyncio.create_task(_wall_clock_poller(application))
+    scheduler_task = asyncio.create_task(_deadline_scheduler(application))
     server_task = asyncio.create_task(server.serve())
 
     logger.info("FastAPI dashboard listening on http://127.0.0.1:8083")
@@ -490,9 +591,9 @@ async def start_scheduler() -> None:
     await application.updater.stop()
     await application.stop()
     await application.shutdown()
-    poller_task.cancel()
+    scheduler_task.cancel()
 
-    # Drain in-flight flow tasks before cancelling server/poller (C1/C4)
+    # Drain in-flight flow tasks before cancelling server/scheduler (C1/C4)
     if _ACTIVE_FLOW_TASKS:
         logger.info("Shutdown: draining %d in-flight flow task(s)", len(_ACTIVE_FLOW_TASKS))
         try:
@@ -508,15 +609,17 @@ async def start_scheduler() -> None:
 
     try:
         await asyncio.wait_for(
-            asyncio.gather(server_task, poller_task, return_exceptions=True),
+            asyncio.gather(server_task, scheduler_task, return_exceptions=True),
             timeout=30,
         )
     except asyncio.TimeoutError:
         logger.warning("Shutdown timed out after 30s — force-cancelling tasks")
         server_task.cancel()
-        poller_task.cancel()
+        scheduler_task.cancel()
         # Give cancelled tasks a brief chance to finalize
-        await asyncio.gather(server_task, poller_task, return_exceptions=True)
+        await asyncio.gather(server_task, scheduler_task, return_exceptions=True)
+
+    await get_listener().stop()
 
     # Close the psycopg3 pool so its worker threads exit and the process can terminate
     from soccersmartbet.db import close_pool  # noqa: PLC0415
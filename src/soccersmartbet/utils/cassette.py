@@ -0,0 +1,236 @@
+"""Record/replay cassettes for outbound HTTP and LLM calls.
+
+Every external call in the flows (FotMob, football-data.org, The Odds API,
+winner.co.il, Open-Meteo, OpenAI) goes through :func:`http_get` or
+:func:`replay_or_record`.  Behaviour is selected by ``CASSETTE_MODE``:
+
+``off`` (default)
+    Pass-through — the live call is made and nothing is written.
+``record``
+    The live call is made and the normalized request plus its response is
+    written to ``CASSETTE_DIR`` as a gzip-compressed JSON file.
+``replay``
+    No network.  The response is read back from the cassette; a missing
+    cassette raises :class:`CassetteMiss`, which subclasses
+    ``requests.ConnectionError`` so tools degrade exactly as they would
+    with the network down (error dict, never an unhandled crash).
+
+Cassette files are keyed by a SHA-256 of the *normalized* request: method,
+scheme/host/path, and the merged, sorted query parameters.  Headers are
+excluded on purpose — FotMob's ``x-mas`` token embeds a timestamp and API
+keys must never end up in recorded files.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, TypeVar
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from soccersmartbet.utils.concurrency import host_slot
+from soccersmartbet.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+_MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY)
+
+_DEFAULT_DIR = "cassettes"
+
+# Query parameters that carry credentials — stripped from the key and from
+# the recorded request so cassettes are safe to share.
+_SECRET_PARAMS = frozenset({"apiKey", "api_key", "apikey", "token", "key"})
+
+T = TypeVar("T")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode when no cassette exists for a request."""
+
+
+def cassette_mode() -> str:
+    """Return the active cassette mode (read from the env on every call)."""
+    mode = os.getenv("CASSETTE_MODE", MODE_OFF).strip().lower() or MODE_OFF
+    if mode not in _MODES:
+        logger.warning("cassette: unknown CASSETTE_MODE=%r — treating as off", mode)
+        return MODE_OFF
+    return mode
+
+
+def cassette_dir() -> Path:
+    """Return the root directory cassettes are read from / written to."""
+    return Path(os.getenv("CASSETTE_DIR", _DEFAULT_DIR))
+
+
+# ---------------------------------------------------------------------------
+# Keying
+# ---------------------------------------------------------------------------
+
+
+def normalize_http_request(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+) -> dict[str, Any]:
+    """Return a canonical, credential-free description of an HTTP request.
+
+    Query parameters embedded in *url* and passed via *params* are merged and
+    sorted, so ``get(url + "?a=1&b=2")`` and ``get(url, params={"b": 2, "a": 1})``
+    share a cassette.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query = sorted((k, v) for k, v in query if k not in _SECRET_PARAMS)
+    base = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, "", ""))
+    return {"method": method.upper(), "url": base, "query": query}
+
+
+def cassette_key(kind: str, material: Any) -> str:
+    """Return the stable hex key for *material* under cassette *kind*."""
+    blob = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{kind}:{blob}".encode("utf-8")).hexdigest()
+
+
+def _cassette_path(kind: str, key: str) -> Path:
+    return cassette_dir() / kind / key[:2] / f"{key}.json.gz"
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def _read(kind: str, key: str) -> Optional[dict[str, Any]]:
+    path = _cassette_path(kind, key)
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def _write(kind: str, key: str, record: dict[str, Any]) -> None:
+    path = _cassette_path(kind, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Atomic replace: parallel fan-out branches may record the same request.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            gz.write(json.dumps(record, sort_keys=True, default=str).encode("utf-8"))
+        os.replace(tmp, path)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def replay_or_record(
+    kind: str,
+    material: Any,
+    live: Callable[[], T],
+    encode: Callable[[T], Any],
+    decode: Callable[[Any], T],
+) -> T:
+    """Generic record/replay wrapper around one external call.
+
+    Args:
+        kind: Cassette namespace (``"http"``, ``"llm"``...).
+        material: JSON-serialisable, normalized description of the request.
+        live: Zero-arg callable performing the real call.
+        encode: Turns the live result into a JSON-serialisable payload.
+        decode: Rebuilds the result from a recorded payload.
+
+    Returns:
+        The live result (``off``/``record``) or the replayed one (``replay``).
+
+    Raises:
+        CassetteMiss: In replay mode when no cassette exists for *material*.
+    """
+    mode = cassette_mode()
+    if mode == MODE_OFF:
+        return live()
+
+    key = cassette_key(kind, material)
+    if mode == MODE_REPLAY:
+        record = _read(kind, key)
+        if record is None:
+            raise CassetteMiss(f"no {kind} cassette for {material!r} (key={key[:12]})")
+        return decode(record["response"])
+
+    result = live()
+    try:
+        _write(kind, key, {"request": material, "response": encode(result)})
+    except Exception as exc:  # recording must never break a live run
+        logger.warning("cassette: failed to record %s key=%s: %s", kind, key[:12], exc)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+def _encode_response(resp: requests.Response) -> dict[str, Any]:
+    return {
+        "status_code": resp.status_code,
+        "headers": dict(resp.headers),
+        "body_b64": base64.b64encode(resp.content or b"").decode("ascii"),
+        "encoding": resp.encoding,
+    }
+
+
+def _decode_response(url: str) -> Callable[[dict[str, Any]], requests.Response]:
+    def _decode(payload: dict[str, Any]) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = payload["status_code"]
+        resp.headers = CaseInsensitiveDict(payload.get("headers") or {})
+        resp._content = base64.b64decode(payload.get("body_b64") or "")
+        resp.encoding = payload.get("encoding")
+        resp.url = url
+        return resp
+
+    return _decode
+
+
+def http_get(
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    """Cassette-aware drop-in for ``requests.get`` / ``session.get``.
+
+    Returns a real ``requests.Response`` in every mode, so callers keep using
+    ``status_code``, ``headers``, ``json()`` and ``raise_for_status()``.  Live
+    requests wait for a ``MAX_HTTP_PER_HOST`` slot (see
+    :mod:`soccersmartbet.utils.concurrency`).
+    """
+    material = normalize_http_request("GET", url, params)
+    getter = session.get if session is not None else requests.get
+    host = urlsplit(url).netloc.lower()
+
+    def _live() -> requests.Response:
+        # Only live requests count against the per-host limit.
+        with host_slot(host):
+            return getter(url, params=params, headers=headers, timeout=timeout)
+
+    with span("http", host) as s:
+        resp = replay_or_record("http", material, _live, _encode_response, _decode_response(url))
+        s.cache_hit = cassette_mode() == MODE_REPLAY
+        s.error = resp.status_code >= 400
+        return resp
@@ -0,0 +1,147 @@
+"""Concurrency governor for the analyze_game fan-out.
+
+``fan_out_to_analysis`` sends one ``analyze_game`` per game and each runs
+three intelligence nodes at once, so a busy matchday would otherwise put 3N
+LLM calls and dozens of HTTP requests in flight together and trip the
+providers' rate limits.  Three process-wide limits apply instead:
+
+* ``MAX_GAMES_IN_FLIGHT`` (default 6) — ``analyze_game`` invocations running
+  at once (:func:`game_slot`).
+* ``MAX_LLM_IN_FLIGHT`` (default 8) — live LLM calls (:func:`llm_slot`, taken
+  by :mod:`soccersmartbet.utils.llm`).
+* ``MAX_HTTP_PER_HOST`` (default 4) — live HTTP requests per host
+  (:func:`host_slot`, taken by :func:`soccersmartbet.utils.cassette.http_get`).
+
+``0`` disables a limit.  Waiters are served by priority, not arrival: a game
+holds its kickoff (``YYYY-MM-DD HH:MM``) as the priority of everything it does,
+so when slots are scarce the earliest kickoff goes first and finishes first.
+Work outside a game (picker, expert reports) has the top priority.  Cache and
+cassette-replay hits never take a slot.  Each wait is recorded as a
+``ratelimit`` span in the flow trace.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from soccersmartbet.utils.tracing import span
+
+MAX_GAMES_IN_FLIGHT = int(os.getenv("MAX_GAMES_IN_FLIGHT", "6"))
+MAX_LLM_IN_FLIGHT = int(os.getenv("MAX_LLM_IN_FLIGHT", "8"))
+MAX_HTTP_PER_HOST = int(os.getenv("MAX_HTTP_PER_HOST", "4"))
+
+# Lowest sorts first, so un-prioritised work ("") is never starved by games.
+_priority: ContextVar[str] = ContextVar("concurrency_priority", default="")
+
+
+class PrioritySlots:
+    """A counting semaphore that wakes the lowest-priority-key waiter first.
+
+    Waiters with equal keys are served in arrival order.  A *limit* of 0 or
+    less never blocks.
+
+    Args:
+        name: Label for the ``ratelimit`` span recorded while waiting.
+        limit: Slots that can be held at once.
+    """
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.in_flight_max = 0
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[str, int]] = []
+        self._seq = itertools.count()
+
+    def acquire(self, priority: str = "") -> float:
+        """Block until a slot is free and this is the first waiter in line.
+
+        Returns:
+            Seconds spent waiting (0.0 when a slot was free).
+        """
+        with self._cond:
+            if self.limit <= 0 or (self.in_flight < self.limit and not self._waiters):
+                self._take()
+                return 0.0
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+        start = time.monotonic()
+        with span("ratelimit", self.name), self._cond:
+            self._cond.wait_for(
+                lambda: self.in_flight < self.limit and self._waiters[0] == ticket
+            )
+            heapq.heappop(self._waiters)
+            self._take()
+            # The next waiter may also fit (several slots freed at once).
+            self._cond.notify_all()
+        return time.monotonic() - start
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def hold(self, priority: str = "") -> Iterator[None]:
+        """Hold one slot for the duration of the block."""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        self.in_flight_max = max(self.in_flight_max, self.in_flight)
+
+
+_games = PrioritySlots("games", MAX_GAMES_IN_FLIGHT)
+_llm = PrioritySlots("llm", MAX_LLM_IN_FLIGHT)
+_hosts: dict[str, PrioritySlots] = {}
+_hosts_guard = threading.Lock()
+
+
+def kickoff_priority(match_date: str, kickoff_time: str) -> str:
+    """Return the priority key of a game (earlier kickoff sorts first)."""
+    return f"{match_date} {kickoff_time}"
+
+
+@contextmanager
+def game_slot(priority: str) -> Iterator[None]:
+    """Run one game's analysis in a game slot, at *priority* throughout.
+
+    Everything the block does — including LangGraph nodes run from it, which
+    inherit the context — waits for LLM and HTTP slots at this priority.
+    """
+    token = _priority.set(priority)
+    try:
+        with _games.hold(priority):
+            yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def llm_slot() -> Iterator[None]:
+    """Hold one of the ``MAX_LLM_IN_FLIGHT`` LLM slots."""
+    with _llm.hold(_priority.get()):
+        yield
+
+
+@contextmanager
+def host_slot(host: str) -> Iterator[None]:
+    """Hold one of *host*'s ``MAX_HTTP_PER_HOST`` request slots."""
+    with _hosts_guard:
+        slots = _hosts.get(host)
+        if slots is None:
+            slots = _hosts[host] = PrioritySlots(f"http:{host}", MAX_HTTP_PER_HOST)
+    with slots.hold(_priority.get()):
+        yield
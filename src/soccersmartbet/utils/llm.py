@@ -0,0 +1,222 @@
+"""Single entry point for every ChatOpenAI call in the project.
+
+Agents used to build ``ChatOpenAI(...).with_structured_output(...)`` inline.
+Routing them through :func:`invoke_structured` / :func:`invoke_text` gives one
+place to apply the record/replay cassette layer (see
+:mod:`soccersmartbet.utils.cassette`), to record an ``llm`` tracing span
+with token usage (see :mod:`soccersmartbet.utils.tracing`), and to serve
+structured outputs from the persistent ``llm_cache`` table.
+
+The response cache is keyed by model, temperature, every message (system
+prompt + user message) and the output schema hash, so a force-override rerun
+or a retry after a late-stage failure reuses the earlier answers instead of
+paying for them again.  ``LLM_CACHE_TTL_HOURS`` (default 24, ``0`` disables)
+bounds reuse; ``LLM_CACHE_BYPASS=1`` or ``bypass_cache=True`` forces a fresh
+call (the fresh answer still refreshes the cache).  The cache is only used
+with ``CASSETTE_MODE=off`` — cassettes already make record/replay runs
+deterministic and must stay DB-free.
+
+Live calls (cache and cassette misses) each hold one of the
+``MAX_LLM_IN_FLIGHT`` slots of :mod:`soccersmartbet.utils.concurrency`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Sequence, Type, TypeVar
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_openai import ChatOpenAI
+from psycopg.types.json import Jsonb
+from pydantic import BaseModel
+
+from soccersmartbet.db import get_cursor
+from soccersmartbet.utils.cassette import (
+    MODE_OFF,
+    MODE_REPLAY,
+    cassette_key,
+    cassette_mode,
+    replay_or_record,
+)
+from soccersmartbet.utils.concurrency import llm_slot
+from soccersmartbet.utils.tracing import Span, span
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+_DEFAULT_CACHE_TTL_HOURS = 24.0
+
+
+def schema_hash(schema: Type[BaseModel]) -> str:
+    """Return a short, stable hash of a Pydantic model's JSON schema."""
+    blob = json.dumps(schema.model_json_schema(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_messages(messages: Sequence[BaseMessage]) -> list[list[Any]]:
+    return [[m.type, m.content] for m in messages]
+
+
+def _record_usage(s: Span, message: Any) -> None:
+    usage = getattr(message, "usage_metadata", None) or {}
+    s.attrs["input_tokens"] = usage.get("input_tokens", 0)
+    s.attrs["output_tokens"] = usage.get("output_tokens", 0)
+
+
+# ---------------------------------------------------------------------------
+# Response cache (llm_cache table)
+# ---------------------------------------------------------------------------
+
+
+def cache_ttl_hours() -> float:
+    """Return the response-cache TTL in hours (``0`` disables the cache)."""
+    try:
+        return max(0.0, float(os.getenv("LLM_CACHE_TTL_HOURS", _DEFAULT_CACHE_TTL_HOURS)))
+    except ValueError:
+        return _DEFAULT_CACHE_TTL_HOURS
+
+
+def cache_bypassed() -> bool:
+    """Return True when ``LLM_CACHE_BYPASS`` asks for fresh LLM calls."""
+    return os.getenv("LLM_CACHE_BYPASS", "").strip().lower() in ("1", "true", "yes")
+
+
+def _cache_get(key: str) -> dict[str, Any] | None:
+    sql = "SELECT response FROM llm_cache WHERE cache_key = %s AND expires_at > NOW()"
+    try:
+        with get_cursor(commit=False) as cur:
+            cur.execute(sql, (key,))
+            row = cur.fetchone()
+    except Exception as exc:  # the cache must never fail an LLM call
+        logger.warning("llm_cache: read failed for key=%s: %s", key[:12], exc)
+        return None
+    return row[0] if row else None
+
+
+def _cache_put(
+    key: str,
+    model: str,
+    schema_name: str,
+    response: dict[str, Any],
+    ttl_hours: float,
+) -> None:
+    sql = """
+        INSERT INTO llm_cache (cache_key, model, schema_name, response, expires_at)
+        VALUES (%(key)s, %(model)s, %(schema)s, %(response)s,
+                NOW() + %(ttl)s * INTERVAL '1 hour')
+        ON CONFLICT (cache_key) DO UPDATE
+            SET response = EXCLUDED.response,
+                created_at = NOW(),
+                expires_at = EXCLUDED.expires_at
+    """
+    params = {
+        "key": key,
+        "model": model,
+        "schema": schema_name,
+        "response": Jsonb(response),
+        "ttl": ttl_hours,
+    }
+    try:
+        with get_cursor(commit=True) as cur:
+            cur.execute(sql, params)
+            # Opportunistic purge keeps the table bounded without a cron job.
+            cur.execute("DELETE FROM llm_cache WHERE expires_at < NOW()")
+    except Exception as exc:
+        logger.warning("llm_cache: write failed for key=%s: %s", key[:12], exc)
+
+
+def invoke_structured(
+    model: str,
+    temperature: float,
+    schema: Type[M],
+    messages: Sequence[BaseMessage],
+    bypass_cache: bool = False,
+) -> M:
+    """Invoke *model* with structured output parsed into *schema*.
+
+    Args:
+        model: OpenAI model name.
+        temperature: Sampling temperature.
+        schema: Pydantic model the reply is parsed into.
+        messages: System + user messages sent verbatim.
+        bypass_cache: Skip the ``llm_cache`` lookup (the fresh reply is still stored).
+
+    Returns:
+        The parsed *schema* instance.
+    """
+    material = {
+        "model": model,
+        "temperature": temperature,
+        "schema": f"{schema.__name__}:{schema_hash(schema)}",
+        "messages": _normalize_messages(messages),
+    }
+    ttl_hours = cache_ttl_hours()
+    use_cache = cassette_mode() == MODE_OFF and ttl_hours > 0
+    cache_key = cassette_key("llm", material) if use_cache else ""
+
+    with span("llm", model, schema=schema.__name__) as s:
+        if use_cache and not (bypass_cache or cache_bypassed()):
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                try:
+                    result = schema.model_validate(cached)
+                except ValueError as exc:
+                    logger.warning("llm_cache: stale %s entry ignored: %s", schema.__name__, exc)
+                else:
+                    s.cache_hit = True
+                    return result
+
+        def _live() -> M:
+            llm = ChatOpenAI(model=model, temperature=temperature)
+            with llm_slot():
+                out = llm.with_structured_output(schema, include_raw=True).invoke(list(messages))
+            _record_usage(s, out["raw"])
+            if out["parsing_error"] is not None:
+                raise out["parsing_error"]
+            return out["parsed"]
+
+        s.cache_hit = cassette_mode() == MODE_REPLAY
+        result = replay_or_record(
+            "llm",
+            material,
+            _live,
+            lambda out: out.model_dump(mode="json"),
+            schema.model_validate,
+        )
+        if use_cache:
+            _cache_put(cache_key, model, schema.__name__, result.model_dump(mode="json"), ttl_hours)
+        return result
+
+
+def invoke_text(
+    model: str,
+    temperature: float,
+    messages: Sequence[BaseMessage],
+) -> AIMessage:
+    """Invoke *model* for a free-text reply (returns the ``AIMessage``)."""
+    material = {
+        "model": model,
+        "temperature": temperature,
+        "messages": _normalize_messages(messages),
+    }
+
+    with span("llm", model) as s:
+
+        def _live() -> AIMessage:
+            with llm_slot():
+                reply = ChatOpenAI(model=model, temperature=temperature).invoke(list(messages))
+            _record_usage(s, reply)
+            return reply
+
+        s.cache_hit = cassette_mode() == MODE_REPLAY
+        return replay_or_record(
+            "llm",
+            material,
+            _live,
+            lambda msg: {"content": msg.content},
+            lambda payload: AIMessage(content=payload["content"]),
+        )
@@ -0,0 +1,244 @@
+"""Lightweight span tracing for the LangGraph flows.
+
+A :class:`FlowTrace` is bound to the current context by :func:`trace_flow`
+(the ``run_*_flow`` entry points do this).  LangGraph runs nodes in worker
+threads with a copy of the caller's context, so every node, tool, HTTP and
+LLM span recorded anywhere below the entry point lands in the same trace.
+
+Spans are aggregated in memory (never one row per span) and, when the flow
+finishes or fails, a compact summary is written to ``run_events`` as a
+``flow_trace`` event so the dashboard can show which node or API dominated
+the run.  Outside a traced flow every helper here is a cheap no-op.
+"""
+
+from __future__ import annotations
+
+import functools
+import heapq
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_SLOWEST_N = 5
+
+_current: ContextVar[Optional["FlowTrace"]] = ContextVar("ssb_flow_trace", default=None)
+
+
+@dataclass
+class Span:
+    """One timed unit of work.  ``attrs`` is free-form (tokens, host, ...)."""
+
+    kind: str
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    duration_ms: float = 0.0
+    error: bool = False
+    cache_hit: bool = False
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Agg:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, span: Span) -> None:
+        self.count += 1
+        self.total_ms += span.duration_ms
+        self.max_ms = max(self.max_ms, span.duration_ms)
+        self.errors += int(span.error)
+        self.cache_hits += int(span.cache_hit)
+        self.input_tokens += int(span.attrs.get("input_tokens") or 0)
+        self.output_tokens += int(span.attrs.get("output_tokens") or 0)
+
+    def as_dict(self, with_tokens: bool = False) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+        }
+        if with_tokens:
+            out["input_tokens"] = self.input_tokens
+            out["output_tokens"] = self.output_tokens
+        return out
+
+
+class FlowTrace:
+    """Thread-safe span aggregator for one flow run."""
+
+    def __init__(self, flow_type: str) -> None:
+        self.flow_type = flow_type
+        self.started = time.perf_counter()
+        self.total_ms: float = 0.0
+        self.status = "running"
+        self.error_type: Optional[str] = None
+        self._lock = threading.Lock()
+        # kind -> name -> aggregate.  Kinds: node, tool, http, llm, cache, ratelimit.
+        self._aggs: dict[str, dict[str, _Agg]] = {}
+        self._slowest: list[tuple[float, str, str]] = []
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._aggs.setdefault(span.kind, {}).setdefault(span.name, _Agg()).add(span)
+            entry = (span.duration_ms, span.kind, span.name)
+            if len(self._slowest) < _SLOWEST_N:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the JSON-serialisable per-run summary."""
+        with self._lock:
+            aggs = {kind: dict(names) for kind, names in self._aggs.items()}
+            slowest = sorted(self._slowest, reverse=True)
+
+        llm_total = _Agg()
+        for agg in aggs.get("llm", {}).values():
+            llm_total.count += agg.count
+            llm_total.total_ms += agg.total_ms
+            llm_total.max_ms = max(llm_total.max_ms, agg.max_ms)
+            llm_total.errors += agg.errors
+            llm_total.cache_hits += agg.cache_hits
+            llm_total.input_tokens += agg.input_tokens
+            llm_total.output_tokens += agg.output_tokens
+
+        out: dict[str, Any] = {
+            "flow_type": self.flow_type,
+            "status": self.status,
+            "total_ms": round(self.total_ms, 1),
+        }
+        if self.error_type:
+            out["error_type"] = self.error_type
+        for kind, key in (
+            ("node", "nodes"),
+            ("tool", "tools"),
+            ("http", "http"),
+            ("cache", "caches"),
+            ("ratelimit", "rate_limits"),
+        ):
+            out[key] = {
+                name: agg.as_dict()
+                for name, agg in sorted(aggs.get(kind, {}).items(), key=lambda kv: -kv[1].total_ms)
+            }
+        out["llm"] = {
+            **llm_total.as_dict(with_tokens=True),
+            "models": {name: agg.as_dict(with_tokens=True) for name, agg in aggs.get("llm", {}).items()},
+        }
+        out["slowest"] = [
+            {"kind": kind, "name": name, "ms": round(ms, 1)} for ms, kind, name in slowest
+        ]
+        return out
+
+
+def current_trace() -> Optional[FlowTrace]:
+    """Return the trace bound to the current context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Span]:
+    """Time the enclosed block as one span; callers may mutate the yielded span."""
+    trace = _current.get()
+    s = Span(kind=kind, name=name, attrs=dict(attrs))
+    try:
+        yield s
+    except BaseException:
+        s.error = True
+        raise
+    finally:
+        s.duration_ms = (time.perf_counter() - s.start) * 1000
+        if trace is not None:
+            trace.record(s)
+
+
+def traced_node(name: str, fn: F) -> F:
+    """Wrap a LangGraph node function so each invocation records a ``node`` span."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span("node", name):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def traced_tool(fn: F) -> F:
+    """Decorate a ``fetch_*`` tool.  A returned ``{"error": ...}`` counts as an error."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span("tool", fn.__name__) as s:
+            result = fn(*args, **kwargs)
+            if isinstance(result, dict) and result.get("error"):
+                s.error = True
+            return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def mark_cache_hit(name: str) -> None:
+    """Record a zero-duration ``cache`` span for an in-process cache hit."""
+    trace = _current.get()
+    if trace is not None:
+        trace.record(Span(kind="cache", name=name, cache_hit=True))
+
+
+def _persist(trace: FlowTrace, triggered_by: str) -> None:
+    # Deferred import: utils must not import the webapp package at load time.
+    from soccersmartbet.utils.timezone import today_isr  # noqa: PLC0415
+    from soccersmartbet.webapp.audit import EventType, write_run_event  # noqa: PLC0415
+
+    try:
+        write_run_event(today_isr(), EventType.FLOW_TRACE, triggered_by, trace.summary())
+    except Exception as exc:  # tracing must never fail a flow
+        logger.warning("tracing: failed to persist %s trace: %s", trace.flow_type, exc)
+
+
+@contextmanager
+def trace_flow(flow_type: str, triggered_by: str = "manual") -> Iterator[FlowTrace]:
+    """Bind a new :class:`FlowTrace` for the enclosed flow run and persist it on exit.
+
+    Args:
+        flow_type: ``pre_gambling``, ``gambling`` or ``post_games``.
+        triggered_by: One of 'scheduler', 'manual', 'recovery' (run_events CHECK).
+    """
+    trace = FlowTrace(flow_type)
+    token = _current.set(trace)
+    try:
+        yield trace
+        trace.status = "completed"
+    except BaseException as exc:
+        trace.status = "failed"
+        trace.error_type = type(exc).__name__
+        raise
+    finally:
+        _current.reset(token)
+        trace.total_ms = (time.perf_counter() - trace.started) * 1000
+        summary = trace.summary()
+        llm = summary["llm"]
+        logger.info(
+            "trace %s: %s in %.1fs — llm calls=%d tokens=%d/%d, slowest=%s",
+            flow_type,
+            trace.status,
+            trace.total_ms / 1000,
+            llm["count"],
+            llm["input_tokens"],
+            llm["output_tokens"],
+            summary["slowest"][:1],
+        )
+        _persist(trace, triggered_by)
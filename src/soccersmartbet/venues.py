@@ -0,0 +1,239 @@
+"""Home-stadium store (the ``venues`` table).
+
+``fetch_venue`` and ``fetch_weather`` both need the home team's stadium,
+which FotMob only serves inside the full ``/api/data/teams`` payload.  This
+module keeps one row per FotMob team id — stadium name, city, lat/lon,
+capacity, surface — and both tools read it first, so a game costs at most one
+team-payload download (the first time that team hosts) and weather becomes a
+single Open-Meteo request.
+
+Lookups go memory → ``venues`` → FotMob.  Stadiums rarely change, so a row is
+only re-fetched after ``VENUE_TTL``; a failed refresh keeps serving the
+stored row.  A team FotMob lists without a venue is stored with NULL fields,
+so it is not re-downloaded on every game either.  Concurrent lookups for the
+same team share one download.  Pre-seed every team with a ``fotmob_id``::
+
+    python -m soccersmartbet.venues --seed [--refresh]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from soccersmartbet.db import get_cursor
+from soccersmartbet.utils.timezone import now_isr
+from soccersmartbet.utils.tracing import mark_cache_hit
+
+logger = logging.getLogger(__name__)
+
+VENUE_TTL = timedelta(days=180)
+_SEED_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class Venue:
+    """A team's home stadium as FotMob lists it (fields None when unknown)."""
+
+    fotmob_team_id: int
+    name: Optional[str]
+    city: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    capacity: Optional[int]
+    surface: Optional[str]
+    fetched_at: datetime
+
+    @property
+    def coordinates(self) -> Optional[tuple[float, float]]:
+        """Return ``(latitude, longitude)``, or None when FotMob has no location."""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
+
+# ---------------------------------------------------------------------------
+# Parsing (pure)
+# ---------------------------------------------------------------------------
+
+
+def _capacity(value: Any) -> Optional[int]:
+    digits = re.sub(r"\D", "", str(value)) if value is not None else ""
+    return int(digits) if digits else None
+
+
+def venue_from_team_data(team_id: int, team_data: dict[str, Any], fetched_at: datetime) -> Venue:
+    """Extract the venue from a FotMob ``/api/data/teams`` payload."""
+    venue = (team_data.get("overview") or {}).get("venue") or {}
+    widget = venue.get("widget") or {}
+    # Capacity and surface are in statPairs, not widget
+    stat_pairs = venue.get("statPairs") or []
+    capacity = next((v for k, v in stat_pairs if k == "Capacity"), None)
+    surface = next((v for k, v in stat_pairs if k == "Surface"), None)
+    location = widget.get("location") or []
+    latitude = longitude = None
+    if len(location) >= 2:
+        try:
+            latitude, longitude = float(location[0]), float(location[1])
+        except (TypeError, ValueError):
+            pass
+    return Venue(
+        fotmob_team_id=team_id,
+        name=widget.get("name"),
+        city=widget.get("city"),
+        latitude=latitude,
+        longitude=longitude,
+        capacity=_capacity(capacity),
+        surface=surface,
+        fetched_at=fetched_at,
+    )
+
+
+# ---------------------------------------------------------------------------
+# DB I/O (best-effort: the store must never fail a tool)
+# ---------------------------------------------------------------------------
+
+_COLUMNS = "fotmob_team_id, name, city, latitude, longitude, capacity, surface, fetched_at"
+
+_UPSERT_SQL = f"""
+INSERT INTO venues ({_COLUMNS})
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (fotmob_team_id) DO UPDATE
+    SET name = EXCLUDED.name,
+        city = EXCLUDED.city,
+        latitude = EXCLUDED.latitude,
+        longitude = EXCLUDED.longitude,
+        capacity = EXCLUDED.capacity,
+        surface = EXCLUDED.surface,
+        fetched_at = EXCLUDED.fetched_at
+"""
+
+
+def _load(team_id: int) -> Optional[Venue]:
+    try:
+        with get_cursor(commit=False) as cur:
+            cur.execute(f"SELECT {_COLUMNS} FROM venues WHERE fotmob_team_id = %s", (team_id,))
+            row = cur.fetchone()
+    except Exception as exc:
+        logger.warning("venues: read failed for team %s: %s", team_id, exc)
+        return None
+    return Venue(*row) if row else None
+
+
+def _save(venue: Venue) -> None:
+    try:
+        with get_cursor() as cur:
+            cur.execute(
+                _UPSERT_SQL,
+                (venue.fotmob_team_id, venue.name, venue.city, venue.latitude,
+                 venue.longitude, venue.capacity, venue.surface, venue.fetched_at),
+            )
+    except Exception as exc:
+        logger.warning("venues: write failed for team %s: %s", venue.fotmob_team_id, exc)
+
+
+# ---------------------------------------------------------------------------
+# Lookup
+# ---------------------------------------------------------------------------
+
+_memory: dict[int, Venue] = {}
+_locks: dict[int, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _fresh(venue: Optional[Venue], now: datetime) -> bool:
+    return venue is not None and now - venue.fetched_at < VENUE_TTL
+
+
+def get_venue(team_id: int, client: Any = None, refresh: bool = False) -> Optional[Venue]:
+    """Return the home venue of FotMob team *team_id*.
+
+    Args:
+        team_id: FotMob team id.
+        client: FotMob client (default :func:`get_fotmob_client`).
+        refresh: Re-download even when a fresh row is stored.
+
+    Returns:
+        The venue, or None when it is neither stored nor downloadable.
+    """
+    with _locks_guard:
+        lock = _locks.setdefault(team_id, threading.Lock())
+    with lock:
+        now = now_isr()
+        stored = _memory.get(team_id)
+        if not refresh and _fresh(stored, now):
+            mark_cache_hit("venues.memory")
+            return stored
+        if stored is None:
+            stored = _load(team_id)
+        if not refresh and _fresh(stored, now):
+            _memory[team_id] = stored
+            return stored
+
+        if client is None:
+            from soccersmartbet.pre_gambling_flow.tools.fotmob_client import get_fotmob_client
+
+            client = get_fotmob_client()
+        team_data = client.get_team_data(team_id)
+        if not team_data:
+            if stored is not None:
+                logger.info("venues: refresh failed for team %s, keeping stored row", team_id)
+                _memory[team_id] = stored
+            return stored
+        venue = venue_from_team_data(team_id, team_data, now)
+        _save(venue)
+        _memory[team_id] = venue
+        return venue
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+
+def seed_team_ids(cur: Any) -> list[int]:
+    """Return every distinct ``teams.fotmob_id``."""
+    cur.execute("SELECT DISTINCT fotmob_id FROM teams WHERE fotmob_id IS NOT NULL ORDER BY 1")
+    return [int(row[0]) for row in cur.fetchall()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from soccersmartbet.db import close_pool
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="FotMob home-stadium store")
+    parser.add_argument(
+        "--seed", action="store_true", help="fetch the venue of every team not yet stored"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="with --seed, re-fetch venues already stored"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.seed:
+            with get_cursor(commit=False) as cur:
+                team_ids = seed_team_ids(cur)
+            with ThreadPoolExecutor(max_workers=_SEED_WORKERS, thread_name_prefix="venue") as pool:
+                venues = list(pool.map(lambda tid: get_venue(tid, refresh=args.refresh), team_ids))
+            located = sum(1 for v in venues if v is not None and v.coordinates)
+            logger.info("venues: %d/%d team(s) with a located venue", located, len(team_ids))
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT COUNT(*), COUNT(latitude), MIN(fetched_at) FROM venues")
+            total, located, oldest = cur.fetchone()
+        logger.info("venues: %d row(s), %d located, oldest fetched %s", total, located, oldest)
+    finally:
+        close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,35 @@
 """FastAPI application shell for SoccerSmartBet dashboard.
 
 Binds to 127.0.0.1:8083.  Static files served from webapp/static/.
-No auth, no SSE, no WebSocket — polling only.
+No auth.  Live scores come from a background ingester started in the app
+lifespan, next to the odds sampler that records line movement.  Status and
+row-change notifications are pushed to the Today tab over Server-Sent
+Events (GET /api/status/stream), fed by one Postgres LISTEN connection per
+process; everything else is request/response.
 """
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import time as _time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from soccersmartbet.daily_runs import get_pending_post_games
 from soccersmartbet.db import get_cursor
+from soccersmartbet.db_listener import ChangeListener, get_listener
 from soccersmartbet.utils.timezone import now_isr, today_isr
+from soccersmartbet.webapp.async_cache import AsyncCache, cache_metrics
+from soccersmartbet.webapp.audit import EventType
+from soccersmartbet.webapp.compression import CompressionMiddleware
+from soccersmartbet.webapp.etag import DATA_VERSION, conditional_get_middleware
 
 logger = logging.getLogger(__name__)
 
@@ -26,24 +38,51 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 _PROCESS_START = now_isr()
 
+from soccersmartbet.webapp.live_ingester import start_live_ingester
+from soccersmartbet.webapp.odds_sampler import start_odds_sampler
 from soccersmartbet.webapp.routes.filter_values import router as filter_values_router
 from soccersmartbet.webapp.routes.insights import router as insights_router
 from soccersmartbet.webapp.routes.live import router as live_router
+from soccersmartbet.webapp.routes.odds import router as odds_router
 from soccersmartbet.webapp.routes.stats import router as stats_router
 from soccersmartbet.webapp.routes.today import router as today_router
 from soccersmartbet.webapp.runtime_state import LAST_POLLER_TICK
+from soccersmartbet.webapp.serialize import ORJSONResponse
 
 # ---------------------------------------------------------------------------
-# Status cache: key "today" → (payload_dict, cached_at_isr)
+# Status cache: key "today" → payload_dict (1s fresh, 4s stale-while-revalidate)
 # ---------------------------------------------------------------------------
-_STATUS_CACHE: dict[str, tuple[dict, Any]] = {}
-_STATUS_LOCK = asyncio.Lock()
+_STATUS_CACHE: AsyncCache[str, dict] = AsyncCache("status", ttl_s=1.0, stale_s=4.0, max_entries=1)
+# The ETag middleware tags /api/status/today by these tables (webapp/etag.py).
+DATA_VERSION.on_change(("daily_runs", "run_events"), lambda: _STATUS_CACHE.invalidate("today"))
 
 # ---------------------------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title="SoccerSmartBet Dashboard", docs_url=None, redoc_url=None)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    """Run the live-score ingester, odds sampler and data-version counters while serving."""
+    tasks = [t for t in (start_live_ingester(), start_odds_sampler()) if t is not None]
+    DATA_VERSION.start()
+    try:
+        yield
+    finally:
+        await DATA_VERSION.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+app = FastAPI(
+    title="SoccerSmartBet Dashboard",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=_lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Mount static files (Wave 11 will populate; directory must exist)
 _STATIC_DIR = Path(__file__).parent / "static"
@@ -65,6 +104,9 @@ app.include_router(insights_router)
 # Filter-values endpoint: GET /api/filter/values?key=<dsl_key>
 app.include_router(filter_values_router)
 
+# Odds movement: GET /api/games/{game_id}/odds (filled by the odds sampler)
+app.include_router(odds_router)
+
 
 @app.get("/", include_in_schema=False)
 async def _root_redirect() -> RedirectResponse:
@@ -88,6 +130,13 @@ async def _unhandled_exception_middleware(request: Request, call_next: Any) -> A
         )
 
 
+# Conditional GET (ETag / 304) for read-only JSON APIs — see webapp/etag.py.
+app.middleware("http")(conditional_get_middleware)
+
+# Brotli / gzip — registered last so it is outermost and sees every response.
+app.add_middleware(CompressionMiddleware)
+
+
 # ---------------------------------------------------------------------------
 # GET /api/health
 # ---------------------------------------------------------------------------
@@ -95,7 +144,7 @@ async def _unhandled_exception_middleware(request: Request, call_next: Any) -> A
 
 @app.get("/api/health")
 async def health() -> dict:
-    """Return liveness data: uptime, DB round-trip, last poller tick."""
+    """Return liveness data: uptime, DB round-trip, last poller tick, cache metrics."""
     uptime = (now_isr() - _PROCESS_START).total_seconds()
 
     t0 = _time.perf_counter()
@@ -108,6 +157,7 @@ async def health() -> dict:
         "uptime_seconds": round(uptime, 1),
         "db_ping_ms": db_ping_ms,
         "last_poller_tick_isr": LAST_POLLER_TICK[0] or None,
+        "caches": cache_metrics(),
     }
 
 
@@ -171,6 +221,11 @@ def _fetch_status_from_db() -> dict:
         }
         for r in event_rows
     ]
+    # Newest flow_trace summary (if it is still within the event window) — powers
+    # the "Last Run Breakdown" tile without an extra query.
+    last_trace = next(
+        (e["payload"] for e in events if e["event_type"] == EventType.FLOW_TRACE), None
+    )
 
     if run_row is None:
         return {
@@ -193,6 +248,7 @@ def _fetch_status_from_db() -> dict:
             "pending_post_games_date": pending_pg_date,
             "pending_post_games_game_ids": pending_pg_game_ids,
             "events": events,
+            "last_trace": last_trace,
         }
 
     def _iso(dt: Any) -> str | None:
@@ -218,27 +274,127 @@ def _fetch_status_from_db() -> dict:
         "pending_post_games_date": pending_pg_date,
         "pending_post_games_game_ids": pending_pg_game_ids,
         "events": events,
+        "last_trace": last_trace,
     }
 
 
 async def _get_cached_status() -> dict:
-    """Return status payload with 1-second server-side TTL cache.
+    """Return status payload from the 1-second AsyncCache.
 
-    Uses _STATUS_LOCK to prevent concurrent DB fetches on cache miss
-    (cache stampede / race condition guard).
+    Concurrent misses share one DB fetch (single-flight), and an entry up to
+    5 seconds old is served immediately while it refreshes in the background.
     """
-    now = now_isr()
-    async with _STATUS_LOCK:
-        if "today" in _STATUS_CACHE:
-            payload, cached_at = _STATUS_CACHE["today"]
-            if (now - cached_at).total_seconds() < 1.0:
-                return payload
-        payload = _fetch_status_from_db()
-        _STATUS_CACHE["today"] = (payload, now)
-        return payload
+    return await _STATUS_CACHE.get("today", lambda: asyncio.to_thread(_fetch_status_from_db))
 
 
 @app.get("/api/status/today")
 async def status_today() -> dict:
     """Return daily_runs row + last 10 run_events for today (1s TTL cache)."""
     return await _get_cached_status()
+
+
+# ---------------------------------------------------------------------------
+# GET /api/status/stream — Server-Sent Events push channel
+# ---------------------------------------------------------------------------
+
+_SSE_HEARTBEAT_S = 15.0
+_SSE_CLIENT_QUEUE = 50
+# Tables whose changes alter the /api/status/today payload.
+_STATUS_TABLES = frozenset({"daily_runs", "run_events"})
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+class _StatusBroadcaster:
+    """Fan DB change notifications out to every connected SSE client.
+
+    Holds one subscription on the process-wide ChangeListener and re-reads
+    the status payload once per burst of daily_runs / run_events changes, no
+    matter how many dashboards are open.  Other tables (games, bets) are
+    forwarded as lightweight ``change`` events so clients refetch only what
+    changed.  A listener reconnect (table ``"*"``) triggers both.
+    """
+
+    def __init__(self) -> None:
+        self._clients: set[asyncio.Queue[str]] = set()
+        self._task: asyncio.Task | None = None
+
+    def connect(self) -> asyncio.Queue[str]:
+        listener = get_listener()
+        listener.ensure_running()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(listener))
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=_SSE_CLIENT_QUEUE)
+        self._clients.add(queue)
+        return queue
+
+    def disconnect(self, queue: asyncio.Queue[str]) -> None:
+        self._clients.discard(queue)
+
+    def publish(self, message: str) -> None:
+        for queue in list(self._clients):
+            if queue.full():
+                queue.get_nowait()  # a stalled client loses its oldest message
+            queue.put_nowait(message)
+
+    async def _run(self, listener: ChangeListener) -> None:
+        changes = listener.subscribe()
+        try:
+            while True:
+                batch = [await changes.get()]
+                while not changes.empty():
+                    batch.append(changes.get_nowait())
+                if not self._clients:
+                    continue
+                tables = {c.get("table") for c in batch}
+                if tables & (_STATUS_TABLES | {"*"}):
+                    _STATUS_CACHE.invalidate("today")  # the row just changed
+                    try:
+                        self.publish(_sse("status", await _get_cached_status()))
+                    except Exception:
+                        logger.exception("status stream: status refresh failed")
+                for table in sorted(t for t in tables - _STATUS_TABLES if t):
+                    self.publish(_sse("change", {"table": table}))
+        finally:
+            listener.unsubscribe(changes)
+
+
+_BROADCASTER = _StatusBroadcaster()
+
+
+@app.get("/api/status/stream")
+async def status_stream(request: Request) -> StreamingResponse:
+    """Push status updates and row-change notifications as Server-Sent Events.
+
+    Events:
+        ``status`` — full /api/status/today payload (sent on connect and on
+        every daily_runs / run_events change).
+        ``change`` — ``{"table": "games" | "bets" | "*"}``; the client
+        refetches the affected data.
+    A comment heartbeat every 15s keeps proxies from closing idle streams.
+    """
+    initial = await _get_cached_status()
+    queue = _BROADCASTER.connect()
+
+    async def _events():
+        try:
+            yield "retry: 3000\n" + _sse("status", initial)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=_SSE_HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    message = ": ping\n\n"
+                yield message
+        finally:
+            _BROADCASTER.disconnect(queue)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,202 @@
+"""In-process async cache shared by the dashboard's hot endpoints.
+
+One :class:`AsyncCache` replaces the hand-rolled dict caches in the status,
+live-score and filter-values handlers.  Per entry it distinguishes three ages:
+
+* ``age < ttl_s`` — fresh: returned as-is (``hits``);
+* ``ttl_s <= age < ttl_s + stale_s`` — stale: returned immediately while one
+  background task reloads it (``stale_hits`` / ``refreshes``);
+* older, or missing — the caller awaits a load (``misses``).
+
+Loads are single-flight per key: concurrent callers for the same key await
+the same task (``coalesced``) instead of each hitting the upstream.  If a
+load fails and an expired value is still held, that value is served
+(stale-if-error) and the failure is counted in ``errors``; otherwise the
+exception propagates to every waiter.
+
+Entries are kept in LRU order and the least recently used one is evicted
+beyond ``max_entries``.  ``pin`` marks values that never expire (e.g.
+finished games).  :meth:`AsyncCache.invalidate` / :meth:`invalidate_all`
+also detach loads already running, so a load that started before a write
+can never store its result afterwards.  Every cache registers itself by name so ``/api/health``
+can report :func:`cache_metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_REGISTRY: dict[str, "AsyncCache[Any, Any]"] = {}
+
+
+@dataclass
+class CacheMetrics:
+    """Counters for one cache since process start (or the last clear)."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    evictions: int = 0
+
+
+class AsyncCache(Generic[K, V]):
+    """Single-flight, stale-while-revalidate LRU cache for async loaders."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_s: float,
+        *,
+        stale_s: float = 0.0,
+        max_entries: int = 256,
+        pin: Callable[[V], bool] | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl_s = ttl_s
+        self.stale_s = stale_s
+        self.max_entries = max_entries
+        self.metrics = CacheMetrics()
+        self._pin = pin
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task] = {}
+        # Bumped by every invalidation; a load only stores under the one it began in.
+        self._generation = 0
+        _REGISTRY[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def peek(self, key: K) -> V | None:
+        """Return the stored value for *key* regardless of age (no metrics)."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: K, value: V, *, age: float = 0.0) -> None:
+        """Store *value*; *age* back-dates it by that many seconds."""
+        self._entries[key] = (value, time.monotonic() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop *key* so the next read loads it again (not joining a running load)."""
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+        self._generation += 1
+
+    def invalidate_all(self) -> None:
+        """Drop every entry and running load, keeping the metrics."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the metrics."""
+        self._entries.clear()
+        self._inflight.clear()
+        self.metrics = CacheMetrics()
+
+    async def get(
+        self, key: K, loader: Callable[[], Awaitable[V]], *, fresh: bool = False
+    ) -> V:
+        """Return the value for *key*, loading it with *loader* when needed.
+
+        Args:
+            key: Cache key.
+            loader: Zero-argument coroutine function producing the value.
+            fresh: Skip the stored value and wait for a new load.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and not fresh:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            pinned = self._pin is not None and self._pin(value)
+            if pinned or age < self.ttl_s:
+                self.metrics.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl_s + self.stale_s:
+                self.metrics.stale_hits += 1
+                self._entries.move_to_end(key)
+                if self._running_load(key) is None:
+                    self.metrics.refreshes += 1
+                    self._start_load(key, loader).add_done_callback(
+                        lambda t: self._log_refresh_error(key, t)
+                    )
+                return value
+
+        task = self._running_load(key)
+        if task is not None:
+            self.metrics.coalesced += 1
+        else:
+            self.metrics.misses += 1
+            task = self._start_load(key, loader)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            stale = self._entries.get(key)
+            if stale is None:
+                raise
+            logger.warning("cache %s: load of %r failed — serving stale value", self.name, key)
+            return stale[0]
+
+    def _running_load(self, key: K) -> asyncio.Task | None:
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            return None
+        return task
+
+    def _start_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> asyncio.Task:
+        generation = self._generation
+
+        async def _load() -> V:
+            try:
+                value = await loader()
+            except Exception:
+                self.metrics.errors += 1
+                raise
+            if self._generation == generation:
+                self.set(key, value)
+            return value
+
+        task = asyncio.ensure_future(_load())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    def _forget(self, key: K, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _log_refresh_error(self, key: K, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "cache %s: background refresh of %r failed: %s",
+                self.name,
+                key,
+                task.exception(),
+            )
+
+
+def cache_metrics() -> dict[str, dict[str, int]]:
+    """Return the metrics of every registered cache, keyed by cache name."""
+    return {
+        name: {**asdict(cache.metrics), "entries": len(cache)}
+        for name, cache in sorted(_REGISTRY.items())
+    }
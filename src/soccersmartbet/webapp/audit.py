@@ -26,6 +26,7 @@ class EventType:
     POST_GAMES_STARTED: str = "post_games_started"
     POST_GAMES_COMPLETED: str = "post_games_completed"
     POST_GAMES_FAILED: str = "post_games_failed"
+    FLOW_TRACE: str = "flow_trace"
 
 
 def write_run_event(
@@ -0,0 +1,207 @@
+"""Brotli / gzip response compression for the dashboard.
+
+A pure ASGI middleware (no ``BaseHTTPMiddleware`` buffering) that picks
+``br`` or ``gzip`` from the request's ``Accept-Encoding`` — honouring
+``q=0`` — and compresses text-like responses on the way out:
+
+* a body below ``minimum_size`` (by length or ``Content-Length``) is sent as-is;
+* multi-chunk bodies (large static files) are compressed incrementally;
+* Server-Sent Events, already-encoded responses, bodiless statuses
+  (204 / 304) and partial content (206 or ``Content-Range`` — the static
+  mount answers Range requests) always pass through untouched, so the
+  status stream keeps flushing event by event and byte ranges keep
+  addressing the identity body.
+
+Weak ETags (see :mod:`soccersmartbet.webapp.etag`) stay valid across
+encodings, so conditional GETs work the same compressed or not.  A strong
+ETag (``StaticFiles``) names the exact bytes, so it is weakened on the
+compressed variant; weak comparison still matches it on ``If-None-Match``.
+"""
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Protocol
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content types worth compressing; everything else (images, fonts) is
+# already compressed.  text/event-stream is excluded explicitly below.
+_COMPRESSIBLE_PREFIXES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+_ENCODINGS = ("br", "gzip")  # server preference order
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 11 is several times slower for a few % smaller bodies
+
+
+class _Compressor(Protocol):
+    def process(self, data: bytes) -> bytes: ...
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int) -> None:
+        self._b = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._b.process(data) + self._b.flush()
+
+    def finish(self) -> bytes:
+        return self._b.finish()
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Return ``"br"``, ``"gzip"`` or None for an ``Accept-Encoding`` value.
+
+    Codings with ``q=0`` are refused; ``*`` accepts any coding not listed.
+    Among acceptable codings the server's preference (brotli first) wins.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    for coding in _ENCODINGS:
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_PREFIXES)
+
+
+class CompressionMiddleware:
+    """Compress eligible responses with brotli or gzip.
+
+    Args:
+        app: The wrapped ASGI app.
+        minimum_size: Bodies smaller than this are not compressed.
+        gzip_level: zlib level (1–9).
+        brotli_quality: Brotli quality (0–11); mid values suit dynamic JSON.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _compress(self, coding: str, body: bytes) -> bytes:
+        if coding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _compressor(self, coding: str) -> _Compressor:
+        if coding == "br":
+            return _Brotli(self.brotli_quality)
+        return _Gzip(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or "content-range" in headers
+                    or "content-encoding" in headers
+                    or not _is_compressible(headers)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message  # held until the first body chunk
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(raw=response_start["headers"])
+                # Wrapping http middlewares re-chunk bodies, so fall back to
+                # the declared length when the first chunk is not the last.
+                size = len(body)
+                if more_body:
+                    size = int(headers.get("content-length") or self.minimum_size)
+                if size < self.minimum_size:
+                    passthrough = True
+                    await send(response_start)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if not more_body:
+                    body = self._compress(coding, body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                compressor = self._compressor(coding)
+                await send(response_start)
+
+            assert compressor is not None
+            chunk = compressor.process(body)
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,170 @@
+"""Weak ETags and conditional GETs for the dashboard's read-only JSON APIs.
+
+A handler derives an ETag from whatever identifies its payload (the JSON
+text itself, a snapshot version, request parameters), then answers
+``If-None-Match`` hits with a bodiless 304 instead of re-sending the data.
+Weak comparison (RFC 9110 §8.8.3.2) is used throughout.
+
+For the routes in ``ETAG_ROUTES`` this happens in
+:func:`conditional_get_middleware`, *before* the handler runs: the ETag is
+derived from :data:`DATA_VERSION` — per-table write counters bumped by the
+``ssb_changes`` NOTIFY triggers — plus today's date, the path and the query
+string.  A repeat poll with nothing written in between therefore costs no
+query at all.  While the LISTEN connection is down the counters cannot be
+trusted, so requests pass straight through without validators.
+
+Routes that serve from an in-process cache register it with
+:meth:`DataVersion.on_change`; it is invalidated *before* the counter moves,
+so a request carrying the new tag can never be answered from data loaded
+before the write.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import secrets
+from typing import Any, Callable
+
+from fastapi import Request, Response
+
+from soccersmartbet.db_listener import ChangeListener, get_listener
+from soccersmartbet.utils.timezone import today_isr
+
+_BET_TABLES = ("bets", "games")
+
+# GET routes validated by the middleware → tables their payload is read from.
+ETAG_ROUTES: tuple[tuple[re.Pattern[str], tuple[str, ...]], ...] = (
+    (re.compile(r"^/api/bets$"), _BET_TABLES),
+    (re.compile(r"^/api/pnl$"), _BET_TABLES),
+    (re.compile(r"^/api/teams/[^/]+/stats$"), _BET_TABLES),
+    (re.compile(r"^/api/leagues/[^/]+/stats$"), _BET_TABLES),
+    (re.compile(r"^/api/filter/values$"), _BET_TABLES),
+    (re.compile(r"^/api/today/pnl$"), _BET_TABLES),
+    (re.compile(r"^/api/status/today$"), ("daily_runs", "run_events")),
+)
+
+
+def weak_etag(*parts: object) -> str:
+    """Return a weak ETag (``W/"…"``) hashed from *parts*."""
+    blob = "\x1f".join(str(p) for p in parts).encode("utf-8")
+    return f'W/"{hashlib.sha1(blob).hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True when the request's ``If-None-Match`` matches *etag*."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(tag) == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 carrying *etag*."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+# ---------------------------------------------------------------------------
+# Data-version counters
+# ---------------------------------------------------------------------------
+
+
+class DataVersion:
+    """Per-table write counters kept current by the process ChangeListener."""
+
+    def __init__(self) -> None:
+        self._epoch = secrets.token_hex(4)
+        self._counts: dict[str, int] = {}
+        self._listener: ChangeListener | None = None
+        self._task: asyncio.Task | None = None
+        self._invalidators: list[tuple[frozenset[str], Callable[[], None]]] = []
+
+    def on_change(self, tables: tuple[str, ...], invalidate: Callable[[], None]) -> None:
+        """Call *invalidate* on every write to one of *tables*, before the counter moves."""
+        self._invalidators.append((frozenset(tables), invalidate))
+
+    def bump(self, table: str) -> None:
+        """Record a write to *table*; ``"*"`` (listener reconnect) resets everything."""
+        for tables, invalidate in self._invalidators:
+            if table == "*" or table in tables:
+                invalidate()
+        if table == "*":
+            self._epoch = secrets.token_hex(4)
+            self._counts.clear()
+        else:
+            self._counts[table] = self._counts.get(table, 0) + 1
+
+    def token(self, tables: tuple[str, ...]) -> str | None:
+        """Return a version string for *tables*, or None while untrusted."""
+        if self._listener is None or not self._listener.connected:
+            return None
+        return ":".join([self._epoch, *(str(self._counts.get(t, 0)) for t in tables)])
+
+    def start(self, listener: ChangeListener | None = None) -> asyncio.Task:
+        """Subscribe to *listener* (default: the process listener) on the running loop."""
+        self._listener = listener or get_listener()
+        self._listener.ensure_running()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(self._listener), name="data-version")
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._listener = None
+
+    async def _run(self, listener: ChangeListener) -> None:
+        changes = listener.subscribe()
+        try:
+            while True:
+                change = await changes.get()
+                self.bump(change.get("table") or "*")
+        finally:
+            listener.unsubscribe(changes)
+
+
+DATA_VERSION = DataVersion()
+
+
+def _route_tables(path: str) -> tuple[str, ...] | None:
+    for pattern, tables in ETAG_ROUTES:
+        if pattern.match(path):
+            return tables
+    return None
+
+
+async def conditional_get_middleware(request: Request, call_next: Any) -> Any:
+    """Answer unchanged GETs on ``ETAG_ROUTES`` with 304 before the handler runs."""
+    if request.method != "GET":
+        return await call_next(request)
+    tables = _route_tables(request.url.path)
+    version = DATA_VERSION.token(tables) if tables is not None else None
+    if version is None:
+        return await call_next(request)
+
+    # Computed before the handler runs: a write that lands mid-query yields
+    # new data under the old tag, never old data under a new one (cached
+    # routes are invalidated before the counter moves, see on_change).
+    etag = weak_etag(
+        version,
+        today_isr(),
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers.setdefault("Cache-Control", "no-cache")
+    return response
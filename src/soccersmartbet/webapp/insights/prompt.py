@@ -1,6 +1,7 @@
 """System prompt + single-shot LLM call for the AI insights endpoint.
 
 This is NOT a LangGraph flow — it is one synchronous ``ChatOpenAI.invoke``
+(routed through :func:`soccersmartbet.utils.llm.invoke_text`)
 wrapped in :func:`asyncio.to_thread` by the caller in :mod:`jobs`.
 
 The model / temperature choice mirrors
@@ -15,9 +16,9 @@ import logging
 from typing import Iterable
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from soccersmartbet.pre_gambling_flow.agents.game_intelligence import INTELLIGENCE_MODEL
+from soccersmartbet.utils.llm import invoke_text
 from soccersmartbet.utils.timezone import format_isr_date, format_isr_time
 from soccersmartbet.webapp.query.models import BetRow, FilterResult
 
@@ -159,8 +160,9 @@ def generate_insights(result: FilterResult) -> str:
         result.aggregates.count,
     )
 
-    model = ChatOpenAI(model=INTELLIGENCE_MODEL, temperature=0.2)
-    response = model.invoke(
+    response = invoke_text(
+        INTELLIGENCE_MODEL,
+        0.2,
         [
             SystemMessage(content=SYSTEM_PROMPT),
             HumanMessage(content=_build_user_message(result)),
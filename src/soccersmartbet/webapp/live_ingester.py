@@ -0,0 +1,196 @@
+"""Background live-score ingester for /api/today/live.
+
+One task per process polls FotMob for today's mapped games and publishes a
+versioned :class:`~soccersmartbet.webapp.routes.live.LiveSnapshot`.  Request
+handlers only read the snapshot, so FotMob load depends on the number of
+games in play, not on the number of open dashboards.
+
+Adaptive cadence, driven by ``games.kickoff_time``:
+
+* more than ``_PRE_KICKOFF_LEAD`` before kickoff — idle, a ``"pre"``
+  placeholder is published without calling FotMob;
+* from the lead until full time — every ``_LIVE_POLL_S`` (``_HT_POLL_S``
+  during half-time);
+* after ``FT`` — never again; the final entry stays in the snapshot;
+* ``_GIVE_UP_AFTER`` past kickoff without ``FT`` (postponed / abandoned) —
+  polling stops and the last known entry is kept.
+
+Between polls the task sleeps until the next due game, waking early on a
+``games`` NOTIFY so newly persisted games are picked up immediately.
+``LIVE_INGESTER=0`` disables it; the route then falls back to on-demand
+fetches with its 30-second cache.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+from soccersmartbet.db import get_cursor
+from soccersmartbet.db_listener import get_listener, wait_for_change
+from soccersmartbet.utils.timezone import isr_datetime, now_isr
+from soccersmartbet.webapp.routes.live import (
+    _fetch_match_raw,
+    _parse_game_entry,
+    publish_snapshot,
+    unknown_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+_PRE_KICKOFF_LEAD = timedelta(minutes=5)
+_GIVE_UP_AFTER = timedelta(hours=4)
+_LIVE_POLL_S = 30
+_HT_POLL_S = 60
+# Upper bound on any sleep: re-reads games (date rollover, missed NOTIFY)
+# and republishes so the route never treats the snapshot as stale.
+_IDLE_RECHECK_S = 600
+_ERROR_BACKOFF_S = 30
+
+
+def ingester_enabled() -> bool:
+    """Return False when ``LIVE_INGESTER`` turns the background ingester off."""
+    return os.getenv("LIVE_INGESTER", "1").strip().lower() not in ("0", "false", "no")
+
+
+def _fetch_games(run_date: date) -> list[dict]:
+    """Return the run date's fotmob-mapped games with ISR kickoff datetimes."""
+    with get_cursor(commit=False) as cur:
+        cur.execute(
+            """
+            SELECT game_id, fotmob_match_id, kickoff_time
+            FROM games
+            WHERE match_date = %s
+              AND fotmob_match_id IS NOT NULL
+            ORDER BY game_id
+            """,
+            (run_date,),
+        )
+        rows = cur.fetchall()
+    return [
+        {
+            "game_id": game_id,
+            "fotmob_match_id": fotmob_match_id,
+            "kickoff": isr_datetime(
+                run_date.year, run_date.month, run_date.day, kt.hour, kt.minute
+            ),
+        }
+        for game_id, fotmob_match_id, kt in rows
+    ]
+
+
+def _plan_polls(
+    now: datetime,
+    games: list[dict],
+    entries: dict[int, dict],
+    polled_at: dict[int, datetime],
+) -> tuple[list[dict], datetime | None]:
+    """Decide which games to poll now and when the next poll is due.
+
+    Pure function of its inputs so the cadence can be tested without a
+    clock, a DB or FotMob.
+
+    Args:
+        now: Current ISR time.
+        games: Rows from :func:`_fetch_games`.
+        entries: Last parsed entry per game_id.
+        polled_at: Last poll attempt per game_id.
+
+    Returns:
+        ``(due, next_poll_at)`` — games to fetch now and the earliest future
+        poll time, or ``None`` when every game is finished or abandoned.
+    """
+    due: list[dict] = []
+    next_at: datetime | None = None
+    for game in games:
+        gid = game["game_id"]
+        entry = entries.get(gid)
+        if entry is not None and entry["finished"]:
+            continue
+        window_opens = game["kickoff"] - _PRE_KICKOFF_LEAD
+        if now < window_opens:
+            candidate = window_opens
+        elif entry is not None and now > game["kickoff"] + _GIVE_UP_AFTER:
+            continue
+        else:
+            at_half_time = entry is not None and entry["period"] == "HT"
+            cadence = timedelta(seconds=_HT_POLL_S if at_half_time else _LIVE_POLL_S)
+            last = polled_at.get(gid)
+            if last is None or now >= last + cadence:
+                due.append(game)
+                candidate = now + cadence
+            else:
+                candidate = last + cadence
+        next_at = candidate if next_at is None else min(next_at, candidate)
+    return due, next_at
+
+
+async def _poll_game(game: dict, previous: dict | None) -> dict:
+    """Fetch one game; keep *previous* (or an ``unknown`` entry) on failure."""
+    data = await asyncio.to_thread(_fetch_match_raw, game["fotmob_match_id"])
+    if data is None:
+        return previous or unknown_entry(game["game_id"], game["fotmob_match_id"])
+    return _parse_game_entry(game["game_id"], game["fotmob_match_id"], data)
+
+
+async def run_live_ingester() -> None:
+    """Poll FotMob for today's games forever, publishing a snapshot per cycle."""
+    listener = get_listener()
+    listener.ensure_running()
+    wake = listener.subscribe()
+    run_date: date | None = None
+    entries: dict[int, dict] = {}
+    polled_at: dict[int, datetime] = {}
+    logger.info("live_ingester: started")
+    try:
+        while True:
+            now = now_isr()
+            try:
+                games = await asyncio.to_thread(_fetch_games, now.date())
+            except Exception as exc:
+                logger.warning("live_ingester: games query failed (%s)", exc)
+                await asyncio.sleep(_ERROR_BACKOFF_S)
+                continue
+
+            if now.date() != run_date:
+                run_date = now.date()
+                entries.clear()
+                polled_at.clear()
+
+            due, next_at = _plan_polls(now, games, entries, polled_at)
+            if due:
+                results = await asyncio.gather(
+                    *(_poll_game(g, entries.get(g["game_id"])) for g in due)
+                )
+                for game, entry in zip(due, results):
+                    entries[game["game_id"]] = entry
+                    polled_at[game["game_id"]] = now
+                logger.debug("live_ingester: polled %d game(s)", len(due))
+
+            snap = publish_snapshot(
+                run_date,
+                [
+                    entries.get(g["game_id"])
+                    or unknown_entry(g["game_id"], g["fotmob_match_id"], period="pre")
+                    for g in games
+                ],
+            )
+
+            deadline = now + timedelta(seconds=_IDLE_RECHECK_S)
+            if next_at is not None:
+                deadline = min(deadline, next_at)
+            logger.debug(
+                "live_ingester: snapshot v%d, next poll at %s", snap.version, deadline
+            )
+            await wait_for_change(deadline, wake, ("games",))
+    finally:
+        listener.unsubscribe(wake)
+
+
+def start_live_ingester() -> asyncio.Task | None:
+    """Start the ingester on the running loop (``None`` when disabled)."""
+    if not ingester_enabled():
+        logger.info("live_ingester: disabled by LIVE_INGESTER")
+        return None
+    return asyncio.create_task(run_live_ingester(), name="live-ingester")
@@ -0,0 +1,106 @@
+"""Background winner.co.il odds sampler feeding ``odds_snapshots``.
+
+One task per process.  While any of today's games has not kicked off it
+samples every ``ODDS_SAMPLE_INTERVAL_S`` seconds (default 600): it refreshes
+the shared winner line snapshot
+(:func:`~soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds.get_winner_line`)
+and records each pending game's price through
+:func:`soccersmartbet.odds_history.sample` — one download and one bulk
+insert per round, however many games there are.
+
+With nothing left to sample it sleeps until the idle recheck.  Either wait
+ends early on a ``games`` NOTIFY, so the morning pick starts the series
+immediately.
+``ODDS_SAMPLER=0`` disables it.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import os
+from datetime import datetime, timedelta
+
+from soccersmartbet import odds_history
+from soccersmartbet.db import get_cursor
+from soccersmartbet.db_listener import get_listener, wait_for_change
+from soccersmartbet.utils.timezone import now_isr
+
+logger = logging.getLogger(__name__)
+
+# The package re-exports the fetch_winner_odds function under the module's name.
+_winner = importlib.import_module(
+    "soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds"
+)
+
+_DEFAULT_INTERVAL_S = 600
+_IDLE_RECHECK_S = 1800
+_ERROR_BACKOFF_S = 60
+
+
+def sampler_enabled() -> bool:
+    """Return False when ``ODDS_SAMPLER`` turns the background sampler off."""
+    return os.getenv("ODDS_SAMPLER", "1").strip().lower() not in ("0", "false", "no")
+
+
+def _interval() -> timedelta:
+    try:
+        seconds = int(os.getenv("ODDS_SAMPLE_INTERVAL_S", str(_DEFAULT_INTERVAL_S)))
+    except ValueError:
+        seconds = _DEFAULT_INTERVAL_S
+    return timedelta(seconds=max(seconds, 60))
+
+
+def _count_pending(now: datetime) -> int:
+    with get_cursor(commit=False) as cur:
+        return len(odds_history.fetch_pending_games(cur, now))
+
+
+def sample_once(now: datetime, interval: timedelta) -> int:
+    """Take one sample for today's pending games; returns rows written.
+
+    The line is re-downloaded unless the shared snapshot is younger than
+    half an *interval* (e.g. the picker or a tool lookup just fetched it).
+    """
+    line, error = _winner.get_winner_line(max_age=interval / 2)
+    if line is None:
+        logger.warning("odds_sampler: winner line unavailable (%s)", error)
+        return 0
+    with get_cursor() as cur:
+        return odds_history.sample(cur, now, line)
+
+
+async def run_odds_sampler() -> None:
+    """Sample today's pending games forever."""
+    listener = get_listener()
+    listener.ensure_running()
+    wake = listener.subscribe()
+    interval = _interval()
+    logger.info("odds_sampler: started (every %ds)", interval.total_seconds())
+    try:
+        while True:
+            now = now_isr()
+            try:
+                pending = await asyncio.to_thread(_count_pending, now)
+                if pending:
+                    written = await asyncio.to_thread(sample_once, now, interval)
+                    logger.debug(
+                        "odds_sampler: %d pending game(s), %d change(s) stored", pending, written
+                    )
+            except Exception as exc:
+                logger.warning("odds_sampler: sampling failed (%s)", exc)
+                await asyncio.sleep(_ERROR_BACKOFF_S)
+                continue
+
+            wait = interval if pending else timedelta(seconds=_IDLE_RECHECK_S)
+            await wait_for_change(now + wait, wake, ("games",))
+    finally:
+        listener.unsubscribe(wake)
+
+
+def start_odds_sampler() -> asyncio.Task | None:
+    """Start the sampler on the running loop (``None`` when disabled)."""
+    if not sampler_enabled():
+        logger.info("odds_sampler: disabled by ODDS_SAMPLER")
+        return None
+    return asyncio.create_task(run_odds_sampler(), name="odds-sampler")
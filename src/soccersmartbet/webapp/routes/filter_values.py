@@ -12,9 +12,11 @@ Response shapes:
   Date      → {"key": str, "kind": "date",    "min": str,   "max": str}
 
 Design decisions:
-- In-process 60-second TTL cache per key: distinct-value queries are called
-  on every keypress in the autocomplete widget and the underlying data changes
-  at most once per day.  No external cache dependency (Redis not needed).
+- In-process AsyncCache per key (60-second TTL, then up to 10 minutes of
+  stale-while-revalidate): distinct-value queries are called on every
+  keypress in the autocomplete widget and the underlying data changes at
+  most once per day.  Concurrent misses share one DB query.  No external
+  cache dependency (Redis not needed).
 - Cache bypass: ?fresh=1 forces a new DB query and refills the cache entry.
 - Enum canonical labels for outcome/prediction/result: the compiler maps any
   accepted alias to a single-char DB value ('1'/'x'/'2').  We expose the
@@ -25,14 +27,16 @@ Design decisions:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-import time as _time
 from typing import Annotated, Union
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, ConfigDict
 
 from soccersmartbet.db import get_cursor
+from soccersmartbet.webapp.async_cache import AsyncCache
+from soccersmartbet.webapp.etag import DATA_VERSION
 from soccersmartbet.webapp.query.parser import VALID_KEYS
 
 logger = logging.getLogger(__name__)
@@ -122,25 +126,14 @@ _ENUM_LABELS: list[str] = [
 # ---------------------------------------------------------------------------
 
 _CACHE_TTL_SECONDS: float = 60.0
+_CACHE_STALE_SECONDS: float = 600.0
 
-# key → (payload_dict, cached_at_monotonic)
-_cache: dict[str, tuple[dict, float]] = {}
-
-
-def _cache_get(key: str) -> dict | None:
-    """Return cached payload for *key* if still within TTL, else None."""
-    entry = _cache.get(key)
-    if entry is None:
-        return None
-    payload, cached_at = entry
-    if (_time.monotonic() - cached_at) < _CACHE_TTL_SECONDS:
-        return payload
-    return None
-
-
-def _cache_set(key: str, payload: dict) -> None:
-    """Store *payload* for *key* with the current monotonic timestamp."""
-    _cache[key] = (payload, _time.monotonic())
+# key → payload_dict
+_cache: AsyncCache[str, dict] = AsyncCache(
+    "filter_values", ttl_s=_CACHE_TTL_SECONDS, stale_s=_CACHE_STALE_SECONDS
+)
+# The ETag middleware tags these responses by bets/games writes (webapp/etag.py).
+DATA_VERSION.on_change(("bets", "games"), _cache.invalidate_all)
 
 
 # ---------------------------------------------------------------------------
@@ -315,8 +308,9 @@ async def get_filter_values(
 ) -> FilterValuesResponse:
     """Return the valid values (or numeric/date range) for a given DSL filter key.
 
-    Responses are cached in-process with a 60-second TTL.  Pass ``?fresh=1``
-    to bypass the cache and force a new DB query.
+    Responses are cached in-process with a 60-second TTL, then served stale
+    while refreshing in the background.  Pass ``?fresh=1`` to bypass the
+    cache and force a new DB query.
 
     Args:
         key: A DSL key from the parser's ``VALID_KEYS`` set.
@@ -335,14 +329,8 @@ async def get_filter_values(
             detail=f"Unknown filter key: {key}",
         )
 
-    use_cache = not bool(fresh)
-    if use_cache:
-        cached = _cache_get(key)
-        if cached is not None:
-            return cached  # type: ignore[return-value]
-
     fetcher = _FETCHERS[key]
-    payload = fetcher()  # type: ignore[operator]
-    _cache_set(key, payload)
-
+    payload = await _cache.get(
+        key, lambda: asyncio.to_thread(fetcher), fresh=bool(fresh)  # type: ignore[arg-type]
+    )
     return payload  # type: ignore[return-value]
@@ -17,10 +17,19 @@ Period derivation (matches spec):
   - finished                                   → "FT"
   - anything else (parse error, unknown)       → "unknown"
 
-Caching:
-  - 30-second in-process cache per game, keyed by (game_id, fotmob_match_id).
-  - Finished games are NOT evicted from cache (period "FT"); they will keep
-    returning the cached final score without hitting FotMob again.
+Snapshot (normal path):
+  - The background live ingester (webapp/live_ingester.py) polls FotMob at
+    an adaptive cadence and publishes a versioned LiveSnapshot of every
+    mapped game for the day.  While a snapshot for today is fresh, requests
+    read it in O(1) and never call FotMob — upstream load is independent of
+    how many dashboards are open.
+
+Caching (on-demand fallback, used when the ingester is not running):
+  - AsyncCache per game, keyed by (game_id, fotmob_match_id): fresh for 30
+    seconds, then served stale for up to 30 more while one background fetch
+    refreshes it.  Concurrent requests share a single FotMob fetch per game.
+  - Finished games are pinned (period "FT"); they will keep returning the
+    cached final score without hitting FotMob again.
   - On FotMob failure for one game, last known cached value is returned if
     available, else period="unknown".
   - Cache does NOT persist across process restarts.
@@ -43,26 +52,77 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import time
+from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Any, Optional
 
-import requests
-
 from fastapi import APIRouter
 from soccersmartbet.db import get_cursor
 from soccersmartbet.post_games_flow.pnl_calculator import compute_bet_pnl_estimate
 from soccersmartbet.pre_gambling_flow.tools.fotmob_client import _generate_xmas_header
+from soccersmartbet.utils.cassette import http_get
 from soccersmartbet.utils.timezone import now_isr, today_isr
+from soccersmartbet.webapp.async_cache import AsyncCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # ---------------------------------------------------------------------------
-# In-process cache: (game_id, fotmob_match_id) → (payload_dict, cached_at_epoch)
+# In-process cache: (game_id, fotmob_match_id) → entry dict
 # ---------------------------------------------------------------------------
-_LIVE_CACHE: dict[tuple[int, int], tuple[dict, float]] = {}
 _CACHE_TTL_SECONDS = 30.0
+_LIVE_CACHE: AsyncCache[tuple[int, int], dict] = AsyncCache(
+    "live",
+    ttl_s=_CACHE_TTL_SECONDS,
+    stale_s=_CACHE_TTL_SECONDS,
+    max_entries=128,
+    pin=lambda entry: bool(entry.get("finished")),
+)
+
+# ---------------------------------------------------------------------------
+# Shared snapshot written by the live ingester, read by every request
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    """Immutable view of every mapped game's live state for one run date."""
+
+    version: int
+    run_date: date
+    as_of: datetime
+    entries: tuple[dict, ...]
+
+
+# A snapshot older than this is ignored (ingester stopped or stuck); the
+# ingester republishes at least every live_ingester._IDLE_RECHECK_S seconds.
+_SNAPSHOT_MAX_AGE_S = 900.0
+
+_SNAPSHOT: LiveSnapshot | None = None
+
+
+def publish_snapshot(run_date: date, entries: list[dict]) -> LiveSnapshot:
+    """Replace the shared snapshot with *entries*, bumping its version."""
+    global _SNAPSHOT
+    version = _SNAPSHOT.version + 1 if _SNAPSHOT is not None else 1
+    _SNAPSHOT = LiveSnapshot(
+        version=version,
+        run_date=run_date,
+        as_of=now_isr(),
+        entries=tuple(dict(e) for e in entries),
+    )
+    return _SNAPSHOT
+
+
+def current_snapshot() -> LiveSnapshot | None:
+    """Return today's snapshot if the ingester published one recently."""
+    snap = _SNAPSHOT
+    if snap is None or snap.run_date != today_isr():
+        return None
+    if (now_isr() - snap.as_of).total_seconds() > _SNAPSHOT_MAX_AGE_S:
+        return None
+    return snap
 
 # ---------------------------------------------------------------------------
 # FotMob helpers (sync, runs in asyncio.to_thread)
@@ -81,7 +141,7 @@ def _fetch_match_raw(fotmob_match_id: int) -> Optional[dict]:
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             ),
         }
-        resp = requests.get(url, headers=headers, timeout=_FOTMOB_TIMEOUT)
+        resp = http_get(url, headers=headers, timeout=_FOTMOB_TIMEOUT)
         resp.raise_for_status()
         return resp.json()
     except Exception as exc:
@@ -123,6 +183,19 @@ def _derive_period(data: dict) -> str:
         return "unknown"
 
 
+def unknown_entry(game_id: int, fotmob_match_id: int, period: str = "unknown") -> dict:
+    """Return a placeholder entry for a game with no FotMob data."""
+    return {
+        "game_id": game_id,
+        "fotmob_match_id": fotmob_match_id,
+        "home_score": None,
+        "away_score": None,
+        "period": period,
+        "minute": None,
+        "finished": False,
+    }
+
+
 def _parse_game_entry(game_id: int, fotmob_match_id: int, data: dict) -> dict:
     """Build a single game entry dict from a FotMob match response."""
     period = _derive_period(data)
@@ -168,44 +241,21 @@ def _parse_game_entry(game_id: int, fotmob_match_id: int, data: dict) -> dict:
 async def _get_game_live(game_id: int, fotmob_match_id: int) -> dict:
     """Return a live entry for one game, with cache and graceful degradation.
 
-    - Checks the 30-second cache first.
+    - Served from the AsyncCache (30s fresh + 30s stale-while-revalidate).
     - Finished games are served from cache indefinitely (no re-poll).
     - On FotMob failure, returns last known cache value or period="unknown".
     """
-    cache_key = (game_id, fotmob_match_id)
-    now_epoch = time.monotonic()
-
-    # Cache hit
-    if cache_key in _LIVE_CACHE:
-        cached_entry, cached_at = _LIVE_CACHE[cache_key]
-        # Serve from cache if: still within TTL, OR game is finished
-        if cached_entry.get("finished") or (now_epoch - cached_at) < _CACHE_TTL_SECONDS:
-            return cached_entry
-
-    # Cache miss (or stale) — fetch from FotMob
-    data = await asyncio.to_thread(_fetch_match_raw, fotmob_match_id)
-
-    if data is None:
-        # Degraded: return stale cache if available, else unknown
-        if cache_key in _LIVE_CACHE:
-            stale_entry, _ = _LIVE_CACHE[cache_key]
-            logger.debug(
-                "FotMob fetch failed for game_id=%d; returning stale cache", game_id
-            )
-            return stale_entry
-        return {
-            "game_id": game_id,
-            "fotmob_match_id": fotmob_match_id,
-            "home_score": None,
-            "away_score": None,
-            "period": "unknown",
-            "minute": None,
-            "finished": False,
-        }
 
-    entry = _parse_game_entry(game_id, fotmob_match_id, data)
-    _LIVE_CACHE[cache_key] = (entry, now_epoch)
-    return entry
+    async def _load() -> dict:
+        data = await asyncio.to_thread(_fetch_match_raw, fotmob_match_id)
+        if data is None:
+            raise LookupError(f"FotMob match {fotmob_match_id} unavailable")
+        return _parse_game_entry(game_id, fotmob_match_id, data)
+
+    try:
+        return await _LIVE_CACHE.get((game_id, fotmob_match_id), _load)
+    except LookupError:
+        return unknown_entry(game_id, fotmob_match_id)
 
 
 # ---------------------------------------------------------------------------
@@ -262,44 +312,20 @@ def _fetch_today_bets() -> dict[tuple[int, str], dict]:
 
 
 # ---------------------------------------------------------------------------
-# Route
+# P&L estimates (shared with GET /api/today/snapshot)
 # ---------------------------------------------------------------------------
 
 
-@router.get("/api/today/live")
-async def today_live() -> dict[str, Any]:
-    """Return live scores for today's fotmob-mapped games.
-
-    Each game entry includes:
-      - game_id, fotmob_match_id, home_score, away_score
-      - period: "pre" | "1H" | "HT" | "2H" | "FT" | "unknown"
-      - minute: e.g. "59'" while in-play, null otherwise
-      - finished: bool
-      - user_pnl_estimate / ai_pnl_estimate: float or null
-        (populated for finished games and for in-play games with known
-        scores; for FT the settled value is used when bets.pnl is set)
-      - pnl_estimate_is_live: bool — true when the estimate is based on
-        a current in-play scoreline rather than a confirmed final result
+def attach_pnl_estimates(
+    entries: list[dict], bets_by_key: dict[tuple[int, str], dict]
+) -> None:
+    """Add user/ai P&L estimates and ``pnl_estimate_is_live`` to live entries in place.
 
-    Games without fotmob_match_id are not included.
+    Args:
+        entries: Live game entries (see :func:`_parse_game_entry`).
+        bets_by_key: Bets keyed by (game_id, bettor), shaped like
+            :func:`_fetch_today_bets` values.
     """
-    # Fetch today's mapped games and all today's bets in parallel
-    today_games, bets_by_key = _fetch_today_games(), _fetch_today_bets()
-
-    if not today_games:
-        return {
-            "as_of_isr": now_isr().isoformat(),
-            "games": [],
-        }
-
-    # Fan-out: fetch live data for every game concurrently
-    tasks = [
-        _get_game_live(g["game_id"], g["fotmob_match_id"])
-        for g in today_games
-    ]
-    entries: list[dict] = list(await asyncio.gather(*tasks))
-
-    # Attach P&L estimates for finished games and in-play games with known scores
     _LIVE_PERIODS = frozenset({"1H", "HT", "2H"})
     for entry in entries:
         gid = entry["game_id"]
@@ -339,7 +365,57 @@ async def today_live() -> dict[str, Any]:
                     )
                     entry[f"{bettor}_pnl_estimate"] = estimate
 
+
+# ---------------------------------------------------------------------------
+# Route
+# ---------------------------------------------------------------------------
+
+
+@router.get("/api/today/live")
+async def today_live() -> dict[str, Any]:
+    """Return live scores for today's fotmob-mapped games.
+
+    Each game entry includes:
+      - game_id, fotmob_match_id, home_score, away_score
+      - period: "pre" | "1H" | "HT" | "2H" | "FT" | "unknown"
+      - minute: e.g. "59'" while in-play, null otherwise
+      - finished: bool
+      - user_pnl_estimate / ai_pnl_estimate: float or null
+        (populated for finished games and for in-play games with known
+        scores; for FT the settled value is used when bets.pnl is set)
+      - pnl_estimate_is_live: bool — true when the estimate is based on
+        a current in-play scoreline rather than a confirmed final result
+
+    Games without fotmob_match_id are not included.  ``version`` is the
+    ingester snapshot version (null when served on demand).
+    """
+    snap = current_snapshot()
+    if snap is not None:
+        # Ingester path: O(1) read; only bets come from the DB
+        bets_by_key = _fetch_today_bets()
+        entries = [dict(e) for e in snap.entries]
+        as_of, version = snap.as_of, snap.version
+    else:
+        # On-demand fallback: fetch today's mapped games, then FotMob per game
+        today_games, bets_by_key = _fetch_today_games(), _fetch_today_bets()
+        tasks = [
+            _get_game_live(g["game_id"], g["fotmob_match_id"])
+            for g in today_games
+        ]
+        entries = list(await asyncio.gather(*tasks))
+        as_of, version = now_isr(), None
+
+    if not entries:
+        return {
+            "as_of_isr": as_of.isoformat(),
+            "version": version,
+            "games": [],
+        }
+
+    attach_pnl_estimates(entries, bets_by_key)
+
     return {
-        "as_of_isr": now_isr().isoformat(),
+        "as_of_isr": as_of.isoformat(),
+        "version": version,
         "games": entries,
     }
@@ -0,0 +1,65 @@
+"""Odds-movement route.
+
+Routes:
+  GET  /api/games/{game_id}/odds      — Pick-time odds plus the sampled series
+
+The series comes from ``odds_snapshots``, written by the background odds
+sampler (see :mod:`soccersmartbet.odds_history`), so serving it never
+touches winner.co.il.  The ETag is hashed from the body: the table has no
+NOTIFY trigger, so the data-version middleware cannot validate it.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from soccersmartbet.db import get_cursor
+from soccersmartbet.odds_history import read_movement
+from soccersmartbet.webapp.etag import etag_matches, not_modified, weak_etag
+from soccersmartbet.webapp.serialize import ORJSONResponse, dumps
+
+router = APIRouter()
+
+
+def _fetch_game_odds(game_id: int) -> dict[str, Any] | None:
+    with get_cursor(commit=False) as cur:
+        cur.execute(
+            "SELECT home_win_odd, draw_odd, away_win_odd FROM games WHERE game_id = %s",
+            (game_id,),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        series = read_movement(cur, [game_id]).get(game_id, [])
+    return {
+        "game_id": game_id,
+        "opening": {"home": float(row[0]), "draw": float(row[1]), "away": float(row[2])},
+        "series": series,
+        "closing": series[-1] if series else None,
+    }
+
+
+@router.get("/api/games/{game_id}/odds")
+async def get_game_odds(game_id: int, request: Request) -> Response:
+    """Return a game's line movement between pick time and kickoff.
+
+    Returns:
+        ``{game_id, opening, series, closing}`` — ``opening`` is the
+        pick-time line from ``games``; ``series`` lists every sampled change
+        as ``{ts, home, draw, away}`` oldest first; ``closing`` is the last
+        point (null before the first sample).
+
+    Raises:
+        HTTP 404 with ``not_found`` when the game does not exist.
+    """
+    payload = await asyncio.to_thread(_fetch_game_odds, game_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail={"error": "not_found", "game_id": game_id})
+    body = dumps(payload)
+    etag = weak_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return ORJSONResponse(payload, headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -18,6 +18,13 @@ Design decision — team lookup:
   rejected because team_registry is an in-memory bootstrap cache, not
   a DB-backed authoritative index — it would add a fragile dependency.
 
+Design decision — precomputed rollups:
+  Team and League stats are read from ``stats_rollups`` (one indexed query
+  over a handful of rows) plus the few still-pending bets, instead of
+  re-aggregating every bet per request.  The post-games ``calculate_pnl``
+  node folds each settlement into the rollups in the same transaction; see
+  ``soccersmartbet.stats_rollups``.
+
 Design decision — notable games:
   Top-5 by absolute P&L magnitude (|pnl|).  Stake-based ordering would
   rank same-stake bets arbitrarily.  Upset-based ordering requires
@@ -35,19 +42,16 @@ from __future__ import annotations
 import logging
 import urllib.parse
 from pathlib import Path
-from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import FileResponse
 
 from soccersmartbet.db import get_cursor
-from soccersmartbet.team_registry import (
-    get_normalized_variants,
-    normalize_team_name,
-    resolve_team,
-)
+from soccersmartbet.stats_rollups import read_league_stats, read_team_stats
+from soccersmartbet.team_registry import get_normalized_variants, resolve_team
 from soccersmartbet.webapp.query.parser import ParseError
 from soccersmartbet.webapp.query.service import run_filter
+from soccersmartbet.webapp.serialize import ORJSONResponse, RowFormat, shape_bets
 
 logger = logging.getLogger(__name__)
 
@@ -92,7 +96,8 @@ async def serve_league_html(slug: str) -> FileResponse:
 @router.get("/api/bets")
 async def get_bets(
     filter: str = Query(default="", alias="filter"),
-) -> dict:
+    format: RowFormat = Query(default="records"),
+) -> ORJSONResponse:
     """Return bets matching the given DSL filter as JSON.
 
     Empty / missing ``filter`` param → all bets (no WHERE clause restriction
@@ -101,10 +106,13 @@ async def get_bets(
 
     Args:
         filter: Raw DSL string (e.g. ``league:pl date:2026-04``).
+        format: ``records`` (default) for a list of row objects, or
+            ``columns`` for one array per field (see
+            :mod:`soccersmartbet.webapp.serialize`).
 
     Returns:
-        ``{rows, aggregates, row_cap_hit, dsl}`` — the ``FilterResult``
-        serialised as JSON.
+        ``{rows | columns, aggregates, row_cap_hit, dsl}`` — the
+        ``FilterResult`` serialised as JSON.
 
     Raises:
         HTTP 400 with ``{error, detail}`` on parse failure.
@@ -117,29 +125,10 @@ async def get_bets(
             detail={"error": "parse_error", "detail": str(exc)},
         )
 
-    def _row(b: Any) -> dict:
-        return {
-            "bet_id": b.bet_id,
-            "bettor": b.bettor,
-            "prediction": b.prediction,
-            "stake": float(b.stake),
-            "odds": float(b.odds),
-            "result": b.result,
-            "pnl": float(b.pnl) if b.pnl is not None else None,
-            "game_id": b.game_id,
-            "home_team": b.home_team,
-            "away_team": b.away_team,
-            "match_date": b.match_date.isoformat(),
-            "kickoff_time": b.kickoff_time.strftime("%H:%M"),
-            "league": b.league,
-            "outcome": b.outcome,
-            "home_score": b.home_score,
-            "away_score": b.away_score,
-        }
-
     agg = result.aggregates
-    return {
-        "rows": [_row(b) for b in result.rows],
+    # Returned as a response so FastAPI skips jsonable_encoder's per-value walk.
+    return ORJSONResponse({
+        **shape_bets(result.rows, format),
         "aggregates": {
             "count": agg.count,
             "total_stake": float(agg.total_stake),
@@ -148,7 +137,7 @@ async def get_bets(
         },
         "row_cap_hit": result.row_cap_hit,
         "dsl": result.dsl,
-    }
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -220,30 +209,29 @@ async def get_team_stats(slug: str) -> dict:
     """Return rollup stats for a team identified by URL-encoded name slug.
 
     The slug is decoded, resolved to a canonical team name via
-    ``team_registry.resolve_team``, then matched against games using a
-    Python-side filter rather than SQL ILIKE.
+    ``team_registry.resolve_team``, then served from the precomputed
+    ``stats_rollups`` rows (see :mod:`soccersmartbet.stats_rollups`).
 
-    Design decision — Python-side filtering instead of SQL ILIKE:
+    Design decision — normalized-variant keys instead of SQL ILIKE:
       The canonical name (e.g. ``"Atletico Madrid"``) is not guaranteed to be
       a contiguous substring of the raw string stored in ``games.home_team``
       (e.g. ``"Club Atlético de Madrid"``).  Diacritics (``"é"`` vs ``"e"``)
       and inserted words (``"de"``) both break naive ILIKE substring matching,
-      and PostgreSQL's ``unaccent`` extension is not installed.  The fix
-      instead: (1) collects every normalized alias variant via
-      ``get_normalized_variants``, (2) fetches all joined rows without a team
-      filter (LIMIT 2000 still caps the scan), and (3) keeps only rows where
-      ``normalize_team_name(home_team)`` or ``normalize_team_name(away_team)``
-      is in the variant set.  At the current data scale (tens of games) the
-      extra Python loop is negligible.
+      and PostgreSQL's ``unaccent`` extension is not installed.  Team rollups
+      are therefore keyed by ``normalize_team_name(stored name)``, and this
+      route sums the rows whose key is in ``get_normalized_variants``.
 
     Args:
         slug: URL-encoded team name (e.g. ``Arsenal%20FC`` or
             ``Club+Atl%C3%A9tico+de+Madrid``).
 
     Returns:
-        ``{team_name, total_bets, win_rate, total_pnl, total_stake,
-           notable_games}`` where ``notable_games`` is top-5 bets by
-        ``|pnl|``.
+        ``{team_name, total_bets, settled_bets, win_rate, total_pnl,
+           total_stake, notable_games, by_bettor}``.  ``total_bets`` and
+        ``total_stake`` count every bet; ``settled_bets``, ``win_rate`` and
+        ``total_pnl`` only settled ones.  ``notable_games`` is the top-5
+        settled bets by ``|pnl|``.  The full per-bet ``bets`` list is no
+        longer returned; the Team page loads bets via ``/api/bets``.
 
     Raises:
         HTTP 404 with ``unknown_team`` when slug cannot be resolved.
@@ -261,102 +249,15 @@ async def get_team_stats(slug: str) -> dict:
     # E.g. for "Atletico Madrid": {"atletico madrid", "atletico", "atletico de madrid", "atm", ...}
     variants = get_normalized_variants(canonical)
 
-    sql = """
-        SELECT
-            b.bet_id,
-            b.bettor,
-            b.prediction,
-            b.stake,
-            b.odds,
-            b.result,
-            b.pnl,
-            g.game_id,
-            g.home_team,
-            g.away_team,
-            g.match_date,
-            g.kickoff_time,
-            g.league,
-            g.outcome,
-            g.home_score,
-            g.away_score
-        FROM bets b
-        JOIN games g ON g.game_id = b.game_id
-        ORDER BY g.match_date DESC, g.kickoff_time DESC
-        LIMIT 2000
-    """
-
     with get_cursor(commit=False) as cur:
-        cur.execute(sql)
-        all_rows = cur.fetchall()
-
-    # Python-side filter: keep rows where the normalized stored team name
-    # matches any known variant of the canonical.  This handles accent
-    # divergence ("Atlético" → "atletico") and prefix divergence
-    # ("Club Atletico de Madrid" → "atletico de madrid") in one step.
-    rows = [
-        r
-        for r in all_rows
-        if normalize_team_name(r[8]) in variants or normalize_team_name(r[9]) in variants
-    ]
-
-    if not rows:
+        stats = read_team_stats(cur, variants)
+
+    if stats["total_bets"] == 0:
         raise HTTPException(
             status_code=404,
             detail={"error": "not_found", "detail": f"No bets found for team '{canonical}'"},
         )
-
-    total_stake = 0.0
-    total_pnl = 0.0
-    wins = 0
-    settled = 0
-    bet_list = []
-
-    for r in rows:
-        pnl_val = float(r[6]) if r[6] is not None else None
-        stake_val = float(r[3])
-        total_stake += stake_val
-        if pnl_val is not None:
-            total_pnl += pnl_val
-            settled += 1
-            if pnl_val > 0:
-                wins += 1
-        bet_list.append({
-            "bet_id": r[0],
-            "bettor": r[1],
-            "prediction": r[2],
-            "stake": stake_val,
-            "odds": float(r[4]),
-            "result": r[5],
-            "pnl": pnl_val,
-            "game_id": r[7],
-            "home_team": r[8],
-            "away_team": r[9],
-            "match_date": r[10].isoformat(),
-            "kickoff_time": r[11].strftime("%H:%M"),
-            "league": r[12],
-            "outcome": r[13],
-            "home_score": r[14],
-            "away_score": r[15],
-        })
-
-    win_rate = wins / settled if settled > 0 else None
-
-    # Notable games: top-5 by |pnl| (only settled bets)
-    notable = sorted(
-        [b for b in bet_list if b["pnl"] is not None],
-        key=lambda x: abs(x["pnl"]),
-        reverse=True,
-    )[:5]
-
-    return {
-        "team_name": canonical,
-        "total_bets": len(bet_list),
-        "total_stake": round(total_stake, 2),
-        "total_pnl": round(total_pnl, 2),
-        "win_rate": win_rate,
-        "notable_games": notable,
-        "bets": bet_list,
-    }
+    return {"team_name": canonical, **stats}
 
 
 # ---------------------------------------------------------------------------
@@ -368,14 +269,16 @@ async def get_team_stats(slug: str) -> dict:
 async def get_league_stats(slug: str) -> dict:
     """Return rollup stats for a league identified by URL-encoded name slug.
 
-    The slug is decoded and matched against ``games.league`` using ILIKE.
+    The slug is decoded and prefix-matched against the league rollup keys
+    (``games.league`` values) using ILIKE.
 
     Args:
         slug: URL-encoded league name (e.g. ``Premier%20League`` or ``pl``).
 
     Returns:
-        ``{league_name, total_bets, win_rate, total_pnl, total_stake,
-           notable_games}`` — same shape as team stats.
+        ``{league_name, total_bets, settled_bets, win_rate, total_pnl,
+           total_stake, notable_games, by_bettor}`` — same shape as team
+        stats, also without the per-bet ``bets`` list.
 
     Raises:
         HTTP 404 when no bets match the slug.
@@ -387,89 +290,12 @@ async def get_league_stats(slug: str) -> dict:
     _safe_league = league_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
     pattern = f"{_safe_league}%"
 
-    sql = """
-        SELECT
-            b.bet_id,
-            b.bettor,
-            b.prediction,
-            b.stake,
-            b.odds,
-            b.result,
-            b.pnl,
-            g.game_id,
-            g.home_team,
-            g.away_team,
-            g.match_date,
-            g.kickoff_time,
-            g.league,
-            g.outcome,
-            g.home_score,
-            g.away_score
-        FROM bets b
-        JOIN games g ON g.game_id = b.game_id
-        WHERE g.league ILIKE %(name)s ESCAPE '\\'
-        ORDER BY g.match_date DESC, g.kickoff_time DESC
-        LIMIT 2000
-    """
-
     with get_cursor(commit=False) as cur:
-        cur.execute(sql, {"name": pattern})
-        rows = cur.fetchall()
+        stats = read_league_stats(cur, pattern)
 
-    if not rows:
+    if stats is None:
         raise HTTPException(
             status_code=404,
             detail={"error": "not_found", "detail": f"No bets found for league matching '{league_name}'"},
         )
-
-    total_stake = 0.0
-    total_pnl = 0.0
-    wins = 0
-    settled = 0
-    bet_list = []
-
-    for r in rows:
-        pnl_val = float(r[6]) if r[6] is not None else None
-        stake_val = float(r[3])
-        total_stake += stake_val
-        if pnl_val is not None:
-            total_pnl += pnl_val
-            settled += 1
-            if pnl_val > 0:
-                wins += 1
-        bet_list.append({
-            "bet_id": r[0],
-            "bettor": r[1],
-            "prediction": r[2],
-            "stake": stake_val,
-            "odds": float(r[4]),
-            "result": r[5],
-            "pnl": pnl_val,
-            "game_id": r[7],
-            "home_team": r[8],
-            "away_team": r[9],
-            "match_date": r[10].isoformat(),
-            "kickoff_time": r[11].strftime("%H:%M"),
-            "league": r[12],
-            "outcome": r[13],
-            "home_score": r[14],
-            "away_score": r[15],
-        })
-
-    win_rate = wins / settled if settled > 0 else None
-
-    notable = sorted(
-        [b for b in bet_list if b["pnl"] is not None],
-        key=lambda x: abs(x["pnl"]),
-        reverse=True,
-    )[:5]
-
-    return {
-        "league_name": league_name,
-        "total_bets": len(bet_list),
-        "total_stake": round(total_stake, 2),
-        "total_pnl": round(total_pnl, 2),
-        "win_rate": win_rate,
-        "notable_games": notable,
-        "bets": bet_list,
-    }
+    return {"league_name": league_name, **stats}
@@ -2,26 +2,31 @@
 
 Routes:
   GET  /today            — Serve today.html
+  GET  /api/today/snapshot — Whole Today view (status, bets, bankroll, live) in one query
   POST /api/runs         — Manual flow trigger (pre_gambling / post_games / regenerate_report)
   PATCH /api/bets/{bet_id} — Edit prediction and/or stake within the allowed window
 """
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
 from pathlib import Path
 from typing import Literal
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, Field
 
+from soccersmartbet.checkpointing import clear_checkpoint
 from soccersmartbet.daily_runs import upsert_daily_run
 from soccersmartbet.db import get_conn, get_cursor
 from soccersmartbet.utils.timezone import format_isr_time, isr_datetime, now_isr, today_isr
 from soccersmartbet.webapp.audit import EventType, write_run_event
+from soccersmartbet.webapp.etag import DATA_VERSION, etag_matches, not_modified, weak_etag
+from soccersmartbet.webapp.routes.live import attach_pnl_estimates, current_snapshot
 from soccersmartbet.webapp.run_mutex import (
     FlowConflict,
     InvalidTransition,
@@ -188,6 +193,9 @@ def _force_clear(run_date: date) -> None:
     This means a force-override on a day with existing games accumulates rows — that
     is an accepted trade-off documented here.  Operator can inspect via DB directly.
 
+    Also drops today's pre-gambling checkpoint thread — otherwise the re-run
+    would resume the old attempt and skip the analysis whose rows were deleted.
+
     Called AFTER acquire_flow so the delete is conditional on taking the mutex slot.
     """
     with get_conn() as conn:
@@ -214,6 +222,7 @@ def _force_clear(run_date: date) -> None:
                 (run_date,),
             )
         conn.commit()
+    clear_checkpoint("pre_gambling", run_date)
     logger.info("force_clear: deleted report rows for %s (games + bets preserved)", run_date)
 
 
@@ -644,3 +653,205 @@ async def today_pnl() -> dict:
         current = current + timedelta(days=1)
 
     return {"history": history}
+
+
+# ---------------------------------------------------------------------------
+# GET /api/today/snapshot — the whole Today view from one query
+# ---------------------------------------------------------------------------
+
+# One round-trip: every CTE feeds a single json_build_object, so Postgres
+# returns the pre-shaped payload as text.  Field names and shapes match
+# /api/status/today ("status") and /api/today/data ("bets", "bankroll").
+_SNAPSHOT_SQL = """
+    WITH params AS (
+        SELECT %(today)s::date AS today
+    ),
+    run AS (
+        SELECT d.*
+        FROM daily_runs d
+        JOIN params p ON d.run_date = p.today
+    ),
+    events AS (
+        SELECT e.event_id, e.event_type, e.triggered_by, e.triggered_at, e.payload
+        FROM run_events e
+        JOIN params p ON e.run_date = p.today
+        ORDER BY e.triggered_at DESC
+        LIMIT 10
+    ),
+    pending AS (
+        SELECT run_date, game_ids
+        FROM daily_runs
+        WHERE post_games_trigger_at IS NOT NULL
+          AND post_games_completed_at IS NULL
+        ORDER BY run_date DESC
+        LIMIT 1
+    ),
+    today_bets AS (
+        SELECT
+            b.bet_id, b.game_id, b.bettor, b.prediction, b.stake, b.odds,
+            b.justification, b.result, b.pnl,
+            g.kickoff_time, g.match_date, g.home_team, g.away_team, g.league,
+            g.home_win_odd, g.draw_odd, g.away_win_odd, g.status AS game_status,
+            g.match_date + g.kickoff_time AS kickoff_local
+        FROM bets b
+        JOIN games g ON g.game_id = b.game_id
+        JOIN params p ON g.match_date = p.today
+    ),
+    totals AS (
+        SELECT
+            k.bettor,
+            k.total_bankroll AS balance,
+            (SELECT SUM(t.pnl) FROM today_bets t
+             WHERE t.bettor = k.bettor AND t.pnl IS NOT NULL) AS today_pnl
+        FROM bankroll k
+    )
+    SELECT json_build_object(
+        'status', (
+            SELECT json_build_object(
+                'run_date', COALESCE(r.run_date, p.today),
+                'today_date', p.today,
+                'status', COALESCE(r.status, 'idle'),
+                'pre_gambling_started_at', r.pre_gambling_started_at,
+                'pre_gambling_completed_at', r.pre_gambling_completed_at,
+                'gambling_completed_at', r.gambling_completed_at,
+                'post_games_trigger_at', r.post_games_trigger_at,
+                'post_games_completed_at', r.post_games_completed_at,
+                'games_found', r.games_found,
+                'game_ids', COALESCE(to_json(r.game_ids), '[]'::json),
+                'user_bet_completed',
+                    CASE WHEN r.run_date IS NULL THEN false ELSE r.user_bet_completed END,
+                'ai_bet_completed',
+                    CASE WHEN r.run_date IS NULL THEN false ELSE r.ai_bet_completed END,
+                'no_games_user_confirmed', r.no_games_user_confirmed,
+                'last_trigger_source', r.last_trigger_source,
+                'attempt_count', CASE WHEN r.run_date IS NULL THEN 0 ELSE r.attempt_count END,
+                'last_error', r.last_error,
+                'pending_post_games_date', (SELECT run_date FROM pending),
+                'pending_post_games_game_ids',
+                    COALESCE((SELECT to_json(game_ids) FROM pending), '[]'::json),
+                'events', COALESCE(
+                    (SELECT json_agg(json_build_object(
+                                'event_id', e.event_id,
+                                'event_type', e.event_type,
+                                'triggered_by', e.triggered_by,
+                                'triggered_at', e.triggered_at,
+                                'payload', e.payload
+                            ) ORDER BY e.triggered_at DESC)
+                     FROM events e),
+                    '[]'::json),
+                'last_trace', (
+                    SELECT e.payload FROM events e
+                    WHERE e.event_type = %(flow_trace)s
+                    ORDER BY e.triggered_at DESC
+                    LIMIT 1
+                )
+            )
+            FROM params p
+            LEFT JOIN run r ON true
+        ),
+        'bets', COALESCE(
+            (SELECT json_agg(json_build_object(
+                        'bet_id', t.bet_id,
+                        'game_id', t.game_id,
+                        'bettor', t.bettor,
+                        'prediction', t.prediction,
+                        'stake', t.stake,
+                        'odds', t.odds,
+                        'justification', t.justification,
+                        'result', t.result,
+                        'pnl', t.pnl,
+                        'game', json_build_object(
+                            'game_id', t.game_id,
+                            'kickoff_time', to_char(t.kickoff_time, 'HH24:MI'),
+                            'kickoff_iso',
+                                to_char(t.kickoff_local, 'YYYY-MM-DD"T"HH24:MI:SS')
+                                || '+' || to_char(
+                                    t.kickoff_local - (
+                                        t.kickoff_local AT TIME ZONE 'Asia/Jerusalem'
+                                        AT TIME ZONE 'UTC'
+                                    ),
+                                    'HH24:MI'
+                                ),
+                            'match_date', t.match_date,
+                            'home_team', t.home_team,
+                            'away_team', t.away_team,
+                            'league', t.league,
+                            'home_win_odd', t.home_win_odd,
+                            'draw_odd', t.draw_odd,
+                            'away_win_odd', t.away_win_odd,
+                            'status', t.game_status
+                        )
+                    ) ORDER BY t.kickoff_time, t.bettor)
+             FROM today_bets t),
+            '[]'::json),
+        'bankroll', (
+            SELECT json_object_agg(
+                v.bettor,
+                json_build_object('balance', t.balance, 'today_pnl', t.today_pnl)
+            )
+            FROM (VALUES ('user'), ('ai')) AS v (bettor)
+            LEFT JOIN totals t ON t.bettor = v.bettor
+        )
+    )::text
+"""
+
+
+# Tables the snapshot reads (bankroll only changes together with bets).
+_SNAPSHOT_TABLES = ("daily_runs", "run_events", "bets", "games")
+
+
+def _fetch_today_snapshot_json(today: date) -> str:
+    """Run the snapshot query and return Postgres' JSON text unparsed."""
+    with get_cursor(commit=False) as cur:
+        cur.execute(_SNAPSHOT_SQL, {"today": today, "flow_trace": EventType.FLOW_TRACE})
+        return cur.fetchone()[0]
+
+
+def _live_section(bets: list[dict]) -> dict | None:
+    """Return the ingester's live entries with P&L estimates, or None if unavailable."""
+    snap = current_snapshot()
+    if snap is None:
+        return None
+    entries = [dict(e) for e in snap.entries]
+    bets_by_key = {
+        (b["game_id"], b["bettor"]): {
+            "prediction": b["prediction"],
+            "stake": b["stake"],
+            "odds": b["odds"],
+            "settled_pnl": b["pnl"],
+        }
+        for b in bets
+    }
+    attach_pnl_estimates(entries, bets_by_key)
+    return {"as_of_isr": snap.as_of.isoformat(), "version": snap.version, "games": entries}
+
+
+@router.get("/api/today/snapshot")
+async def today_snapshot(request: Request) -> Response:
+    """Return the whole Today view — status, bets, bankroll and live scores.
+
+    Status, bets and bankroll come from one CTE query that Postgres shapes
+    into JSON (``json_build_object`` / ``json_agg``); live scores come from
+    the in-memory ingester snapshot (``live`` is null when it is not running).
+    The weak ETag covers both, so an unchanged poll with ``If-None-Match``
+    gets an empty 304 — before the query when the data-version counters are
+    live, otherwise after hashing the query result.
+    """
+    today = today_isr()
+    snap = current_snapshot()
+    live_version = snap.version if snap is not None else None
+    version = DATA_VERSION.token(_SNAPSHOT_TABLES)
+    if version is not None:
+        etag = weak_etag(version, today, live_version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        body = await asyncio.to_thread(_fetch_today_snapshot_json, today)
+    else:
+        body = await asyncio.to_thread(_fetch_today_snapshot_json, today)
+        etag = weak_etag(body, live_version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    payload = json.loads(body)
+    payload["live"] = _live_section(payload["bets"])
+    return JSONResponse(payload, headers={"ETag": etag, "Cache-Control": "no-cache"})
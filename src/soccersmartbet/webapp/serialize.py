@@ -0,0 +1,110 @@
+"""Fast JSON encoding and shared row shaping for the dashboard API.
+
+:class:`ORJSONResponse` is the app's default response class: orjson renders
+dates, datetimes and nested dicts natively and several times faster than the
+stdlib encoder.  ``Decimal`` (what psycopg returns for NUMERIC columns) is
+encoded as a float, matching what the routes used to do by hand.
+
+Bet rows are shaped in one place for every route that returns them.  Two
+layouts are supported:
+
+* ``records`` (default) — ``[{"bet_id": 1, "stake": 100.0, ...}, ...]``,
+  the shape the History / Team / League pages consume.
+* ``columns`` (opt-in) — ``{"bet_id": [1, 2, ...], "stake": [100.0, ...]}``.
+  Each column is built by one list comprehension, so no per-row dict is
+  created and the key names are sent once instead of once per row.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Iterable, Literal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+RowFormat = Literal["records", "columns"]
+
+# Output order of a bet row — matches compiler.BASE_SELECT.
+BET_COLUMNS: tuple[str, ...] = (
+    "bet_id",
+    "bettor",
+    "prediction",
+    "stake",
+    "odds",
+    "result",
+    "pnl",
+    "game_id",
+    "home_team",
+    "away_team",
+    "match_date",
+    "kickoff_time",
+    "league",
+    "outcome",
+    "home_score",
+    "away_score",
+)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode *content* with orjson (``Decimal`` → float, non-str dict keys allowed)."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered by orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ---------------------------------------------------------------------------
+# Bet rows
+# ---------------------------------------------------------------------------
+
+
+def _bet_values(b: Any) -> tuple:  # type: ignore[type-arg]
+    # match_date stays a date: orjson writes it as YYYY-MM-DD.
+    return (
+        b.bet_id,
+        b.bettor,
+        b.prediction,
+        float(b.stake),
+        float(b.odds),
+        b.result,
+        float(b.pnl) if b.pnl is not None else None,
+        b.game_id,
+        b.home_team,
+        b.away_team,
+        b.match_date,
+        b.kickoff_time.strftime("%H:%M"),
+        b.league,
+        b.outcome,
+        b.home_score,
+        b.away_score,
+    )
+
+
+def bet_records(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """Shape :class:`~soccersmartbet.webapp.query.models.BetRow` objects as records."""
+    return [dict(zip(BET_COLUMNS, _bet_values(b))) for b in rows]
+
+
+def bet_columns(rows: Iterable[Any]) -> dict[str, list[Any]]:
+    """Shape bet rows column-wise: one array per field in ``BET_COLUMNS`` order."""
+    values = [_bet_values(b) for b in rows]
+    if not values:
+        return {name: [] for name in BET_COLUMNS}
+    return dict(zip(BET_COLUMNS, (list(col) for col in zip(*values))))
+
+
+def shape_bets(rows: Iterable[Any], fmt: RowFormat = "records") -> dict[str, Any]:
+    """Return ``{"rows": [...]}`` or ``{"columns": {...}}`` for *fmt*."""
+    if fmt == "columns":
+        return {"columns": bet_columns(rows)}
+    return {"rows": bet_records(rows)}
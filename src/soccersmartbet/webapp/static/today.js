@@ -22,7 +22,9 @@
 // Constants
 // ─────────────────────────────────────────────
 
-const POLL_MS = 2500;
+const POLL_MS = 2500;            // fallback status poll while the SSE stream is down
+const MATCH_POLL_MS = 10000;     // fallback match-data poll while the SSE stream is down
+const CHANGE_DEBOUNCE_MS = 500;  // coalesce bursts of games/bets change events
 const RUNNING_STATUSES = new Set([
   "pre_gambling_running",
   "gambling_running",
@@ -72,6 +74,14 @@ let _lastLiveData = null;   // full response from /api/today/live
 let _liveInterval = null;   // handle for live polling interval
 let _livePollingActive = false;
 
+// Status stream (SSE) — polling only runs while the stream is disconnected
+let _statusStream = null;
+let _fallbackIntervals = [];
+let _changeTimer = null;
+
+// ETag of the last /api/today/snapshot response (sent back as If-None-Match)
+let _snapshotEtag = null;
+
 // ─────────────────────────────────────────────
 // DOM refs
 // ─────────────────────────────────────────────
@@ -83,6 +93,7 @@ function initRefs() {
     // status strip
     flowTimeline:   document.getElementById("flow-timeline"),
     statusError:    document.getElementById("status-error"),
+    runTrace:       document.getElementById("run-trace"),
 
     // buttons
     btnPreGambling: document.getElementById("btn-pre-gambling"),
@@ -155,18 +166,82 @@ async function poll() {
   try {
     const resp = await fetch("/api/status/today");
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
-    _status = await resp.json();
-    updateFlowTimeline(_status);
-    updateButtons(_status);
+    applyStatus(await resp.json());
   } catch (e) {
     console.warn("poll /api/status/today failed:", e);
   }
 }
 
+function applyStatus(s) {
+  _status = s;
+  updateFlowTimeline(_status);
+  updateRunTrace(_status.last_trace);
+  updateButtons(_status);
+}
+
+
+// ─────────────────────────────────────────────
+// Status stream (Server-Sent Events)
+// ─────────────────────────────────────────────
+
+// The server pushes a `status` event whenever daily_runs / run_events change
+// and a `change` event ({table}) for games / bets.  EventSource reconnects by
+// itself; while it is down we fall back to the old interval polling.
+function openStatusStream() {
+  if (_statusStream || typeof EventSource === "undefined") {
+    if (!_statusStream) _startFallbackPolling();
+    return;
+  }
+  _statusStream = new EventSource("/api/status/stream");
+  _statusStream.onopen = () => _stopFallbackPolling();
+  _statusStream.onerror = () => _startFallbackPolling();
+  _statusStream.addEventListener("status", (evt) => {
+    try {
+      applyStatus(JSON.parse(evt.data));
+    } catch (e) {
+      console.warn("status stream: bad status event", e);
+    }
+  });
+  _statusStream.addEventListener("change", (evt) => {
+    let table = "*";
+    try { table = JSON.parse(evt.data).table; } catch (e) { /* refetch everything */ }
+    if (table === "bets" || table === "*") fetchPnlHistory();
+    clearTimeout(_changeTimer);
+    _changeTimer = setTimeout(fetchMatchData, CHANGE_DEBOUNCE_MS);
+  });
+}
+
+function closeStatusStream() {
+  if (_statusStream) {
+    _statusStream.close();
+    _statusStream = null;
+  }
+  clearTimeout(_changeTimer);
+  _stopFallbackPolling();
+}
+
+function _startFallbackPolling() {
+  if (_fallbackIntervals.length) return;
+  console.info("[status] stream unavailable — polling every", POLL_MS, "ms");
+  _fallbackIntervals = [
+    setInterval(poll,           POLL_MS),
+    setInterval(fetchMatchData, MATCH_POLL_MS),
+  ];
+}
+
+function _stopFallbackPolling() {
+  _fallbackIntervals.forEach(id => clearInterval(id));
+  _fallbackIntervals = [];
+}
+
+// Whole Today view in one request; the ETag makes unchanged refreshes a 304.
 async function fetchMatchData() {
   try {
-    const resp = await fetch("/api/today/data");
+    const headers = _snapshotEtag ? { "If-None-Match": _snapshotEtag } : {};
+    const resp = await fetch("/api/today/snapshot", { headers, cache: "no-store" });
+    if (resp.status === 304) return;
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+    _snapshotEtag = resp.headers.get("ETag");
     // MEDIUM-3: clear any persisted error markup before assigning new data
     for (const el of [els.userBalance, els.aiBalance]) {
       if (el && el.querySelector(".bankroll-unavailable")) {
@@ -175,9 +250,12 @@ async function fetchMatchData() {
       }
     }
     const data = await resp.json();
+    if (data.status) applyStatus(data.status);
+    if (data.live) _lastLiveData = data.live;
     _allBets = data.bets || [];
     _bankroll = data.bankroll || null;
     applyFilterAndRender();
+    applyLiveOverlay();
     renderBankroll();
     renderScoreboard();
     updateModRibbon();
@@ -765,6 +843,44 @@ function updateFlowTimeline(s) {
   }
 }
 
+const TRACE_FLOW_LABELS = {
+  pre_gambling: "Pre-Gambling",
+  gambling:     "Gambling",
+  post_games:   "Post-Games",
+};
+
+function fmtMs(ms) {
+  return ms >= 1000 ? `${(ms / 1000).toFixed(1)}s` : `${Math.round(ms)}ms`;
+}
+
+// Top-N entries of a {name: {total_ms, ...}} map (server sorts by total_ms desc).
+function topTraceEntries(map, n) {
+  return Object.entries(map || {}).slice(0, n)
+    .map(([name, agg]) => `${escHtml(name)} ${fmtMs(agg.total_ms)}`)
+    .join(", ");
+}
+
+function updateRunTrace(t) {
+  if (!els.runTrace) return;
+  if (!t) {
+    els.runTrace.innerHTML = `<span class="sub">&mdash;</span>`;
+    return;
+  }
+  const label = TRACE_FLOW_LABELS[t.flow_type] || t.flow_type;
+  const cls   = t.status === "failed" ? "err" : "check";
+  const llm   = t.llm || {};
+  const nodes = topTraceEntries(t.nodes, 2);
+  const http  = topTraceEntries(t.http, 2);
+  const tokens = (llm.input_tokens || 0) + (llm.output_tokens || 0);
+
+  els.runTrace.innerHTML =
+    `<span class="${cls}">${escHtml(label)}</span> ${fmtMs(t.total_ms || 0)}` +
+    (nodes ? `<div class="sub">Nodes: ${nodes}</div>` : "") +
+    (http  ? `<div class="sub">APIs: ${http}</div>` : "") +
+    `<div class="sub">LLM: ${llm.count || 0} calls, ${tokens} tokens` +
+    (llm.cache_hits ? `, ${llm.cache_hits} cached` : "") + `</div>`;
+}
+
 // ─────────────────────────────────────────────
 // Button lock / unlock
 // ─────────────────────────────────────────────
@@ -2058,10 +2174,10 @@ document.addEventListener("DOMContentLoaded", async () => {
   await fetchMatchData();
   await fetchPnlHistory();
 
-  // Polling & chip tick — stored so we can pause/resume on visibility change
+  // Status and match data arrive over the SSE stream; the remaining timers
+  // are stored so we can pause/resume them on visibility change
+  openStatusStream();
   let _intervals = [
-    setInterval(poll,           POLL_MS),
-    setInterval(fetchMatchData, 10000),
     setInterval(fetchPnlHistory, 60000),
     setInterval(tickChips,      60000),  // 60s tick — avoid UI jitter during EDIT
   ];
@@ -2073,6 +2189,7 @@ document.addEventListener("DOMContentLoaded", async () => {
     if (document.hidden) {
       _intervals.forEach(id => clearInterval(id));
       _intervals = [];
+      closeStatusStream();
       // Stop live polling too
       _stopLivePolling();
       // Fix iter-18: clear idle timer so it doesn't fire silently while tab is hidden
@@ -2083,13 +2200,12 @@ document.addEventListener("DOMContentLoaded", async () => {
       // Fix iter-19: clear any stale intervals before re-creating to prevent doubling
       _intervals.forEach(id => clearInterval(id));
       _intervals = [];
-      // Resume immediately then restart intervals
+      // Resume immediately then reopen the stream and restart intervals
       poll();
       fetchMatchData();
       tickChips();
+      openStatusStream();
       _intervals = [
-        setInterval(poll,           POLL_MS),
-        setInterval(fetchMatchData, 10000),
         setInterval(fetchPnlHistory, 60000),
         setInterval(tickChips,      60000),
       ];
@@ -0,0 +1,264 @@
+"""Tests for the competition-scan cache and H2H history store in tools.game.fetch_h2h.
+
+Coverage:
+  1. CompetitionScan — exact unordered pair hit, substring fallback, earliest
+     kickoff wins; team names are resolved once per scan.
+  2. get_competition_scan — one request per competition inside SCAN_TTL,
+     shared by concurrent callers; failed scans are not cached.
+  3. fetch_h2h history — first sync fetches HISTORY_DEPTH meetings and stores
+     finished ones only; a pair synced today makes no head2head request; an
+     older sync asks only for meetings since synced_through and merges them;
+     a failed refresh serves the stored history.
+
+HTTP and the h2h tables are replaced by in-memory fakes — no network or DB.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+# The package re-exports the fetch_h2h function under the module's name.
+fh = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.game.fetch_h2h")
+
+_TODAY = date(2026, 5, 1)
+
+
+def _match(match_id: int, home: str, away: str, utc_date: str, score=None,
+           status: str = "FINISHED") -> dict:
+    full_time = {"home": score[0], "away": score[1]} if score else {"home": None, "away": None}
+    return {
+        "id": match_id,
+        "utcDate": f"{utc_date}T19:00:00Z",
+        "status": status,
+        "homeTeam": {"name": home},
+        "awayTeam": {"name": away},
+        "score": {"fullTime": full_time},
+    }
+
+
+_SCHEDULED = [
+    _match(900, "Arsenal FC", "Chelsea FC", "2026-05-09", status="SCHEDULED"),
+    _match(901, "Chelsea FC", "Arsenal FC", "2026-05-02", status="TIMED"),
+    _match(902, "Liverpool FC", "Everton FC", "2026-05-03", status="SCHEDULED"),
+]
+_MEETINGS = [
+    _match(10, "Arsenal FC", "Chelsea FC", "2025-12-01", (2, 1)),
+    _match(11, "Chelsea FC", "Arsenal FC", "2025-04-01", (0, 0)),
+    _match(12, "Chelsea FC", "Arsenal FC", "2024-10-01", (3, 1)),
+    _match(901, "Chelsea FC", "Arsenal FC", "2026-05-02", status="TIMED"),
+]
+
+
+class _Api:
+    """Fake football-data.org: records every request."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.status = 200
+        self.meetings = list(_MEETINGS)
+        self.gate: threading.Event | None = None
+
+    def __call__(self, url: str, headers=None, params=None, timeout=None):
+        self.calls.append((url, dict(params or {})))
+        if self.gate is not None:
+            self.gate.wait(1)
+        if url.endswith("/head2head"):
+            payload = {"matches": self.meetings}
+        else:
+            payload = {"matches": _SCHEDULED}
+        return SimpleNamespace(status_code=self.status, headers={}, json=lambda: payload)
+
+    def urls(self, suffix: str) -> list[dict]:
+        return [params for url, params in self.calls if url.endswith(suffix)]
+
+
+class _Store:
+    """In-memory h2h_pairs / h2h_meetings."""
+
+    def __init__(self) -> None:
+        self.pairs: dict[tuple, tuple[date, int]] = {}
+        self.meetings: dict[tuple, dict[int, dict]] = {}
+
+    def load(self, key, limit):
+        if key not in self.pairs:
+            return None
+        synced_through, depth = self.pairs[key]
+        rows = fh._merge(list(self.meetings.get(key, {}).values()), [])[:limit]
+        return fh._History(synced_through, depth, rows)
+
+    def save(self, key, meetings, synced_through, depth):
+        self.pairs[key] = (synced_through, depth)
+        self.meetings.setdefault(key, {}).update((m["match_id"], m) for m in meetings)
+
+
+@pytest.fixture()
+def api(monkeypatch) -> _Api:
+    fake = _Api()
+    store = _Store()
+    resolved: list[str] = []
+
+    def resolve(name: str) -> str:
+        resolved.append(name)
+        return name.removesuffix(" FC")
+
+    fake.store = store
+    fake.resolved = resolved
+    monkeypatch.setattr(fh, "FOOTBALL_DATA_API_KEY", "token")
+    monkeypatch.setattr(fh.football_data, "http_get", fake)
+    monkeypatch.setattr(fh.football_data, "_bucket", fh.football_data.TokenBucket(6000))
+    monkeypatch.setattr(fh, "resolve_team", resolve)
+    monkeypatch.setattr(fh, "_load_history", store.load)
+    monkeypatch.setattr(fh, "_save_history", store.save)
+    monkeypatch.setattr(fh, "today_isr", lambda: _TODAY)
+    monkeypatch.setattr(fh, "_scans", {})
+    return fake
+
+
+# ---------------------------------------------------------------------------
+# 1. CompetitionScan
+# ---------------------------------------------------------------------------
+
+
+def test_scan_find_exact_pair_either_way_round_earliest_first(api):
+    scan = fh.CompetitionScan.build(_SCHEDULED, fetched_at=None)
+
+    assert scan.find("arsenal", "chelsea")["id"] == 901
+    assert scan.find("chelsea", "arsenal")["id"] == 901
+    assert scan.find("liverpool", "everton")["id"] == 902
+    assert sorted(api.resolved) == sorted(
+        name for m in _SCHEDULED for name in (m["homeTeam"]["name"], m["awayTeam"]["name"])
+    )
+
+
+def test_scan_find_falls_back_to_substring_match(api):
+    scan = fh.CompetitionScan.build(_SCHEDULED, fetched_at=None)
+
+    assert scan.find("everton fc", "liverpool")["id"] == 902
+    assert scan.find("arsenal", "everton") is None
+
+
+# ---------------------------------------------------------------------------
+# 2. get_competition_scan
+# ---------------------------------------------------------------------------
+
+
+def test_scan_is_fetched_once_per_competition(api):
+    for home, away in (("Arsenal", "Chelsea"), ("Liverpool", "Everton")):
+        result = fh.fetch_h2h(home, away, league="Premier League")
+        assert result["error"] is None
+
+    assert len(api.urls("/competitions/PL/matches")) == 1
+    assert len(api.urls("/head2head")) == 2
+
+
+def test_concurrent_callers_share_one_scan(api):
+    api.gate = threading.Event()
+    results: list = []
+    threads = [
+        threading.Thread(target=lambda: results.append(fh.get_competition_scan("PL", {})))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    api.gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(api.urls("/competitions/PL/matches")) == 1
+    assert len({id(scan) for scan, _err in results}) == 1
+
+
+def test_failed_scan_is_not_cached(api):
+    api.status = 503
+    assert fh.get_competition_scan("PL", {}) == (None, "H2H API error: 503")
+
+    api.status = 200
+    scan, error = fh.get_competition_scan("PL", {})
+    assert error is None and scan is not None
+    assert len(api.urls("/competitions/PL/matches")) == 2
+
+
+def test_stale_scan_is_refetched(api):
+    scan, _ = fh.get_competition_scan("PL", {})
+    scan.fetched_at -= fh.SCAN_TTL + timedelta(seconds=1)
+
+    fh.get_competition_scan("PL", {})
+    assert len(api.urls("/competitions/PL/matches")) == 2
+
+
+# ---------------------------------------------------------------------------
+# 3. fetch_h2h history
+# ---------------------------------------------------------------------------
+
+
+def test_first_sync_stores_finished_meetings_only(api):
+    result = fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+
+    assert api.urls("/head2head") == [{"limit": fh._HISTORY_DEPTH}]
+    key = ("arsenal", "chelsea")
+    assert api.store.pairs[key] == (_TODAY, fh._HISTORY_DEPTH)
+    assert sorted(api.store.meetings[key]) == [10, 11, 12]
+    assert result["upcoming_match_id"] == 901
+    assert result["upcoming_match_date"] == "2026-05-02"
+    assert [m["date"] for m in result["h2h_matches"]] == ["2025-12-01", "2025-04-01", "2024-10-01"]
+    assert [m["winner"] for m in result["h2h_matches"]] == ["Arsenal", "DRAW", "Chelsea"]
+    assert result["total_h2h"] == 3
+
+
+def test_pair_synced_today_makes_no_head2head_request(api):
+    fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+    again = fh.fetch_h2h("Chelsea", "Arsenal", limit=2, league="Premier League")
+
+    assert len(api.urls("/head2head")) == 1
+    assert [m["winner"] for m in again["h2h_matches"]] == ["Arsenal", "DRAW"]
+
+
+def test_older_sync_fetches_only_new_meetings(api):
+    key = ("arsenal", "chelsea")
+    fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+    api.store.pairs[key] = (date(2026, 1, 10), fh._HISTORY_DEPTH)
+    api.meetings = [_match(13, "Arsenal FC", "Chelsea FC", "2026-03-01", (1, 1))]
+
+    result = fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+
+    assert api.urls("/head2head")[-1] == {"dateFrom": "2026-01-10", "dateTo": "2026-05-01"}
+    assert api.store.pairs[key] == (_TODAY, fh._HISTORY_DEPTH)
+    assert [m["date"] for m in result["h2h_matches"]][:2] == ["2026-03-01", "2025-12-01"]
+    assert result["total_h2h"] == 4
+
+
+def test_larger_limit_than_stored_depth_refetches_in_full(api):
+    key = ("arsenal", "chelsea")
+    api.store.pairs[key] = (_TODAY, 3)
+
+    fh.fetch_h2h("Arsenal", "Chelsea", limit=8, league="Premier League")
+
+    assert api.urls("/head2head") == [{"limit": fh._HISTORY_DEPTH}]
+
+
+def test_failed_refresh_serves_stored_history(api):
+    key = ("arsenal", "chelsea")
+    fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+    api.store.pairs[key] = (date(2026, 1, 10), fh._HISTORY_DEPTH)
+    api.status = 500
+
+    result = fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+
+    assert result["error"] is None
+    assert result["total_h2h"] == 3
+    assert api.store.pairs[key][0] == date(2026, 1, 10)
+
+
+def test_first_sync_failure_reports_api_error(api):
+    fh.get_competition_scan("PL", {})
+    api.status = 500
+
+    result = fh.fetch_h2h("Arsenal", "Chelsea", league="Premier League")
+
+    assert result["error"] == "H2H API error: 500"
+    assert result["upcoming_match_id"] == 901
+    assert result["h2h_matches"] == []
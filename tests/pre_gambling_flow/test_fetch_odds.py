@@ -0,0 +1,119 @@
+"""Tests for the concurrent league sweep in tools.game.fetch_odds.
+
+Coverage:
+  1. First lookup fetches every sport once, concurrently; later games in the
+     snapshot window are index lookups with no further requests.
+  2. Exact (home, away) index hit and accent-folded substring fallback.
+  3. Failed sports (429 twice, errors) are not cached and are retried on the
+     next lookup; out-of-season sports (404) are cached as empty.
+  4. Snapshots expire after SNAPSHOT_TTL.
+
+http_get, resolve_team and the clock are patched — no network or DB.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from soccersmartbet.utils.timezone import isr_datetime
+
+# The package re-exports the fetch_odds function under the module's name.
+fo = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.game.fetch_odds")
+
+
+def _event(home: str, away: str, event_id: str) -> dict:
+    return {
+        "id": event_id, "home_team": home, "away_team": away,
+        "commence_time": "2026-05-01T19:00:00Z",
+        "bookmakers": [{"key": "betfair", "markets": [{"key": "h2h", "outcomes": [
+            {"name": home, "price": 2.1}, {"name": away, "price": 3.5},
+            {"name": "Draw", "price": 3.4},
+        ]}]}],
+    }
+
+
+_EVENTS = {
+    "soccer_epl": [_event("Chelsea", "Everton", "epl-1"), _event("Arsenal", "Fulham", "epl-2")],
+    "soccer_spain_la_liga": [_event("Atlético Madrid", "Sevilla", "liga-1")],
+}
+
+
+class _OddsApi:
+    """http_get stand-in serving _EVENTS; records sport keys and peak concurrency."""
+
+    def __init__(self, status: dict[str, int] | None = None) -> None:
+        self.status = status or {}
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, params: dict, timeout: float) -> SimpleNamespace:
+        sport_key = url.rstrip("/").split("/")[-2]
+        with self._lock:
+            self.calls.append(sport_key)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        threading.Event().wait(0.01)  # time.sleep is patched out below
+        with self._lock:
+            self.in_flight -= 1
+        status = self.status.get(sport_key, 200)
+        return SimpleNamespace(status_code=status, json=lambda: _EVENTS.get(sport_key, []))
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(fo, "ODDS_API_KEY", "test-key")
+    monkeypatch.setattr(fo, "_snapshots", {})
+    monkeypatch.setattr(fo, "_event_index", {})
+    monkeypatch.setattr(fo, "resolve_team", lambda name: None)
+    monkeypatch.setattr(fo.time, "sleep", lambda s: None)
+
+
+class TestSweep:
+    def test_one_concurrent_sweep_serves_every_game(self) -> None:
+        api = _OddsApi()
+        with patch.object(fo, "http_get", api):
+            first = fo.fetch_odds("Chelsea", "Everton")
+            second = fo.fetch_odds("Arsenal", "Fulham")
+            missing = fo.fetch_odds("Arsenal", "Everton")
+
+        assert sorted(api.calls) == sorted(fo.SOCCER_LEAGUES)
+        assert api.peak > 1
+        assert (first["match_id"], first["odds_home"], first["error"]) == ("epl-1", 2.1, None)
+        assert second["match_id"] == "epl-2"
+        assert missing["error"].startswith("No upcoming match")
+
+    def test_substring_fallback(self) -> None:
+        with patch.object(fo, "http_get", _OddsApi()):
+            result = fo.fetch_odds("Atletico", "Sevilla FC")
+        assert result["match_id"] == "liga-1"
+
+    def test_failed_sport_retried_empty_sport_cached(self) -> None:
+        api = _OddsApi(status={"soccer_epl": 429, "soccer_fifa_world_cup": 404})
+        with patch.object(fo, "http_get", api):
+            assert fo.fetch_odds("Chelsea", "Everton")["match_id"] is None
+            assert api.calls.count("soccer_epl") == 2  # one 429 retry
+
+            api.status = {}
+            api.calls.clear()
+            assert fo.fetch_odds("Chelsea", "Everton")["match_id"] == "epl-1"
+        assert api.calls == ["soccer_epl"]
+
+    def test_snapshot_expires(self, monkeypatch) -> None:
+        now = [isr_datetime(2026, 5, 1, 12, 0)]
+        monkeypatch.setattr(fo, "now_isr", lambda: now[0])
+        api = _OddsApi()
+        with patch.object(fo, "http_get", api):
+            fo.fetch_odds("Chelsea", "Everton")
+            now[0] += fo.SNAPSHOT_TTL - timedelta(seconds=1)
+            fo.fetch_odds("Chelsea", "Everton")
+            assert len(api.calls) == len(fo.SOCCER_LEAGUES)
+            now[0] += timedelta(seconds=1)
+            fo.fetch_odds("Chelsea", "Everton")
+        assert len(api.calls) == 2 * len(fo.SOCCER_LEAGUES)
@@ -0,0 +1,161 @@
+"""Tests for the batched Open-Meteo forecasts in tools.game.fetch_weather.
+
+Coverage:
+  1. fetch_forecasts — one request for every point (comma-separated
+     coordinates, one location per distinct stadium, date range covering
+     every kickoff); single-location object responses; kickoff index
+     computed from the series start; invalid datetimes and request failures
+     reported per point.
+  2. prefetch_weather / prefetched_weather — a whole slate in one request;
+     successes are served until PREFETCH_TTL, failures are not stored.
+
+Open-Meteo and the venue lookup are patched — no network or DB.
+"""
+from __future__ import annotations
+
+import importlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from soccersmartbet.utils.timezone import isr_datetime
+
+# The package re-exports the fetch_weather function under the module's name.
+fw = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.game.fetch_weather")
+
+_NOW = isr_datetime(2026, 5, 2, 9, 0)
+_LONDON = (51.555, -0.108)
+_MADRID = (40.453, -3.688)
+
+
+def _series(lat: float, start: str, days: int) -> dict:
+    """Hourly series whose temperature encodes the latitude and the hour index."""
+    t0 = datetime.fromisoformat(start)
+    hours = [t0 + timedelta(hours=h) for h in range(24 * days)]
+    return {
+        "latitude": lat,
+        "hourly": {
+            "time": [h.strftime("%Y-%m-%dT%H:00") for h in hours],
+            "temperature_2m": [round(lat) + h / 100 for h in range(len(hours))],
+            "precipitation": [0.6] * len(hours),
+            "precipitation_probability": [40] * len(hours),
+            "windspeed_10m": [12.0] * len(hours),
+        },
+    }
+
+
+class _OpenMeteo:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.fail: Exception | None = None
+
+    def __call__(self, url, params=None, timeout=None):
+        self.calls.append(params)
+        if self.fail is not None:
+            raise self.fail
+        lats = [float(x) for x in params["latitude"].split(",")]
+        start = params["start_date"]
+        days = (datetime.fromisoformat(params["end_date"]) - datetime.fromisoformat(start)).days + 1
+        payload = [_series(lat, f"{start}T00:00", days) for lat in lats]
+        body = payload if len(payload) > 1 else payload[0]
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: body)
+
+
+@pytest.fixture()
+def meteo(monkeypatch) -> _OpenMeteo:
+    fake = _OpenMeteo()
+    monkeypatch.setattr(fw, "http_get", fake)
+    monkeypatch.setattr(fw, "_prefetched", {})
+    monkeypatch.setattr(fw, "now_isr", lambda: _NOW)
+    return fake
+
+
+# ---------------------------------------------------------------------------
+# 1. fetch_forecasts
+# ---------------------------------------------------------------------------
+
+
+def test_one_request_for_all_points(meteo):
+    results = fw.fetch_forecasts([
+        (*_LONDON, "2026-05-02T19:30:00"),
+        (*_MADRID, "2026-05-02T21:00:00"),
+        (*_LONDON, "2026-05-03T14:00:00"),
+    ])
+
+    assert len(meteo.calls) == 1
+    params = meteo.calls[0]
+    assert params["latitude"] == "51.555,40.453"
+    assert params["longitude"] == "-0.108,-3.688"
+    assert (params["start_date"], params["end_date"]) == ("2026-05-02", "2026-05-03")
+    # temperature = round(lat) + hour_index / 100
+    assert [r["temperature_celsius"] for r in results] == [52.19, 40.21, 52.38]
+    assert all(r["error"] is None and r["conditions"] == "Rain" for r in results)
+
+
+def test_single_location_object_response(meteo):
+    (result,) = fw.fetch_forecasts([(*_MADRID, "2026-05-02T18:00:00Z")])
+
+    assert result["temperature_celsius"] == 40.18
+    assert result["precipitation_probability"] == 40
+
+
+def test_kickoff_outside_series_is_reported(meteo, monkeypatch):
+    def short(url, params=None, timeout=None):
+        return SimpleNamespace(
+            raise_for_status=lambda: None, json=lambda: _series(40.0, "2026-05-01T00:00", 1)
+        )
+
+    monkeypatch.setattr(fw, "http_get", short)
+    (result,) = fw.fetch_forecasts([(*_MADRID, "2026-05-02T18:00:00")])
+
+    assert result["error"] == "Match time 2026-05-02T18:00 not in forecast"
+
+
+def test_invalid_datetime_and_request_failures_are_per_point(meteo):
+    results = fw.fetch_forecasts([(*_LONDON, "tomorrow"), (*_MADRID, "2026-05-02T21:00:00")])
+    assert results[0]["error"] == "Invalid datetime format"
+    assert results[1]["error"] is None
+    assert meteo.calls[0]["latitude"] == "40.453"
+
+    meteo.fail = requests.Timeout()
+    results = fw.fetch_forecasts([(*_LONDON, "2026-05-02T19:00:00")] * 2)
+    assert [r["error"] for r in results] == ["Weather API timeout"] * 2
+
+
+# ---------------------------------------------------------------------------
+# 2. prefetch_weather / prefetched_weather
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def located(monkeypatch):
+    venues = {"Arsenal": ("London", _LONDON, None), "Atletico": ("Madrid", _MADRID, None),
+              "Nowhere FC": (None, None, "Team 'Nowhere FC' not found in any major league")}
+    monkeypatch.setattr(fw, "_locate", venues.__getitem__)
+
+
+def test_prefetch_serves_the_slate_from_one_request(meteo, located):
+    games = [
+        ("Arsenal", "Chelsea", "2026-05-02T19:00:00"),
+        ("Atletico", "Betis", "2026-05-02T21:00:00"),
+        ("Nowhere FC", "Elsewhere", "2026-05-02T15:00:00"),
+    ]
+
+    results = fw.prefetch_weather(games)
+
+    assert len(meteo.calls) == 1
+    assert results[games[0]]["venue_city"] == "London"
+    assert results[games[2]]["error"].startswith("Team 'Nowhere FC'")
+    assert fw.prefetched_weather(*games[1]) == results[games[1]]
+    assert fw.prefetched_weather(*games[2]) is None  # failures are fetched per game
+
+
+def test_prefetched_results_expire(meteo, located, monkeypatch):
+    game = ("Arsenal", "Chelsea", "2026-05-02T19:00:00")
+    fw.prefetch_weather([game])
+
+    monkeypatch.setattr(fw, "now_isr", lambda: _NOW + fw.PREFETCH_TTL)
+
+    assert fw.prefetched_weather(*game) is None
@@ -0,0 +1,172 @@
+"""Tests for the shared winner.co.il line snapshot in tools.game.fetch_winner_odds.
+
+Coverage:
+  1. get_winner_line — one download serves the picker and every per-game
+     lookup inside SNAPSHOT_TTL; a stale snapshot is re-downloaded; failed
+     downloads are not cached.
+  2. WinnerLine.find — Hebrew pair hit, canonical pair fallback, miss.
+  3. fetch_all_winner_odds — league filter (case-insensitive substring) keeps
+     line order; resolve_team runs once per distinct Hebrew name.
+  4. iter_markets — yields exactly json.loads(body)["markets"] whatever the
+     whitespace or key order; missing / null / empty markets yield nothing;
+     malformed bodies raise ValueError.
+
+The download and the team registry are patched — no network or DB.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from soccersmartbet.utils.timezone import isr_datetime
+
+# The package re-exports the fetch_winner_odds function under the module's name.
+wo = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.game.fetch_winner_odds")
+
+_HE_TO_CANONICAL = {"ברצלונה": "Barcelona", "ריאל מדריד": "Real Madrid", "ארסנל": "Arsenal",
+                    "צ'לסי": "Chelsea"}
+_CANONICAL = set(_HE_TO_CANONICAL.values())
+_REGISTRY_HE = {"Barcelona": "ברצלונה", "Real Madrid": "ריאל מדריד", "Arsenal": "ארסנל"}
+
+
+def _event(home_he: str, away_he: str, league_en: str, odds_home: float = 2.0) -> dict:
+    return {
+        "home_name_he": home_he, "away_name_he": away_he, "league_he": "", "league_en": league_en,
+        "odds_home": odds_home, "odds_draw": 3.2, "odds_away": 3.9,
+        "commence_time": "2026-05-01T22:00:00+03:00",
+    }
+
+
+_EVENTS = [
+    _event("ברצלונה", "ריאל מדריד", "La Liga"),
+    _event("ארסנל", "צ'לסי", "Premier League"),
+    _event("ריאל מדריד", "ברצלונה", "La Liga", odds_home=1.8),
+    _event("מכבי", "הפועל", "Israeli Premier League"),
+]
+
+
+class _Download:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.error: str | None = None
+
+    def __call__(self) -> tuple[list[dict], str | None]:
+        self.calls += 1
+        if self.error:
+            return [], self.error
+        return [dict(e) for e in _EVENTS], None
+
+
+@pytest.fixture()
+def download(monkeypatch) -> _Download:
+    fake = _Download()
+    resolved: list[str] = []
+
+    def resolve(name: str) -> str | None:
+        resolved.append(name)
+        return _HE_TO_CANONICAL.get(name, name if name in _CANONICAL else None)
+
+    fake.resolved = resolved
+    monkeypatch.setattr(wo, "_fetch_all_soccer_events", fake)
+    monkeypatch.setattr(wo, "resolve_team", resolve)
+    monkeypatch.setattr(wo, "get_source_name_he", _REGISTRY_HE.get)
+    monkeypatch.setattr(wo, "_line", None)
+    return fake
+
+
+class TestSnapshot:
+    def test_one_download_for_picker_and_lookups(self, download) -> None:
+        assert len(wo.fetch_all_winner_odds()["events"]) == 4
+        assert wo.fetch_winner_odds("Barcelona", "Real Madrid")["odds_home"] == 2.0
+        assert wo.fetch_winner_odds("Real Madrid", "Barcelona")["odds_home"] == 1.8
+        assert download.calls == 1
+
+    def test_stale_snapshot_redownloaded(self, download, monkeypatch) -> None:
+        now = [isr_datetime(2026, 5, 1, 12, 0)]
+        monkeypatch.setattr(wo, "now_isr", lambda: now[0])
+        wo.fetch_all_winner_odds()
+        now[0] += wo.SNAPSHOT_TTL - timedelta(seconds=1)
+        wo.fetch_all_winner_odds()
+        assert download.calls == 1
+        now[0] += timedelta(seconds=1)
+        wo.fetch_all_winner_odds()
+        assert download.calls == 2
+
+    def test_failure_not_cached(self, download) -> None:
+        download.error = "winner.co.il returned HTTP 503 from GetCMobileLine"
+        assert wo.fetch_winner_odds("Barcelona", "Real Madrid")["error"] == download.error
+        download.error = None
+        assert wo.fetch_winner_odds("Barcelona", "Real Madrid")["error"] is None
+        assert download.calls == 2
+
+
+class TestLookup:
+    def test_canonical_fallback_and_miss(self, download) -> None:
+        # Registry Hebrew for Chelsea is unknown, so the canonical pair index answers.
+        result = wo.fetch_winner_odds("Arsenal", "Chelsea")
+        assert (result["league"], result["away_name_he"]) == ("Premier League", "צ'לסי")
+        assert wo.fetch_winner_odds("Arsenal", "Barcelona")["error"].startswith("No upcoming")
+
+    def test_league_filter_and_single_resolution(self, download) -> None:
+        la_liga = wo.fetch_all_winner_odds("la liga")["events"]
+        assert [(e["home_team"], e["away_team"]) for e in la_liga] == [
+            ("Barcelona", "Real Madrid"), ("Real Madrid", "Barcelona"),
+        ]
+        premier = wo.fetch_all_winner_odds("premier league")["events"]
+        assert [e["league"] for e in premier] == ["Premier League", "Israeli Premier League"]
+        israeli = premier[1]
+        assert (israeli["home_team"], israeli["away_team"]) == ("מכבי", "הפועל")
+
+        hebrew_names = [n for n in download.resolved if n not in _CANONICAL]
+        assert len(hebrew_names) == len(set(hebrew_names))
+
+
+class TestIterMarkets:
+    _MARKETS = [
+        {"mp": "1X2 תוצאת סיום", "desc": "ברצלונה - ריאל מדריד",
+         "outcomes": [{"desc": "1", "price": 2.0}, {"desc": "X", "price": 3.1}]},
+        {"mp": "מעל/מתחת", "desc": "a - b", "nested": {"markets": [1, 2]}, "outcomes": []},
+    ]
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_matches_full_parse(self, indent) -> None:
+        body = json.dumps(
+            {"lineChecksum": "abc", "sports": [{"markets": "decoy"}], "markets": self._MARKETS,
+             "serverTime": None},
+            ensure_ascii=False, indent=indent,
+        ).encode("utf-8")
+        assert list(wo.iter_markets(body)) == self._MARKETS
+
+    @pytest.mark.parametrize("body", ['{}', '{"markets": null}', '{ "markets" : [ ] , "x": 1}'])
+    def test_no_markets(self, body) -> None:
+        assert list(wo.iter_markets(body)) == []
+
+    @pytest.mark.parametrize("body", ["", "[]", '{"markets": [{"a": 1},]}', '{"markets": [{"a": 1}'])
+    def test_malformed(self, body) -> None:
+        with pytest.raises(ValueError):
+            list(wo.iter_markets(body))
+
+    def test_fetch_parses_body_and_reports_bad_json(self, monkeypatch) -> None:
+        market = {
+            "mp": "1X2 תוצאת סיום", "desc": "ברצלונה - ריאל מדריד", "league": "ספרדית ראשונה",
+            "e_date": 260501, "m_hour": "2200",
+            "outcomes": [{"desc": "1", "price": 2.0}, {"desc": "‏X‏", "price": 3.1},
+                         {"desc": "2", "price": 3.6}],
+        }
+        bodies = [json.dumps({"markets": [market, self._MARKETS[1]]}).encode(), b"<html>"]
+        monkeypatch.setattr(wo, "_get_session", lambda: None)
+        monkeypatch.setattr(
+            wo, "http_get",
+            lambda *a, **k: SimpleNamespace(status_code=200, content=bodies.pop(0)),
+        )
+
+        events, error = wo._fetch_all_soccer_events()
+        assert error is None
+        assert [(e["league_en"], e["odds_draw"]) for e in events] == [("La Liga", 3.1)]
+
+        events, error = wo._fetch_all_soccer_events()
+        assert events == [] and error.startswith("Invalid JSON from winner.co.il")
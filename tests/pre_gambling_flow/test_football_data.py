@@ -0,0 +1,156 @@
+"""Tests for the shared football-data.org scheduler in tools.football_data.
+
+Coverage:
+  1. TokenBucket — a full burst is free, then callers are paced at the rate;
+     waiters are served in arrival order; queue depth is tracked.
+  2. TokenBucket.observe — X-Requests-Available-Minute caps the tokens; an
+     exhausted counter or a 429 closes the bucket until the reset, after
+     which the full burst is back.
+  3. get — a 429 is retried through the bucket; every attempt throttled
+     returns None; replay mode skips the bucket.
+
+Rates are high (tens of tokens a second) so the real waits stay short.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from soccersmartbet.pre_gambling_flow.tools import football_data as fd
+
+
+# ---------------------------------------------------------------------------
+# 1. TokenBucket
+# ---------------------------------------------------------------------------
+
+
+def test_burst_is_free_then_paced_at_the_rate():
+    bucket = fd.TokenBucket(per_minute=1200, burst=2)  # one token every 50 ms
+
+    t0 = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - t0
+
+    assert waits[:2] == [0.0, 0.0]
+    assert all(w > 0 for w in waits[2:])
+    assert elapsed >= 0.09
+    assert bucket.metrics.requests == 4
+    assert bucket.metrics.waited == 2
+
+
+def test_waiters_are_served_in_arrival_order():
+    bucket = fd.TokenBucket(per_minute=600, burst=1)  # one token every 100 ms
+    bucket.acquire()  # empty the bucket so everyone queues
+    served: list[int] = []
+
+    def worker(n: int) -> None:
+        bucket.acquire()
+        served.append(n)
+
+    threads = []
+    for n in range(5):
+        t = threading.Thread(target=worker, args=(n,))
+        t.start()
+        threads.append(t)
+        while bucket.metrics.queue_depth < n + 1:  # enqueued before the next one starts
+            time.sleep(0.001)
+    for t in threads:
+        t.join()
+
+    assert served == [0, 1, 2, 3, 4]
+    assert bucket.metrics.queue_depth == 0
+    assert bucket.metrics.queue_depth_max == 5
+
+
+# ---------------------------------------------------------------------------
+# 2. observe
+# ---------------------------------------------------------------------------
+
+
+def test_available_header_caps_tokens():
+    bucket = fd.TokenBucket(per_minute=1200, burst=10)
+
+    bucket.observe(available=1, reset_s=30)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() > 0
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"available": 0, "reset_s": 0.1},
+    {"available": None, "reset_s": 0.1, "throttled": True},
+])
+def test_exhausted_counter_closes_bucket_until_reset(kwargs):
+    bucket = fd.TokenBucket(per_minute=60, burst=3)
+
+    bucket.observe(**kwargs)
+    waited = bucket.acquire()
+
+    assert waited >= 0.09
+    # The server's minute restarted: the whole burst is available again.
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.metrics.throttled == int(kwargs.get("throttled", False))
+
+
+# ---------------------------------------------------------------------------
+# 3. get
+# ---------------------------------------------------------------------------
+
+
+class _Server:
+    def __init__(self, statuses: list[int]) -> None:
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self, url, headers=None, params=None, timeout=None):
+        self.calls += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        headers = {"X-Requests-Available-Minute": "0" if status == 429 else "9",
+                   "X-RequestCounter-Reset": "0.05"}
+        return SimpleNamespace(status_code=status, headers=headers)
+
+
+@pytest.fixture()
+def bucket(monkeypatch) -> fd.TokenBucket:
+    fresh = fd.TokenBucket(per_minute=1200, burst=10)
+    monkeypatch.setattr(fd, "_bucket", fresh)
+    monkeypatch.delenv("CASSETTE_MODE", raising=False)
+    return fresh
+
+
+def test_429_is_retried_after_the_shared_reset(bucket, monkeypatch):
+    server = _Server([429, 200])
+    monkeypatch.setattr(fd, "http_get", server)
+
+    t0 = time.monotonic()
+    resp = fd.get("https://api.football-data.org/v4/matches", {})
+
+    assert resp.status_code == 200
+    assert server.calls == 2
+    assert time.monotonic() - t0 >= 0.04
+    assert fd.metrics()["throttled"] == 1
+    assert fd.metrics()["requests"] == 2
+
+
+def test_every_attempt_throttled_returns_none(bucket, monkeypatch):
+    server = _Server([429] * 10)
+    monkeypatch.setattr(fd, "http_get", server)
+    monkeypatch.setattr(fd, "_MAX_ATTEMPTS", 2)
+
+    assert fd.get("https://api.football-data.org/v4/matches", {}) is None
+    assert server.calls == 2
+
+
+def test_replay_mode_skips_the_bucket(bucket, monkeypatch):
+    monkeypatch.setenv("CASSETTE_MODE", "replay")
+    monkeypatch.setattr(fd, "http_get", _Server([]))
+    bucket.observe(available=0, reset_s=60)
+
+    resp = fd.get("https://api.football-data.org/v4/matches", {})
+
+    assert resp.status_code == 200
+    assert fd.metrics()["requests"] == 0
@@ -0,0 +1,175 @@
+"""Tests for the prefetch_game_data node and the run-scoped store behind it.
+
+Coverage:
+  1. run_store — outside a run the fetcher is always called; inside a run a
+     key is fetched once (also under concurrency) and failures are retried.
+  2. prefetch_game_data — one download per distinct team payload, team news
+     and league; venues for home sides; every forecast in one call keyed the
+     way run_game_intelligence reads it; team tools afterwards make no
+     requests; a failing resource does not fail the node.
+
+FotMob is a FotMobClient subclass with ``_request`` faked; the other
+prefetch targets are recorders.  No network or DB.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+
+import pytest
+
+from soccersmartbet.pre_gambling_flow.nodes import prefetch_game_data as node
+from soccersmartbet.pre_gambling_flow.tools import run_store
+from soccersmartbet.pre_gambling_flow.tools.fotmob_client import FOTMOB_LEAGUES, FotMobClient
+
+# The team package re-exports the tool functions under their module names.
+fetch_form_mod = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.team.fetch_form")
+fetch_league_position_mod = importlib.import_module(
+    "soccersmartbet.pre_gambling_flow.tools.team.fetch_league_position"
+)
+
+_TEAMS = {"Arsenal": 9825, "Chelsea": 8455, "Everton": 8668}
+
+
+@pytest.fixture(autouse=True)
+def _no_active_run():
+    run_store.end_run()
+    yield
+    run_store.end_run()
+
+
+# ---------------------------------------------------------------------------
+# 1. run_store
+# ---------------------------------------------------------------------------
+
+
+def test_outside_a_run_every_call_fetches():
+    calls: list[int] = []
+
+    for _ in range(2):
+        run_store.cached(("fotmob.team", 1), lambda: calls.append(1) or {"id": 1})
+
+    assert calls == [1, 1]
+
+
+def test_inside_a_run_each_key_is_fetched_once():
+    store = run_store.start_run()
+    gate = threading.Event()
+    calls: list[int] = []
+
+    def fetch() -> dict:
+        calls.append(1)
+        gate.wait(1)
+        return {"id": 1}
+
+    threads = [
+        threading.Thread(target=run_store.cached, args=(("fotmob.team", 1), fetch))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert (store.fetches, store.hits) == (1, 3)
+
+
+def test_failed_fetches_are_not_stored():
+    store = run_store.start_run()
+    results = iter([None, {"id": 1}])
+
+    assert run_store.cached(("fotmob.news", 1), lambda: next(results)) is None
+    assert run_store.cached(("fotmob.news", 1), lambda: next(results)) == {"id": 1}
+    assert store.fetches == 2
+
+
+# ---------------------------------------------------------------------------
+# 2. prefetch_game_data
+# ---------------------------------------------------------------------------
+
+
+class _FotMob(FotMobClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[tuple[str, int]] = []
+        self.lock = threading.Lock()
+        self.competitions: list[str] = []
+        self.venues: list[int] = []
+        self.weather: list[list] = []
+
+    def get_league_standings(self, league_id: int) -> list:
+        with self.lock:
+            self.requests.append(("tltable", league_id))
+        return []
+
+    def find_team(self, team_name: str) -> dict | None:
+        team_id = _TEAMS.get(team_name)
+        return {"id": team_id, "name": team_name, "position": 3} if team_id else None
+
+    def _request(self, endpoint: str, params: dict = None) -> dict:
+        with self.lock:
+            self.requests.append((endpoint.rsplit("/", 1)[-1], params["id"]))
+        if params["id"] == _TEAMS["Everton"] and endpoint.endswith("tlnews"):
+            raise RuntimeError("boom")
+        return {"overview": {"teamForm": []}}
+
+
+def _game(home: str, away: str, league: str, kickoff: str) -> dict:
+    return {"home_team": home, "away_team": away, "league": league,
+            "match_date": "2026-05-02", "kickoff_time": kickoff}
+
+
+@pytest.fixture()
+def fotmob(monkeypatch) -> _FotMob:
+    client = _FotMob()
+    for mod in (node, fetch_form_mod, fetch_league_position_mod):
+        monkeypatch.setattr(mod, "get_fotmob_client", lambda: client)
+    monkeypatch.setattr(node, "prefetch_competition", client.competitions.append)
+    monkeypatch.setattr(node, "get_venue", lambda team_id, _client: client.venues.append(team_id))
+    monkeypatch.setattr(node, "prefetch_weather", lambda games: client.weather.append(list(games)))
+    return client
+
+
+def test_each_distinct_resource_is_fetched_once(fotmob):
+    state = {
+        "all_games": [
+            _game("Arsenal", "Chelsea", "Premier League", "17:00"),
+            _game("Everton", "Arsenal", "Premier League", "19:30"),
+            _game("Nowhere", "Elsewhere", "Premier League", "21:00"),  # not analyzed
+        ],
+        "games_to_analyze": [11, 12],
+    }
+
+    assert node.prefetch_game_data(state) == {}
+
+    tables = [r for r in fotmob.requests if r[0] == "tltable"]
+    payloads = sorted(r for r in fotmob.requests if r[0] != "tltable")
+    assert len(tables) == len(FOTMOB_LEAGUES)
+    assert payloads == sorted(
+        (kind, team_id) for kind in ("teams", "tlnews") for team_id in _TEAMS.values()
+    )
+    assert fotmob.competitions == ["Premier League"]
+    assert sorted(fotmob.venues) == sorted([_TEAMS["Arsenal"], _TEAMS["Everton"]])
+    assert fotmob.weather == [[
+        ("Arsenal", "Chelsea", "2026-05-02T17:00:00"),
+        ("Everton", "Arsenal", "2026-05-02T19:30:00"),
+    ]]
+
+    # The branches' tools now read the stored payloads.
+    fotmob.requests.clear()
+    assert fetch_form_mod.fetch_form("Arsenal")["error"] is None
+    assert fetch_league_position_mod.fetch_league_position("Arsenal")["position"] == 3
+    assert fotmob.requests == []
+
+
+def test_failed_resource_is_left_for_the_tool(fotmob):
+    state = {"all_games": [_game("Everton", "Chelsea", "Premier League", "17:00")],
+             "games_to_analyze": [11]}
+
+    node.prefetch_game_data(state)
+    fotmob.requests.clear()
+
+    assert fotmob.get_team_news(_TEAMS["Everton"]) is None  # retried, fails again
+    assert fotmob.requests == [("tlnews", _TEAMS["Everton"])]
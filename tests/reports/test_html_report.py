@@ -0,0 +1,123 @@
+"""Tests for batched report generation in soccersmartbet.reports.html_report.
+
+Coverage:
+  1. generate_reports_html — one DB query for all games; every distinct team
+     and league logo downloaded once across the batch; missing games get the
+     "not found" page.
+  2. Logos already in the on-disk store render with no download.
+  3. generate_game_report_html — renders the same page as the batch.
+
+get_conn and the logo download are patched, and the logo store lives in
+tmp_path — no DB or network.
+"""
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from soccersmartbet.reports import html_report, logo_store
+
+_COLUMNS = (
+    "game_id", "match_date", "kickoff_time", "home_team", "away_team", "league", "venue",
+    "home_win_odd", "away_win_odd", "draw_odd", "home_fotmob_id", "away_fotmob_id",
+    "game_report", "team_reports", "expert_analysis",
+)
+
+
+def _row(game_id: int, home_id: int, away_id: int) -> tuple:
+    return (
+        game_id, datetime.date(2026, 5, 1), datetime.time(21, 0), f"Home {game_id}",
+        f"Away {game_id}", "Premier League", "Stadium", Decimal("2.10"), Decimal("3.40"),
+        Decimal("3.10"), home_id, away_id,
+        {"h2h_bullets": ["close games"], "weather_bullets": [], "venue": None},
+        [{"team_name": f"Home {game_id}", "form_streak": "WWDLW", "last_5_games": None}],
+        ["Expert line"],
+    )
+
+
+class _Conn:
+    """get_conn stand-in counting executed queries."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.queries = 0
+        cur = MagicMock()
+        cur.description = [SimpleNamespace(name=c) for c in _COLUMNS]
+        cur.execute.side_effect = self._execute
+        cur.fetchall.side_effect = lambda: self.rows
+        cur.__enter__.return_value = cur
+        self.conn = MagicMock()
+        self.conn.cursor.return_value = cur
+        self.conn.__enter__.return_value = self.conn
+
+    def _execute(self, _sql: str, params: dict) -> None:
+        self.queries += 1
+        self.rows = [r for r in self.rows if r[0] in params["game_ids"]]
+
+    def __call__(self):
+        return self.conn
+
+
+class _Logos:
+    """http_get stand-in for FotMob images: records URLs, 404s when ``ok`` is False."""
+
+    def __init__(self, ok: bool = True) -> None:
+        self.ok = ok
+        self.calls: list[str] = []
+
+    def __call__(self, url: str, timeout: float) -> SimpleNamespace:
+        self.calls.append(url)
+        return SimpleNamespace(
+            status_code=200 if self.ok else 404,
+            headers={"content-type": "image/png"},
+            content=url.encode(),
+        )
+
+
+@pytest.fixture(autouse=True)
+def _logo_store(monkeypatch, tmp_path):
+    store = logo_store.LogoStore(tmp_path)
+    monkeypatch.setattr(html_report, "get_logo_store", lambda: store)
+    return store
+
+
+class TestGenerateReports:
+    def test_one_query_and_one_download_per_logo(self) -> None:
+        # Games 1 and 2 share away team 20.
+        conn = _Conn([_row(1, 10, 20), _row(2, 11, 20)])
+        fetch = _Logos()
+        with patch.object(html_report, "get_conn", conn), \
+             patch.object(logo_store, "http_get", fetch):
+            reports = html_report.generate_reports_html([1, 2, 3])
+
+        assert conn.queries == 1
+        assert len(fetch.calls) == 4  # teams 10, 11, 20 + league 47
+        assert "Home 1" in reports[1] and 'class="team-logo"' in reports[1]
+        assert "Expert line" in reports[2]
+        assert "Game 3 not found" in reports[3]
+
+    def test_stored_logos_render_without_network(self, _logo_store) -> None:
+        with patch.object(logo_store, "http_get", _Logos()):
+            _logo_store.prefetch([("team", 10), ("team", 20), ("league", 47)])
+        restarted = logo_store.LogoStore(_logo_store.root)
+        fetch = _Logos()
+        with patch.object(html_report, "get_logo_store", lambda: restarted), \
+             patch.object(html_report, "get_conn", _Conn([_row(1, 10, 20)])), \
+             patch.object(logo_store, "http_get", fetch):
+            report = html_report.generate_game_report_html(1)
+
+        assert fetch.calls == []
+        assert report.count("data:image/png;base64,") == 3
+
+    def test_single_game_matches_batch(self) -> None:
+        with patch.object(logo_store, "http_get", _Logos(ok=False)):
+            with patch.object(html_report, "get_conn", _Conn([_row(1, 10, 20)])):
+                single = html_report.generate_game_report_html(1)
+            with patch.object(html_report, "get_conn", _Conn([_row(1, 10, 20)])):
+                batch = html_report.generate_reports_html([1])[1]
+        assert single == batch
+        assert "<img" not in single  # failed logo fetches render no image
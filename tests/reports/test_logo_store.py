@@ -0,0 +1,129 @@
+"""Tests for soccersmartbet.reports.logo_store.
+
+Coverage:
+  1. prefetch — distinct keys downloaded once each, concurrently; the data URI
+     and raw bytes land on disk and a fresh store serves them with no network.
+  2. Failures — recorded with a retry-after instead of forever: skipped inside
+     the window, retried after it; backoff doubles and a 404 waits the max.
+     A failed refresh keeps the logo already stored.
+  3. seed_keys — every team fotmob_id plus each distinct league id.
+
+http_get is patched and the store lives in tmp_path — no network.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from soccersmartbet.reports import logo_store
+from soccersmartbet.reports.logo_store import LogoStore
+
+
+class _Images:
+    """http_get stand-in: records URLs and peak concurrency; ``status`` per call."""
+
+    def __init__(self, status: int | Exception = 200, delay: float = 0.0) -> None:
+        self.status = status
+        self.delay = delay
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, timeout: float) -> SimpleNamespace:
+        with self._lock:
+            self.calls.append(url)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if isinstance(self.status, Exception):
+            raise self.status
+        return SimpleNamespace(
+            status_code=self.status,
+            headers={"content-type": "image/png; charset=binary"},
+            content=b"PNG:" + url.encode(),
+        )
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPrefetch:
+    def test_distinct_keys_fetched_concurrently_once(self, tmp_path) -> None:
+        images = _Images(delay=0.02)
+        keys = [("team", i) for i in range(6)] * 2
+        with patch.object(logo_store, "http_get", images):
+            logos = LogoStore(tmp_path).prefetch(keys)
+
+        assert len(images.calls) == 6
+        assert images.peak > 1
+        assert set(logos) == set(keys)
+        assert all(uri.startswith("data:image/png;base64,") for uri in logos.values())
+
+    def test_persisted_logo_survives_restart(self, tmp_path) -> None:
+        with patch.object(logo_store, "http_get", _Images()):
+            uri = LogoStore(tmp_path).get(("league", 47))
+
+        assert (tmp_path / "league" / "47.png").read_bytes().startswith(b"PNG:")
+        meta = json.loads((tmp_path / "league" / "47.json").read_text())
+        assert (meta["content_type"], meta["data_uri"]) == ("image/png", uri)
+
+        images = _Images()
+        with patch.object(logo_store, "http_get", images):
+            assert LogoStore(tmp_path).get(("league", 47)) == uri
+        assert images.calls == []
+
+
+class TestFailures:
+    def test_retry_after_window(self, tmp_path) -> None:
+        clock = _Clock()
+        failing = _Images(status=requests.ConnectionError("down"))
+        with patch.object(logo_store, "http_get", failing):
+            assert LogoStore(tmp_path, clock=clock).get(("team", 1)) is None
+
+        # A restart inside the window neither downloads nor forgets the failure.
+        store = LogoStore(tmp_path, clock=clock)
+        images = _Images()
+        with patch.object(logo_store, "http_get", images):
+            assert store.get(("team", 1)) is None
+            assert images.calls == []
+            clock.now += logo_store.retry_delay(1)
+            assert store.get(("team", 1)) is not None
+        assert len(images.calls) == 1
+
+    def test_backoff(self) -> None:
+        assert logo_store.retry_delay(1) == logo_store._RETRY_BASE_S
+        assert logo_store.retry_delay(2) == 2 * logo_store._RETRY_BASE_S
+        assert logo_store.retry_delay(50) == logo_store._RETRY_MAX_S
+        assert logo_store.retry_delay(1, status_code=404) == logo_store._RETRY_MAX_S
+
+    def test_failed_refresh_keeps_logo(self, tmp_path) -> None:
+        store = LogoStore(tmp_path)
+        with patch.object(logo_store, "http_get", _Images()):
+            uri = store.get(("team", 1))
+        with patch.object(logo_store, "http_get", _Images(status=500)):
+            assert store.prefetch([("team", 1)], refresh=True) == {("team", 1): uri}
+        assert "data_uri" in json.loads((tmp_path / "team" / "1.json").read_text())
+
+
+def test_seed_keys() -> None:
+    cur = MagicMock()
+    cur.fetchall.return_value = [(8456,), (9825,)]
+    keys = logo_store.seed_keys(cur)
+
+    assert keys[:2] == [("team", 8456), ("team", 9825)]
+    leagues = [k for k in keys if k[0] == "league"]
+    assert len(leagues) == len(set(logo_store.FOTMOB_LEAGUE_ID.values()))
+    assert ("league", 47) in leagues
@@ -0,0 +1,159 @@
+"""Tests for the deadline scheduler in soccersmartbet.telegram.triggers.
+
+Coverage:
+  1. _plan_triggers: pre-gambling fires once at/after its time and re-checks
+     soon until pre_gambling_started_at is written; otherwise the next
+     deadline is today's or tomorrow's trigger time.
+  2. _plan_triggers: a future post_games_trigger_at becomes the deadline; a
+     due one fires and schedules a fallback re-check.
+  3. _sleep_until: returns at the deadline, wakes early on a daily_runs
+     NOTIFY, ignores unrelated tables, and detects wall-clock jumps.
+  4. ChangeListener fan-out: every subscriber gets each payload; full queues
+     drop the oldest item.  wait_for_change wakes only on watched tables.
+
+No DB or Telegram access: pure functions and asyncio only.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from soccersmartbet.db_listener import ChangeListener, wait_for_change
+from soccersmartbet.telegram import triggers
+from soccersmartbet.utils.timezone import isr_datetime, now_isr
+
+
+def _at(hour: int, minute: int = 0):
+    return isr_datetime(2026, 5, 1, hour, minute)
+
+
+def _pre_at():
+    return _at(triggers._PRE_GAMBLING_HOUR, triggers._PRE_GAMBLING_MINUTE)
+
+
+class TestPlanTriggers:
+    def test_before_pre_gambling_time_sleeps_until_it(self) -> None:
+        now = _pre_at() - timedelta(minutes=30)
+        due, next_check = triggers._plan_triggers(now, None, None)
+        assert due == []
+        assert next_check == _pre_at()
+
+    def test_pre_gambling_fires_when_due_and_not_started(self) -> None:
+        now = _pre_at() + timedelta(minutes=1)
+        due, next_check = triggers._plan_triggers(now, None, None)
+        assert due == ["pre_gambling"]
+        assert next_check == now + timedelta(seconds=triggers._FALLBACK_RECHECK_S)
+
+    def test_fired_pre_gambling_without_started_at_is_retried(self) -> None:
+        # The last fire failed before writing pre_gambling_started_at: no
+        # NOTIFY will come, so the scheduler must re-check on its own.
+        now = _pre_at() + timedelta(minutes=5)
+        daily = {"pre_gambling_started_at": None, "status": "failed"}
+        due, next_check = triggers._plan_triggers(now, daily, None)
+        assert due == ["pre_gambling"]
+        assert next_check == now + timedelta(seconds=triggers._FALLBACK_RECHECK_S)
+
+        started = {"pre_gambling_started_at": _pre_at(), "status": "pre_gambling_done"}
+        due, next_check = triggers._plan_triggers(next_check, started, None)
+        assert due == []
+        assert next_check == _pre_at() + timedelta(days=1)
+
+    def test_pre_gambling_not_refired_once_started(self) -> None:
+        now = _pre_at() + timedelta(hours=1)
+        daily = {"pre_gambling_started_at": _pre_at(), "status": "pre_gambling_running"}
+        due, _ = triggers._plan_triggers(now, daily, None)
+        assert due == []
+
+    def test_future_post_games_trigger_is_the_deadline(self) -> None:
+        now = _pre_at() + timedelta(hours=1)
+        trigger_at = _at(23, 15)
+        daily = {"pre_gambling_started_at": _pre_at(), "status": "gambling_done"}
+        pending = {"run_date": now.date(), "post_games_trigger_at": trigger_at, "game_ids": [1]}
+        due, next_check = triggers._plan_triggers(now, daily, pending)
+        assert due == []
+        assert next_check == trigger_at
+
+    def test_due_post_games_fires_and_rechecks_soon(self) -> None:
+        now = _at(23, 30)
+        daily = {"pre_gambling_started_at": _pre_at(), "status": "gambling_done"}
+        pending = {"run_date": now.date(), "post_games_trigger_at": _at(23, 15), "game_ids": [1]}
+        due, next_check = triggers._plan_triggers(now, daily, pending)
+        assert due == ["post_games"]
+        assert next_check == now + timedelta(seconds=triggers._FALLBACK_RECHECK_S)
+
+
+class _Connected:
+    connected = True
+
+
+class TestSleepUntil:
+    def test_returns_at_deadline(self) -> None:
+        async def _run() -> str:
+            deadline = triggers.now_isr() + timedelta(milliseconds=50)
+            return await triggers._sleep_until(deadline, asyncio.Queue(), _Connected())
+
+        assert asyncio.run(_run()) == "deadline"
+
+    def test_daily_runs_notify_wakes_early(self) -> None:
+        async def _run() -> str:
+            wake: asyncio.Queue = asyncio.Queue()
+            wake.put_nowait({"table": "bets", "op": "INSERT"})
+            asyncio.get_running_loop().call_later(
+                0.05, wake.put_nowait, {"table": "daily_runs", "op": "UPDATE"}
+            )
+            deadline = triggers.now_isr() + timedelta(hours=1)
+            return await asyncio.wait_for(
+                triggers._sleep_until(deadline, wake, _Connected()), timeout=5
+            )
+
+        assert asyncio.run(_run()) == "notify"
+
+    def test_wall_clock_jump_is_detected(self) -> None:
+        real_now = triggers.now_isr()
+        clock = iter([real_now, real_now + timedelta(minutes=30), real_now])
+
+        async def _run() -> str:
+            deadline = real_now + timedelta(hours=2)
+            with patch.object(triggers, "_MAX_SLICE_S", 0.01), \
+                 patch.object(triggers, "now_isr", side_effect=lambda: next(clock)):
+                return await triggers._sleep_until(deadline, asyncio.Queue(), _Connected())
+
+        assert asyncio.run(_run()) == "drift"
+
+
+class TestChangeListenerFanOut:
+    def test_every_subscriber_receives_payloads(self) -> None:
+        async def _run():
+            listener = ChangeListener()
+            a, b = listener.subscribe(), listener.subscribe()
+            listener.publish({"table": "daily_runs"})
+            listener.unsubscribe(b)
+            listener.publish({"table": "games"})
+            return [a.get_nowait(), a.get_nowait()], b.qsize()
+
+        received, b_size = asyncio.run(_run())
+        assert [p["table"] for p in received] == ["daily_runs", "games"]
+        assert b_size == 1
+
+    def test_full_queue_drops_oldest(self) -> None:
+        async def _run():
+            listener = ChangeListener()
+            q = listener.subscribe()
+            for i in range(q.maxsize + 3):
+                listener.publish({"table": "t", "n": i})
+            return q.qsize(), q.get_nowait()["n"]
+
+        size, first = asyncio.run(_run())
+        assert size == 100
+        assert first == 3
+
+    def test_wait_for_change_wakes_only_on_watched_tables(self) -> None:
+        async def _run():
+            q: asyncio.Queue = asyncio.Queue()
+            for table in ("odds_snapshots", "bets", "games"):
+                q.put_nowait({"table": table})
+            await wait_for_change(now_isr() + timedelta(seconds=5), q, ("games",))
+            return q.qsize()
+
+        assert asyncio.run(_run()) == 0
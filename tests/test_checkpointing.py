@@ -0,0 +1,127 @@
+"""Tests for resumable flow runs (soccersmartbet.checkpointing).
+
+Coverage:
+  1. thread_id is keyed by flow and run_date, plus an input fingerprint.
+  2. A failed run resumes at the failed node; Send branches that succeeded
+     and earlier nodes are not re-run.
+  3. A completed thread is discarded so the next run starts fresh.
+  4. Graphs compiled without a checkpointer are invoked directly.
+
+Uses LangGraph's in-memory saver — no Postgres needed.
+"""
+from __future__ import annotations
+
+import operator
+from datetime import date
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from soccersmartbet.checkpointing import run_checkpointed, thread_id
+
+_DAY = date(2026, 5, 1)
+
+
+class _State(TypedDict):
+    items: list[int]
+    done: Annotated[list[int], operator.add]
+
+
+def _build(calls: list[str], failing: set[str], checkpointer=None):
+    def pick(state: _State) -> dict:
+        calls.append("pick")
+        return {"items": [1, 2, 3]}
+
+    def analyze(payload: dict) -> dict:
+        name = f"analyze{payload['i']}"
+        calls.append(name)
+        if name in failing:
+            raise RuntimeError(name)
+        return {"done": [payload["i"]]}
+
+    def report(state: _State) -> dict:
+        calls.append("report")
+        if "report" in failing:
+            raise RuntimeError("report")
+        return {}
+
+    graph = StateGraph(_State)
+    graph.add_node("pick", pick)
+    graph.add_node("analyze", analyze)
+    graph.add_node("report", report)
+    graph.add_edge(START, "pick")
+    graph.add_conditional_edges(
+        "pick", lambda s: [Send("analyze", {"i": i}) for i in s["items"]], ["analyze"]
+    )
+    graph.add_edge("analyze", "report")
+    graph.add_edge("report", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+_INITIAL = {"items": [], "done": []}
+
+
+class TestThreadId:
+    def test_keyed_by_flow_and_date(self) -> None:
+        assert thread_id("pre_gambling", _DAY) == "pre_gambling:2026-05-01"
+
+    def test_inputs_fingerprint_is_stable_and_distinct(self) -> None:
+        a = thread_id("post_games", _DAY, [1, 2])
+        assert a == thread_id("post_games", _DAY, [1, 2])
+        assert a != thread_id("post_games", _DAY, [1, 3])
+        assert a.startswith("post_games:2026-05-01:")
+
+
+class TestRunCheckpointed:
+    def test_resume_skips_completed_work(self) -> None:
+        saver = InMemorySaver()
+        calls: list[str] = []
+        failing = {"analyze3"}
+        graph = _build(calls, failing, saver)
+
+        with pytest.raises(RuntimeError):
+            run_checkpointed(graph, _INITIAL, "pre_gambling", _DAY)
+
+        failing.clear()
+        calls.clear()
+        result = run_checkpointed(graph, _INITIAL, "pre_gambling", _DAY)
+
+        assert calls == ["analyze3", "report"]
+        assert sorted(result["done"]) == [1, 2, 3]
+
+    def test_completed_thread_starts_fresh(self) -> None:
+        saver = InMemorySaver()
+        calls: list[str] = []
+        graph = _build(calls, set(), saver)
+
+        run_checkpointed(graph, _INITIAL, "pre_gambling", _DAY)
+        calls.clear()
+        result = run_checkpointed(graph, _INITIAL, "pre_gambling", _DAY)
+
+        assert calls[0] == "pick"
+        assert sorted(result["done"]) == [1, 2, 3]  # not doubled by the reducer
+
+    def test_different_inputs_do_not_resume(self) -> None:
+        saver = InMemorySaver()
+        calls: list[str] = []
+        failing = {"report"}
+        graph = _build(calls, failing, saver)
+
+        with pytest.raises(RuntimeError):
+            run_checkpointed(graph, _INITIAL, "gambling", _DAY, inputs={"bets": 1})
+
+        failing.clear()
+        calls.clear()
+        run_checkpointed(graph, _INITIAL, "gambling", _DAY, inputs={"bets": 2})
+
+        assert calls[0] == "pick"
+
+    def test_without_checkpointer_invokes_directly(self) -> None:
+        calls: list[str] = []
+        result = run_checkpointed(_build(calls, set()), _INITIAL, "pre_gambling", _DAY)
+
+        assert calls[0] == "pick"
+        assert sorted(result["done"]) == [1, 2, 3]
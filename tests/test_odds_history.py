@@ -0,0 +1,124 @@
+"""Tests for soccersmartbet.odds_history and its consumers.
+
+Coverage:
+  1. to_fixed / from_fixed — decimal odds round-trip through fixed point
+     (half-up, no float drift).
+  2. pending_games — only games whose kickoff is still ahead are sampled.
+  3. match_line — fixed-point rows for listed games; unlisted games and
+     non-prices (<= 1.00) are skipped.
+  4. record_snapshots / read_movement — one bulk statement per round with
+     column arrays; series grouped per game, oldest first, as floats.
+  5. ai_betting_agent._movement_line — described only when the line moved.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+import pytest
+
+from soccersmartbet import odds_history as oh
+from soccersmartbet.gambling_flow.ai_betting_agent import _movement_line
+from soccersmartbet.utils.timezone import isr_datetime
+
+_UTC = datetime.timezone.utc
+
+
+class TestFixedPoint:
+    @pytest.mark.parametrize("odd, fixed", [(2.15, 215), (1.01, 101), (12.0, 1200), (3.3, 330)])
+    def test_round_trip(self, odd, fixed) -> None:
+        assert oh.to_fixed(odd) == fixed
+        assert oh.from_fixed(fixed) == odd
+
+    def test_half_up(self) -> None:
+        assert oh.to_fixed(1.005) == 101
+        assert oh.to_fixed(2.125) == 213
+
+
+def test_pending_games() -> None:
+    now = isr_datetime(2026, 5, 1, 18, 0)
+    day = datetime.date(2026, 5, 1)
+    games = [
+        (1, "A", "B", day, datetime.time(17, 30)),
+        (2, "C", "D", day, datetime.time(18, 0)),
+        (3, "E", "F", day, datetime.time(21, 45)),
+    ]
+    assert oh.pending_games(now, games) == [(3, "E", "F")]
+
+
+class _Line:
+    def __init__(self, events: dict[tuple[str, str], tuple[float, float, float]]) -> None:
+        self.events = events
+
+    def find(self, home: str, away: str) -> dict[str, float] | None:
+        odds = self.events.get((home, away))
+        if odds is None:
+            return None
+        return dict(zip(("odds_home", "odds_draw", "odds_away"), odds))
+
+
+def test_match_line() -> None:
+    line = _Line({("A", "B"): (2.1, 3.35, 3.6), ("E", "F"): (1.0, 9.0, 21.0)})
+    games = [(1, "A", "B"), (2, "C", "D"), (3, "E", "F")]
+    assert oh.match_line(line, games) == [(1, 210, 335, 360)]
+
+
+class _Cursor:
+    def __init__(self, rows: list[tuple] | None = None) -> None:
+        self.rows = rows or []
+        self.executed: list[tuple[str, dict[str, Any]]] = []
+        self.rowcount = 2
+
+    def execute(self, sql: str, params: dict[str, Any]) -> None:
+        self.executed.append((sql, params))
+
+    def fetchall(self) -> list[tuple]:
+        return self.rows
+
+
+class TestStorage:
+    def test_one_bulk_insert(self) -> None:
+        cur = _Cursor()
+        ts = datetime.datetime(2026, 5, 1, 9, 0, tzinfo=_UTC)
+        written = oh.record_snapshots(cur, ts, [(1, 210, 335, 360), (2, 150, 400, 650)])
+
+        assert written == 2
+        [(sql, params)] = cur.executed
+        assert "unnest" in sql and "IS DISTINCT FROM" in sql
+        assert params == {
+            "ts": ts, "game_ids": [1, 2], "home": [210, 150], "draw": [335, 400], "away": [360, 650],
+        }
+
+    def test_nothing_to_record(self) -> None:
+        cur = _Cursor()
+        assert oh.record_snapshots(cur, datetime.datetime.now(_UTC), []) == 0
+        assert oh.read_movement(cur, []) == {}
+        assert cur.executed == []
+
+    def test_read_movement(self) -> None:
+        t0 = datetime.datetime(2026, 5, 1, 9, 0, tzinfo=_UTC)
+        t1 = t0 + datetime.timedelta(hours=1)
+        cur = _Cursor([(1, t0, 210, 335, 360), (1, t1, 200, 340, 380), (2, t0, 150, 400, 650)])
+        series = oh.read_movement(cur, [1, 2, 3])
+
+        assert set(series) == {1, 2}
+        assert [p["home"] for p in series[1]] == [2.1, 2.0]
+        assert series[1][-1] == {"ts": t1, "home": 2.0, "draw": 3.4, "away": 3.8}
+
+
+class TestAgentPrompt:
+    _GAME = {"home_win_odd": 2.10, "draw_odd": 3.35, "away_win_odd": 3.60}
+
+    def test_described_when_moved(self) -> None:
+        ts = datetime.datetime(2026, 5, 1, 15, 30, tzinfo=_UTC)
+        game = {**self._GAME, "odds_movement": [{"ts": ts, "home": 1.95, "draw": 3.4, "away": 3.9}]}
+        assert _movement_line(game) == (
+            "Line movement since pick: 1=2.10→1.95 / X=3.35→3.40 / 2=3.60→3.90"
+            " (as of 18:30 ISR)"
+        )
+
+    def test_silent_without_movement(self) -> None:
+        ts = datetime.datetime(2026, 5, 1, 15, 30, tzinfo=_UTC)
+        unchanged = {"ts": ts, "home": 2.1, "draw": 3.35, "away": 3.6}
+        assert _movement_line({**self._GAME, "odds_movement": [unchanged]}) is None
+        assert _movement_line({**self._GAME, "odds_movement": []}) is None
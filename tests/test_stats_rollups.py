@@ -0,0 +1,195 @@
+"""Tests for soccersmartbet.stats_rollups.
+
+Coverage:
+  1. Rollup.add — totals, wins, bounded top-N by |pnl|; re-settlement applies
+     the delta without double counting, and demoting a notable bet marks the
+     top-N stale until reset_notable recomputes it.
+  2. merge / stats_payload — per-bettor totals and the combined top-N match a
+     from-scratch computation; pending bets count in total_bets only;
+     nothing to report → zeroed totals.
+  3. rollup_keys — league key plus normalized home and away team keys.
+  4. Incremental folding (fold_settled_bets) ends in the same state as a full
+     rebuild, against a fake cursor — also when a re-settlement demotes a
+     notable bet below a bet pushed out earlier.
+"""
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from soccersmartbet import stats_rollups as sr
+
+
+def _bet(bet_id: int, pnl: float, bettor: str = "user", home: str = "Arsenal FC",
+         away: str = "Chelsea", league: str = "Premier League", stake: float = 100.0) -> dict:
+    return {
+        "bet_id": bet_id, "bettor": bettor, "prediction": "1", "stake": stake,
+        "odds": 2.0, "result": "1", "pnl": pnl, "game_id": bet_id, "home_team": home,
+        "away_team": away, "match_date": "2026-05-01", "kickoff_time": "21:00",
+        "league": league, "outcome": "1", "home_score": 1, "away_score": 0,
+    }
+
+
+class TestRollup:
+    def test_totals_and_bounded_notable(self) -> None:
+        rollup = sr.Rollup()
+        for i, pnl in enumerate([10.0, -80.0, 5.0, 40.0, -1.0, 60.0, 20.0], start=1):
+            rollup.add(_bet(i, pnl))
+
+        assert (rollup.total_bets, rollup.wins) == (7, 5)
+        assert rollup.total_pnl == pytest.approx(54.0)
+        assert rollup.win_rate == pytest.approx(5 / 7)
+        assert [b["pnl"] for b in rollup.notable] == [-80.0, 60.0, 40.0, 20.0, 10.0]
+
+    def test_resettlement_applies_delta(self) -> None:
+        rollup = sr.Rollup()
+        rollup.add(_bet(1, 100.0))
+        rollup.add(_bet(1, -100.0), previous_pnl=100.0)
+
+        assert (rollup.total_bets, rollup.wins, rollup.total_stake) == (1, 0, 100.0)
+        assert rollup.total_pnl == pytest.approx(-100.0)
+        assert [b["pnl"] for b in rollup.notable] == [-100.0]
+
+    def test_demoted_notable_bet_marks_top_n_stale(self) -> None:
+        rollup = sr.Rollup()
+        bets = [_bet(i, pnl) for i, pnl in enumerate([100.0, 90.0, 80.0, 70.0, 60.0, 50.0], 1)]
+        for bet in bets:
+            rollup.add(bet)
+        rollup.add(_bet(3, 85.0), previous_pnl=80.0)
+        assert not rollup.notable_stale
+
+        bets[0] = _bet(1, 1.0)
+        rollup.add(bets[0], previous_pnl=100.0)
+
+        assert rollup.notable_stale
+        rollup.reset_notable(bets)
+        assert not rollup.notable_stale
+        assert [b["bet_id"] for b in rollup.notable] == [2, 3, 4, 5, 6]
+
+    def test_from_notable_round_trip(self) -> None:
+        rollup = sr.Rollup()
+        for i in range(1, 4):
+            rollup.add(_bet(i, float(i)))
+        again = sr.Rollup.from_notable(rollup.notable, total_bets=3, wins=3)
+        again.add(_bet(9, 0.5))
+        assert [b["bet_id"] for b in again.notable] == [3, 2, 1, 9]
+
+
+class TestPayload:
+    def test_per_bettor_and_combined(self) -> None:
+        bets = [_bet(1, 50.0), _bet(2, -100.0, bettor="ai"), _bet(3, 30.0, bettor="ai")]
+        rollups = sr.build_rollups(bets)
+        league = [(k[2], r) for k, r in rollups.items() if k[0] == "league"]
+
+        payload = sr.stats_payload(league)
+
+        assert payload["total_bets"] == 3
+        assert payload["total_pnl"] == -20.0
+        assert payload["win_rate"] == pytest.approx(2 / 3)
+        assert [b["bet_id"] for b in payload["notable_games"]] == [2, 1, 3]
+        assert payload["by_bettor"]["ai"]["win_rate"] == 0.5
+        assert payload["by_bettor"]["user"]["total_stake"] == 100.0
+
+    def test_pending_bets_count_in_totals_only(self) -> None:
+        rollups = [(k[2], r) for k, r in sr.build_rollups([_bet(1, 50.0)]).items()
+                   if k[0] == "league"]
+        rollups.append(("user", sr.Rollup(pending_bets=1, pending_stake=200.0)))
+
+        payload = sr.stats_payload(rollups)
+
+        assert (payload["total_bets"], payload["settled_bets"]) == (2, 1)
+        assert payload["total_stake"] == 300.0
+        assert payload["win_rate"] == 1.0
+        assert [b["bet_id"] for b in payload["notable_games"]] == [1]
+
+    def test_empty_is_zeroed(self) -> None:
+        payload = sr.stats_payload([])
+
+        assert (payload["total_bets"], payload["settled_bets"]) == (0, 0)
+        assert (payload["total_pnl"], payload["win_rate"]) == (0.0, None)
+        assert (payload["notable_games"], payload["by_bettor"]) == ([], {})
+
+
+class TestKeys:
+    def test_league_and_normalized_teams(self) -> None:
+        keys = sr.rollup_keys(_bet(1, 1.0, home="Club Atlético de Madrid", away="Arsenal FC"))
+        assert keys == {
+            ("league", "Premier League", "user"),
+            ("team", "atletico de madrid", "user"),
+            ("team", "arsenal", "user"),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Incremental folding vs rebuild
+# ---------------------------------------------------------------------------
+
+
+def _row(bet: dict) -> tuple:
+    return (
+        bet["bet_id"], bet["bettor"], bet["prediction"], Decimal(str(bet["stake"])),
+        Decimal(str(bet["odds"])), bet["result"], Decimal(str(bet["pnl"])), bet["game_id"],
+        bet["home_team"], bet["away_team"], datetime.date(2026, 5, 1),
+        datetime.time(21, 0), bet["league"], bet["outcome"], bet["home_score"],
+        bet["away_score"],
+    )
+
+
+class _FakeCursor:
+    """Just enough of a cursor for fold_settled_bets: settled bets + rollup rows."""
+
+    def __init__(self) -> None:
+        self.bets: dict[int, dict] = {}
+        self.table: dict[sr.RollupKey, tuple] = {}
+        self._result: list[tuple] = []
+
+    def execute(self, sql: str, params: dict[str, Any]) -> None:
+        if "FROM bets" in sql and "ids" in params:
+            self._result = [_row(self.bets[i]) for i in params["ids"] if i in self.bets]
+        elif "FROM bets" in sql:
+            self._result = [_row(b) for b in self.bets.values() if b["bettor"] in params["bettors"]]
+        else:
+            wanted = set(zip(params["scopes"], params["keys"], params["bettors"]))
+            self._result = [k + v for k, v in self.table.items() if k in wanted]
+
+    def executemany(self, sql: str, rows: list[dict[str, Any]]) -> None:
+        for p in rows:
+            self.table[(p["scope"], p["scope_key"], p["bettor"])] = (
+                p["total_bets"], p["wins"], Decimal(str(p["total_stake"])),
+                Decimal(str(p["total_pnl"])), p["notable"].obj,
+            )
+
+    def fetchall(self) -> list[tuple]:
+        return self._result
+
+
+@pytest.mark.parametrize("settlements", [
+    [
+        [_bet(1, 50.0), _bet(2, -100.0, bettor="ai")],
+        [_bet(3, 75.0, home="Liverpool"), _bet(4, -100.0, home="Liverpool", bettor="ai")],
+        [_bet(2, 120.0, bettor="ai")],  # re-settled
+    ],
+    [
+        [_bet(i, pnl) for i, pnl in enumerate([100.0, 90.0, 80.0, 70.0, 60.0, 50.0], 1)],
+        [_bet(1, 1.0)],  # re-settled out of the top 5; bet 6 must come back
+    ],
+], ids=["resettled-up", "resettled-out-of-top-n"])
+def test_folding_matches_rebuild(settlements: list[list[dict]]) -> None:
+    cur = _FakeCursor()
+    for batch in settlements:
+        previous = {b["bet_id"]: cur.bets[b["bet_id"]]["pnl"] if b["bet_id"] in cur.bets else None
+                    for b in batch}
+        cur.bets.update({b["bet_id"]: b for b in batch})
+        sr.fold_settled_bets(cur, previous)
+
+    expected = sr.build_rollups(cur.bets.values())
+
+    assert set(cur.table) == set(expected)
+    for key, rollup in expected.items():
+        total_bets, wins, stake, pnl, notable = cur.table[key]
+        assert (total_bets, wins) == (rollup.total_bets, rollup.wins), key
+        assert float(pnl) == pytest.approx(rollup.total_pnl), key
+        assert [b["bet_id"] for b in notable] == [b["bet_id"] for b in rollup.notable], key
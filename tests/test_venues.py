@@ -0,0 +1,192 @@
+"""Tests for the home-stadium store (soccersmartbet.venues) and its two readers.
+
+Coverage:
+  1. venue_from_team_data — widget name/city/location and statPairs
+     capacity/surface; a payload without a venue gives an all-None venue.
+  2. get_venue — memory → table → FotMob order; one download per team
+     however many lookups (including concurrent ones); stale rows are
+     re-fetched and kept when the refresh fails.
+  3. fetch_venue / fetch_weather — both read the store, so a game makes a
+     single team-payload download; weather needs only the Open-Meteo call.
+
+FotMob, Open-Meteo and the ``venues`` table are in-memory fakes.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from soccersmartbet import venues
+from soccersmartbet.utils.timezone import isr_datetime
+
+# The package re-exports the tool functions under their module names.
+fetch_venue_mod = importlib.import_module("soccersmartbet.pre_gambling_flow.tools.game.fetch_venue")
+fetch_weather_mod = importlib.import_module(
+    "soccersmartbet.pre_gambling_flow.tools.game.fetch_weather"
+)
+
+_NOW = isr_datetime(2026, 5, 1, 10, 0)
+
+_TEAM_DATA = {
+    "overview": {
+        "venue": {
+            "widget": {"name": "Emirates Stadium", "city": "London", "location": [51.555, -0.108]},
+            "statPairs": [["Capacity", "60,704"], ["Surface", "Grass"], ["Opened", 2006]],
+        }
+    }
+}
+
+
+class _FotMob:
+    def __init__(self) -> None:
+        self.team_calls: list[int] = []
+        self.available = True
+        self.gate: threading.Event | None = None
+
+    def find_team(self, name: str) -> dict:
+        return {"id": 9825, "name": "Arsenal"}
+
+    def get_team_data(self, team_id: int) -> dict | None:
+        self.team_calls.append(team_id)
+        if self.gate is not None:
+            self.gate.wait(1)
+        return _TEAM_DATA if self.available else None
+
+
+@pytest.fixture()
+def fotmob(monkeypatch) -> _FotMob:
+    client = _FotMob()
+    table: dict[int, venues.Venue] = {}
+    client.table = table
+    monkeypatch.setattr(venues, "_memory", {})
+    monkeypatch.setattr(venues, "_load", table.get)
+    monkeypatch.setattr(venues, "_save", lambda v: table.__setitem__(v.fotmob_team_id, v))
+    monkeypatch.setattr(venues, "now_isr", lambda: _NOW)
+    return client
+
+
+# ---------------------------------------------------------------------------
+# 1. venue_from_team_data
+# ---------------------------------------------------------------------------
+
+
+def test_venue_from_team_data():
+    venue = venues.venue_from_team_data(9825, _TEAM_DATA, _NOW)
+
+    assert venue.name == "Emirates Stadium"
+    assert venue.city == "London"
+    assert venue.coordinates == (51.555, -0.108)
+    assert venue.capacity == 60704
+    assert venue.surface == "Grass"
+
+
+def test_team_without_venue_is_all_none():
+    venue = venues.venue_from_team_data(1, {"overview": {}}, _NOW)
+
+    assert (venue.name, venue.city, venue.coordinates, venue.capacity) == (None, None, None, None)
+
+
+# ---------------------------------------------------------------------------
+# 2. get_venue
+# ---------------------------------------------------------------------------
+
+
+def test_one_download_per_team(fotmob):
+    first = venues.get_venue(9825, fotmob)
+    venues._memory.clear()  # e.g. a new process: the table answers
+    again = venues.get_venue(9825, fotmob)
+    third = venues.get_venue(9825, fotmob)
+
+    assert fotmob.team_calls == [9825]
+    assert first == again == third
+    assert 9825 in fotmob.table
+
+
+def test_concurrent_lookups_share_one_download(fotmob):
+    fotmob.gate = threading.Event()
+    results: list = []
+    threads = [
+        threading.Thread(target=lambda: results.append(venues.get_venue(9825, fotmob)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    fotmob.gate.set()
+    for t in threads:
+        t.join()
+
+    assert fotmob.team_calls == [9825]
+    assert len(set(results)) == 1
+
+
+def test_stale_row_is_refetched(fotmob):
+    stale = venues.venue_from_team_data(9825, {"overview": {}}, _NOW - venues.VENUE_TTL)
+    fotmob.table[9825] = stale
+
+    venue = venues.get_venue(9825, fotmob)
+
+    assert fotmob.team_calls == [9825]
+    assert venue.name == "Emirates Stadium"
+    assert fotmob.table[9825].fetched_at == _NOW
+
+
+def test_failed_refresh_keeps_stored_row(fotmob):
+    stale = venues.venue_from_team_data(9825, _TEAM_DATA, _NOW - venues.VENUE_TTL - timedelta(1))
+    fotmob.table[9825] = stale
+    fotmob.available = False
+
+    assert venues.get_venue(9825, fotmob) == stale
+    assert venues.get_venue(404, fotmob) is None
+
+
+# ---------------------------------------------------------------------------
+# 3. Tools
+# ---------------------------------------------------------------------------
+
+
+def test_venue_and_weather_share_one_team_download(fotmob, monkeypatch):
+    weather_calls: list[dict] = []
+
+    def open_meteo(url, params=None, timeout=None):
+        weather_calls.append(params)
+        hourly = {
+            "time": ["2026-05-02T19:00"],
+            "temperature_2m": [14.0],
+            "precipitation": [0.6],
+            "precipitation_probability": [55],
+            "windspeed_10m": [11.0],
+        }
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"hourly": hourly})
+
+    for mod in (fetch_venue_mod, fetch_weather_mod):
+        monkeypatch.setattr(mod, "get_fotmob_client", lambda: fotmob)
+    monkeypatch.setattr(fetch_weather_mod, "http_get", open_meteo)
+
+    venue = fetch_venue_mod.fetch_venue("Arsenal", "Chelsea")
+    weather = fetch_weather_mod.fetch_weather("Arsenal", "Chelsea", "2026-05-02T19:00:00")
+
+    assert fotmob.team_calls == [9825]
+    assert venue["venue_name"] == "Emirates Stadium"
+    assert venue["venue_capacity"] == 60704
+    assert venue["error"] is None
+    assert weather["error"] is None
+    assert weather["venue_city"] == "London"
+    assert weather["conditions"] == "Rain"
+    assert (weather_calls[0]["latitude"], weather_calls[0]["longitude"]) == ("51.555", "-0.108")
+
+
+def test_tools_report_missing_venue(fotmob, monkeypatch):
+    fotmob.table[9825] = venues.venue_from_team_data(9825, {"overview": {}}, _NOW)
+    for mod in (fetch_venue_mod, fetch_weather_mod):
+        monkeypatch.setattr(mod, "get_fotmob_client", lambda: fotmob)
+
+    venue = fetch_venue_mod.fetch_venue("Arsenal", "Chelsea")
+    weather = fetch_weather_mod.fetch_weather("Arsenal", "Chelsea", "2026-05-02T19:00:00")
+
+    assert venue["error"] == "Venue data not available"
+    assert weather["error"] == "Venue city not found for team 'Arsenal'"
+    assert fotmob.team_calls == []
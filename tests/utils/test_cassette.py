@@ -0,0 +1,111 @@
+"""Tests for the record/replay cassette layer.
+
+Coverage:
+  1. Request normalization — param order, URL-embedded query, secret stripping.
+  2. HTTP record → replay round-trip produces an equivalent Response.
+  3. Replay miss raises CassetteMiss (a requests.ConnectionError).
+  4. Off mode never touches the cassette directory.
+  5. Structured LLM output round-trips through the cassette.
+
+No real HTTP or LLM calls: the live callables are mocked.
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+
+@pytest.fixture()
+def cassettes(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSETTE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _fake_response(status: int = 200, body: bytes = b'{"ok": true}') -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers["Content-Type"] = "application/json"
+    resp.encoding = "utf-8"
+    return resp
+
+
+class TestNormalizeHttpRequest:
+    def test_param_order_and_embedded_query_share_a_key(self) -> None:
+        from soccersmartbet.utils.cassette import cassette_key, normalize_http_request
+
+        a = normalize_http_request("get", "https://x.test/api?b=2&a=1")
+        b = normalize_http_request("GET", "https://X.test/api", {"a": 1, "b": 2})
+        assert cassette_key("http", a) == cassette_key("http", b)
+
+    def test_api_key_is_stripped(self) -> None:
+        from soccersmartbet.utils.cassette import normalize_http_request
+
+        norm = normalize_http_request("GET", "https://x.test/odds", {"apiKey": "s3cret", "regions": "eu"})
+        assert norm["query"] == [("regions", "eu")]
+
+
+class TestHttpGet:
+    def test_record_then_replay_round_trip(self, cassettes, monkeypatch) -> None:
+        from soccersmartbet.utils import cassette
+
+        monkeypatch.setenv("CASSETTE_MODE", "record")
+        with patch.object(cassette.requests, "get", return_value=_fake_response()) as live:
+            recorded = cassette.http_get("https://x.test/api", params={"id": 7}, timeout=1)
+        assert live.call_count == 1
+        assert list(cassettes.rglob("*.json.gz"))
+
+        monkeypatch.setenv("CASSETTE_MODE", "replay")
+        with patch.object(cassette.requests, "get", side_effect=AssertionError("network")):
+            replayed = cassette.http_get("https://x.test/api?id=7", timeout=1)
+
+        assert replayed.status_code == recorded.status_code
+        assert replayed.json() == {"ok": True}
+        assert replayed.headers["content-type"] == "application/json"
+
+    def test_replay_miss_raises_connection_error(self, cassettes, monkeypatch) -> None:
+        from soccersmartbet.utils.cassette import CassetteMiss, http_get
+
+        monkeypatch.setenv("CASSETTE_MODE", "replay")
+        with pytest.raises(requests.ConnectionError) as exc_info:
+            http_get("https://x.test/missing")
+        assert isinstance(exc_info.value, CassetteMiss)
+
+    def test_off_mode_writes_nothing(self, cassettes, monkeypatch) -> None:
+        from soccersmartbet.utils import cassette
+
+        monkeypatch.delenv("CASSETTE_MODE", raising=False)
+        with patch.object(cassette.requests, "get", return_value=_fake_response()):
+            cassette.http_get("https://x.test/api")
+        assert not list(cassettes.rglob("*"))
+
+
+class _Bullets(BaseModel):
+    bullets: list[str]
+
+
+class TestInvokeStructured:
+    def test_llm_record_then_replay(self, cassettes, monkeypatch) -> None:
+        from soccersmartbet.utils import llm
+
+        messages = [SystemMessage(content="sys"), HumanMessage(content="user")]
+        fake_chat = MagicMock()
+        fake_chat.with_structured_output.return_value.invoke.return_value = {
+            "raw": MagicMock(usage_metadata={"input_tokens": 3, "output_tokens": 1}),
+            "parsed": _Bullets(bullets=["a"]),
+            "parsing_error": None,
+        }
+
+        monkeypatch.setenv("CASSETTE_MODE", "record")
+        with patch.object(llm, "ChatOpenAI", return_value=fake_chat):
+            llm.invoke_structured("m", 0.2, _Bullets, messages)
+
+        monkeypatch.setenv("CASSETTE_MODE", "replay")
+        with patch.object(llm, "ChatOpenAI", side_effect=AssertionError("network")):
+            out = llm.invoke_structured("m", 0.2, _Bullets, messages)
+
+        assert out == _Bullets(bullets=["a"])
@@ -0,0 +1,168 @@
+"""Tests for the fan-out concurrency governor (soccersmartbet.utils.concurrency).
+
+Coverage:
+  1. PrioritySlots — never more than *limit* holders; a freed slot goes to
+     the lowest priority key, ties in arrival order; limit 0 never blocks.
+  2. game_slot / llm_slot / host_slot — a game's kickoff orders its LLM
+     waits; hosts have separate slots; http_get takes a host slot only for
+     live requests.
+  3. fan_out_to_analysis — Sends are ordered earliest kickoff first and keep
+     each game paired with its own game_id.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from soccersmartbet.pre_gambling_flow.graph_manager import fan_out_to_analysis
+from soccersmartbet.utils import cassette, concurrency
+
+
+def _wait_for_waiters(slots: concurrency.PrioritySlots, n: int) -> None:
+    while len(slots._waiters) < n:
+        time.sleep(0.001)
+
+
+# ---------------------------------------------------------------------------
+# 1. PrioritySlots
+# ---------------------------------------------------------------------------
+
+
+def test_freed_slots_go_to_the_earliest_kickoff():
+    slots = concurrency.PrioritySlots("games", limit=1)
+    slots.acquire()
+    served: list[str] = []
+
+    def game(priority: str) -> None:
+        with slots.hold(priority):
+            served.append(priority)
+
+    threads = []
+    for n, priority in enumerate(["2026-05-02 21:00", "2026-05-02 15:00",
+                                  "2026-05-02 18:00", "2026-05-02 15:00"]):
+        t = threading.Thread(target=game, args=(priority,))
+        t.start()
+        threads.append(t)
+        _wait_for_waiters(slots, n + 1)
+    slots.release()
+    for t in threads:
+        t.join()
+
+    assert served == ["2026-05-02 15:00", "2026-05-02 15:00",
+                      "2026-05-02 18:00", "2026-05-02 21:00"]
+    assert slots.in_flight == 0
+    assert slots.in_flight_max == 1
+
+
+def test_never_more_than_limit_in_flight():
+    slots = concurrency.PrioritySlots("llm", limit=3)
+
+    def call() -> None:
+        with slots.hold():
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert slots.in_flight_max == 3
+
+
+def test_zero_limit_never_blocks():
+    slots = concurrency.PrioritySlots("off", limit=0)
+
+    assert [slots.acquire() for _ in range(20)] == [0.0] * 20
+
+
+# ---------------------------------------------------------------------------
+# 2. game_slot / llm_slot / host_slot
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def governor(monkeypatch):
+    monkeypatch.setattr(concurrency, "_games", concurrency.PrioritySlots("games", 2))
+    monkeypatch.setattr(concurrency, "_llm", concurrency.PrioritySlots("llm", 1))
+    monkeypatch.setattr(concurrency, "_hosts", {})
+    return concurrency
+
+
+def test_game_priority_orders_llm_waits(governor):
+    served: list[str] = []
+
+    def game(kickoff: str) -> None:
+        with governor.game_slot(governor.kickoff_priority("2026-05-02", kickoff)):
+            with governor.llm_slot():
+                served.append(kickoff)
+
+    governor._llm.acquire()  # the one LLM slot is busy
+    threads = []
+    for n, kickoff in enumerate(["20:00", "16:00"]):
+        t = threading.Thread(target=game, args=(kickoff,))
+        t.start()
+        threads.append(t)
+        _wait_for_waiters(governor._llm, n + 1)
+    governor._llm.release()
+    for t in threads:
+        t.join()
+
+    assert served == ["16:00", "20:00"]
+    assert governor._games.in_flight_max == 2
+    assert governor._games.in_flight == 0
+
+
+def test_host_slots_are_per_host(governor):
+    with governor.host_slot("www.fotmob.com"), governor.host_slot("api.open-meteo.com"):
+        pass
+
+    assert set(governor._hosts) == {"www.fotmob.com", "api.open-meteo.com"}
+    assert all(h.in_flight == 0 and h.limit == governor.MAX_HTTP_PER_HOST
+               for h in governor._hosts.values())
+
+
+def test_http_get_takes_a_host_slot_only_when_live(governor, monkeypatch, tmp_path):
+    hosts: list[str] = []
+    real_slot = concurrency.host_slot
+
+    def recording_slot(host: str):
+        hosts.append(host)
+        return real_slot(host)
+
+    monkeypatch.setattr(cassette, "host_slot", recording_slot)
+    monkeypatch.setenv("CASSETTE_MODE", "off")
+    monkeypatch.setenv("CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setattr(cassette.requests, "get", lambda *a, **k: SimpleNamespace(status_code=200))
+
+    cassette.http_get("https://API.open-meteo.com/v1/forecast")
+
+    assert hosts == ["api.open-meteo.com"]
+
+    monkeypatch.setenv("CASSETTE_MODE", "replay")
+    with pytest.raises(cassette.CassetteMiss):
+        cassette.http_get("https://api.open-meteo.com/v1/forecast")
+    assert hosts == ["api.open-meteo.com"]
+
+
+# ---------------------------------------------------------------------------
+# 3. fan_out_to_analysis
+# ---------------------------------------------------------------------------
+
+
+def test_sends_are_ordered_earliest_kickoff_first():
+    games = [
+        {"home_team": h, "away_team": a, "match_date": d, "kickoff_time": k, "league": "PL"}
+        for h, a, d, k in [("Late", "X", "2026-05-02", "21:00"),
+                           ("Tomorrow", "Y", "2026-05-03", "13:00"),
+                           ("Early", "Z", "2026-05-02", "14:30")]
+    ]
+
+    sends = fan_out_to_analysis({"games_to_analyze": [11, 12, 13], "all_games": games})
+
+    assert [(s.arg["game_id"], s.arg["home_team"]) for s in sends] == [
+        (13, "Early"), (11, "Late"), (12, "Tomorrow"),
+    ]
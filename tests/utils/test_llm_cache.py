@@ -0,0 +1,126 @@
+"""Tests for the persistent LLM response cache in soccersmartbet.utils.llm.
+
+Coverage:
+  1. A cache hit returns the stored answer without constructing ChatOpenAI.
+  2. A miss calls the model and stores the parsed answer with the TTL.
+  3. bypass_cache / LLM_CACHE_BYPASS skip the lookup but still refresh the entry.
+  4. LLM_CACHE_TTL_HOURS=0 and cassette record/replay modes never touch the cache.
+  5. The key changes with the system prompt, user message and model.
+
+The DB helpers (_cache_get / _cache_put) are patched — no Postgres needed.
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+
+class _Picks(BaseModel):
+    picks: list[str]
+
+
+_MESSAGES = [SystemMessage(content="sys"), HumanMessage(content="user")]
+
+
+def _fake_chat(parsed: BaseModel) -> MagicMock:
+    chat = MagicMock()
+    chat.with_structured_output.return_value.invoke.return_value = {
+        "raw": MagicMock(usage_metadata={"input_tokens": 5, "output_tokens": 2}),
+        "parsed": parsed,
+        "parsing_error": None,
+    }
+    return chat
+
+
+@pytest.fixture(autouse=True)
+def _cache_env(monkeypatch):
+    monkeypatch.setenv("CASSETTE_MODE", "off")
+    monkeypatch.delenv("LLM_CACHE_TTL_HOURS", raising=False)
+    monkeypatch.delenv("LLM_CACHE_BYPASS", raising=False)
+
+
+class TestInvokeStructuredCache:
+    def test_hit_skips_the_model(self) -> None:
+        from soccersmartbet.utils import llm
+
+        with patch.object(llm, "_cache_get", return_value={"picks": ["cached"]}), \
+             patch.object(llm, "_cache_put") as put, \
+             patch.object(llm, "ChatOpenAI", side_effect=AssertionError("network")):
+            out = llm.invoke_structured("m", 0.3, _Picks, _MESSAGES)
+
+        assert out == _Picks(picks=["cached"])
+        put.assert_not_called()
+
+    def test_miss_calls_model_and_stores(self) -> None:
+        from soccersmartbet.utils import llm
+
+        with patch.object(llm, "_cache_get", return_value=None), \
+             patch.object(llm, "_cache_put") as put, \
+             patch.object(llm, "ChatOpenAI", return_value=_fake_chat(_Picks(picks=["fresh"]))):
+            out = llm.invoke_structured("m", 0.3, _Picks, _MESSAGES)
+
+        assert out == _Picks(picks=["fresh"])
+        key, model, schema_name, response, ttl = put.call_args.args
+        assert len(key) == 64
+        assert (model, schema_name, response, ttl) == ("m", "_Picks", {"picks": ["fresh"]}, 24.0)
+
+    def test_stale_schema_entry_falls_through(self) -> None:
+        from soccersmartbet.utils import llm
+
+        with patch.object(llm, "_cache_get", return_value={"unexpected": 1}), \
+             patch.object(llm, "_cache_put"), \
+             patch.object(llm, "ChatOpenAI", return_value=_fake_chat(_Picks(picks=["fresh"]))):
+            out = llm.invoke_structured("m", 0.3, _Picks, _MESSAGES)
+
+        assert out == _Picks(picks=["fresh"])
+
+    @pytest.mark.parametrize("via_env", [False, True])
+    def test_bypass_skips_lookup_but_refreshes(self, monkeypatch, via_env: bool) -> None:
+        from soccersmartbet.utils import llm
+
+        if via_env:
+            monkeypatch.setenv("LLM_CACHE_BYPASS", "1")
+        with patch.object(llm, "_cache_get") as get, \
+             patch.object(llm, "_cache_put") as put, \
+             patch.object(llm, "ChatOpenAI", return_value=_fake_chat(_Picks(picks=["fresh"]))):
+            llm.invoke_structured("m", 0.3, _Picks, _MESSAGES, bypass_cache=not via_env)
+
+        get.assert_not_called()
+        put.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "env", [{"LLM_CACHE_TTL_HOURS": "0"}, {"CASSETTE_MODE": "record"}]
+    )
+    def test_disabled_modes_never_touch_cache(self, monkeypatch, tmp_path, env) -> None:
+        from soccersmartbet.utils import llm
+
+        monkeypatch.setenv("CASSETTE_DIR", str(tmp_path))
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        with patch.object(llm, "_cache_get") as get, \
+             patch.object(llm, "_cache_put") as put, \
+             patch.object(llm, "ChatOpenAI", return_value=_fake_chat(_Picks(picks=["x"]))):
+            llm.invoke_structured("m", 0.3, _Picks, _MESSAGES)
+
+        get.assert_not_called()
+        put.assert_not_called()
+
+    def test_key_depends_on_prompt_and_model(self) -> None:
+        from soccersmartbet.utils import llm
+
+        keys = []
+        variants = [
+            ("m", _MESSAGES),
+            ("m", [SystemMessage(content="sys2"), HumanMessage(content="user")]),
+            ("m", [SystemMessage(content="sys"), HumanMessage(content="user2")]),
+            ("m2", _MESSAGES),
+        ]
+        with patch.object(llm, "_cache_get", return_value={"picks": []}) as get:
+            for model, messages in variants:
+                llm.invoke_structured(model, 0.3, _Picks, messages)
+                keys.append(get.call_args.args[0])
+
+        assert len(set(keys)) == len(variants)
@@ -0,0 +1,120 @@
+"""Tests for the flow tracing layer.
+
+Coverage:
+  1. Spans outside a traced flow are no-ops.
+  2. Node / tool / HTTP / LLM / cache spans aggregate into one summary.
+  3. traced_tool marks ``{"error": ...}`` results as errors.
+  4. trace_flow records completed / failed status and persists exactly once.
+  5. Spans recorded in worker threads (copied context) land in the caller's trace.
+
+Persistence is patched — no DB access.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from soccersmartbet.utils.tracing import (
+    current_trace,
+    mark_cache_hit,
+    span,
+    trace_flow,
+    traced_node,
+    traced_tool,
+)
+
+
+@pytest.fixture()
+def persisted():
+    calls: list[tuple[str, dict]] = []
+    with patch(
+        "soccersmartbet.utils.tracing._persist",
+        side_effect=lambda trace, triggered_by: calls.append((triggered_by, trace.summary())),
+    ):
+        yield calls
+
+
+class TestSpans:
+    def test_no_trace_is_noop(self) -> None:
+        assert current_trace() is None
+        with span("http", "example.com") as s:
+            pass
+        assert s.duration_ms >= 0
+        mark_cache_hit("whatever")  # must not raise
+
+    def test_summary_aggregates_by_kind(self, persisted) -> None:
+        @traced_tool
+        def fetch_thing() -> dict:
+            with span("http", "api.example.com"):
+                pass
+            return {"ok": True}
+
+        node = traced_node("my_node", lambda state: fetch_thing())
+
+        with trace_flow("pre_gambling", triggered_by="scheduler"):
+            node({})
+            node({})
+            with span("llm", "gpt-test") as s:
+                s.attrs["input_tokens"] = 10
+                s.attrs["output_tokens"] = 4
+            mark_cache_hit("fotmob.league_table")
+
+        triggered_by, summary = persisted[0]
+        assert triggered_by == "scheduler"
+        assert summary["flow_type"] == "pre_gambling"
+        assert summary["status"] == "completed"
+        assert summary["nodes"]["my_node"]["count"] == 2
+        assert summary["tools"]["fetch_thing"]["count"] == 2
+        assert summary["http"]["api.example.com"]["count"] == 2
+        assert summary["caches"]["fotmob.league_table"]["cache_hits"] == 1
+        assert summary["llm"]["count"] == 1
+        assert summary["llm"]["input_tokens"] == 10
+        assert summary["llm"]["models"]["gpt-test"]["output_tokens"] == 4
+        assert len(summary["slowest"]) <= 5
+
+    def test_traced_tool_error_dict_counts_as_error(self, persisted) -> None:
+        @traced_tool
+        def fetch_broken() -> dict:
+            return {"error": "boom"}
+
+        with trace_flow("gambling"):
+            assert fetch_broken() == {"error": "boom"}
+
+        assert persisted[0][1]["tools"]["fetch_broken"]["errors"] == 1
+
+    def test_worker_thread_with_copied_context(self, persisted) -> None:
+        with trace_flow("post_games"):
+            ctx = contextvars.copy_context()
+
+            def _work() -> None:
+                with span("node", "threaded"):
+                    pass
+
+            t = threading.Thread(target=ctx.run, args=(_work,))
+            t.start()
+            t.join()
+
+        assert persisted[0][1]["nodes"]["threaded"]["count"] == 1
+
+
+class TestTraceFlow:
+    def test_failure_is_recorded_and_reraised(self, persisted) -> None:
+        with pytest.raises(ValueError):
+            with trace_flow("pre_gambling"):
+                raise ValueError("nope")
+
+        assert len(persisted) == 1
+        summary = persisted[0][1]
+        assert summary["status"] == "failed"
+        assert summary["error_type"] == "ValueError"
+        assert current_trace() is None
+
+    def test_persist_failure_never_raises(self) -> None:
+        with patch(
+            "soccersmartbet.webapp.audit.write_run_event", side_effect=RuntimeError("db down")
+        ):
+            with trace_flow("gambling"):
+                pass
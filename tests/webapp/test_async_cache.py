@@ -0,0 +1,129 @@
+"""Tests for soccersmartbet.webapp.async_cache.AsyncCache.
+
+Coverage:
+  1. Single-flight: concurrent misses for one key share one load.
+  2. Stale-while-revalidate: a stale value is returned at once and refreshed
+     by exactly one background load.
+  3. Expiry past the stale window waits for a new load; pinned values never
+     expire; fresh=True forces a load.
+  4. Stale-if-error on failed loads; errors propagate when nothing is cached.
+  5. LRU eviction beyond max_entries, and metrics / cache_metrics().
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from soccersmartbet.webapp.async_cache import AsyncCache, cache_metrics
+
+
+class _Loader:
+    """Counting loader that yields to the loop before returning its value."""
+
+    def __init__(self, value="v", fail: bool = False) -> None:
+        self.value = value
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"{self.value}{self.calls}"
+
+
+def _cache(**kwargs) -> AsyncCache:
+    return AsyncCache("test", ttl_s=kwargs.pop("ttl_s", 60.0), **kwargs)
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_share_one_load(self) -> None:
+        cache, load = _cache(), _Loader()
+
+        async def _run():
+            return await asyncio.gather(*(cache.get("k", load) for _ in range(10)))
+
+        assert asyncio.run(_run()) == ["v1"] * 10
+        assert load.calls == 1
+        assert (cache.metrics.misses, cache.metrics.coalesced) == (1, 9)
+
+    def test_fresh_value_is_a_hit(self) -> None:
+        cache, load = _cache(), _Loader()
+
+        async def _run():
+            await cache.get("k", load)
+            return await cache.get("k", load)
+
+        assert asyncio.run(_run()) == "v1"
+        assert cache.metrics.hits == 1
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_value_served_while_one_refresh_runs(self) -> None:
+        cache, load = _cache(ttl_s=1.0, stale_s=60.0), _Loader()
+        cache.set("k", "old", age=5)
+
+        async def _run():
+            first = await asyncio.gather(*(cache.get("k", load) for _ in range(5)))
+            await asyncio.sleep(0.05)
+            return first, await cache.get("k", load)
+
+        first, after = asyncio.run(_run())
+        assert first == ["old"] * 5
+        assert after == "v1"
+        assert load.calls == 1
+        assert (cache.metrics.stale_hits, cache.metrics.refreshes) == (5, 1)
+
+    def test_past_stale_window_waits_for_load(self) -> None:
+        cache, load = _cache(ttl_s=1.0, stale_s=1.0), _Loader()
+        cache.set("k", "old", age=5)
+        assert asyncio.run(cache.get("k", load)) == "v1"
+
+    def test_pinned_value_never_expires(self) -> None:
+        cache, load = _cache(ttl_s=1.0, pin=lambda v: v == "final"), _Loader()
+        cache.set("k", "final", age=9999)
+        assert asyncio.run(cache.get("k", load)) == "final"
+        assert load.calls == 0
+
+    def test_fresh_forces_load(self) -> None:
+        cache, load = _cache(), _Loader()
+        cache.set("k", "old")
+        assert asyncio.run(cache.get("k", load, fresh=True)) == "v1"
+
+
+class TestErrors:
+    def test_failed_load_serves_expired_value(self) -> None:
+        cache = _cache(ttl_s=1.0)
+        cache.set("k", "old", age=9999)
+        assert asyncio.run(cache.get("k", _Loader(fail=True))) == "old"
+        assert cache.metrics.errors == 1
+
+    def test_failed_load_without_value_raises(self) -> None:
+        cache = _cache()
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get("k", _Loader(fail=True)))
+        assert "k" not in cache
+
+
+class TestEvictionAndMetrics:
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = _cache(max_entries=2)
+
+        async def _run():
+            cache.set("a", 1)
+            cache.set("b", 2)
+            await cache.get("a", _Loader())  # touch a
+            cache.set("c", 3)
+
+        asyncio.run(_run())
+        assert ("a" in cache, "b" in cache, "c" in cache) == (True, False, True)
+        assert cache.metrics.evictions == 1
+
+    def test_registered_caches_are_reported(self) -> None:
+        cache = AsyncCache("test_metrics", ttl_s=1.0)
+        cache.set("k", 1)
+        report = cache_metrics()["test_metrics"]
+        assert report["entries"] == 1
+        assert report["hits"] == 0
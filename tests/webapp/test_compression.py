@@ -0,0 +1,188 @@
+"""Tests for soccersmartbet.webapp.compression.CompressionMiddleware.
+
+Coverage:
+  1. negotiate() — brotli preferred, q=0 refusals, "*" wildcard, absent header.
+  2. Large JSON is compressed (br / gzip) with Vary and a correct
+     Content-Length; small bodies and identity clients pass through.
+  3. Multi-chunk bodies are compressed incrementally and decode intact.
+  4. text/event-stream, already-encoded responses, 304s and partial content
+     (206 / Content-Range) are untouched.
+  5. Behind an http middleware (re-chunked bodies) Content-Length decides.
+  6. Static files — Range requests get identity bytes; a compressed
+     variant carries a weak ETag that still yields 304s.
+"""
+from __future__ import annotations
+
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from soccersmartbet.webapp.compression import CompressionMiddleware, negotiate
+
+_BIG = {"rows": [{"team": "Arsenal", "n": i} for i in range(500)]}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/big")
+    async def big() -> dict:
+        return _BIG
+
+    @app.get("/small")
+    async def small() -> dict:
+        return {"ok": True}
+
+    @app.get("/chunks")
+    async def chunks() -> StreamingResponse:
+        parts = (b"line %d\n" % i * 50 for i in range(40))
+        return StreamingResponse(parts, media_type="text/plain")
+
+    @app.get("/events")
+    async def events() -> StreamingResponse:
+        parts = iter([b"data: " + b"x" * 2000 + b"\n\n"])
+        return StreamingResponse(parts, media_type="text/event-stream")
+
+    @app.get("/encoded")
+    async def encoded() -> Response:
+        body = gzip.compress(b"y" * 5000)
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/not-modified")
+    async def not_modified() -> Response:
+        return Response(status_code=304, headers={"ETag": 'W/"a"'})
+
+    @app.get("/partial")
+    async def partial() -> Response:
+        return Response(b"z" * 4000, status_code=206, media_type="text/plain",
+                        headers={"Content-Range": "bytes 0-3999/9000"})
+
+    @app.get("/range")
+    async def content_range() -> Response:
+        return Response(b"z" * 4000, media_type="text/plain",
+                        headers={"Content-Range": "bytes 0-3999/4000"})
+
+    return TestClient(app)
+
+
+def _raw(client: TestClient, path: str, accept: str) -> tuple[dict, bytes]:
+    """GET *path* without the client decoding the body."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept}) as resp:
+        return resp.headers, b"".join(resp.iter_raw())
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize(("header", "expected"), [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("*;q=0, gzip", "gzip"),
+        ("identity", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_choice(self, header, expected) -> None:
+        assert negotiate(header) == expected
+
+
+class TestCompression:
+    def test_brotli_body_and_headers(self, client: TestClient) -> None:
+        headers, body = _raw(client, "/big", "gzip, br")
+        assert headers["content-encoding"] == "br"
+        assert headers["vary"] == "Accept-Encoding"
+        assert int(headers["content-length"]) == len(body)
+        assert brotli.decompress(body) == client.get("/big", headers={"Accept-Encoding": "identity"}).content
+
+    def test_gzip_when_brotli_not_accepted(self, client: TestClient) -> None:
+        headers, body = _raw(client, "/big", "gzip")
+        assert headers["content-encoding"] == "gzip"
+        assert b'"Arsenal"' in gzip.decompress(body)
+
+    def test_small_and_identity_pass_through(self, client: TestClient) -> None:
+        headers, body = _raw(client, "/small", "br")
+        assert "content-encoding" not in headers
+        assert body == b'{"ok":true}'
+        assert "content-encoding" not in _raw(client, "/big", "identity")[0]
+
+    def test_multi_chunk_body_is_streamed_compressed(self, client: TestClient) -> None:
+        headers, body = _raw(client, "/chunks", "gzip")
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        assert gzip.decompress(body) == b"".join(b"line %d\n" % i * 50 for i in range(40))
+
+
+class TestPassThrough:
+    @pytest.mark.parametrize(("path", "encoding"), [
+        ("/events", None),
+        ("/encoded", "gzip"),
+        ("/not-modified", None),
+        ("/partial", None),
+        ("/range", None),
+    ])
+    def test_untouched(self, client: TestClient, path: str, encoding: str | None) -> None:
+        headers, _ = _raw(client, path, "br")
+        assert headers.get("content-encoding") == encoding
+        assert "vary" not in headers
+
+
+class TestBehindHttpMiddleware:
+    def test_small_rechunked_body_is_not_compressed(self) -> None:
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def _noop(request, call_next):
+            return await call_next(request)
+
+        app.add_middleware(CompressionMiddleware)
+
+        @app.get("/small")
+        async def small() -> dict:
+            return {"ok": True}
+
+        @app.get("/big")
+        async def big() -> dict:
+            return _BIG
+
+        client = TestClient(app)
+        assert "content-encoding" not in _raw(client, "/small", "br")[0]
+        headers, body = _raw(client, "/big", "br")
+        assert headers["content-encoding"] == "br"
+        assert b'"Arsenal"' in brotli.decompress(body)
+
+
+class TestStaticFiles:
+    @pytest.fixture
+    def static_client(self, tmp_path) -> TestClient:
+        (tmp_path / "app.js").write_text("const x = 1;\n" * 500)
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware)
+        app.mount("/static", StaticFiles(directory=tmp_path))
+        return TestClient(app)
+
+    def test_range_request_gets_identity_bytes(self, static_client: TestClient) -> None:
+        resp = static_client.get(
+            "/static/app.js", headers={"Accept-Encoding": "br", "Range": "bytes=0-1999"}
+        )
+        assert resp.status_code == 206
+        assert "content-encoding" not in resp.headers
+        assert resp.content == (b"const x = 1;\n" * 500)[:2000]
+
+    def test_compressed_variant_has_weak_etag(self, static_client: TestClient) -> None:
+        identity = static_client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        headers, _ = _raw(static_client, "/static/app.js", "br")
+
+        assert not identity.headers["etag"].startswith("W/")
+        assert headers["etag"] == "W/" + identity.headers["etag"]
+        revalidated = static_client.get(
+            "/static/app.js",
+            headers={"Accept-Encoding": "br", "If-None-Match": headers["etag"]},
+        )
+        assert revalidated.status_code == 304
@@ -0,0 +1,199 @@
+"""Tests for the data-version ETag middleware in soccersmartbet.webapp.etag.
+
+Coverage:
+  1. DataVersion: no token while the listener is disconnected; a write to a
+     listed table changes the token, other tables do not; a reconnect
+     ("*") resets every token.
+  2. Middleware: first GET gets an ETag; a matching If-None-Match is
+     answered with 304 without running the handler.
+  3. A bets/games change, a different query string or an unregistered path
+     never yields a 304; without a connected listener nothing is added.
+  4. /api/today/snapshot short-circuits before its query when counters are live.
+  5. Cached routes: a write invalidates the cache before the tag moves, so
+     write → GET → conditional GET never pins pre-write data under the new
+     tag (including a load already running when the write lands); the
+     filter-values and status caches are registered.
+
+No DB: the listener is a stub and handlers count their calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from soccersmartbet.webapp import etag as etag_mod
+from soccersmartbet.webapp.async_cache import AsyncCache
+from soccersmartbet.webapp.routes import live
+from soccersmartbet.webapp.routes import today as today_mod
+
+
+class _Listener:
+    def __init__(self, connected: bool = True) -> None:
+        self.connected = connected
+
+
+@pytest.fixture
+def version(monkeypatch) -> etag_mod.DataVersion:
+    dv = etag_mod.DataVersion()
+    dv._listener = _Listener()
+    monkeypatch.setattr(etag_mod, "DATA_VERSION", dv)
+    monkeypatch.setattr(today_mod, "DATA_VERSION", dv)
+    return dv
+
+
+@pytest.fixture
+def app_and_calls(version):
+    calls: list[str] = []
+    app = FastAPI()
+    app.middleware("http")(etag_mod.conditional_get_middleware)
+
+    @app.get("/api/bets")
+    async def bets(q: str = "") -> dict:
+        calls.append(q)
+        return {"bets": [q]}
+
+    @app.get("/api/other")
+    async def other() -> dict:
+        calls.append("other")
+        return {}
+
+    return TestClient(app), calls
+
+
+class TestDataVersion:
+    def test_token_tracks_listed_tables(self, version) -> None:
+        before = version.token(("bets", "games"))
+        version.bump("daily_runs")
+        assert version.token(("bets", "games")) == before
+        version.bump("games")
+        assert version.token(("bets", "games")) != before
+
+    def test_reconnect_resets_and_disconnect_disables(self, version) -> None:
+        before = version.token(("bets",))
+        version.bump("*")
+        assert version.token(("bets",)) != before
+        version._listener.connected = False
+        assert version.token(("bets",)) is None
+
+
+class TestMiddleware:
+    def test_match_short_circuits_before_handler(self, app_and_calls) -> None:
+        client, calls = app_and_calls
+        first = client.get("/api/bets?q=league:x")
+        tag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+
+        again = client.get("/api/bets?q=league:x", headers={"If-None-Match": tag})
+
+        assert again.status_code == 304
+        assert calls == ["league:x"]
+
+    def test_write_or_new_params_refetch(self, app_and_calls, version) -> None:
+        client, calls = app_and_calls
+        tag = client.get("/api/bets?q=a").headers["etag"]
+
+        assert client.get("/api/bets?q=b", headers={"If-None-Match": tag}).status_code == 200
+        version.bump("bets")
+        assert client.get("/api/bets?q=a", headers={"If-None-Match": tag}).status_code == 200
+        assert calls == ["a", "b", "a"]
+
+    def test_unregistered_path_and_disconnected_listener_pass_through(
+        self, app_and_calls, version
+    ) -> None:
+        client, _ = app_and_calls
+        assert "etag" not in client.get("/api/other").headers
+        version._listener.connected = False
+        assert "etag" not in client.get("/api/bets").headers
+
+
+class TestSnapshotPreCheck:
+    def test_snapshot_skips_query_on_match(self, version, monkeypatch) -> None:
+        live._SNAPSHOT = None
+        queries: list[object] = []
+
+        def fake_query(today):
+            queries.append(today)
+            return json.dumps({"status": {}, "bets": [], "bankroll": {}})
+
+        monkeypatch.setattr(today_mod, "_fetch_today_snapshot_json", fake_query)
+        app = FastAPI()
+        app.include_router(today_mod.router)
+        client = TestClient(app)
+
+        tag = client.get("/api/today/snapshot").headers["etag"]
+        again = client.get("/api/today/snapshot", headers={"If-None-Match": tag})
+
+        assert again.status_code == 304
+        assert len(queries) == 1
+
+
+class TestCachedRoutes:
+    @pytest.fixture
+    def cached_app(self, version):
+        db = {"bets": 1}
+        cache: AsyncCache[str, dict] = AsyncCache("test_etag_cached", ttl_s=60.0, stale_s=600.0)
+        version.on_change(("bets", "games"), cache.invalidate_all)
+        app = FastAPI()
+        app.middleware("http")(etag_mod.conditional_get_middleware)
+
+        @app.get("/api/filter/values")
+        async def values() -> dict:
+            async def load() -> dict:
+                return dict(db)
+
+            return await cache.get("all", load)
+
+        return TestClient(app), db, cache
+
+    def test_write_get_conditional_get(self, cached_app, version) -> None:
+        client, db, _ = cached_app
+        old = client.get("/api/filter/values")
+
+        db["bets"] = 2
+        version.bump("bets")  # the NOTIFY for that write
+        new = client.get("/api/filter/values", headers={"If-None-Match": old.headers["etag"]})
+        again = client.get("/api/filter/values", headers={"If-None-Match": new.headers["etag"]})
+
+        assert new.status_code == 200
+        assert new.json() == {"bets": 2}
+        assert again.status_code == 304
+
+    def test_load_running_at_the_write_is_not_stored(self) -> None:
+        cache: AsyncCache[str, int] = AsyncCache("test_etag_inflight", ttl_s=60.0)
+
+        async def scenario() -> tuple[int, int]:
+            gate = asyncio.Event()
+
+            async def old_load() -> int:
+                await gate.wait()
+                return 1
+
+            async def new_load() -> int:
+                return 2
+
+            first = asyncio.ensure_future(cache.get("k", old_load))
+            await asyncio.sleep(0)
+            cache.invalidate_all()  # the write lands mid-load
+            after = await cache.get("k", new_load)
+            gate.set()
+            return await first, after
+
+        assert asyncio.run(scenario()) == (1, 2)
+        assert cache.peek("k") == 2
+
+    def test_filter_values_and_status_caches_are_registered(self) -> None:
+        from soccersmartbet.webapp import app as app_mod
+        from soccersmartbet.webapp.routes import filter_values
+
+        filter_values._cache.set("league", {"league": []})
+        app_mod._STATUS_CACHE.set("today", {})
+
+        etag_mod.DATA_VERSION.bump("games")
+        assert "league" not in filter_values._cache
+        assert "today" in app_mod._STATUS_CACHE
+        etag_mod.DATA_VERSION.bump("run_events")
+        assert "today" not in app_mod._STATUS_CACHE
@@ -14,7 +14,6 @@ No real HTTP calls or DB connections: everything is mocked.
 from __future__ import annotations
 
 import datetime
-import time
 from decimal import Decimal
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -242,8 +241,7 @@ def _make_client(
             from soccersmartbet.webapp.routes.live import _LIVE_CACHE
             cache_key = (game_id, fotmob_match_id)
             if cache_key in _LIVE_CACHE:
-                cached_entry, _ = _LIVE_CACHE[cache_key]
-                return cached_entry
+                return _LIVE_CACHE.peek(cache_key)
             return {
                 "game_id": game_id,
                 "fotmob_match_id": fotmob_match_id,
@@ -640,7 +638,7 @@ class TestLivePnlEstimates:
 
 
 class TestLiveCache:
-    """Test the 30-second in-process cache in _get_game_live."""
+    """Test the 30-second in-process AsyncCache in _get_game_live."""
 
     def test_cache_hit_skips_second_http_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Second call within TTL must not call _fetch_match_raw again."""
@@ -649,8 +647,6 @@ class TestLiveCache:
         # Import the module and clear the cache before the test
         import soccersmartbet.webapp.routes.live as live_mod
 
-        # Stash original cache and restore after test
-        original_cache = dict(live_mod._LIVE_CACHE)
         live_mod._LIVE_CACHE.clear()
 
         call_count = [0]
@@ -672,9 +668,7 @@ class TestLiveCache:
         assert call_count[0] == 1  # no second HTTP call
         assert entry1 == entry2
 
-        # Restore cache
         live_mod._LIVE_CACHE.clear()
-        live_mod._LIVE_CACHE.update(original_cache)
 
     def test_finished_game_served_from_cache_indefinitely(
         self, monkeypatch: pytest.MonkeyPatch
@@ -683,7 +677,6 @@ class TestLiveCache:
         import soccersmartbet.webapp.routes.live as live_mod
         import asyncio
 
-        original_cache = dict(live_mod._LIVE_CACHE)
         live_mod._LIVE_CACHE.clear()
 
         call_count = [0]
@@ -705,14 +698,13 @@ class TestLiveCache:
             "finished": True,
         }
         # Set cached_at far in the past (TTL has definitely expired)
-        live_mod._LIVE_CACHE[(99, 777001)] = (finished_entry, time.monotonic() - 9999)
+        live_mod._LIVE_CACHE.set((99, 777001), finished_entry, age=9999)
 
         result = asyncio.run(live_mod._get_game_live(99, 777001))
         assert call_count[0] == 0  # cache served without re-fetch
         assert result["period"] == "FT"
 
         live_mod._LIVE_CACHE.clear()
-        live_mod._LIVE_CACHE.update(original_cache)
 
     def test_stale_cache_returned_on_fotmob_failure(
         self, monkeypatch: pytest.MonkeyPatch
@@ -721,7 +713,6 @@ class TestLiveCache:
         import soccersmartbet.webapp.routes.live as live_mod
         import asyncio
 
-        original_cache = dict(live_mod._LIVE_CACHE)
         live_mod._LIVE_CACHE.clear()
 
         def fake_fetch_raw_fail(match_id: int):
@@ -738,11 +729,10 @@ class TestLiveCache:
             "minute": "12'",
             "finished": False,
         }
-        live_mod._LIVE_CACHE[(55, 666001)] = (stale_entry, time.monotonic() - 9999)
+        live_mod._LIVE_CACHE.set((55, 666001), stale_entry, age=9999)
 
         result = asyncio.run(live_mod._get_game_live(55, 666001))
         assert result["period"] == "1H"
         assert result["minute"] == "12'"
 
         live_mod._LIVE_CACHE.clear()
-        live_mod._LIVE_CACHE.update(original_cache)
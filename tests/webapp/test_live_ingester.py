@@ -0,0 +1,159 @@
+"""Tests for the background live-score ingester and the snapshot read path.
+
+Coverage:
+  1. _plan_polls: idle before the pre-kickoff window, 30s cadence in play,
+     60s at half-time, never after FT, gives up long after kickoff.
+  2. One ingester cycle polls only the due games, publishes a versioned
+     snapshot with "pre" placeholders, and keeps the last entry on failure.
+  3. GET /api/today/live serves a fresh snapshot without calling FotMob and
+     falls back to on-demand fetches when the snapshot is stale.
+
+No DB, listener or FotMob access: helpers are patched.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from soccersmartbet.webapp import live_ingester
+from soccersmartbet.webapp.routes import live
+from soccersmartbet.utils.timezone import isr_datetime
+
+_KICKOFF = isr_datetime(2026, 5, 1, 21, 0)
+_GAME = {"game_id": 1, "fotmob_match_id": 101, "kickoff": _KICKOFF}
+
+_FOTMOB_1H = {
+    "home": {"score": 1},
+    "away": {"score": 0},
+    "status": {"started": True, "ongoing": True, "liveTime": {"short": "12'"}},
+    "halfs": {"secondHalfStarted": ""},
+}
+
+
+def _entry(period: str, finished: bool = False) -> dict:
+    return {**live.unknown_entry(1, 101, period=period), "finished": finished}
+
+
+@pytest.fixture(autouse=True)
+def _reset_snapshot():
+    live._SNAPSHOT = None
+    yield
+    live._SNAPSHOT = None
+
+
+class TestPlanPolls:
+    def test_idle_until_pre_kickoff_window(self) -> None:
+        now = _KICKOFF - timedelta(hours=2)
+        due, next_at = live_ingester._plan_polls(now, [_GAME], {}, {})
+        assert due == []
+        assert next_at == _KICKOFF - live_ingester._PRE_KICKOFF_LEAD
+
+    def test_in_play_polls_every_live_cadence(self) -> None:
+        now = _KICKOFF + timedelta(minutes=20)
+        entries = {1: _entry("1H")}
+        polled = {1: now - timedelta(seconds=31)}
+        due, next_at = live_ingester._plan_polls(now, [_GAME], entries, polled)
+        assert due == [_GAME]
+        assert next_at == now + timedelta(seconds=live_ingester._LIVE_POLL_S)
+
+        polled = {1: now - timedelta(seconds=10)}
+        due, next_at = live_ingester._plan_polls(now, [_GAME], entries, polled)
+        assert due == []
+        assert next_at == now + timedelta(seconds=20)
+
+    def test_half_time_polls_slower(self) -> None:
+        now = _KICKOFF + timedelta(minutes=50)
+        last = now - timedelta(seconds=40)
+        due, next_at = live_ingester._plan_polls(now, [_GAME], {1: _entry("HT")}, {1: last})
+        assert due == []
+        assert next_at == last + timedelta(seconds=live_ingester._HT_POLL_S)
+
+    def test_finished_and_abandoned_games_stop(self) -> None:
+        after_ft = _KICKOFF + timedelta(hours=2)
+        late = _KICKOFF + live_ingester._GIVE_UP_AFTER + timedelta(minutes=1)
+        assert live_ingester._plan_polls(after_ft, [_GAME], {1: _entry("FT", True)}, {}) == ([], None)
+        assert live_ingester._plan_polls(late, [_GAME], {1: _entry("2H")}, {1: late}) == ([], None)
+
+    def test_late_start_polls_unseen_game_once(self) -> None:
+        late = _KICKOFF + timedelta(hours=6)
+        due, _ = live_ingester._plan_polls(late, [_GAME], {}, {})
+        assert due == [_GAME]
+
+
+def _one_cycle(now, games, fotmob: dict) -> list[int]:
+    """Run the ingester until its first sleep; return the fotmob ids fetched."""
+    fetched: list[int] = []
+
+    def fake_fetch(fotmob_match_id: int):
+        fetched.append(fotmob_match_id)
+        return fotmob.get(fotmob_match_id)
+
+    async def stop(deadline, wake, tables):
+        raise asyncio.CancelledError
+
+    listener = MagicMock()
+    listener.subscribe.return_value = asyncio.Queue()
+    with patch.object(live_ingester, "get_listener", return_value=listener), \
+         patch.object(live_ingester, "now_isr", return_value=now), \
+         patch.object(live_ingester, "_fetch_games", return_value=games), \
+         patch.object(live_ingester, "_fetch_match_raw", side_effect=fake_fetch), \
+         patch.object(live_ingester, "wait_for_change", side_effect=stop):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(live_ingester.run_live_ingester())
+    return fetched
+
+
+class TestIngesterCycle:
+    def test_polls_due_games_and_publishes_snapshot(self) -> None:
+        later = {"game_id": 2, "fotmob_match_id": 202, "kickoff": _KICKOFF + timedelta(hours=3)}
+        fetched = _one_cycle(_KICKOFF + timedelta(minutes=12), [_GAME, later], {101: _FOTMOB_1H})
+
+        assert fetched == [101]
+        snap = live._SNAPSHOT
+        assert snap.version == 1
+        assert [(e["game_id"], e["period"]) for e in snap.entries] == [(1, "1H"), (2, "pre")]
+
+    def test_failed_fetch_publishes_unknown(self) -> None:
+        _one_cycle(_KICKOFF + timedelta(minutes=12), [_GAME], {})
+        assert live._SNAPSHOT.entries[0]["period"] == "unknown"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(live.router)
+    return TestClient(app)
+
+
+class TestSnapshotReadPath:
+    def test_fresh_snapshot_served_without_fotmob(self, monkeypatch) -> None:
+        live.publish_snapshot(live.today_isr(), [live._parse_game_entry(1, 101, _FOTMOB_1H)])
+        monkeypatch.setattr(live, "_fetch_today_bets", lambda: {})
+        monkeypatch.setattr(live, "_get_game_live", MagicMock(side_effect=AssertionError("fetch")))
+
+        data = _client().get("/api/today/live").json()
+
+        assert data["version"] == 1
+        assert data["games"][0]["period"] == "1H"
+        assert data["games"][0]["home_score"] == 1
+
+    def test_stale_snapshot_falls_back_to_on_demand(self, monkeypatch) -> None:
+        live.publish_snapshot(live.today_isr() - timedelta(days=1), [_entry("FT", True)])
+        monkeypatch.setattr(
+            live, "_fetch_today_games", lambda: [{"game_id": 1, "fotmob_match_id": 101}]
+        )
+        monkeypatch.setattr(live, "_fetch_today_bets", lambda: {})
+
+        async def fake_live(game_id, fotmob_match_id):
+            return _entry("2H")
+
+        monkeypatch.setattr(live, "_get_game_live", fake_live)
+
+        data = _client().get("/api/today/live").json()
+
+        assert data["version"] is None
+        assert data["games"][0]["period"] == "2H"
@@ -0,0 +1,105 @@
+"""Tests for soccersmartbet.webapp.serialize and GET /api/bets?format=.
+
+Coverage:
+  1. dumps / ORJSONResponse — Decimal as float, dates as ISO strings.
+  2. bet_records matches the historical per-row shape; bet_columns holds the
+     same values column-wise (including for an empty result).
+  3. /api/bets returns records by default and columns on request; an
+     unknown format is a 422.
+
+run_filter is patched — no DB.
+"""
+from __future__ import annotations
+
+from datetime import date, time
+from decimal import Decimal
+from unittest.mock import patch
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from soccersmartbet.webapp.query.models import BetRow, FilterAggregates, FilterResult
+from soccersmartbet.webapp.routes import stats
+from soccersmartbet.webapp.serialize import (
+    BET_COLUMNS,
+    ORJSONResponse,
+    bet_columns,
+    bet_records,
+    dumps,
+)
+
+
+def _bet(bet_id: int, pnl: str | None) -> BetRow:
+    return BetRow(
+        bet_id=bet_id, bettor="user", prediction="1", stake=Decimal("100"),
+        odds=Decimal("2.50"), result=None if pnl is None else "win",
+        pnl=None if pnl is None else Decimal(pnl), game_id=7, home_team="A",
+        away_team="B", match_date=date(2026, 5, 1), kickoff_time=time(21, 0),
+        league="Premier League", outcome=None, home_score=None, away_score=None,
+    )
+
+
+_ROWS = [_bet(1, "150.00"), _bet(2, None)]
+
+
+class TestEncoding:
+    def test_decimal_and_date(self) -> None:
+        body = dumps({"d": date(2026, 5, 1), "x": Decimal("1.50"), 3: None})
+        assert orjson.loads(body) == {"d": "2026-05-01", "x": 1.5, "3": None}
+
+    def test_response_class_renders_with_orjson(self) -> None:
+        assert ORJSONResponse({"x": Decimal("2")}).body == b'{"x":2.0}'
+
+
+class TestBetShapes:
+    def test_records_keep_historical_shape(self) -> None:
+        record = orjson.loads(dumps(bet_records(_ROWS)))[0]
+        assert list(record) == list(BET_COLUMNS)
+        assert record["stake"] == 100.0
+        assert record["pnl"] == 150.0
+        assert record["match_date"] == "2026-05-01"
+        assert record["kickoff_time"] == "21:00"
+
+    def test_columns_hold_the_same_values(self) -> None:
+        records = bet_records(_ROWS)
+        columns = bet_columns(_ROWS)
+        assert list(columns) == list(BET_COLUMNS)
+        for name in BET_COLUMNS:
+            assert columns[name] == [r[name] for r in records]
+
+    def test_empty_columns(self) -> None:
+        assert bet_columns([]) == {name: [] for name in BET_COLUMNS}
+
+
+class TestBetsEndpoint:
+    @pytest.fixture
+    def client(self) -> TestClient:
+        result = FilterResult(
+            rows=_ROWS,
+            aggregates=FilterAggregates(
+                count=2, total_stake=Decimal("200"), total_pnl=Decimal("150"), win_rate=1.0,
+            ),
+            row_cap_hit=False,
+            dsl="",
+        )
+        app = FastAPI()
+        app.include_router(stats.router)
+        with patch.object(stats, "run_filter", return_value=result):
+            yield TestClient(app)
+
+    def test_records_by_default(self, client: TestClient) -> None:
+        data = client.get("/api/bets").json()
+        assert [r["bet_id"] for r in data["rows"]] == [1, 2]
+        assert "columns" not in data
+        assert data["aggregates"]["total_stake"] == 200.0
+
+    def test_columns_on_request(self, client: TestClient) -> None:
+        data = client.get("/api/bets?format=columns").json()
+        assert data["columns"]["bet_id"] == [1, 2]
+        assert data["columns"]["pnl"] == [150.0, None]
+        assert "rows" not in data
+
+    def test_unknown_format_rejected(self, client: TestClient) -> None:
+        assert client.get("/api/bets?format=csv").status_code == 422
@@ -0,0 +1,112 @@
+"""Tests for GET /api/status/stream (Server-Sent Events).
+
+Coverage:
+  1. _sse formatting — event name, JSON data, blank-line terminator.
+  2. Broadcaster — one status re-read per burst of daily_runs / run_events
+     changes, fanned out to every client.
+  3. Broadcaster — games / bets changes are forwarded as ``change`` events
+     without touching the DB; a listener reconnect triggers both.
+  4. Endpoint — the first chunk carries the retry hint and current status.
+
+The ChangeListener is never started and _fetch_status_from_db is patched:
+no DB connections.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from soccersmartbet.db_listener import ChangeListener
+from soccersmartbet.webapp import app as app_module
+
+
+def _parse(message: str) -> tuple[str, dict]:
+    event_line, data_line = message.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+def _drain(queue: asyncio.Queue) -> list[tuple[str, dict]]:
+    out = []
+    while not queue.empty():
+        out.append(_parse(queue.get_nowait()))
+    return out
+
+
+async def _broadcast(payloads: list[dict], clients: int = 2):
+    """Feed *payloads* through a fresh broadcaster; return each client's events."""
+    listener = ChangeListener()
+    broadcaster = app_module._StatusBroadcaster()
+    with patch.object(app_module, "get_listener", return_value=listener), \
+         patch.object(listener, "ensure_running"):
+        queues = [broadcaster.connect() for _ in range(clients)]
+        await asyncio.sleep(0)  # let _run subscribe
+        for payload in payloads:
+            listener.publish(payload)
+        await asyncio.sleep(0.1)  # status is fetched in a worker thread
+        broadcaster._task.cancel()
+    return [_drain(q) for q in queues]
+
+
+class TestSseFormat:
+    def test_event_and_json_data(self) -> None:
+        message = app_module._sse("status", {"run_date": date(2026, 5, 1), "n": 1})
+        assert message.endswith("\n\n")
+        assert _parse(message) == ("status", {"run_date": "2026-05-01", "n": 1})
+
+
+class TestStatusBroadcaster:
+    def setup_method(self) -> None:
+        app_module._STATUS_CACHE.clear()
+
+    def test_status_burst_is_fetched_once_for_all_clients(self) -> None:
+        fetch = MagicMock(return_value={"status": "gambling_running"})
+        with patch.object(app_module, "_fetch_status_from_db", fetch):
+            received = asyncio.run(_broadcast([
+                {"table": "daily_runs", "op": "UPDATE"},
+                {"table": "run_events", "op": "INSERT"},
+            ], clients=3))
+
+        assert fetch.call_count == 1
+        assert received == [[("status", {"status": "gambling_running"})]] * 3
+
+    def test_row_changes_forwarded_without_db_read(self) -> None:
+        fetch = MagicMock(side_effect=AssertionError("no status read expected"))
+        with patch.object(app_module, "_fetch_status_from_db", fetch):
+            received = asyncio.run(_broadcast([
+                {"table": "games", "op": "UPDATE"},
+                {"table": "bets", "op": "INSERT"},
+                {"table": "bets", "op": "UPDATE"},
+            ]))
+
+        assert received[0] == [("change", {"table": "bets"}), ("change", {"table": "games"})]
+        assert received[1] == received[0]
+
+    def test_reconnect_refreshes_status_and_signals_refetch(self) -> None:
+        with patch.object(app_module, "_fetch_status_from_db", return_value={"status": "idle"}):
+            received = asyncio.run(_broadcast([{"table": "*", "op": "RECONNECT"}], clients=1))
+
+        assert received[0] == [("status", {"status": "idle"}), ("change", {"table": "*"})]
+
+
+class TestStatusStreamEndpoint:
+    def test_first_chunk_is_current_status(self) -> None:
+        app_module._STATUS_CACHE.clear()
+
+        async def _run() -> str:
+            listener = ChangeListener()
+            with patch.object(app_module, "_fetch_status_from_db", return_value={"status": "idle"}), \
+                 patch.object(app_module, "get_listener", return_value=listener), \
+                 patch.object(listener, "ensure_running"), \
+                 patch.object(app_module, "_BROADCASTER", app_module._StatusBroadcaster()) as b:
+                response = await app_module.status_stream(MagicMock())
+                first = await response.body_iterator.__anext__()
+                await response.body_iterator.aclose()
+                b._task.cancel()
+                assert not b._clients  # disconnected on close
+            return first
+
+        first = asyncio.run(_run())
+        assert first.startswith("retry: 3000\n")
+        assert _parse(first.removeprefix("retry: 3000\n")) == ("status", {"status": "idle"})
@@ -4,10 +4,14 @@ Covers:
   1. Atlético case — stored "Club Atlético de Madrid" (with accent + inserted word)
      resolves and returns matching bets.
   2. Unknown slug → 404 unknown_team.
-  3. Resolved team with no matching bets → 404 not_found.
+  3. Resolved team with no matching bets → 404 not_found; pending-only bets
+     count in total_bets but not in settled_bets.
   4. Response JSON shape matches documented contract.
 
-No DB is touched: get_cursor and team_registry module state are both mocked.
+No DB is touched: team_registry module state is mocked and get_cursor yields
+a fake cursor serving stats_rollups rows built from the fake bet rows with
+stats_rollups.build_rollups — the same code calculate_pnl / --rebuild use —
+and the unsettled fake rows as pending bets.
 """
 from __future__ import annotations
 
@@ -21,6 +25,8 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from soccersmartbet.stats_rollups import bet_entry, build_rollups
+
 # ---------------------------------------------------------------------------
 # Registry state fixtures — injected before any import of the route module
 # ---------------------------------------------------------------------------
@@ -83,7 +89,7 @@ def _make_row(
     stake: float = 50.0,
     odds: float = 2.1,
 ) -> tuple:
-    """Return a tuple matching the SELECT column order in get_team_stats."""
+    """Return a tuple matching the stats_rollups._SETTLED_BETS_SQL column order."""
     return (
         bet_id,           # 0  b.bet_id
         "user",           # 1  b.bettor
@@ -119,13 +125,34 @@ _DB_ROWS_ARSENAL_UNSETTLED: list[tuple] = [
 ]
 
 
+class _RollupCursor:
+    """Fake cursor answering read_team_stats from rollups of *db_rows*."""
+
+    def __init__(self, db_rows: list[tuple]) -> None:
+        self._rollups = build_rollups(bet_entry(r) for r in db_rows if r[6] is not None)
+        self._pending = [(r[1], r[3], r[8], r[9]) for r in db_rows if r[6] is None]
+        self._result: list[tuple] = []
+
+    def execute(self, sql: str, params: dict[str, Any] | None = None) -> None:
+        if "pnl IS NULL" in sql:
+            self._result = self._pending
+            return
+        self._result = [
+            (bettor, r.total_bets, r.wins, Decimal(str(r.total_stake)),
+             Decimal(str(r.total_pnl)), r.notable)
+            for (scope, key, bettor), r in self._rollups.items()
+            if scope == "team" and key in params["keys"]
+        ]
+
+    def fetchall(self) -> list[tuple]:
+        return self._result
+
+
 def _make_client(monkeypatch: pytest.MonkeyPatch, db_rows: list[tuple]) -> TestClient:
     """Build a TestClient with registry and DB mocked."""
     _patch_registry(monkeypatch)
 
-    # Mock get_cursor as a context manager that returns a cursor with fetchall.
-    mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = db_rows
+    mock_cursor = _RollupCursor(db_rows)
 
     mock_cm = MagicMock()
     mock_cm.__enter__ = MagicMock(return_value=mock_cursor)
@@ -176,8 +203,8 @@ class TestGetTeamStats:
         assert data["total_bets"] == 2
         assert data["team_name"] == "Atletico Madrid"
 
-        home_teams = {b["home_team"] for b in data["bets"]}
-        away_teams = {b["away_team"] for b in data["bets"]}
+        home_teams = {b["home_team"] for b in data["notable_games"]}
+        away_teams = {b["away_team"] for b in data["notable_games"]}
         assert "Club Atlético de Madrid" in home_teams | away_teams
         assert "Arsenal FC" not in home_teams | away_teams
 
@@ -220,6 +247,20 @@ class TestGetTeamStats:
         detail = response.json().get("detail", {})
         assert detail.get("error") == "not_found"
 
+    def test_pending_bets_count_in_total_bets(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A team whose only bet is unsettled is found, not reported missing."""
+        client = _make_client(monkeypatch, _DB_ROWS + _DB_ROWS_ARSENAL_UNSETTLED)
+        response = client.get("/api/teams/Arsenal/stats")
+
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert (data["total_bets"], data["settled_bets"]) == (2, 1)
+        assert data["total_stake"] == 100.0
+        assert data["total_pnl"] == 5.0
+        assert data["by_bettor"]["user"]["total_bets"] == 2
+
     def test_response_shape(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -232,11 +273,12 @@ class TestGetTeamStats:
         for key in (
             "team_name",
             "total_bets",
+            "settled_bets",
             "total_stake",
             "total_pnl",
             "win_rate",
             "notable_games",
-            "bets",
+            "by_bettor",
         ):
             assert key in data, f"Missing key: {key}"
 
@@ -268,4 +310,6 @@ class TestGetTeamStats:
         response = client.get("/api/teams/Atletico%20Madrid/stats")
 
         assert response.status_code == 200
-        assert len(response.json()["notable_games"]) <= 5
+        notable = response.json()["notable_games"]
+        assert len(notable) <= 5
+        assert [b["pnl"] for b in notable] == [70.0, 60.0, 50.0, 40.0, 30.0]
@@ -0,0 +1,107 @@
+"""Tests for GET /api/today/snapshot and the weak-ETag helpers.
+
+Coverage:
+  1. weak_etag / etag_matches — stable tags, weak comparison, lists and "*".
+  2. Endpoint returns Postgres' JSON with an ETag; a matching If-None-Match
+     gets an empty 304.
+  3. The live section is null without an ingester snapshot, and carries P&L
+     estimates computed from the snapshot's own bets when one is published.
+  4. A new live snapshot version changes the ETag.
+
+The snapshot query is patched to return fixed JSON text — no DB needed.
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from soccersmartbet.webapp.etag import etag_matches, weak_etag
+from soccersmartbet.webapp.routes import live
+from soccersmartbet.webapp.routes import today as today_mod
+
+_BET = {
+    "bet_id": 1,
+    "game_id": 7,
+    "bettor": "user",
+    "prediction": "1",
+    "stake": 100.0,
+    "odds": 2.5,
+    "justification": "",
+    "result": None,
+    "pnl": None,
+    "game": {"game_id": 7, "kickoff_time": "21:00", "home_team": "A", "away_team": "B"},
+}
+_DB_JSON = json.dumps({
+    "status": {"status": "gambling_done", "events": []},
+    "bets": [_BET],
+    "bankroll": {"user": {"balance": 10000.0, "today_pnl": None},
+                 "ai": {"balance": 10000.0, "today_pnl": None}},
+})
+
+
+def _request(if_none_match: str | None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def _no_live_snapshot():
+    live._SNAPSHOT = None
+    yield
+    live._SNAPSHOT = None
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(today_mod, "_fetch_today_snapshot_json", lambda today: _DB_JSON)
+    app = FastAPI()
+    app.include_router(today_mod.router)
+    return TestClient(app)
+
+
+class TestEtagHelpers:
+    def test_weak_etag_is_stable_and_distinct(self) -> None:
+        assert weak_etag("a", 1) == weak_etag("a", 1)
+        assert weak_etag("a", 1) != weak_etag("a", 2)
+        assert weak_etag("a").startswith('W/"')
+
+    def test_matching_uses_weak_comparison(self) -> None:
+        tag = weak_etag("x")
+        strong = tag.removeprefix("W/")
+        assert etag_matches(_request(tag), tag)
+        assert etag_matches(_request(f'"other", {strong}'), tag)
+        assert etag_matches(_request("*"), tag)
+        assert not etag_matches(_request('"other"'), tag)
+        assert not etag_matches(_request(None), tag)
+
+
+class TestTodaySnapshot:
+    def test_returns_db_payload_with_etag_then_304(self, client: TestClient) -> None:
+        resp = client.get("/api/today/snapshot")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["bets"] == [_BET]
+        assert data["status"]["status"] == "gambling_done"
+        assert data["live"] is None
+
+        again = client.get("/api/today/snapshot", headers={"If-None-Match": resp.headers["etag"]})
+        assert again.status_code == 304
+        assert again.content == b""
+
+    def test_live_section_has_estimates_and_changes_etag(self, client: TestClient) -> None:
+        before = client.get("/api/today/snapshot").headers["etag"]
+        live.publish_snapshot(live.today_isr(), [{
+            **live.unknown_entry(7, 700, period="2H"), "home_score": 2, "away_score": 0,
+        }])
+
+        resp = client.get("/api/today/snapshot", headers={"If-None-Match": before})
+
+        assert resp.status_code == 200
+        game = resp.json()["live"]["games"][0]
+        assert game["pnl_estimate_is_live"] is True
+        assert game["user_pnl_estimate"] == pytest.approx(150.0)
+        assert game["ai_pnl_estimate"] is None